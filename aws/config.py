@@ -16,6 +16,8 @@ load_dotenv()
 AWS_REGION = "us-east-2"
 BUCKET_NAME = "artifacts-for-modelregistry"
 DYNAMODB_TABLE_NAME = "Artifacts"
+# GSI on the Artifacts table: partition key `canonical_url`, sort key `created_at`
+CANONICAL_URL_INDEX = os.getenv("CANONICAL_URL_INDEX", "canonical_url-index")
 
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
@@ -30,6 +32,125 @@ s3 = session.client("s3")
 dynamodb = session.resource("dynamodb")
 table = dynamodb.Table(DYNAMODB_TABLE_NAME)
 
+# --- Streaming ingest ---
+# S3 rejects multipart parts smaller than 5 MiB (except the final part), so the
+# configured part size is clamped to that floor.
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+S3_MULTIPART_PART_SIZE = max(
+    S3_MIN_PART_SIZE, int(os.getenv("S3_MULTIPART_PART_SIZE", 8 * 1024 * 1024))
+)
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", 1024 * 1024))
+DOWNLOAD_TIMEOUT = float(os.getenv("DOWNLOAD_TIMEOUT", 30))
+
+# --- Content-addressed blobs ---
+# Artifact bytes live under blobs/sha256/<digest>; this table counts how many
+# artifact items reference each digest.
+BLOBS_TABLE_NAME = os.getenv("BLOBS_TABLE", "ArtifactBlobs")
+blobs_table = dynamodb.Table(BLOBS_TABLE_NAME)
+# A blob whose last reference was dropped is marked as deleting until its S3
+# object is gone. Ingests of the same digest wait for that; a mark older than
+# this many seconds is treated as left behind by a crashed process.
+BLOB_DELETE_STALE_SECONDS = int(os.getenv("BLOB_DELETE_STALE_SECONDS", 300))
+
+# --- Ranged download ---
+# Sources that accept byte ranges are fetched over several connections, each
+# range going straight to S3 as one multipart part.
+RANGED_DOWNLOAD = os.getenv("RANGED_DOWNLOAD", "1") == "1"
+RANGED_MIN_SIZE = int(float(os.getenv("RANGED_MIN_SIZE_MB", 64)) * 1024 * 1024)
+RANGED_MAX_CONNECTIONS = int(os.getenv("RANGED_MAX_CONNECTIONS", 16))
+RANGED_MAX_PART_SIZE = max(
+    S3_MULTIPART_PART_SIZE, int(float(os.getenv("RANGED_MAX_PART_MB", 64)) * 1024 * 1024)
+)
+RANGED_RETRIES = int(os.getenv("RANGED_RETRIES", 3))
+
+# --- Snapshot ingest ---
+# With SNAPSHOT_INGEST=1, Hugging Face models/datasets are stored as a full
+# repo snapshot (every selected file plus a manifest) instead of one file.
+SNAPSHOT_INGEST = os.getenv("SNAPSHOT_INGEST", "0") == "1"
+SNAPSHOT_EXCLUDE = [
+    p.strip()
+    for p in os.getenv("SNAPSHOT_EXCLUDE", "*.h5,*.msgpack,*.ot,*.tflite,*.mlmodel,.gitattributes").split(",")
+    if p.strip()
+]
+SNAPSHOT_WORKERS = int(os.getenv("SNAPSHOT_WORKERS", 16))
+# Concurrent file transfers per source host; "host=n,..." overrides single hosts.
+SNAPSHOT_PER_HOST_CONCURRENCY = int(os.getenv("SNAPSHOT_PER_HOST_CONCURRENCY", 8))
+SNAPSHOT_HOST_CONCURRENCY = {
+    host.strip(): int(limit)
+    for host, _, limit in (
+        item.partition("=") for item in os.getenv("SNAPSHOT_HOST_CONCURRENCY", "").split(",") if "=" in item
+    )
+}
+# Cap on the combined size of files being transferred at once.
+SNAPSHOT_MAX_INFLIGHT_BYTES = int(float(os.getenv("SNAPSHOT_MAX_INFLIGHT_MB", 2048)) * 1024 * 1024)
+
+# --- Ingest admission control ---
+# Transfers reserve their buffer footprint (one part per stream/connection)
+# against a process-wide budget and take a slot for their source host.
+# Synchronous requests wait up to INGEST_ADMISSION_WAIT seconds, then get 429.
+INGEST_MAX_INFLIGHT_BYTES = int(float(os.getenv("INGEST_MAX_INFLIGHT_MB", 1024)) * 1024 * 1024)
+INGEST_MAX_CONCURRENT = int(os.getenv("INGEST_MAX_CONCURRENT", 16))
+INGEST_PER_HOST_CONCURRENCY = int(os.getenv("INGEST_PER_HOST_CONCURRENCY", 8))
+INGEST_ADMISSION_WAIT = float(os.getenv("INGEST_ADMISSION_WAIT", 10))
+
+# --- Size preflight ---
+# Ingest works out the download size before fetching (HF file sizes or a HEAD;
+# snapshots fall back to the repo size). Artifacts up to INGEST_SMALL_ARTIFACT_MB are fetched in one
+# request and held in memory; anything over INGEST_MAX_ARTIFACT_GB is rejected
+# with 413 before any bytes move.
+INGEST_PREFLIGHT_HEAD = os.getenv("INGEST_PREFLIGHT_HEAD", "1") == "1"
+INGEST_SMALL_ARTIFACT_BYTES = int(float(os.getenv("INGEST_SMALL_ARTIFACT_MB", 8)) * 1024 * 1024)
+INGEST_MAX_ARTIFACT_BYTES = int(float(os.getenv("INGEST_MAX_ARTIFACT_GB", 50)) * 1024 ** 3)
+
+# --- Dataflow scoring ---
+# With DATAFLOW_SCORING=1, ingest starts each metric as soon as the data
+# fetchers it declares have finished instead of after all of them.
+DATAFLOW_SCORING = os.getenv("DATAFLOW_SCORING", "1") == "1"
+
+# --- Score cache ---
+# Ratings computed by the rate endpoint are cached in-process, keyed by the
+# canonical URL, a digest of the fetched inputs and the metric versions.
+# Scores older than SCORE_CACHE_TTL seconds are reported as stale.
+SCORE_CACHE_TTL = float(os.getenv("SCORE_CACHE_TTL", 6 * 3600))
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", 1024))
+
+# --- Ingestion jobs ---
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", 4))
+INGEST_QUEUE_LIMIT = int(os.getenv("INGEST_QUEUE_LIMIT", 100))
+# "sqlite" (local journal file) or "dynamodb" (INGEST_JOBS_TABLE)
+INGEST_JOB_STORE = os.getenv("INGEST_JOB_STORE", "sqlite").lower()
+INGEST_JOB_DB = os.getenv(
+    "INGEST_JOB_DB", os.path.join(os.path.dirname(__file__), "../backend/ingest_jobs.db")
+)
+# Staging multipart uploads older than this that no unfinished job has
+# checkpointed are aborted; the reaper runs every INGEST_REAP_INTERVAL seconds.
+INGEST_UPLOAD_MAX_AGE = float(os.getenv("INGEST_UPLOAD_MAX_AGE_HOURS", 24)) * 3600
+INGEST_REAP_INTERVAL = float(os.getenv("INGEST_REAP_INTERVAL", 3600))
+# A process holds each job it queued or recovered under a lease it renews
+# every third of INGEST_JOB_LEASE seconds. Other processes only take over
+# unfinished jobs whose lease has expired.
+INGEST_JOB_LEASE = int(os.getenv("INGEST_JOB_LEASE", 60))
+INGEST_JOBS_TABLE_NAME = os.getenv("INGEST_JOBS_TABLE", "IngestJobs")
+jobs_table = dynamodb.Table(INGEST_JOBS_TABLE_NAME)
+
+# --- Idempotency-Key handling ---
+# Completed keys replay their response for this long; a key left "pending" by
+# a crashed process is treated as abandoned after IDEMPOTENCY_PENDING_SECONDS.
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 24 * 3600))
+IDEMPOTENCY_PENDING_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_SECONDS", 3600))
+IDEMPOTENCY_TABLE_NAME = os.getenv("IDEMPOTENCY_TABLE", "IngestIdempotency")
+idempotency_table = dynamodb.Table(IDEMPOTENCY_TABLE_NAME)
+
+# --- Batch ingestion ---
+BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", 500))
+# Per-stage concurrency for POST /artifacts/batch (see backend.services.ingest.INGEST_STAGES)
+BATCH_STAGE_LIMITS = {
+    "metadata": int(os.getenv("BATCH_METADATA_CONCURRENCY", 16)),
+    "metric_data": int(os.getenv("BATCH_METRIC_DATA_CONCURRENCY", 8)),
+    "score": int(os.getenv("BATCH_SCORE_CONCURRENCY", 4)),
+    "transfer": int(os.getenv("BATCH_TRANSFER_CONCURRENCY", 4)),
+}
+
 # --- Tokens ---
 UPLOAD_TOKEN = os.getenv("UPLOAD_TOKEN", "default_upload_token")
 ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "default_admin_token")
@@ -0,0 +1,48 @@
+"""Batch ingestion API router.
+
+Registers many artifact URLs in one request, pipelining metadata fetch,
+scoring and transfer across URLs.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+import logging
+from aws.config import BATCH_MAX_URLS
+from backend.deps import artifact_manager, storage_manager, verify_token
+from backend.services.batch import BatchIngestor
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+class ArtifactBatchRequest(BaseModel):
+    """
+    Request schema for batch ingestion.
+
+    Attributes:
+        urls (List[str]): Source URLs; duplicates (after normalization) are dropped.
+        artifact_type (str, optional): Force a type; otherwise inferred per URL.
+        concurrency (Dict[str, int], optional): Per-stage concurrency overrides.
+    """
+    urls: List[str]
+    artifact_type: Optional[str] = None
+    concurrency: Optional[Dict[str, int]] = None
+
+
+@router.post("/artifacts/batch")
+def artifacts_batch_create(request: ArtifactBatchRequest, _: bool = Depends(verify_token)):
+    """Ingest a list of URLs and return per-URL results plus a throughput summary."""
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="Missing urls")
+    if len(request.urls) > BATCH_MAX_URLS:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_MAX_URLS} URLs per batch")
+    if request.artifact_type and request.artifact_type not in ["model", "dataset", "code"]:
+        raise HTTPException(status_code=400, detail="Invalid artifact_type")
+
+    try:
+        ingestor = BatchIngestor(artifact_manager, storage_manager, request.concurrency)
+        return ingestor.run(request.urls, request.artifact_type)
+    except Exception:
+        logger.exception("Batch ingestion failed")
+        raise HTTPException(status_code=500, detail="Batch ingestion failed")
@@ -4,11 +4,14 @@ Provides artifact registration via URL ingestion and persists metadata/content
 through the shared storage layer.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, Request
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response, status, Request
 from pydantic import BaseModel
-import requests
 import logging
-from backend.deps import artifact_manager, storage_manager, verify_token
+from aws.config import INGEST_ADMISSION_WAIT
+from backend.deps import artifact_manager, storage_manager, job_manager, idempotency, verify_token
+from backend.services.idempotency import IdempotencyConflict, IdempotencyInProgress, request_fingerprint
+from backend.services.ingest import IngestError, IngestPipeline
+from backend.services.jobs import JobQueueFull
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -26,95 +29,145 @@ class ArtifactUploadRequest(BaseModel):
     url: str
 
 
+def queue_ingest_job(
+    artifact_type: str,
+    request: ArtifactUploadRequest,
+    response: Response,
+    refresh: bool,
+    idempotency_key: str | None,
+) -> dict:
+    """
+    Queue an ingestion job and return its record (answered with 202).
+
+    Shared by `POST /jobs/artifact/{artifact_type}` and
+    `POST /artifact/{artifact_type}?async=true`. Sets `Location` to the job.
+    """
+    def submit():
+        return job_manager.submit(request.url, artifact_type, request.name, refresh)["job_id"]
+
+    try:
+        if idempotency_key:
+            fingerprint = request_fingerprint(artifact_type, request.url, request.name, refresh)
+            job_id = idempotency.run(f"jobs:{idempotency_key}", fingerprint, submit)
+        else:
+            job_id = submit()
+        job = job_manager.get(job_id)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": "1"})
+    except JobQueueFull as e:
+        logger.warning(f"[JOBS] Rejecting ingest of {request.url}: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Ingestion queue is full",
+            headers={"Retry-After": "30"},
+        )
+    except Exception:
+        logger.exception("Failed to queue ingestion job")
+        raise HTTPException(status_code=500, detail="Failed to queue ingestion job")
+    if job is None:
+        raise HTTPException(status_code=500, detail="Queued ingestion job is missing from the journal")
+
+    response.status_code = status.HTTP_202_ACCEPTED
+    response.headers["Location"] = f"/jobs/{job['job_id']}"
+    return job
+
+
 @router.post("/artifact/{artifact_type}", status_code=status.HTTP_201_CREATED)
 def artifact_create(
     artifact_type: str,
     request: ArtifactUploadRequest,
     http_request: Request,
+    response: Response,
+    refresh: bool = Query(False),
+    run_async: bool = Query(False, alias="async"),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
     _: bool = Depends(verify_token),
 ):
     """
     Register a new artifact and store both its metadata and actual content.
 
-    Steps:
-    1. Use the artifact URL to fetch metadata via `artifact_manager`.
-    2. Extract `download_url` from metadata.
-    3. Fetch the actual artifact bytes from `download_url`.
-    4. Store artifact data and bytes in storage (S3 + DynamoDB).
-    5. Return stored metadata and download information.
+    Runs the ingest pipeline (`backend.services.ingest.IngestPipeline`)
+    inside the request:
+    1. Use the artifact URL to fetch metadata, metric data and scores via `artifact_manager`.
+    2. Open a streaming GET on the artifact's `download_url`.
+    3. Pipe the response body into S3 (multipart) and store metadata in DynamoDB.
+       The body is never buffered in full, so memory stays bounded per ingest.
+    4. Return stored metadata and download information.
+
+    With `?async=true` the pipeline runs as a background job instead: the
+    response is `202` with the job record and a `Location: /jobs/{job_id}`
+    header, exactly as from `POST /jobs/artifact/{artifact_type}`. Without it
+    the ingest stays synchronous.
+
+    A URL that was already ingested (same canonical URL) returns the existing
+    artifact with `200` after a single index lookup; pass `?refresh=true` to
+    re-process it. Retries carrying the same `Idempotency-Key` header wait for
+    or replay the first request's response instead of ingesting again.
 
     Args:
         artifact_type (str): Type/category of the artifact (e.g., 'model', 'dataset', 'code').
         request (ArtifactUploadRequest): Pydantic model containing artifact URL and optional name.
         http_request (Request): FastAPI request object (can be used for logging or context).
+        response (Response): Used to downgrade the status to 200 for existing artifacts.
+        refresh (bool): Re-process the URL even if it was ingested before.
+        run_async (bool): Queue an ingestion job and answer 202 (`?async=true`).
+        idempotency_key (str | None): Client-chosen key identifying retries of one request.
         _ (bool): Dependency that verifies the request token (via `verify_token`).
 
     Returns:
         dict: Contains metadata of the stored artifact and URLs.
 
     Raises:
-        HTTPException: If fetching metadata, downloading artifact, or storing fails.
+        HTTPException: If fetching metadata, downloading artifact, or storing fails,
+            or the idempotency key conflicts (422) or is still in progress (409),
+            or no transfer capacity frees up within `INGEST_ADMISSION_WAIT` (429 with `Retry-After`).
     """
-    try:
-        # Step 1: Process the artifact URL to get metadata
-        artifact_data = artifact_manager.processUrl(request.url)
-        artifact_id = artifact_data.get("artifact_id")
-        download_url = artifact_data.get("download_url")
-        artifact_data["artifact_type"] = artifact_type
-        artifact_data["processed_url"] = request.url
-        if request.name:
-            artifact_data["name"] = request.name
-
-        # Step 2: Fetch artifact bytes from download_url
-        if not download_url:
-            raise HTTPException(
-                status_code=400,
-                detail="No download URL found for the artifact"
-            )
-
-        response = requests.get(download_url, stream=True)
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to fetch artifact bytes from {download_url}"
-            )
-
-        # Step 3: Convert artifact content to bytes
-        artifact_bytes = response.content
-
-        # Step 4: Store artifact in S3 + DynamoDB
-        ok = storage_manager.store_artifact(
-            artifact_data, artifact_bytes, artifact_data.get("name")
+    if run_async:
+        if artifact_type not in ["model", "dataset", "code"]:
+            raise HTTPException(status_code=400, detail="Invalid artifact_type")
+        return queue_ingest_job(artifact_type, request, response, refresh, idempotency_key)
+
+    def ingest():
+        pipeline = IngestPipeline(artifact_manager, storage_manager, admission_wait=INGEST_ADMISSION_WAIT)
+        existing = None if refresh else pipeline.find_existing(request.url, artifact_type)
+        stored_metadata = existing or pipeline.run(
+            request.url, artifact_type, request.name, reuse_existing=False
         )
-        if not ok:
-            raise HTTPException(status_code=500, detail="Failed to store artifact")
-
-        logger.info(
-            "Stored artifact %s of type %s",
-            artifact_data.get("artifact_id"),
-            artifact_type,
-        )
-
-        # Step 5: Fetch stored metadata
-        stored_metadata = storage_manager.get_artifact(artifact_data.get("artifact_id"))
-        if not stored_metadata:
-            raise HTTPException(
-                status_code=500, detail="Artifact stored but metadata missing"
-            )
 
         # Return metadata and download information
         return {
-            "metadata": {
-                "name": stored_metadata.get("name"),
-                "id": artifact_id,
-                "type": stored_metadata.get("type"),
-            },
-            "data": {
-                "url": request.url,
-                "download_url": download_url,
+            "created": existing is None,
+            "body": {
+                "metadata": {
+                    "name": stored_metadata.get("name"),
+                    "id": stored_metadata.get("artifact_id"),
+                    "type": stored_metadata.get("type"),
+                },
+                "data": {
+                    "url": request.url,
+                    "download_url": stored_metadata.get("download_url"),
+                },
             },
         }
 
+    try:
+        if idempotency_key:
+            fingerprint = request_fingerprint(artifact_type, request.url, request.name, refresh)
+            outcome = idempotency.run(f"create:{idempotency_key}", fingerprint, ingest)
+        else:
+            outcome = ingest()
+        if not outcome["created"]:
+            response.status_code = status.HTTP_200_OK
+        return outcome["body"]
+
+    except IdempotencyConflict as ic:
+        raise HTTPException(status_code=422, detail=str(ic))
+    except IdempotencyInProgress as ip:
+        raise HTTPException(status_code=409, detail=str(ip), headers={"Retry-After": "30"})
+    except IngestError as ie:
+        raise HTTPException(status_code=ie.status_code, detail=ie.detail, headers=ie.headers)
     except HTTPException as he:
         raise he
     except Exception as e:
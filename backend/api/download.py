@@ -3,7 +3,9 @@
 Exposes a stable endpoint that redirects to a short-lived presigned S3 URL.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import RedirectResponse
 import logging
 from backend.deps import storage_manager, verify_token
@@ -15,11 +17,13 @@ logger = logging.getLogger(__name__)
 @router.get("/artifact/{artifact_id}/download")
 def download_artifact(
     artifact_id: str,
+    file: Optional[str] = Query(None, description="Path of one file within a snapshot artifact"),
     _: bool = Depends(verify_token),
 ):
     """
     Returns a stable download endpoint for an artifact.
     Internally generates a short-lived presigned S3 URL and redirects to it.
+    For snapshot artifacts, `?file=<path>` selects a file from the manifest.
     """
     try:
         artifact = storage_manager.get_artifact(artifact_id)
@@ -30,10 +34,16 @@ def download_artifact(
         if not filename:
             raise HTTPException(status_code=500, detail="Artifact filename missing")
 
-        presigned_url = storage_manager.generate_download_url(
-            artifact_id=artifact_id,
-            filename=filename,
-        )
+        if file:
+            presigned_url = storage_manager.generate_file_download_url(artifact, file)
+            if not presigned_url:
+                raise HTTPException(status_code=404, detail="File does not exist in artifact")
+        else:
+            presigned_url = storage_manager.generate_download_url(
+                artifact_id=artifact_id,
+                filename=artifact.get("filename") or filename,
+                s3_uri=artifact.get("url"),
+            )
 
         return RedirectResponse(
             url=presigned_url,
@@ -0,0 +1,44 @@
+"""Ingestion jobs API router.
+
+Queues artifact ingestion on the background worker pool and exposes job state,
+per-stage progress and the resulting artifact id.
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+import logging
+from backend.deps import job_manager, verify_token
+from backend.api.create import ArtifactUploadRequest, queue_ingest_job
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.post("/jobs/artifact/{artifact_type}", status_code=status.HTTP_202_ACCEPTED)
+def artifact_create_job(
+    artifact_type: str,
+    request: ArtifactUploadRequest,
+    response: Response,
+    refresh: bool = Query(False),
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+    _: bool = Depends(verify_token),
+):
+    """
+    Queue an ingestion job and return immediately with its id.
+
+    The job runs the same pipeline as `POST /artifact/{artifact_type}`; poll
+    `GET /jobs/{job_id}` (also sent as the `Location` header) for progress.
+    Retrying with the same `Idempotency-Key` returns the original job instead
+    of queueing another download.
+    """
+    if artifact_type not in ["model", "dataset", "code"]:
+        raise HTTPException(status_code=400, detail="Invalid artifact_type")
+    return queue_ingest_job(artifact_type, request, response, refresh, idempotency_key)
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str, _: bool = Depends(verify_token)):
+    """Return job state, per-stage progress and the artifact id once succeeded."""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job does not exist")
+    return job
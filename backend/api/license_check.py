@@ -7,6 +7,7 @@ against a provided GitHub URL.
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 import requests
+from cli.utils.HttpClient import http_client
 import logging
 from backend.deps import storage_manager, verify_token
 
@@ -29,7 +30,7 @@ def artifact_license_check(id: str, request: SimpleLicenseCheckRequest, _: bool
         if not request.github_url or not isinstance(request.github_url, str):
             raise HTTPException(status_code=400, detail="Malformed request: github_url missing or invalid")
         try:
-            response = requests.head(request.github_url, timeout=5)
+            response = http_client.head(request.github_url)
             if response.status_code >= 400:
                 raise HTTPException(status_code=502, detail="External license information could not be retrieved")
         except requests.RequestException:
@@ -3,20 +3,65 @@
 Exposes scoring/ratings retrieval for a model artifact.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 import logging
 import json
-from backend.deps import storage_manager, verify_token
+import time
+from typing import Any, Dict, Optional
+from backend.deps import storage_manager, score_cache, verify_token
+from backend.services.score_cache import score_key
+from cli.utils.MetricScorer import parse_metric_selection, project_scores
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+
+def _parse_scores(scores: Any, id: str) -> Any:
+    """Scores may be stored or returned as a JSON string; parse them into a dict."""
+    if isinstance(scores, str):
+        try:
+            return json.loads(scores)
+        except Exception:
+            logger.exception(f"[RATE] Failed to parse scores JSON for {id}")
+            return {}
+    return scores
+
+
+def _report(response: Response, source: str, scored_at: Optional[float]) -> None:
+    """
+    Describe where the scores came from in response headers.
+
+    X-Score-Cache is "stored" (DynamoDB item), "hit" (score cache) or "miss"
+    (computed now). X-Score-Age is the seconds since the scores were computed,
+    and X-Score-Stale says whether that exceeds SCORE_CACHE_TTL ("unknown" for
+    scores stored without a timestamp).
+    """
+    response.headers["X-Score-Cache"] = source
+    stale = score_cache.is_stale(scored_at)
+    if scored_at is not None:
+        response.headers["X-Score-Age"] = str(max(0, int(time.time() - scored_at)))
+    response.headers["X-Score-Stale"] = "unknown" if stale is None else str(stale).lower()
+
+
 @router.get("/artifact/model/{id}/rate")
-def artifact_model_rate(id: str, _: bool = Depends(verify_token)):
+def artifact_model_rate(
+    id: str,
+    response: Response,
+    metrics: Optional[str] = Query(None, description="Comma-separated metric names; default all"),
+    _: bool = Depends(verify_token),
+):
     """
     Retrieve the ratings/scores for a model artifact.
     Tries to use stored scores from DynamoDB if available, else recomputes.
     Ensures 'name' and 'category' are always populated.
+
+    Stored scores recorded under older metric versions are recomputed.
+    Computed scores go through the content-keyed score cache and are written
+    back to the artifact item.
+
+    `metrics` limits the response to those metrics' scores (no net_score).
+    A recompute then runs only the data fetchers they depend on, and the
+    partial result is cached but not written to the artifact item.
     """
     try:
         logger.info(f"[RATE] Requested rating for artifact_id={id}")
@@ -36,30 +81,34 @@ def artifact_model_rate(id: str, _: bool = Depends(verify_token)):
         fallback_name = artifact.get("name") or "unknown"
         fallback_category = artifact.get("artifact_type") or artifact.get("type") or "model"
 
-        scores = artifact.get("scores")
-        if scores:
-            logger.info(f"[RATE] Found stored scores for {id}")
-
-            # If stored as JSON string, parse it
-            if isinstance(scores, str):
-                logger.info(f"[RATE] Stored scores are JSON string — attempting parse")
-                try:
-                    scores = json.loads(scores)
-                except Exception:
-                    logger.exception(f"[RATE] Failed to parse stored scores for {id}")
-                    scores = {}
-
-            # Ensure name and category are populated
-            if isinstance(scores, dict):
-                if not scores.get("name") or scores.get("name") == "":
-                    scores["name"] = fallback_name
-                    logger.info(f"[RATE] Injected fallback name into scores: {fallback_name}")
-                if not scores.get("category") or scores.get("category") == "":
-                    scores["category"] = fallback_category
-                    logger.info(f"[RATE] Injected fallback category into scores: {fallback_category}")
+        def with_fallbacks(scores: Dict[str, Any]) -> Dict[str, Any]:
+            if not scores.get("name"):
+                scores["name"] = fallback_name
+                logger.info(f"[RATE] Injected fallback name into scores: {fallback_name}")
+            if not scores.get("category"):
+                scores["category"] = fallback_category
+                logger.info(f"[RATE] Injected fallback category into scores: {fallback_category}")
+            return scores
 
+        scorer = storage_manager.artifact_manager.scorer
+        try:
+            selection = parse_metric_selection(metrics, scorer.metrics)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        versions = scorer.metric_versions()
+
+        scores = _parse_scores(artifact.get("scores"), id)
+        if scores and isinstance(scores, dict):
+            recorded = artifact.get("metric_versions")
+            if recorded and dict(recorded) != versions:
+                logger.info(f"[RATE] Stored scores for {id} predate the current metric versions — recomputing")
+            else:
                 logger.info(f"[RATE] Returning stored score response for {id}")
-                return scores
+                scored_at = artifact.get("scored_at")
+                _report(response, "stored", None if scored_at is None else float(scored_at))
+                if selection is not None:
+                    scores = project_scores(scores, selection)
+                return with_fallbacks(scores)
 
         # If no scores stored, recompute using ArtifactManager
         logger.info(f"[RATE] No valid stored scores found — recomputing for {id}")
@@ -76,25 +125,38 @@ def artifact_model_rate(id: str, _: bool = Depends(verify_token)):
             )
 
         try:
-            artifact_data = storage_manager.artifact_manager.getArtifactData(processed_url)
-            computed = storage_manager.artifact_manager.scoreArtifact(artifact_data)
-
-            # Parse if returned as JSON string
-            if isinstance(computed, str):
-                try:
-                    computed = json.loads(computed)
-                except Exception:
-                    logger.exception(f"[RATE] Failed to parse computed scores JSON for {id}")
-                    raise HTTPException(status_code=500, detail="Failed to compute ratings")
-
-            if isinstance(computed, dict):
-                computed["name"] = fallback_name
-                computed["category"] = fallback_category
-                logger.info(f"[RATE] Returning newly computed scores for {id}")
-                return computed
-            else:
+            artifact_data = storage_manager.artifact_manager.getArtifactData(processed_url, metrics=selection)
+            features = scorer.input_features(artifact_data)
+            if selection is not None:
+                versions = {name: versions[name] for name in selection}
+            key = score_key(processed_url, features, versions)
+
+            cached = score_cache.get(key)
+            if cached is not None:
+                logger.info(f"[RATE] Score cache hit for {id}")
+                _report(response, "hit", cached.scored_at)
+                return with_fallbacks(cached.scores)
+
+            computed = _parse_scores(
+                storage_manager.artifact_manager.scoreArtifact(artifact_data, metrics=selection), id
+            )
+            if not computed:
+                raise HTTPException(status_code=500, detail="Failed to compute ratings")
+            if not isinstance(computed, dict):
                 raise HTTPException(status_code=500, detail="Unexpected score format")
 
+            entry = score_cache.put(key, computed)
+            if selection is None and not storage_manager.update_scores(
+                id, computed, versions, key, entry.scored_at, features
+            ):
+                logger.warning(f"[RATE] Could not persist computed scores for {id}")
+
+            logger.info(f"[RATE] Returning newly computed scores for {id}")
+            _report(response, "miss", entry.scored_at)
+            computed["name"] = fallback_name
+            computed["category"] = fallback_category
+            return computed
+
         except HTTPException:
             raise
         except Exception:
@@ -0,0 +1,35 @@
+"""Re-scoring API router.
+
+Recomputes stored ratings after metric versions change, from the input
+features stored with each artifact (no fetcher network calls).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from typing import List, Optional
+import logging
+from backend.deps import artifact_manager, storage_manager, verify_token
+from backend.services.rescore import Rescorer
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+class ArtifactRescoreRequest(BaseModel):
+    """
+    Request schema for re-scoring.
+
+    Attributes:
+        ids (List[str], optional): Artifacts to re-score; every stored artifact when omitted.
+    """
+    ids: Optional[List[str]] = None
+
+
+@router.post("/artifacts/rescore")
+def artifacts_rescore(request: Optional[ArtifactRescoreRequest] = None, _: bool = Depends(verify_token)):
+    """Re-run only the metrics whose version changed and return per-artifact results plus a summary."""
+    try:
+        return Rescorer(storage_manager, artifact_manager.scorer).run(request.ids if request else None)
+    except Exception:
+        logger.exception("Re-scoring failed")
+        raise HTTPException(status_code=500, detail="Re-scoring failed")
@@ -0,0 +1,20 @@
+"""Stats API router.
+
+Exposes process-level runtime statistics (outbound HTTP connection reuse,
+ingest admission gauges) for tuning and debugging.
+"""
+
+from fastapi import APIRouter, Depends
+import logging
+from backend.deps import verify_token
+from backend.services.admission import ingest_admission
+from cli.utils.HttpClient import http_client
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/stats")
+def get_stats(_: bool = Depends(verify_token)):
+    """Return outbound HTTP client statistics and ingest admission gauges (slots, bytes in flight, queue)."""
+    return {"http": http_client.stats(), "admission": ingest_admission.stats()}
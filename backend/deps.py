@@ -8,12 +8,23 @@ import logging
 from fastapi import Header
 from cli.utils.ArtifactManager import ArtifactManager
 from backend.services.storage import StorageManager
+from backend.services.ingest import IngestPipeline
+from backend.services.jobs import IngestJobManager, make_job_store
+from backend.services.idempotency import IdempotencyRegistry, make_idempotency_store
+from backend.services.score_cache import ScoreCache
 
 logger = logging.getLogger(__name__)
 
 # Shared managers used across routers.
 artifact_manager = ArtifactManager()
 storage_manager = StorageManager()
+job_manager = IngestJobManager(
+    store=make_job_store(),
+    pipeline_factory=lambda: IngestPipeline(artifact_manager, storage_manager),
+    uploads=storage_manager.s3,
+)
+idempotency = IdempotencyRegistry(make_idempotency_store())
+score_cache = ScoreCache()
 
 
 def verify_token(
@@ -32,4 +43,4 @@ def verify_token(
     return True
 
 
-__all__ = ["artifact_manager", "storage_manager", "verify_token"]
\ No newline at end of file
+__all__ = ["artifact_manager", "storage_manager", "job_manager", "idempotency", "score_cache", "verify_token"]
\ No newline at end of file
@@ -5,6 +5,7 @@ all API routers implemented under `backend/api/`.
 """
 
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 import json
 import os
@@ -15,6 +16,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.deps import (
     artifact_manager as _artifact_manager,
     storage_manager as _storage_manager,
+    job_manager as _job_manager,
     verify_token as _verify_token,
 )
 
@@ -31,6 +33,10 @@ from backend.api.cost import router as cost_router
 from backend.api.byregex import router as byregex_router
 from backend.api.delete import router as delete_router
 from backend.api.download import router as download_router
+from backend.api.jobs import router as jobs_router
+from backend.api.batch import router as batch_router
+from backend.api.rescore import router as rescore_router
+from backend.api.stats import router as stats_router
 
 # ============================================================
 # Logging configuration
@@ -87,8 +93,18 @@ class LogRequestBodyMiddleware(BaseHTTPMiddleware):
 artifact_manager = _artifact_manager
 storage_manager = _storage_manager
 verify_token = _verify_token
+job_manager = _job_manager
 
-app = FastAPI(title="Model Registry Backend")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Resume journaled ingestion jobs on startup; release workers on shutdown."""
+    job_manager.start()
+    yield
+    job_manager.shutdown()
+
+
+app = FastAPI(title="Model Registry Backend", lifespan=lifespan)
 
 # Add JSON logging middleware BEFORE everything else
 app.add_middleware(LogRequestBodyMiddleware)
@@ -153,5 +169,9 @@ app.include_router(update_router)
 app.include_router(cost_router)
 app.include_router(delete_router)
 app.include_router(download_router)
+app.include_router(jobs_router)
+app.include_router(batch_router)
+app.include_router(rescore_router)
+app.include_router(stats_router)
 
-__all__ = ["app", "artifact_manager", "storage_manager", "verify_token"]
+__all__ = ["app", "artifact_manager", "storage_manager", "job_manager", "verify_token"]
@@ -0,0 +1,206 @@
+"""Admission control for artifact transfers.
+
+`artifact_create` runs in FastAPI's sync threadpool and job workers run in
+their own pool. Without a shared limit, a burst of requests means as many
+simultaneous downloads, each holding its part buffers. Every transfer
+therefore reserves its buffer footprint against a process-wide bytes-in-flight
+budget. It also takes one of a bounded number of transfer slots, and one slot
+for its source host. Callers that cannot be admitted wait. Synchronous requests
+give up after a deadline and are told when to retry.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from aws.config import (
+    INGEST_MAX_CONCURRENT,
+    INGEST_MAX_INFLIGHT_BYTES,
+    INGEST_PER_HOST_CONCURRENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bounds for the Retry-After hint given to rejected callers (seconds).
+_MIN_RETRY_AFTER = 1
+_MAX_RETRY_AFTER = 60
+
+
+class AdmissionRejected(Exception):
+    """No capacity freed up before the caller's deadline."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Admission:
+    """Capacity held by one admitted caller; `resize` changes its share of the byte budget."""
+
+    def __init__(self, controller: "AdmissionController", host: str, nbytes: int):
+        self._controller = controller
+        self.host = host
+        self.nbytes = nbytes
+
+    def resize(self, nbytes: int, timeout: Optional[float] = None) -> None:
+        """Hold `nbytes` instead; growing waits for budget like `admit` (see `AdmissionController.resize`)."""
+        self._controller.resize(self, nbytes, timeout)
+
+
+class AdmissionController:
+    """Process-wide budget of transfer slots, per-host slots and reserved bytes."""
+
+    def __init__(
+        self,
+        max_bytes: int = INGEST_MAX_INFLIGHT_BYTES,
+        max_transfers: int = INGEST_MAX_CONCURRENT,
+        per_host: int = INGEST_PER_HOST_CONCURRENCY,
+    ):
+        self.max_bytes = max_bytes
+        self.max_transfers = max(1, max_transfers)
+        self.per_host = max(1, per_host)
+        self._cond = threading.Condition()
+        self._bytes = 0
+        self._active = 0
+        self._by_host: Dict[str, int] = {}
+        self._waiting = 0
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        # Smoothed transfer duration, used to suggest when to retry.
+        self._avg_hold: Optional[float] = None
+
+    @contextmanager
+    def admit(self, host: str, nbytes: int, timeout: Optional[float] = None) -> Iterator[Admission]:
+        """
+        Hold one transfer slot, one slot for `host` and `nbytes` of the budget.
+
+        Waits for capacity; with a `timeout` (seconds), raises `AdmissionRejected`
+        once it passes. A request larger than the whole budget is admitted when
+        nothing else holds bytes, so it still makes progress.
+        """
+        start = time.monotonic()
+        with self._cond:
+            if self._await_capacity(host, nbytes, None if timeout is None else start + timeout):
+                self._queued += 1
+                self._wait_seconds += time.monotonic() - start
+            self._active += 1
+            self._bytes += nbytes
+            self._by_host[host] = self._by_host.get(host, 0) + 1
+            self._admitted += 1
+
+        admission = Admission(self, host, nbytes)
+        held_from = time.monotonic()
+        try:
+            yield admission
+        finally:
+            held = time.monotonic() - held_from
+            with self._cond:
+                self._active -= 1
+                self._bytes -= admission.nbytes
+                self._by_host[host] -= 1
+                if not self._by_host[host]:
+                    del self._by_host[host]
+                self._avg_hold = held if self._avg_hold is None else 0.8 * self._avg_hold + 0.2 * held
+                self._cond.notify_all()
+
+    def check(self, host: str, nbytes: int, timeout: Optional[float] = None) -> None:
+        """
+        Wait until `admit(host, nbytes)` could go ahead, without taking anything.
+
+        Lets a caller turn work away early, before the stages that come ahead
+        of its transfer, while only the transfer itself holds capacity. Raises
+        `AdmissionRejected` like `admit` once `timeout` passes.
+        """
+        with self._cond:
+            self._await_capacity(host, nbytes, None if timeout is None else time.monotonic() + timeout)
+
+    def resize(self, admission: Admission, nbytes: int, timeout: Optional[float] = None) -> None:
+        """
+        Change the bytes an admitted caller holds, keeping its slots.
+
+        Shrinking never waits. A caller that has to wait to grow gives up its
+        bytes meanwhile, so two holders growing at once cannot block each other.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if nbytes > admission.nbytes and self._bytes - admission.nbytes and self._over_budget(
+                nbytes - admission.nbytes
+            ):
+                self._bytes -= admission.nbytes
+                admission.nbytes = 0
+                self._cond.notify_all()
+                self._waiting += 1
+                try:
+                    while self._bytes and self._over_budget(nbytes):
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            self._rejected += 1
+                            raise AdmissionRejected("in-flight byte budget exhausted", self._retry_after())
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._bytes += nbytes - admission.nbytes
+            admission.nbytes = nbytes
+            self._cond.notify_all()
+
+    def _await_capacity(self, host: str, nbytes: int, deadline: Optional[float]) -> bool:
+        """Wait (holding `_cond`) until `host` can start a transfer of `nbytes`; True if it had to wait."""
+        blocked = self._blocked(host, nbytes)
+        if not blocked:
+            return False
+        self._waiting += 1
+        try:
+            while blocked:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._rejected += 1
+                    raise AdmissionRejected(blocked, self._retry_after())
+                self._cond.wait(remaining)
+                blocked = self._blocked(host, nbytes)
+        finally:
+            self._waiting -= 1
+        return True
+
+    def _over_budget(self, nbytes: int) -> bool:
+        return self._bytes + nbytes > self.max_bytes
+
+    def _blocked(self, host: str, nbytes: int) -> Optional[str]:
+        """Why a transfer cannot start now, or None when it can."""
+        if self._active >= self.max_transfers:
+            return "too many concurrent transfers"
+        if self._by_host.get(host, 0) >= self.per_host:
+            return f"too many concurrent transfers from {host}"
+        if self._bytes and self._over_budget(nbytes):
+            return "in-flight byte budget exhausted"
+        return None
+
+    def _retry_after(self) -> int:
+        estimate = self._avg_hold if self._avg_hold is not None else 5.0
+        return int(min(_MAX_RETRY_AFTER, max(_MIN_RETRY_AFTER, round(estimate))))
+
+    def stats(self) -> Dict[str, Any]:
+        """Current gauges and cumulative counters."""
+        with self._cond:
+            return {
+                "active_transfers": self._active,
+                "max_transfers": self.max_transfers,
+                "bytes_in_flight": self._bytes,
+                "max_bytes": self.max_bytes,
+                "budget_used": round(self._bytes / self.max_bytes, 3) if self.max_bytes else 0.0,
+                "active_by_host": dict(self._by_host),
+                "per_host_limit": self.per_host,
+                "waiting": self._waiting,
+                "admitted": self._admitted,
+                "queued": self._queued,
+                "rejected": self._rejected,
+                "avg_wait_seconds": round(self._wait_seconds / self._queued, 3) if self._queued else 0.0,
+            }
+
+
+# Shared by every ingest path in this process.
+ingest_admission = AdmissionController()
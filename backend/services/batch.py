@@ -0,0 +1,133 @@
+"""Batch ingestion.
+
+Ingests many source URLs at once by running `IngestPipeline` for each unique
+URL on a shared thread pool. Every pipeline stage is gated by its own
+concurrency limit, so metadata lookups, scoring and transfers of different
+URLs overlap instead of running one URL at a time.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from aws.config import BATCH_STAGE_LIMITS
+from backend.services.ingest import INGEST_STAGES, IngestError, IngestPipeline, canonical_url
+from cli.utils.GitHubGraphQL import github_graphql, repo_from_url
+
+logger = logging.getLogger(__name__)
+
+
+def dedupe_urls(urls: List[str]) -> List[str]:
+    """Drop blanks and URLs whose canonical form was already seen, keeping order."""
+    seen = set()
+    unique: List[str] = []
+    for url in urls:
+        url = (url or "").strip()
+        if not url:
+            continue
+        key = canonical_url(url)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(url)
+    return unique
+
+
+class BatchIngestor:
+    """Run the ingest pipeline over many URLs with per-stage concurrency limits."""
+
+    def __init__(
+        self,
+        artifact_manager,
+        storage_manager,
+        stage_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.stage_limits = {**BATCH_STAGE_LIMITS, **(stage_limits or {})}
+        self.pipeline = IngestPipeline(
+            artifact_manager, storage_manager, stage_limits=self.stage_limits
+        )
+        self._lock = threading.Lock()
+
+    def run(self, urls: List[str], artifact_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Ingest every unique URL and return per-URL results plus a summary.
+
+        Returns:
+            dict: {"results": [...], "summary": {...}} where each result has
+            `url`, `status` ("created", "existing" or "failed"), `artifact_id`,
+            `error`, `bytes` and `seconds`, in input order. "existing" means the
+            URL had been ingested before and nothing was fetched.
+        """
+        unique = dedupe_urls(urls)
+        # In GraphQL mode, load every GitHub repo's metadata in a few aliased queries up front.
+        github_graphql.prefetch(filter(None, (repo_from_url(u) for u in unique)))
+        stage_seconds = {stage: 0.0 for stage in INGEST_STAGES}
+        start = time.time()
+
+        # Enough workers to keep every stage saturated at its own limit.
+        workers = max(1, min(len(unique), sum(self.stage_limits.values())))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+            results = list(
+                pool.map(lambda u: self._ingest_one(u, artifact_type, stage_seconds), unique)
+            )
+
+        elapsed = time.time() - start
+        succeeded = sum(1 for r in results if r["status"] in ("created", "existing"))
+        existing = sum(1 for r in results if r["status"] == "existing")
+        total_bytes = sum(r["bytes"] for r in results)
+        summary = {
+            "submitted": len(urls),
+            "unique": len(unique),
+            "duplicates_dropped": len([u for u in urls if (u or "").strip()]) - len(unique),
+            "succeeded": succeeded,
+            "existing": existing,
+            "failed": len(results) - succeeded,
+            "elapsed_seconds": round(elapsed, 3),
+            "urls_per_second": round(len(results) / elapsed, 3) if elapsed > 0 else 0.0,
+            "bytes_transferred": total_bytes,
+            "mb_per_second": round(total_bytes / (1024 * 1024) / elapsed, 3) if elapsed > 0 else 0.0,
+            "stage_seconds": {k: round(v, 3) for k, v in stage_seconds.items()},
+            "stage_limits": self.stage_limits,
+        }
+        logger.info(
+            f"📦 Batch ingest finished: {succeeded}/{len(results)} succeeded in {elapsed:.1f}s"
+        )
+        return {"results": results, "summary": summary}
+
+    def _ingest_one(
+        self, url: str, artifact_type: Optional[str], stage_seconds: Dict[str, float]
+    ) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "url": url,
+            "status": "failed",
+            "artifact_id": None,
+            "error": None,
+            "bytes": 0,
+            "seconds": 0.0,
+        }
+
+        reused = []
+
+        def on_event(stage: str, state: str, info: Dict[str, Any]) -> None:
+            if info.get("reused"):
+                reused.append(stage)
+            elif state == "progress":
+                result["bytes"] = info.get("bytes", result["bytes"])
+            elif state == "done":
+                with self._lock:
+                    stage_seconds[stage] = stage_seconds.get(stage, 0.0) + info.get("seconds", 0.0)
+
+        start = time.time()
+        try:
+            stored = self.pipeline.run(url, artifact_type, on_event=on_event)
+            result["status"] = "existing" if reused else "created"
+            result["artifact_id"] = stored.get("artifact_id")
+        except IngestError as e:
+            result["error"] = e.detail
+        except Exception as e:
+            logger.exception(f"❌ Batch ingest failed for {url}")
+            result["error"] = str(e)
+        result["seconds"] = round(time.time() - start, 3)
+        return result
@@ -0,0 +1,191 @@
+"""Blob reference counts.
+
+Tracks how many artifact items point at each content-addressed blob so the
+S3 object is only removed when its last reference goes away.
+
+Deleting a blob takes three steps, and the counter records which one it is
+in. `begin_delete` marks a zero count as deleting, the caller removes the S3
+object, and `finish_delete` removes the counter. While the mark is set,
+nothing can take a reference: `acquire` waits for the delete to finish (then
+uploads again), and `acquire_existing` reports the blob as not stored. So an
+ingest can never end up pointing at an object that is being deleted.
+"""
+
+import logging
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from aws.config import BLOB_DELETE_STALE_SECONDS, blobs_table
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks while waiting for another process's delete.
+_DELETE_POLL_SECONDS = 0.2
+
+
+def _conditional_failed(e: ClientError) -> bool:
+    return e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+class BlobRefStore:
+    """
+    Atomic reference counters for blobs, keyed on the SHA-256 digest.
+    """
+
+    def __init__(self, table=None, delete_stale_seconds: int = BLOB_DELETE_STALE_SECONDS):
+        self.table = table or blobs_table
+        self.delete_stale_seconds = delete_stale_seconds
+
+    def acquire(self, sha256: str, size_bytes: int) -> int:
+        """
+        Add one reference to `sha256` and return the new count.
+
+        A count of 1 means the caller must upload the object. Waits while the
+        blob is being deleted.
+        """
+        while True:
+            try:
+                response = self.table.update_item(
+                    Key={"sha256": sha256},
+                    UpdateExpression="ADD refs :one SET size_bytes = :size",
+                    ConditionExpression="attribute_not_exists(deleting)",
+                    ExpressionAttributeValues={":one": 1, ":size": size_bytes},
+                    ReturnValues="UPDATED_NEW",
+                )
+                break
+            except ClientError as e:
+                if not _conditional_failed(e):
+                    raise
+            self._await_delete(sha256)
+        refs = int(response["Attributes"]["refs"])
+        logger.info(f"🔗 Blob {sha256[:12]} now has {refs} reference(s)")
+        return refs
+
+    def acquire_existing(self, sha256: str) -> Optional[int]:
+        """
+        Add one reference to a blob that is already referenced; return its size.
+        None when it has no references or is being deleted, so the caller downloads instead.
+        """
+        try:
+            response = self.table.update_item(
+                Key={"sha256": sha256},
+                UpdateExpression="ADD refs :one",
+                ConditionExpression="refs > :zero AND attribute_not_exists(deleting)",
+                ExpressionAttributeValues={":one": 1, ":zero": 0},
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if _conditional_failed(e):
+                return None
+            raise
+        attributes = response["Attributes"]
+        logger.info(f"🔗 Blob {sha256[:12]} now has {int(attributes['refs'])} reference(s)")
+        return int(attributes.get("size_bytes", 0))
+
+    def release(self, sha256: str) -> Optional[int]:
+        """
+        Drop one reference to `sha256` and return the remaining count.
+        Returns None when no counter exists for `sha256`.
+        """
+        try:
+            response = self.table.update_item(
+                Key={"sha256": sha256},
+                UpdateExpression="ADD refs :minus_one",
+                ConditionExpression="attribute_exists(sha256)",
+                ExpressionAttributeValues={":minus_one": -1},
+                ReturnValues="UPDATED_NEW",
+            )
+        except ClientError as e:
+            if _conditional_failed(e):
+                logger.warning(f"⚠️ Released unknown blob {sha256[:12]}")
+                return None
+            raise
+        refs = int(response["Attributes"]["refs"])
+        logger.info(f"🔗 Blob {sha256[:12]} now has {refs} reference(s)")
+        return refs
+
+    def begin_delete(self, sha256: str) -> Optional[str]:
+        """
+        Mark an unreferenced blob as deleting and return the mark's token.
+        None when it was re-acquired first or another delete is under way.
+        """
+        token = uuid.uuid4().hex
+        try:
+            self.table.update_item(
+                Key={"sha256": sha256},
+                UpdateExpression="SET deleting = :token, deleting_since = :now",
+                ConditionExpression="refs <= :zero AND attribute_not_exists(deleting)",
+                ExpressionAttributeValues={":token": token, ":now": int(time.time()), ":zero": 0},
+                ReturnValues="NONE",
+            )
+        except ClientError as e:
+            if _conditional_failed(e):
+                return None
+            raise
+        return token
+
+    def finish_delete(self, sha256: str, token: str) -> bool:
+        """Remove the counter once the object is gone, if the mark is still `token`."""
+        return self._delete_if_marked(sha256, token)
+
+    def abort_delete(self, sha256: str, token: str) -> None:
+        """Clear the mark after a failed object delete; the zero count stays."""
+        try:
+            self.table.update_item(
+                Key={"sha256": sha256},
+                UpdateExpression="REMOVE deleting, deleting_since",
+                ConditionExpression="deleting = :token",
+                ExpressionAttributeValues={":token": token},
+                ReturnValues="NONE",
+            )
+        except ClientError as e:
+            if not _conditional_failed(e):
+                raise
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.table.get_item(Key={"sha256": sha256}).get("Item")
+        except ClientError as e:
+            logger.error(f"❌ Failed to fetch blob refs ({sha256[:12]}): {e}")
+            return None
+
+    def reset(self) -> None:
+        """Delete every counter. Used alongside a bucket reset."""
+        kwargs: Dict[str, Any] = {}
+        while True:
+            response = self.table.scan(**kwargs)
+            for item in response.get("Items", []):
+                self.table.delete_item(Key={"sha256": item["sha256"]})
+            if "LastEvaluatedKey" not in response:
+                break
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        logger.warning("⚠️ All blob reference counts deleted")
+
+    def _await_delete(self, sha256: str) -> None:
+        """Wait out another delete of `sha256`; drop its mark once it is stale."""
+        item = self.get(sha256) or {}
+        token = item.get("deleting")
+        if not token:
+            return
+        if time.time() - float(item.get("deleting_since", 0)) < self.delete_stale_seconds:
+            time.sleep(_DELETE_POLL_SECONDS)
+            return
+        logger.warning(f"⚠️ Blob {sha256[:12]} delete mark is stale; taking the blob over")
+        # The object may or may not be gone; the next acquire gets count 1 and uploads it again.
+        self._delete_if_marked(sha256, token)
+
+    def _delete_if_marked(self, sha256: str, token: str) -> bool:
+        try:
+            self.table.delete_item(
+                Key={"sha256": sha256},
+                ConditionExpression="deleting = :token",
+                ExpressionAttributeValues={":token": token},
+            )
+            return True
+        except ClientError as e:
+            if _conditional_failed(e):
+                return False
+            raise
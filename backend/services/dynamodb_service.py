@@ -5,8 +5,10 @@ Provides CRUD + scan utilities for artifact metadata stored in DynamoDB.
 
 import logging
 from typing import Optional, List, Dict, Any
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 from aws.config import table as default_table  # rename imported table
+from aws.config import CANONICAL_URL_INDEX
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,23 @@ class DynamoDBService:
             logger.error(f"❌ Failed to fetch artifact (artifact_id={artifact_id}): {e}")
             return None
 
+    def get_by_canonical_url(self, canonical_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the newest artifact registered for `canonical_url` with one GSI query.
+        """
+        try:
+            response = self.table.query(
+                IndexName=CANONICAL_URL_INDEX,
+                KeyConditionExpression=Key("canonical_url").eq(canonical_url),
+                ScanIndexForward=False,
+                Limit=1,
+            )
+            items = response.get("Items", [])
+            return items[0] if items else None
+        except ClientError as e:
+            logger.error(f"❌ Failed to query artifacts by canonical_url={canonical_url}: {e}")
+            return None
+
     def update_item(self, artifact_id: str, update_data: Dict[str, Any]) -> bool:
         try:
             update_expression = "SET " + ", ".join(f"#{k}=:{k}" for k in update_data)
@@ -0,0 +1,272 @@
+"""Idempotency-Key handling for ingest requests.
+
+A client that retries an ingest after a timeout sends the same
+`Idempotency-Key`; the retry waits for (or replays) the original outcome
+instead of starting a second multi-GB download. Keys are coordinated
+in-process with a single-flight map and across processes through a small
+journal (SQLite locally, DynamoDB in production) next to the job journal.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from aws.config import (
+    IDEMPOTENCY_PENDING_SECONDS,
+    IDEMPOTENCY_TTL_SECONDS,
+    INGEST_JOB_DB,
+    INGEST_JOB_STORE,
+    idempotency_table,
+)
+
+logger = logging.getLogger(__name__)
+
+KEY_PENDING = "pending"
+KEY_DONE = "done"
+
+# Claim/read rounds before a key that keeps changing under us is reported as in progress.
+_CLAIM_ATTEMPTS = 3
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used with a different request body."""
+
+
+class IdempotencyInProgress(Exception):
+    """Another process is still handling the request that first used this key."""
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """Stable digest of the request fields a key is bound to."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# ------------------------
+# Key journals
+# ------------------------
+class SQLiteIdempotencyStore:
+    """Key journal stored in a table of the local SQLite job database."""
+
+    def __init__(self, path: str = INGEST_JOB_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency_keys ("
+                " key TEXT PRIMARY KEY,"
+                " expires_at INTEGER NOT NULL,"
+                " data TEXT NOT NULL)"
+            )
+            self._initialized = True
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT data FROM idempotency_keys WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def claim(self, record: Dict[str, Any]) -> bool:
+        """Insert `record` unless the key exists. Returns True when inserted."""
+        with self._lock, self._connect() as conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO idempotency_keys (key, expires_at, data) VALUES (?, ?, ?)",
+                (record["key"], record["expires_at"], json.dumps(record)),
+            )
+        return cur.rowcount == 1
+
+    def takeover(self, record: Dict[str, Any], expected: Dict[str, Any]) -> bool:
+        """Replace the key's record with `record` only if it still holds `expected`. Returns True when replaced."""
+        with self._lock, self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE idempotency_keys SET expires_at = ?, data = ? WHERE key = ? AND data = ?",
+                (record["expires_at"], json.dumps(record), record["key"], json.dumps(expected)),
+            )
+        return cur.rowcount == 1
+
+    def put(self, record: Dict[str, Any]) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO idempotency_keys (key, expires_at, data) VALUES (?, ?, ?)",
+                (record["key"], record["expires_at"], json.dumps(record)),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+
+
+class DynamoDBIdempotencyStore:
+    """Key journal backed by a DynamoDB table keyed on `key` (TTL attribute `expires_at`)."""
+
+    def __init__(self, table=None):
+        self.table = table or idempotency_table
+
+    def _item(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {"key": record["key"], "expires_at": record["expires_at"], "data": json.dumps(record)}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = self.table.get_item(Key={"key": key}).get("Item")
+        except ClientError as e:
+            logger.error(f"❌ Failed to fetch idempotency key: {e}")
+            return None
+        return json.loads(item["data"]) if item else None
+
+    def claim(self, record: Dict[str, Any]) -> bool:
+        try:
+            self.table.put_item(
+                Item=self._item(record),
+                ConditionExpression="attribute_not_exists(#k)",
+                ExpressionAttributeNames={"#k": "key"},
+            )
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+
+    def takeover(self, record: Dict[str, Any], expected: Dict[str, Any]) -> bool:
+        try:
+            self.table.put_item(
+                Item=self._item(record),
+                ConditionExpression="#d = :expected",
+                ExpressionAttributeNames={"#d": "data"},
+                ExpressionAttributeValues={":expected": json.dumps(expected)},
+            )
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+
+    def put(self, record: Dict[str, Any]) -> None:
+        self.table.put_item(Item=self._item(record))
+
+    def delete(self, key: str) -> None:
+        self.table.delete_item(Key={"key": key})
+
+
+def make_idempotency_store():
+    """Build the key journal matching `INGEST_JOB_STORE`."""
+    if INGEST_JOB_STORE == "dynamodb":
+        return DynamoDBIdempotencyStore()
+    os.makedirs(os.path.dirname(os.path.abspath(INGEST_JOB_DB)), exist_ok=True)
+    return SQLiteIdempotencyStore(INGEST_JOB_DB)
+
+
+# ------------------------
+# Registry
+# ------------------------
+class IdempotencyRegistry:
+    """Run a request at most once per Idempotency-Key and replay its result."""
+
+    def __init__(
+        self,
+        store,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        pending_seconds: int = IDEMPOTENCY_PENDING_SECONDS,
+    ):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.pending_seconds = pending_seconds
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: str, fingerprint: str, fn: Callable[[], Any]) -> Any:
+        """
+        Return `fn()`'s result for `key`, calling `fn` only for the first request.
+
+        Concurrent callers in this process wait for the first one; later
+        callers get the journaled result. Failures are not remembered, so a
+        retry after an error runs again.
+
+        Raises:
+            IdempotencyConflict: `key` was used with a different fingerprint.
+            IdempotencyInProgress: another process holds `key` and is still running.
+        """
+        with self._lock:
+            running = self._inflight.get(key)
+            if running is None:
+                future: Future = Future()
+                self._inflight[key] = future
+
+        if running is not None:
+            result, seen = running.result()
+            if seen != fingerprint:
+                raise IdempotencyConflict("Idempotency-Key was reused with a different request")
+            return result
+
+        try:
+            replay = self._claim(key, fingerprint)
+            if replay is not None:
+                future.set_result((replay["result"], replay["fingerprint"]))
+                return replay["result"]
+
+            try:
+                result = fn()
+            except BaseException:
+                self.store.delete(key)
+                raise
+            self.store.put(self._record(key, fingerprint, KEY_DONE, result))
+            future.set_result((result, fingerprint))
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _claim(self, key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Reserve `key` for this request, or return the finished record to replay.
+
+        An expired or abandoned record is replaced only if it is still the one
+        read, so of several processes taking over the same key exactly one
+        wins; the others read the key again and wait for or replay its run.
+        """
+        pending = self._record(key, fingerprint, KEY_PENDING)
+        for _ in range(_CLAIM_ATTEMPTS):
+            if self.store.claim(pending):
+                return None
+
+            record = self.store.get(key)
+            if not record:
+                # Released since the claim failed; claim it again.
+                continue
+            now = time.time()
+            if record["expires_at"] >= now:
+                if record["fingerprint"] != fingerprint:
+                    raise IdempotencyConflict("Idempotency-Key was reused with a different request")
+                if record["status"] == KEY_DONE:
+                    logger.info(f"🔁 Replaying result for Idempotency-Key {key}")
+                    return record
+                if now - record["created_at"] < self.pending_seconds:
+                    raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+                logger.warning(f"⚠️ Taking over abandoned Idempotency-Key {key}")
+            if self.store.takeover(pending, record):
+                return None
+        raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+
+    def _record(self, key: str, fingerprint: str, status: str, result: Any = None) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "key": key,
+            "fingerprint": fingerprint,
+            "status": status,
+            "result": result,
+            "created_at": now,
+            "expires_at": int(now + self.ttl_seconds),
+        }
@@ -0,0 +1,526 @@
+"""Artifact ingestion pipeline.
+
+Runs the staged URL -> metadata -> metric data -> scores -> S3/DynamoDB flow
+shared by the synchronous create endpoint and the background job workers.
+"""
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from cli.utils.HttpClient import http_client
+
+from aws.config import (
+    DATAFLOW_SCORING,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_TIMEOUT,
+    INGEST_MAX_ARTIFACT_BYTES,
+    INGEST_PREFLIGHT_HEAD,
+    INGEST_SMALL_ARTIFACT_BYTES,
+    RANGED_DOWNLOAD,
+    RANGED_MIN_SIZE,
+    S3_MULTIPART_PART_SIZE,
+    SNAPSHOT_INGEST,
+    SNAPSHOT_WORKERS,
+)
+from backend.services.admission import Admission, AdmissionController, AdmissionRejected, ingest_admission
+from backend.services.preflight import SizeEstimate, estimate_repo_size, estimate_size
+from backend.services.ranged import RangedDownload, plan
+from backend.services.snapshot import SnapshotError, SnapshotTransfer, hf_repo_from_url
+
+logger = logging.getLogger(__name__)
+
+_SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+# Ordered pipeline stages; job records report progress against these names.
+INGEST_STAGES = ("metadata", "preflight", "metric_data", "score", "transfer")
+
+_GIB = 1024 * 1024 * 1024
+
+# Snapshots are always fetched from Hugging Face.
+_HF_HOST = "huggingface.co"
+
+# Callback signature: on_event(stage, state, info). `state` is one of
+# "running", "progress", "checkpoint", "done" or "failed"; `info` carries
+# stage details (e.g. {"bytes": n} while transferring, or the multipart
+# upload state for "checkpoint").
+StageCallback = Callable[[str, str, Dict[str, Any]], None]
+
+
+class IngestError(Exception):
+    """Pipeline failure carrying the HTTP status the API layer should return."""
+
+    def __init__(self, status_code: int, detail: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.headers = headers
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a source URL so equivalent spellings compare equal.
+
+    Lowercases the scheme/host, drops `www.`, query strings, fragments,
+    trailing slashes and `.git`, and trims GitHub / Hugging Face browse
+    suffixes (`/tree/...`, `/blob/...`, `/resolve/...`) down to the repo.
+    """
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[len("www."):]
+    parts = [p for p in parsed.path.split("/") if p]
+
+    if host == "github.com":
+        parts = [p.lower() for p in parts[:2]]
+        if parts and parts[-1].endswith(".git"):
+            parts[-1] = parts[-1][: -len(".git")]
+    elif host == "huggingface.co":
+        for marker in ("tree", "blob", "resolve", "commit"):
+            if marker in parts:
+                parts = parts[: parts.index(marker)]
+
+    path = "/".join(parts)
+    return f"https://{host}/{path}" if path else f"https://{host}"
+
+
+class IngestPipeline:
+    """Staged ingestion of a single artifact URL.
+
+    The managers are injected so callers (routers, job workers, tests) can
+    supply their own instances. `stage_limits` optionally caps how many
+    concurrent runs may be inside each stage at once (used by batch ingest
+    so stages of different URLs overlap without oversubscribing any one).
+
+    The preflight stage runs right after metadata and works out the expected
+    size. Artifacts over `max_artifact_bytes` are rejected with 413 before
+    anything is fetched or scored. Those up to `small_artifact_bytes` are
+    fetched with one plain GET, without probing for range support; larger
+    ones take the ranged or streaming path.
+
+    Each transfer is admitted by the process-wide controller: it holds a
+    transfer slot, a slot for the source host and the buffer bytes the
+    preflight size calls for, and only while the transfer stage runs. Before
+    the metric data and score stages a run checks, without reserving, that
+    such a transfer could be admitted. Without an `admission_wait` runs queue
+    for capacity (job workers, batch); with one, they fail with a 429
+    `IngestError` carrying `Retry-After` once it passes, before any expensive
+    work when the server is already busy.
+    """
+
+    def __init__(
+        self,
+        artifact_manager,
+        storage_manager,
+        stage_limits: Optional[Dict[str, int]] = None,
+        snapshots: bool = SNAPSHOT_INGEST,
+        ranged: bool = RANGED_DOWNLOAD,
+        admission: Optional[AdmissionController] = None,
+        admission_wait: Optional[float] = None,
+        preflight_head: bool = INGEST_PREFLIGHT_HEAD,
+        small_artifact_bytes: int = INGEST_SMALL_ARTIFACT_BYTES,
+        max_artifact_bytes: int = INGEST_MAX_ARTIFACT_BYTES,
+        dataflow: bool = DATAFLOW_SCORING,
+    ):
+        self.artifact_manager = artifact_manager
+        self.storage_manager = storage_manager
+        self.snapshots = snapshots
+        self.ranged = ranged
+        self.admission = admission or ingest_admission
+        self.admission_wait = admission_wait
+        self.preflight_head = preflight_head
+        self.small_artifact_bytes = small_artifact_bytes
+        self.max_artifact_bytes = max_artifact_bytes
+        self.dataflow = dataflow
+        self._gates = {
+            stage: threading.BoundedSemaphore(max(1, int(limit)))
+            for stage, limit in (stage_limits or {}).items()
+        }
+
+    def run(
+        self,
+        url: str,
+        artifact_type: Optional[str],
+        name: Optional[str] = None,
+        on_event: Optional[StageCallback] = None,
+        reuse_existing: bool = True,
+        resume: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ingest `url` end to end and return the stored artifact item.
+
+        When `artifact_type` is None the type reported by the metadata
+        fetcher is used. Unless `reuse_existing` is False, an artifact already
+        ingested from the same canonical URL is returned without re-fetching,
+        re-scoring or re-downloading anything.
+
+        A ranged transfer reports its multipart state as `("transfer",
+        "checkpoint", state)` events after every part. Passing the last state
+        back as `resume` continues that upload instead of starting over.
+
+        Raises:
+            IngestError: when the source has no download URL, the artifact is
+                over the size limit (413), the download fails or the artifact
+                cannot be stored.
+        """
+        emit = on_event or (lambda stage, state, info: None)
+
+        existing = self.find_existing(url, artifact_type) if reuse_existing else None
+        if existing:
+            for stage in INGEST_STAGES:
+                emit(stage, "done", {"seconds": 0.0, "reused": True})
+            return existing
+
+        meta_info = self._stage("metadata", emit, self.artifact_manager.getMetadata, url)
+        source = {"download_url": meta_info.get("download_url"), "processed_url": url}
+        estimate = self._stage("preflight", emit, self._preflight, source, meta_info)
+        footprint = self._footprint(source, estimate)
+        self._check_capacity(*footprint)
+
+        if self.dataflow:
+            artifact_data, scores = self._fetch_and_score(emit, meta_info)
+        else:
+            artifact_data = self._stage("metric_data", emit, self.artifact_manager.getMetricData, meta_info)
+            scores = self._stage("score", emit, self.artifact_manager.scoreArtifact, artifact_data)
+
+        artifact_data = self.artifact_manager.newArtifact(url, artifact_data, scores)
+        artifact_data["artifact_type"] = artifact_type or meta_info.get("artifact_type")
+        artifact_data["processed_url"] = url
+        artifact_data["canonical_url"] = canonical_url(url)
+        if name:
+            artifact_data["name"] = name
+        if estimate.size is not None:
+            artifact_data["size_in_gb"] = estimate.size_in_gb
+
+        self._stage("transfer", emit, self._transfer, artifact_data, emit, footprint, resume, estimate)
+
+        stored = self.storage_manager.get_artifact(artifact_data["artifact_id"])
+        if not stored:
+            raise IngestError(500, "Artifact stored but metadata missing")
+        return stored
+
+    def find_existing(self, url: str, artifact_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the artifact already ingested from `url` (same canonical URL and type), if any."""
+        existing = self.storage_manager.find_by_url(url)
+        if not existing:
+            return None
+        if artifact_type and (existing.get("type") or existing.get("artifact_type")) != artifact_type:
+            return None
+        logger.info("Reusing artifact %s for %s", existing.get("artifact_id"), url)
+        return existing
+
+    # ------------------------
+    # Stages
+    # ------------------------
+    def _stage(self, stage: str, emit: StageCallback, fn: Callable, *args):
+        gate = self._gates.get(stage)
+        if gate is not None:
+            gate.acquire()
+        try:
+            emit(stage, "running", {})
+            start = time.time()
+            try:
+                result = fn(*args)
+            except Exception as e:
+                emit(stage, "failed", {"error": str(e)})
+                raise
+            emit(stage, "done", {"seconds": round(time.time() - start, 3)})
+            return result
+        finally:
+            if gate is not None:
+                gate.release()
+
+    def _fetch_and_score(self, emit: StageCallback, meta_info: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+        """
+        The metric_data and score stages as one dataflow run.
+
+        metric_data lasts until every fetcher is done; metrics ready before
+        then already run inside it. The score stage covers the remaining
+        metrics and reports the run's critical path. Each stage holds its gate
+        while it is active.
+        """
+        held: List[threading.BoundedSemaphore] = []
+        stage: Dict[str, Any] = {"name": "metric_data", "start": time.time()}
+
+        def enter(name: str) -> None:
+            gate = self._gates.get(name)
+            if gate is not None:
+                gate.acquire()
+                held.append(gate)
+            stage.update(name=name, start=time.time())
+            emit(name, "running", {})
+
+        def release() -> None:
+            while held:
+                held.pop().release()
+
+        def on_fetched() -> None:
+            emit("metric_data", "done", {"seconds": round(time.time() - stage["start"], 3)})
+            release()
+            enter("score")
+
+        enter("metric_data")
+        try:
+            artifact_data, scores, timings = self.artifact_manager.fetchAndScore(meta_info, on_fetched=on_fetched)
+        except Exception as e:
+            emit(stage["name"], "failed", {"error": str(e)})
+            raise
+        finally:
+            release()
+        emit(
+            "score",
+            "done",
+            {"seconds": round(time.time() - stage["start"], 3), "critical_path": timings.get("critical_path", [])},
+        )
+        return artifact_data, scores
+
+    def _preflight(self, source: Dict[str, Any], meta_info: Dict[str, Any]) -> SizeEstimate:
+        """Find the expected size of `source` (download and processed URL) and reject artifacts over the limit."""
+        download_url = source.get("download_url")
+        if self._snapshot_repo(source):
+            estimate = estimate_repo_size(meta_info)
+        elif download_url:
+            estimate = estimate_size(download_url, meta_info, head=self.preflight_head)
+        else:
+            # `_footprint` reports the missing URL.
+            return SizeEstimate(None, "unknown")
+
+        if estimate.size is not None:
+            self._check_size(estimate.size)
+        logger.info(
+            "Preflight for %s: %s bytes (from %s)",
+            source.get("processed_url"),
+            estimate.size if estimate.size is not None else "unknown",
+            estimate.source,
+        )
+        return estimate
+
+    def _footprint(self, source: Dict[str, Any], estimate: SizeEstimate) -> Tuple[str, int]:
+        """Source host and buffer bytes the transfer is expected to hold, as `_transfer` will pick its path."""
+        if self._snapshot_repo(source):
+            return _HF_HOST, SNAPSHOT_WORKERS * S3_MULTIPART_PART_SIZE
+        download_url = source.get("download_url")
+        if not download_url:
+            raise IngestError(400, "No download URL found for the artifact")
+        host = urlparse(download_url).netloc.lower()
+        size = estimate.size
+        if size is not None and size <= self.small_artifact_bytes:
+            return host, size + DOWNLOAD_CHUNK_SIZE
+        if size is not None and self.ranged and size >= RANGED_MIN_SIZE:
+            layout = plan(size)
+            return host, layout["part_size"] * layout["connections"]
+        return host, S3_MULTIPART_PART_SIZE + DOWNLOAD_CHUNK_SIZE
+
+    def _check_size(self, size: int) -> None:
+        if size > self.max_artifact_bytes:
+            raise IngestError(
+                413,
+                f"Artifact is {size / _GIB:.2f} GB, over the {self.max_artifact_bytes / _GIB:.2f} GB ingest limit",
+            )
+
+    def _snapshot_repo(self, artifact_data: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        return hf_repo_from_url(artifact_data.get("processed_url", "")) if self.snapshots else None
+
+    def _transfer(
+        self,
+        artifact_data: Dict[str, Any],
+        emit: StageCallback,
+        footprint: Tuple[str, int],
+        resume: Optional[Dict[str, Any]] = None,
+        estimate: Optional[SizeEstimate] = None,
+    ) -> None:
+        """Admit the transfer with its expected `footprint` (host, bytes) and run it; admission ends with it."""
+        with self._admitted(*footprint) as admission:
+            self._transfer_admitted(artifact_data, emit, admission, resume, estimate)
+
+    def _transfer_admitted(
+        self,
+        artifact_data: Dict[str, Any],
+        emit: StageCallback,
+        admission: Admission,
+        resume: Optional[Dict[str, Any]] = None,
+        estimate: Optional[SizeEstimate] = None,
+    ) -> None:
+        """
+        Move the artifact from its download URL into S3 + DynamoDB over the path its size calls for.
+
+        `admission` was reserved from the preflight size; it is resized to the chosen path's buffers.
+        """
+        repo = self._snapshot_repo(artifact_data)
+        if repo:
+            return self._transfer_snapshot(artifact_data, repo, emit, admission)
+
+        download_url = artifact_data.get("download_url")
+        if not download_url:
+            raise IngestError(400, "No download URL found for the artifact")
+
+        sha256 = advertised_sha256(download_url)
+        if sha256 and self.storage_manager.link_existing_blob(
+            artifact_data, sha256, artifact_data.get("name")
+        ):
+            logger.info(
+                "Artifact %s reuses stored blob %s; download skipped",
+                artifact_data.get("artifact_id"),
+                sha256[:12],
+            )
+            return
+
+        estimate = estimate or SizeEstimate(None, "unknown")
+        if estimate.size is not None and estimate.size <= self.small_artifact_bytes:
+            # Small enough to sit in memory: one plain GET, no range probe, and
+            # only its own size reserved against the admission budget.
+            return self._transfer_stream(
+                artifact_data, download_url, admission, estimate.size + DOWNLOAD_CHUNK_SIZE, emit
+            )
+
+        ranged = RangedDownload.probe(download_url, response=estimate.head) if self.ranged else None
+        if ranged:
+            # The preflight may have sized the artifact without a HEAD.
+            self._check_size(ranged.size)
+            # A checkpoint only applies to the same source; the storage layer also checks the layout.
+            if resume and resume.get("source") != download_url:
+                resume = None
+            self._resize(admission, ranged.part_size * ranged.connections)
+            ok = self.storage_manager.store_artifact_ranged(
+                artifact_data,
+                ranged,
+                artifact_data.get("name"),
+                lambda total: emit("transfer", "progress", {"bytes": total}),
+                resume=resume,
+                on_checkpoint=lambda state: emit("transfer", "checkpoint", {**state, "source": download_url}),
+            )
+            if not ok:
+                raise IngestError(500, "Failed to store artifact")
+            logger.info(
+                "Stored artifact %s over %d ranged connections (%d range retries)",
+                artifact_data.get("artifact_id"),
+                ranged.connections,
+                ranged.range_retries,
+            )
+            return
+
+        self._transfer_stream(
+            artifact_data, download_url, admission, S3_MULTIPART_PART_SIZE + DOWNLOAD_CHUNK_SIZE, emit
+        )
+
+    def _transfer_stream(
+        self,
+        artifact_data: Dict[str, Any],
+        download_url: str,
+        admission: Admission,
+        reserve: int,
+        emit: StageCallback,
+    ) -> None:
+        """Stream the artifact over one connection, holding `reserve` bytes of admission budget."""
+        received = {"bytes": 0}
+
+        def on_total(total: int) -> None:
+            received["bytes"] = total
+            # Sizes the preflight could not see are enforced as the bytes arrive.
+            self._check_size(total)
+            emit("transfer", "progress", {"bytes": total})
+
+        self._resize(admission, reserve)
+        response = http_client.get(download_url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+        try:
+            if response.status_code != 200:
+                raise IngestError(400, f"Failed to fetch artifact bytes from {download_url}")
+
+            chunks = _count_bytes(response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE), on_total)
+            ok = self.storage_manager.store_artifact_stream(
+                artifact_data, chunks, artifact_data.get("name")
+            )
+        finally:
+            response.close()
+        if not ok:
+            # A stream cut off for being over the limit is a 413, not a storage failure.
+            self._check_size(received["bytes"])
+            raise IngestError(500, "Failed to store artifact")
+
+        logger.info(
+            "Stored artifact %s of type %s",
+            artifact_data.get("artifact_id"),
+            artifact_data.get("artifact_type"),
+        )
+
+    def _check_capacity(self, host: str, nbytes: int) -> None:
+        """Fail fast with 429 when a transfer of `nbytes` from `host` could not be admitted within `admission_wait`."""
+        try:
+            self.admission.check(host, nbytes, timeout=self.admission_wait)
+        except AdmissionRejected as e:
+            raise _capacity_error(e)
+
+    @contextmanager
+    def _admitted(self, host: str, nbytes: int) -> Iterator[Admission]:
+        """Hold admission for one transfer; 429 once `admission_wait` passes without capacity."""
+        try:
+            with self.admission.admit(host, nbytes, timeout=self.admission_wait) as admission:
+                yield admission
+        except AdmissionRejected as e:
+            raise _capacity_error(e)
+
+    def _resize(self, admission: Admission, nbytes: int) -> None:
+        """Hold `nbytes` of budget for the transfer path actually taken; 429 like `_admitted`."""
+        try:
+            admission.resize(nbytes, timeout=self.admission_wait)
+        except AdmissionRejected as e:
+            raise _capacity_error(e)
+
+    def _transfer_snapshot(
+        self, artifact_data: Dict[str, Any], repo: Tuple[str, str], emit: StageCallback, admission: Admission
+    ) -> None:
+        """Store every selected file of a Hugging Face repo plus its manifest."""
+        kind, repo_id = repo
+        transfer = SnapshotTransfer(self.storage_manager)
+        # Every file transfer holds up to one part in memory.
+        self._resize(admission, transfer.workers * S3_MULTIPART_PART_SIZE)
+        try:
+            manifest = transfer.run(kind, repo_id, lambda total: emit("transfer", "progress", {"bytes": total}))
+        except SnapshotError as e:
+            raise IngestError(400, str(e))
+        if not self.storage_manager.store_snapshot(artifact_data, manifest):
+            raise IngestError(500, "Failed to store artifact")
+
+        logger.info(
+            "Stored snapshot %s of %s (%d files)",
+            artifact_data.get("artifact_id"),
+            repo_id,
+            manifest["file_count"],
+        )
+
+
+def _capacity_error(e: AdmissionRejected) -> IngestError:
+    return IngestError(429, f"Ingest capacity exhausted ({e.reason})", headers={"Retry-After": str(e.retry_after)})
+
+
+def advertised_sha256(download_url: str) -> Optional[str]:
+    """
+    Return the SHA-256 a source advertises for `download_url` before download.
+
+    Hugging Face `resolve` URLs for LFS files answer a HEAD with
+    `X-Linked-Etag: "<sha256>"`, which lets ingest skip downloading bytes that
+    are already stored. Other sources return None.
+    """
+    parsed = urlparse(download_url)
+    if not parsed.netloc.lower().endswith("huggingface.co") or "/resolve/" not in parsed.path:
+        return None
+    try:
+        response = http_client.head(download_url, allow_redirects=False, timeout=DOWNLOAD_TIMEOUT)
+    except requests.RequestException:
+        return None
+    etag = response.headers.get("X-Linked-Etag", "").strip().removeprefix("W/").strip('"').lower()
+    return etag if _SHA256_HEX.match(etag) else None
+
+
+def _count_bytes(chunks: Iterable[bytes], on_total: Callable[[int], None]) -> Iterator[bytes]:
+    """Pass chunks through while reporting the running byte total."""
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        on_total(total)
+        yield chunk
@@ -0,0 +1,521 @@
+"""Asynchronous ingestion jobs.
+
+Provides a durable job journal (SQLite locally, DynamoDB in production) and a
+bounded worker pool that runs `IngestPipeline` outside the request thread.
+Each process holds the jobs it queued under an expiring lease (`owner`,
+`lease_expires`) that it keeps renewing. Unfinished jobs whose lease has
+expired, because their process died, are claimed through a conditional write
+and re-queued, on start and periodically after that. Jobs a live process
+still holds are left alone. A ranged transfer checkpoints its multipart
+upload in the job record, so a re-queued job continues from its last stored
+part. Staging uploads that no unfinished job holds are aborted once they pass
+`INGEST_UPLOAD_MAX_AGE`.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from botocore.exceptions import ClientError
+
+from aws.config import (
+    INGEST_JOB_DB,
+    INGEST_JOB_LEASE,
+    INGEST_JOB_STORE,
+    INGEST_QUEUE_LIMIT,
+    INGEST_REAP_INTERVAL,
+    INGEST_UPLOAD_MAX_AGE,
+    INGEST_WORKERS,
+    jobs_table,
+)
+from backend.services.ingest import INGEST_STAGES, IngestError
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+UNFINISHED_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Minimum seconds between persisted transfer-progress updates for one job.
+_PROGRESS_INTERVAL = 1.0
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+class JobQueueFull(Exception):
+    """Raised when the number of unfinished jobs reaches the queue limit."""
+
+
+def _claimable(stored: Optional[Dict[str, Any]], owner: str, now: float) -> bool:
+    """Whether `owner` may write a job whose journaled record is `stored`."""
+    if stored is None:
+        return True
+    if stored.get("status") not in UNFINISHED_STATUSES:
+        return False
+    return stored.get("owner") in (None, owner) or float(stored.get("lease_expires") or 0) <= now
+
+
+# ------------------------
+# Job journals
+# ------------------------
+class SQLiteJobStore:
+    """Job journal backed by a local SQLite file (one row per job, JSON body)."""
+
+    def __init__(self, path: str = INGEST_JOB_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " job_id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " created_at TEXT NOT NULL,"
+                " updated_at TEXT NOT NULL,"
+                " data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status)")
+            self._initialized = True
+        return conn
+
+    def put(self, job: Dict[str, Any]) -> None:
+        with self._lock, self._connect() as conn:
+            self._write(conn, job)
+
+    def claim(self, job: Dict[str, Any], owner: str, lease_until: int) -> bool:
+        """
+        Write `job` as held by `owner` until `lease_until`, unless another
+        owner holds a live lease on it or it already finished.
+        """
+        with self._lock, self._connect() as conn:
+            # Lock the file so processes sharing the journal cannot both claim.
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job["job_id"],)).fetchone()
+            if not _claimable(json.loads(row[0]) if row else None, owner, time.time()):
+                return False
+            job.update(owner=owner, lease_expires=lease_until)
+            self._write(conn, job)
+            return True
+
+    def renew(self, job_id: str, owner: str, lease_until: int) -> bool:
+        """Extend `owner`'s lease on a job; False if it no longer holds it."""
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            job = json.loads(row[0]) if row else None
+            if not job or job.get("owner") != owner or job.get("status") not in UNFINISHED_STATUSES:
+                return False
+            job["lease_expires"] = lease_until
+            self._write(conn, job)
+            return True
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, job: Dict[str, Any]) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, status, created_at, updated_at, data)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (job["job_id"], job["status"], job["created_at"], job["updated_at"], json.dumps(job)),
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_by_status(self, statuses: Iterable[str]) -> List[Dict[str, Any]]:
+        statuses = list(statuses)
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT data FROM jobs WHERE status IN ({placeholders}) ORDER BY created_at",
+                statuses,
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+
+class DynamoDBJobStore:
+    """Job journal backed by a DynamoDB table keyed on `job_id`."""
+
+    def __init__(self, table=None):
+        self.table = table or jobs_table
+
+    def put(self, job: Dict[str, Any]) -> None:
+        self.table.put_item(Item=self._item(job))
+
+    def claim(self, job: Dict[str, Any], owner: str, lease_until: int) -> bool:
+        """
+        Write `job` as held by `owner` until `lease_until`, unless another
+        owner holds a live lease on it or it already finished.
+        """
+        claimed = dict(job, owner=owner, lease_expires=lease_until)
+        try:
+            self.table.put_item(
+                Item=self._item(claimed),
+                ConditionExpression=(
+                    "attribute_not_exists(job_id) OR (#s IN (:queued, :running) AND "
+                    "(attribute_not_exists(#o) OR #o = :owner OR lease_expires <= :now))"
+                ),
+                ExpressionAttributeNames={"#s": "status", "#o": "owner"},
+                ExpressionAttributeValues={
+                    ":queued": JOB_QUEUED,
+                    ":running": JOB_RUNNING,
+                    ":owner": owner,
+                    ":now": int(time.time()),
+                },
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        job.update(owner=owner, lease_expires=lease_until)
+        return True
+
+    def renew(self, job_id: str, owner: str, lease_until: int) -> bool:
+        """Extend `owner`'s lease on a job; False if it no longer holds it."""
+        try:
+            self.table.update_item(
+                Key={"job_id": job_id},
+                UpdateExpression="SET lease_expires = :until",
+                ConditionExpression="#o = :owner AND #s IN (:queued, :running)",
+                ExpressionAttributeNames={"#s": "status", "#o": "owner"},
+                ExpressionAttributeValues={
+                    ":until": lease_until,
+                    ":owner": owner,
+                    ":queued": JOB_QUEUED,
+                    ":running": JOB_RUNNING,
+                },
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def _item(job: Dict[str, Any]) -> Dict[str, Any]:
+        # Store the body as JSON so DynamoDB never sees Python floats. The
+        # lease is also kept top-level for conditional claims.
+        item = {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+            "data": json.dumps(job),
+        }
+        if job.get("owner"):
+            item["owner"] = job["owner"]
+            item["lease_expires"] = int(job.get("lease_expires") or 0)
+        return item
+
+    @staticmethod
+    def _job(item: Dict[str, Any]) -> Dict[str, Any]:
+        job = json.loads(item["data"])
+        # `renew` only updates the top-level attribute.
+        if "lease_expires" in item:
+            job["lease_expires"] = int(item["lease_expires"])
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = self.table.get_item(Key={"job_id": job_id}).get("Item")
+        except ClientError as e:
+            logger.error(f"❌ Failed to fetch job (job_id={job_id}): {e}")
+            return None
+        return self._job(item) if item else None
+
+    def list_by_status(self, statuses: Iterable[str]) -> List[Dict[str, Any]]:
+        wanted = set(statuses)
+        jobs: List[Dict[str, Any]] = []
+        kwargs: Dict[str, Any] = {}
+        while True:
+            response = self.table.scan(**kwargs)
+            jobs.extend(self._job(it) for it in response.get("Items", []) if it.get("status") in wanted)
+            if "LastEvaluatedKey" not in response:
+                break
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return sorted(jobs, key=lambda j: j["created_at"])
+
+
+def make_job_store():
+    """Build the job journal selected by `INGEST_JOB_STORE`."""
+    if INGEST_JOB_STORE == "dynamodb":
+        return DynamoDBJobStore()
+    os.makedirs(os.path.dirname(os.path.abspath(INGEST_JOB_DB)), exist_ok=True)
+    return SQLiteJobStore(INGEST_JOB_DB)
+
+
+# ------------------------
+# Worker pool
+# ------------------------
+class IngestJobManager:
+    """Queue ingestion jobs onto a bounded worker pool and journal their progress."""
+
+    def __init__(
+        self,
+        store,
+        pipeline_factory: Callable[[], Any],
+        max_workers: int = INGEST_WORKERS,
+        max_pending: int = INGEST_QUEUE_LIMIT,
+        uploads=None,
+        upload_max_age: float = INGEST_UPLOAD_MAX_AGE,
+        reap_interval: float = INGEST_REAP_INTERVAL,
+        lease_seconds: int = INGEST_JOB_LEASE,
+    ):
+        self.store = store
+        self.pipeline_factory = pipeline_factory
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        # Anything with `abort_stale_uploads(max_age_seconds, keep)` (the S3 service).
+        self.uploads = uploads
+        self.upload_max_age = upload_max_age
+        self.reap_interval = reap_interval
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stop_reaper = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+        self._leaser: Optional[threading.Thread] = None
+
+    # ------------------------
+    # Lifecycle
+    # ------------------------
+    def start(self) -> int:
+        """
+        Re-queue unfinished jobs whose lease expired (keeping their upload
+        checkpoints) and start the lease keeper and the abandoned-upload
+        reaper. Returns how many jobs were re-queued.
+        """
+        # Reap before re-queuing, while every interrupted job still holds its checkpoint.
+        self._reap_once()
+        recovered = self.recover_expired()
+        self._stop_reaper.clear()
+        if self._leaser is None:
+            self._leaser = threading.Thread(target=self._lease_loop, name="job-leases", daemon=True)
+            self._leaser.start()
+        if self.uploads is not None and self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_loop, name="upload-reaper", daemon=True)
+            self._reaper.start()
+        return recovered
+
+    def recover_expired(self) -> int:
+        """
+        Claim and re-queue unfinished jobs whose lease expired (or that never
+        had one). Jobs another live process holds are skipped; the lease
+        keeper retries them once their lease runs out. Returns how many jobs.
+        """
+        recovered = 0
+        now = time.time()
+        for job in self.store.list_by_status(UNFINISHED_STATUSES):
+            with self._lock:
+                future = self._futures.get(job["job_id"])
+            if (future is not None and not future.done()) or not _claimable(job, self.owner, now):
+                continue
+            job["attempts"] = job.get("attempts", 0) + 1
+            job["status"] = JOB_QUEUED
+            job["stages"] = _fresh_stages()
+            job["updated_at"] = _now()
+            # Another process may have claimed it since the listing.
+            if not self.store.claim(job, self.owner, self._lease_until()):
+                continue
+            self._enqueue(job["job_id"])
+            recovered += 1
+        if recovered:
+            logger.warning(f"⚠️ Re-queued {recovered} unfinished ingestion job(s) with expired leases")
+        return recovered
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work. Unfinished jobs stay in the journal for the next start."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            reaper, self._reaper = self._reaper, None
+            leaser, self._leaser = self._leaser, None
+        self._stop_reaper.set()
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+        for thread in (reaper, leaser):
+            if thread and wait:
+                thread.join()
+
+    def reap_abandoned_uploads(self) -> int:
+        """Abort staging uploads past the deadline that no unfinished job has checkpointed."""
+        if self.uploads is None:
+            return 0
+        held = {
+            job["checkpoint"]["upload_id"]
+            for job in self.store.list_by_status(UNFINISHED_STATUSES)
+            if job.get("checkpoint")
+        }
+        return self.uploads.abort_stale_uploads(self.upload_max_age, keep=held)
+
+    # ------------------------
+    # Public API
+    # ------------------------
+    def submit(
+        self, url: str, artifact_type: str, name: Optional[str] = None, refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Journal a new job and queue it. Raises `JobQueueFull` when saturated.
+        With `refresh` the URL is re-processed even if it was ingested before.
+        """
+        with self._lock:
+            pending = sum(1 for f in self._futures.values() if not f.done())
+        if pending >= self.max_pending:
+            raise JobQueueFull(f"{pending} ingestion jobs already pending")
+
+        now = _now()
+        job: Dict[str, Any] = {
+            "job_id": uuid.uuid4().hex,
+            "status": JOB_QUEUED,
+            "url": url,
+            "artifact_type": artifact_type,
+            "name": name,
+            "refresh": refresh,
+            "artifact_id": None,
+            "error": None,
+            "attempts": 1,
+            "stages": _fresh_stages(),
+            "created_at": now,
+            "updated_at": now,
+            "owner": self.owner,
+            "lease_expires": self._lease_until(),
+        }
+        self.store.put(job)
+        self._enqueue(job["job_id"])
+        logger.info(f"📥 Queued ingestion job {job['job_id']} for {url}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Block until a job queued by this process finishes, then return it."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.store.get(job_id)
+
+    # ------------------------
+    # Internal helpers
+    # ------------------------
+    def _enqueue(self, job_id: str) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ingest"
+                )
+            self._futures = {k: f for k, f in self._futures.items() if not f.done()}
+            self._futures[job_id] = self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        job = self.store.get(job_id)
+        if not job:
+            logger.error(f"❌ Ingestion job {job_id} vanished from the journal")
+            return
+
+        job["status"] = JOB_RUNNING
+        job["updated_at"] = _now()
+        # A job that sat in this queue past its lease may have been taken over.
+        if not self.store.claim(job, self.owner, self._lease_until()):
+            logger.warning(f"⚠️ Ingestion job {job_id} is held by another process; not running it")
+            return
+        last_progress = [0.0]
+
+        def on_event(stage: str, state: str, info: Dict[str, Any]) -> None:
+            entry = job["stages"].setdefault(stage, {"status": "pending"})
+            if state == "progress":
+                entry.update(info)
+                if time.time() - last_progress[0] < _PROGRESS_INTERVAL:
+                    return
+                last_progress[0] = time.time()
+            elif state == "checkpoint":
+                # Persisted after every part so a restarted worker loses at most the parts in flight.
+                job["checkpoint"] = info
+            elif state == "running":
+                entry.update({"status": "running", "started_at": _now()})
+            else:
+                entry.update({"status": state, "finished_at": _now(), **info})
+            self._save(job)
+
+        try:
+            stored = self.pipeline_factory().run(
+                job["url"],
+                job["artifact_type"],
+                job.get("name"),
+                on_event=on_event,
+                reuse_existing=not job.get("refresh", False),
+                resume=job.get("checkpoint"),
+            )
+            job["artifact_id"] = stored.get("artifact_id")
+            job["status"] = JOB_SUCCEEDED
+            logger.info(f"✅ Ingestion job {job_id} produced artifact {job['artifact_id']}")
+        except IngestError as e:
+            job["status"] = JOB_FAILED
+            job["error"] = e.detail
+            logger.error(f"❌ Ingestion job {job_id} failed: {e.detail}")
+        except Exception as e:
+            job["status"] = JOB_FAILED
+            job["error"] = str(e)
+            logger.exception(f"❌ Ingestion job {job_id} crashed")
+        # The upload was completed or aborted either way.
+        job.pop("checkpoint", None)
+        self._save(job)
+
+    def _lease_until(self) -> int:
+        return int(time.time()) + self.lease_seconds
+
+    def _lease_loop(self) -> None:
+        """Renew the leases of jobs queued or running here, and take over expired ones."""
+        while not self._stop_reaper.wait(max(1.0, self.lease_seconds / 3)):
+            with self._lock:
+                held = [job_id for job_id, f in self._futures.items() if not f.done()]
+            for job_id in held:
+                try:
+                    if not self.store.renew(job_id, self.owner, self._lease_until()):
+                        logger.warning(f"⚠️ Lost the lease on ingestion job {job_id}")
+                except Exception:
+                    logger.exception(f"❌ Failed to renew the lease on ingestion job {job_id}")
+            try:
+                self.recover_expired()
+            except Exception:
+                logger.exception("❌ Failed to recover ingestion jobs with expired leases")
+
+    def _reap_loop(self) -> None:
+        while not self._stop_reaper.wait(self.reap_interval):
+            self._reap_once()
+
+    def _reap_once(self) -> None:
+        try:
+            self.reap_abandoned_uploads()
+        except Exception:
+            logger.exception("❌ Failed to reap abandoned multipart uploads")
+
+    def _save(self, job: Dict[str, Any]) -> None:
+        job["updated_at"] = _now()
+        try:
+            # Conditional on still holding the job, so a process that lost its
+            # lease cannot overwrite the new owner's record.
+            if not self.store.claim(job, self.owner, self._lease_until()):
+                logger.warning(f"⚠️ Not journaling ingestion job {job['job_id']}: another process holds it")
+        except Exception:
+            logger.exception(f"❌ Failed to journal ingestion job {job['job_id']}")
+
+
+def _fresh_stages() -> Dict[str, Dict[str, Any]]:
+    return {stage: {"status": "pending"} for stage in INGEST_STAGES}
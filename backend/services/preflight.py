@@ -0,0 +1,116 @@
+"""Size preflight for artifact transfers.
+
+Ingest used to start the GET without knowing how large the object was. The
+preflight finds the expected size from the cheapest available source. It
+first checks the per-file sizes Hugging Face lists in `siblings` (model
+metadata is fetched with `blobs=true`), then tries a HEAD of the download
+URL. Failing both, a single file's size is unknown: the metadata only gives the
+whole repo's `usedStorage` and a parameter count, neither of which is the
+file's size, so the stream enforces the limit instead. A repo snapshot is
+sized from its selected files, else from `usedStorage`. Ingest runs it before
+fetching metric data. It uses the result to reject oversized artifacts, to
+size its transfer capacity and to pick a transfer path.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import unquote, urlparse
+
+import requests
+
+from aws.config import DOWNLOAD_TIMEOUT
+from backend.services.snapshot import select_files
+from cli.utils.HttpClient import http_client
+
+logger = logging.getLogger(__name__)
+
+_GIB = 1024 * 1024 * 1024
+
+
+class SizeEstimate:
+    """Expected download size in bytes (None when unknown) and where it came from."""
+
+    def __init__(self, size: Optional[int], source: str, head: Optional[requests.Response] = None):
+        self.size = size
+        # "siblings", "head", "metadata" (snapshots only) or "unknown".
+        self.source = source
+        # The HEAD response, when one was made, so the ranged probe can reuse it.
+        self.head = head
+
+    @property
+    def size_in_gb(self) -> Optional[float]:
+        return None if self.size is None else self.size / _GIB
+
+
+def estimate_size(
+    download_url: str,
+    meta_info: Dict[str, Any],
+    head: bool = True,
+) -> SizeEstimate:
+    """
+    Expected size of the object behind `download_url`.
+
+    The HEAD is skipped when `siblings` already lists the file, or when `head`
+    is False. A HEAD that fails or reports no length is not an error; the size
+    is then unknown.
+    """
+    size = sibling_size(meta_info, download_url)
+    if size:
+        return SizeEstimate(size, "siblings")
+
+    response = _head(download_url) if head else None
+    if response is not None:
+        size = _content_length(response)
+        if size:
+            return SizeEstimate(size, "head", response)
+    return SizeEstimate(None, "unknown", response)
+
+
+def estimate_repo_size(meta_info: Dict[str, Any]) -> SizeEstimate:
+    """Expected size of a repo snapshot: the selected files' sizes, else the repo's `usedStorage`."""
+    files = [
+        {"path": s["rfilename"], "size": _sibling_bytes(s)}
+        for s in meta_info.get("siblings") or []
+        if isinstance(s, dict) and s.get("rfilename")
+    ]
+    if files and all(f["size"] for f in files):
+        return SizeEstimate(sum(f["size"] for f in select_files(files)), "siblings")
+    used = meta_info.get("usedStorage")
+    if isinstance(used, (int, float)) and used > 0:
+        return SizeEstimate(int(used), "metadata")
+    return SizeEstimate(None, "unknown")
+
+
+def sibling_size(meta_info: Dict[str, Any], download_url: str) -> Optional[int]:
+    """Size Hugging Face lists for the file behind a `resolve` URL, if the metadata carries it."""
+    path = unquote(urlparse(download_url).path)
+    if "/resolve/" not in path:
+        return None
+    # .../resolve/<revision>/<file path>
+    _, _, filename = path.split("/resolve/", 1)[1].partition("/")
+    for sibling in meta_info.get("siblings") or []:
+        if isinstance(sibling, dict) and sibling.get("rfilename") == filename:
+            return _sibling_bytes(sibling)
+    return None
+
+
+def _sibling_bytes(sibling: Dict[str, Any]) -> Optional[int]:
+    size = (sibling.get("lfs") or {}).get("size") or sibling.get("size")
+    return int(size) if isinstance(size, (int, float)) and size > 0 else None
+
+
+def _head(url: str) -> Optional[requests.Response]:
+    try:
+        response = http_client.head(url, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+    except requests.RequestException as e:
+        logger.info("Preflight HEAD of %s failed: %s", url, e)
+        return None
+    return response if response.status_code == 200 else None
+
+
+def _content_length(response: requests.Response) -> Optional[int]:
+    try:
+        size = int(response.headers.get("Content-Length", ""))
+    except ValueError:
+        return None
+    return size if size > 0 else None
@@ -0,0 +1,165 @@
+"""Parallel HTTP range downloads.
+
+A single TCP stream from the Hugging Face CDN tops out well below what the
+worker and S3 can take, so multi-GB ingests are bound by one connection.
+When a source answers a HEAD with `Accept-Ranges: bytes` and a length,
+`RangedDownload` splits the object into ranges that are fetched over several
+connections. `S3Service.stage_ranges` uploads each range as one multipart part
+and hashes the ranges in order. A range that fails or arrives short is retried
+on its own; the rest of the object is not fetched again.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from aws.config import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_TIMEOUT,
+    RANGED_MAX_CONNECTIONS,
+    RANGED_MAX_PART_SIZE,
+    RANGED_MIN_SIZE,
+    RANGED_RETRIES,
+    S3_MULTIPART_PART_SIZE,
+)
+from cli.utils.HttpClient import http_client
+
+logger = logging.getLogger(__name__)
+
+# S3 allows at most 10,000 parts per multipart upload.
+S3_MAX_PARTS = 10_000
+_MIB = 1024 * 1024
+
+
+class RangeError(Exception):
+    """A byte range could not be fetched after all retries."""
+
+
+def plan(
+    size: int,
+    max_connections: int = RANGED_MAX_CONNECTIONS,
+    min_part: int = S3_MULTIPART_PART_SIZE,
+    max_part: int = RANGED_MAX_PART_SIZE,
+) -> Dict[str, int]:
+    """
+    Part size and connection count for an object of `size` bytes.
+
+    Aims for about four ranges per connection, so a slow range does not leave
+    the other connections idle at the end. Parts stay between `min_part` and
+    `max_part`, rounded up to whole MiB. The part size grows beyond `max_part`
+    only when needed to stay under the S3 part limit.
+    """
+    connections = max(1, max_connections)
+    part = size // (connections * 4)
+    part = max(min_part, min(max_part, part), math.ceil(size / S3_MAX_PARTS))
+    part = math.ceil(part / _MIB) * _MIB
+    return {"part_size": part, "connections": max(1, min(connections, math.ceil(size / part)))}
+
+
+class RangedDownload:
+    """One range-capable source object and the plan for fetching it."""
+
+    def __init__(
+        self,
+        url: str,
+        size: int,
+        part_size: int,
+        connections: int,
+        retries: int = RANGED_RETRIES,
+    ):
+        self.url = url
+        self.size = size
+        self.part_size = part_size
+        self.connections = connections
+        self.retries = retries
+        self.range_retries = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def probe(
+        cls,
+        url: str,
+        min_size: int = RANGED_MIN_SIZE,
+        max_connections: int = RANGED_MAX_CONNECTIONS,
+        response: Optional[requests.Response] = None,
+    ) -> Optional["RangedDownload"]:
+        """
+        HEAD the source (following redirects) and plan a ranged download.
+
+        Returns None when the source does not accept byte ranges, does not
+        report a length, or is smaller than `min_size`. The caller then
+        streams the object over one connection. Pass `response` to reuse a
+        HEAD the caller already made.
+        """
+        if response is None:
+            try:
+                response = http_client.head(url, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+            except requests.RequestException:
+                return None
+        if response.status_code != 200:
+            return None
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+            return None
+        try:
+            size = int(response.headers.get("Content-Length", ""))
+        except ValueError:
+            return None
+        if size < max(min_size, 1):
+            return None
+        # Range requests go to the final (e.g. signed CDN) URL, so the redirect is not repeated per range.
+        return cls(response.url or url, size, **plan(size, max_connections))
+
+    def fetch_range(self, start: int, end: int) -> bytes:
+        """
+        Bytes `start..end` (inclusive), retried on their own when a fetch fails or comes back short.
+
+        Raises:
+            RangeError: when every attempt failed.
+        """
+        expected = end - start + 1
+        last_error = ""
+        for attempt in range(self.retries + 1):
+            if attempt:
+                with self._lock:
+                    self.range_retries += 1
+                time.sleep(min(2.0, 0.1 * 2 ** (attempt - 1)))
+            try:
+                data = self._get(start, end)
+            except requests.RequestException as e:
+                last_error = str(e)
+                continue
+            if len(data) == expected:
+                return data
+            last_error = f"got {len(data)} of {expected} bytes"
+            logger.warning(f"⚠️ Range {start}-{end} of {self.url}: {last_error}; retrying")
+        raise RangeError(f"Range {start}-{end} failed after {self.retries + 1} attempts: {last_error}")
+
+    def _get(self, start: int, end: int) -> bytes:
+        response = http_client.get(
+            self.url,
+            headers={"Range": f"bytes={start}-{end}"},
+            stream=True,
+            timeout=DOWNLOAD_TIMEOUT,
+        )
+        try:
+            # A 200 means the server ignored the range; never take the whole body as one part.
+            if response.status_code != 206:
+                raise requests.RequestException(f"range request returned {response.status_code}")
+            buffer = bytearray()
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                buffer.extend(chunk)
+            return bytes(buffer)
+        finally:
+            response.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size_bytes": self.size,
+            "part_size": self.part_size,
+            "connections": self.connections,
+            "range_retries": self.range_retries,
+        }
@@ -3,17 +3,77 @@
 Handles low-level S3 operations (upload/download/delete/presign/reset).
 """
 
+import hashlib
 import logging
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from io import BytesIO
-from aws.config import s3, BUCKET_NAME
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from botocore.exceptions import ClientError
+from aws.config import s3, BUCKET_NAME, S3_MULTIPART_PART_SIZE
 
 logger = logging.getLogger(__name__)
 
+BLOB_PREFIX = "blobs/sha256"
+STAGING_PREFIX = "staging"
+
+
+class StagedBlob:
+    """
+    Bytes streamed to S3 whose SHA-256 is known but whose final key is not.
+
+    Large payloads sit in an uncompleted multipart upload under `staging/`;
+    payloads smaller than one part are held in memory. `commit` moves the
+    bytes to their content-addressed key, `discard` drops them without ever
+    materializing an object (used when the digest is already stored).
+    """
+
+    def __init__(self, service: "S3Service", key: str, sha256: str, size: int,
+                 upload_id: Optional[str], parts: List[dict], tail: bytes, completed: bool = False):
+        self.service = service
+        self.key = key
+        self.sha256 = sha256
+        self.size = size
+        self.upload_id = upload_id
+        self.parts = parts
+        self.tail = tail
+        # True when the bytes already form a complete object at `key` (resumed uploads).
+        self.completed = completed
+
+    def commit(self, dest_key: str) -> str:
+        """Write the staged bytes to `dest_key` and return its S3 URI."""
+        svc = self.service
+        if self.completed:
+            svc.s3.copy({"Bucket": svc.bucket_name, "Key": self.key}, svc.bucket_name, dest_key)
+            svc.delete_artifact(self.key)
+        elif self.upload_id is None:
+            svc.s3.put_object(Bucket=svc.bucket_name, Key=dest_key, Body=self.tail)
+        else:
+            svc.s3.complete_multipart_upload(
+                Bucket=svc.bucket_name,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": self.parts},
+            )
+            # Managed copy switches to UploadPartCopy for objects over 5 GB.
+            svc.s3.copy({"Bucket": svc.bucket_name, "Key": self.key}, svc.bucket_name, dest_key)
+            svc.delete_artifact(self.key)
+        return svc._s3_uri(dest_key)
+
+    def discard(self) -> None:
+        """Drop the staged bytes."""
+        if self.completed:
+            self.service.delete_artifact(self.key)
+        elif self.upload_id is not None:
+            self.service._abort_multipart_upload(self.key, self.upload_id)
+
 
 class S3Service:
     """
     Handles S3 operations for storing artifact files.
-    Supports uploading (from bytes), downloading, deleting, updating, and resetting the bucket.
+    Supports uploading (from bytes or a chunk stream), downloading, deleting,
+    updating, and resetting the bucket.
     """
 
     def __init__(self, bucket_name: str = BUCKET_NAME):
@@ -27,6 +87,38 @@ class S3Service:
         """Return a full s3:// URI."""
         return f"s3://{self.bucket_name}/{key}"
 
+    def key_from_uri(self, uri: str) -> str:
+        """Return the object key of an s3://bucket/key (or legacy https) URI."""
+        prefix = f"s3://{self.bucket_name}/"
+        if uri.startswith(prefix):
+            return uri[len(prefix):]
+        return uri.split(f"{self.bucket_name}/")[-1]
+
+    @staticmethod
+    def blob_key(sha256: str) -> str:
+        """Content-addressed key for bytes with the given SHA-256 hex digest."""
+        return f"{BLOB_PREFIX}/{sha256}"
+
+    def blob_uri(self, sha256: str) -> str:
+        return self._s3_uri(self.blob_key(sha256))
+
+    def object_exists(self, key: str) -> bool:
+        try:
+            self.s3.head_object(Bucket=self.bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def object_size(self, key: str) -> int:
+        return int(self.s3.head_object(Bucket=self.bucket_name, Key=key)["ContentLength"])
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        """Bytes `start..end` (inclusive) of an object."""
+        response = self.s3.get_object(Bucket=self.bucket_name, Key=key, Range=f"bytes={start}-{end}")
+        return response["Body"].read()
+
     # ------------------------
     # Artifact Operations
     # ------------------------
@@ -46,6 +138,231 @@ class S3Service:
             logger.exception(f"❌ Failed to upload artifact '{filename}' for artifact_id={artifact_id}: {e}")
             raise
 
+    def stage_stream(
+        self,
+        chunks: Iterable[bytes],
+        part_size: int = S3_MULTIPART_PART_SIZE,
+    ) -> StagedBlob:
+        """
+        Stream chunks into a staging multipart upload while hashing them.
+
+        Chunks are accumulated into parts of `part_size` bytes, so memory stays
+        bounded by one part regardless of the artifact size.
+        The returned `StagedBlob` must be committed or discarded; a failure
+        while streaming aborts the upload.
+        """
+        key = f"{STAGING_PREFIX}/{uuid.uuid4().hex}"
+        digest = hashlib.sha256()
+        buffer = bytearray()
+        upload_id = None
+        parts: List[dict] = []
+        total = 0
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                digest.update(chunk)
+                buffer.extend(chunk)
+                total += len(chunk)
+                while len(buffer) >= part_size:
+                    if upload_id is None:
+                        upload_id = self._create_multipart_upload(key)
+                    parts.append(
+                        self._upload_part(key, upload_id, len(parts) + 1, bytes(buffer[:part_size]))
+                    )
+                    del buffer[:part_size]
+
+            tail = bytes(buffer)
+            if upload_id is not None and tail:
+                parts.append(self._upload_part(key, upload_id, len(parts) + 1, tail))
+                tail = b""
+        except Exception as e:
+            if upload_id is not None:
+                self._abort_multipart_upload(key, upload_id)
+            logger.exception(f"❌ Failed to stage upload '{key}': {e}")
+            raise
+
+        staged = StagedBlob(self, key, digest.hexdigest(), total, upload_id, parts, tail)
+        logger.info(f"📥 Staged {total} bytes as sha256:{staged.sha256[:12]} ({len(parts)} parts)")
+        return staged
+
+    def stage_ranges(
+        self,
+        fetch_range: Callable[[int, int], bytes],
+        size: int,
+        part_size: int = S3_MULTIPART_PART_SIZE,
+        concurrency: int = 4,
+        on_bytes: Optional[Callable[[int], None]] = None,
+        resume: Optional[Dict[str, Any]] = None,
+        on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> StagedBlob:
+        """
+        Stage an object of known `size` by fetching byte ranges concurrently.
+
+        Each range of `part_size` bytes is fetched with `fetch_range(start, end)`
+        and uploaded as one multipart part. Up to `concurrency` ranges run at
+        once. Ranges are hashed in order as they complete, so memory stays
+        bounded by `concurrency` parts. Any failure aborts the upload.
+
+        After every part, `on_checkpoint` receives the upload's state (key,
+        UploadId, completed parts with their byte offsets). Passing that state
+        back as `resume` continues the same upload: parts S3 still holds are
+        not fetched again. The bytes uploaded before the restart are not in
+        memory, so a resumed object is hashed by reading it back from S3 once.
+        """
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+        done = self._resumable_parts(resume, size, part_size)
+        if resume is None or done is None:
+            key = f"{STAGING_PREFIX}/{uuid.uuid4().hex}"
+            upload_id = self._create_multipart_upload(key)
+            done = {}
+        else:
+            key, upload_id = resume["key"], resume["upload_id"]
+            logger.info(f"⏯️ Resuming upload '{key}' with {len(done)}/{len(ranges)} parts already stored")
+        hash_inline = not done
+        digest = hashlib.sha256()
+        total = sum(ranges[n - 1][1] - ranges[n - 1][0] + 1 for n in done)
+        todo = [n for n in range(1, len(ranges) + 1) if n not in done]
+
+        def fetch_part(part_number: int):
+            start, end = ranges[part_number - 1]
+            body = fetch_range(start, end)
+            part = self._upload_part(key, upload_id, part_number, body)
+            return body, {**part, "start": start, "end": end}
+
+        pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="range")
+        pending: Dict[int, Future] = {}
+        try:
+            next_submit = 0
+            for index in range(len(todo)):
+                while next_submit < len(todo) and next_submit < index + concurrency:
+                    pending[next_submit] = pool.submit(fetch_part, todo[next_submit])
+                    next_submit += 1
+                body, part = pending.pop(index).result()
+                if hash_inline:
+                    digest.update(body)
+                done[part["PartNumber"]] = part
+                total += len(body)
+                if on_bytes:
+                    on_bytes(total)
+                if on_checkpoint:
+                    on_checkpoint({
+                        "key": key,
+                        "upload_id": upload_id,
+                        "size": size,
+                        "part_size": part_size,
+                        "parts": [done[n] for n in sorted(done)],
+                    })
+            parts = [{"ETag": done[n]["ETag"], "PartNumber": n} for n in sorted(done)]
+            if not hash_inline:
+                self.s3.complete_multipart_upload(
+                    Bucket=self.bucket_name, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+                )
+        except Exception as e:
+            for future in pending.values():
+                future.cancel()
+            pool.shutdown(wait=True)
+            self._abort_multipart_upload(key, upload_id)
+            logger.exception(f"❌ Failed to stage ranged upload '{key}': {e}")
+            raise
+        pool.shutdown(wait=True)
+
+        if hash_inline:
+            staged = StagedBlob(self, key, digest.hexdigest(), total, upload_id, parts, b"")
+        else:
+            sha256, total = self._hash_object(key)
+            staged = StagedBlob(self, key, sha256, total, None, parts, b"", completed=True)
+        logger.info(
+            f"📥 Staged {total} bytes as sha256:{staged.sha256[:12]} "
+            f"({len(parts)} ranged parts, {len(todo)} fetched, {concurrency} connections)"
+        )
+        return staged
+
+    def _resumable_parts(
+        self, resume: Optional[Dict[str, Any]], size: int, part_size: int
+    ) -> Optional[Dict[int, dict]]:
+        """
+        Parts of a checkpointed upload that S3 still holds, by part number.
+        None when there is nothing to resume (no checkpoint, a different layout, or the upload is gone).
+        """
+        if not resume or resume.get("size") != size or resume.get("part_size") != part_size:
+            return None
+        stored: Dict[int, str] = {}
+        kwargs: Dict[str, Any] = {}
+        try:
+            while True:
+                response = self.s3.list_parts(
+                    Bucket=self.bucket_name, Key=resume["key"], UploadId=resume["upload_id"], **kwargs
+                )
+                stored.update({p["PartNumber"]: p["ETag"] for p in response.get("Parts", [])})
+                if not response.get("IsTruncated"):
+                    break
+                kwargs["PartNumberMarker"] = response["NextPartNumberMarker"]
+        except ClientError as e:
+            logger.warning(f"⚠️ Cannot resume upload '{resume['key']}': {e}")
+            return None
+        return {
+            p["PartNumber"]: p for p in resume.get("parts", []) if stored.get(p["PartNumber"]) == p["ETag"]
+        }
+
+    def _hash_object(self, key: str) -> Tuple[str, int]:
+        """SHA-256 and size of a stored object, streamed back from S3."""
+        digest = hashlib.sha256()
+        size = 0
+        body = self.s3.get_object(Bucket=self.bucket_name, Key=key)["Body"]
+        for chunk in body.iter_chunks(chunk_size=S3_MULTIPART_PART_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+        return digest.hexdigest(), size
+
+    def abort_stale_uploads(
+        self, max_age_seconds: float, keep: Iterable[str] = (), prefix: str = STAGING_PREFIX
+    ) -> int:
+        """
+        Abort multipart uploads under `prefix` started more than `max_age_seconds` ago.
+        Upload ids in `keep` (e.g. checkpointed by unfinished jobs) are left alone.
+        Returns how many uploads were aborted.
+        """
+        keep = set(keep)
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+        aborted = 0
+        kwargs: Dict[str, Any] = {"Prefix": f"{prefix}/"}
+        while True:
+            response = self.s3.list_multipart_uploads(Bucket=self.bucket_name, **kwargs)
+            for upload in response.get("Uploads", []):
+                if upload["UploadId"] in keep or upload["Initiated"] > cutoff:
+                    continue
+                self._abort_multipart_upload(upload["Key"], upload["UploadId"])
+                aborted += 1
+            if not response.get("IsTruncated"):
+                break
+            kwargs["KeyMarker"] = response["NextKeyMarker"]
+            kwargs["UploadIdMarker"] = response["NextUploadIdMarker"]
+        if aborted:
+            logger.warning(f"⚠️ Aborted {aborted} abandoned multipart upload(s) older than {max_age_seconds:.0f}s")
+        return aborted
+
+    def _create_multipart_upload(self, key: str) -> str:
+        response = self.s3.create_multipart_upload(Bucket=self.bucket_name, Key=key)
+        return response["UploadId"]
+
+    def _upload_part(self, key: str, upload_id: str, part_number: int, body: bytes) -> dict:
+        response = self.s3.upload_part(
+            Bucket=self.bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    def _abort_multipart_upload(self, key: str, upload_id: str) -> None:
+        try:
+            self.s3.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+            logger.warning(f"⚠️ Aborted multipart upload for '{key}'")
+        except Exception:
+            logger.exception(f"❌ Failed to abort multipart upload for '{key}'")
+
     def download_artifact(self, s3_key: str) -> bytes:
         """
         Download an artifact from S3 and return its content as bytes.
@@ -60,14 +377,20 @@ class S3Service:
             logger.exception(f"❌ Failed to download artifact '{s3_key}': {e}")
             raise
 
-    def generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
+    def generate_presigned_url(self, key: str, expires_in: int = 3600, filename: Optional[str] = None) -> str:
         """
         Generate a presigned URL for downloading an artifact from S3.
+        When `filename` is given the response is served as an attachment with
+        that name (blob keys carry no filename of their own).
         """
         try:
+            params = {"Bucket": self.bucket_name, "Key": key}
+            if filename:
+                safe_name = filename.replace('"', "")
+                params["ResponseContentDisposition"] = f'attachment; filename="{safe_name}"'
             url = self.s3.generate_presigned_url(
                 "get_object",
-                Params={"Bucket": self.bucket_name, "Key": key},
+                Params=params,
                 ExpiresIn=expires_in,
             )
             return url
@@ -0,0 +1,92 @@
+"""Content-keyed cache for computed ratings.
+
+A rating depends only on the fetched data the metrics read and on the metric
+implementations. The cache key therefore combines the artifact's canonical URL,
+a digest of those input features and the metric-version vector. Re-rating an
+unchanged artifact reuses its scores, while a changed README or a bumped
+metric version misses. Entries expire after `SCORE_CACHE_TTL` seconds, and the
+least recently used entry is evicted once `SCORE_CACHE_SIZE` are held.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from aws.config import SCORE_CACHE_SIZE, SCORE_CACHE_TTL
+from backend.services.ingest import canonical_url
+
+
+def input_digest(features: Dict[str, Any]) -> str:
+    """Stable digest of the metric input features."""
+    return hashlib.sha256(json.dumps(features, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def score_key(url: str, features: Dict[str, Any], versions: Dict[str, int]) -> str:
+    """Cache key for scoring `features` (see `MetricScorer.input_features`) from `url` with metrics at `versions`."""
+    parts = [canonical_url(url), input_digest(features), sorted((k, int(v)) for k, v in versions.items())]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+class CachedScores:
+    """A cached rating and when it was computed."""
+
+    def __init__(self, scores: Dict[str, Any], scored_at: float):
+        self.scores = scores
+        self.scored_at = scored_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.scored_at
+
+
+class ScoreCache:
+    """Thread-safe TTL + LRU map from score keys to ratings."""
+
+    def __init__(self, ttl: float = SCORE_CACHE_TTL, max_entries: int = SCORE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedScores]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedScores]:
+        """The entry for `key` unless it is missing or expired; a hit marks it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.age >= self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Callers fill in name/category, so hand out a copy.
+            return CachedScores(dict(entry.scores), entry.scored_at)
+
+    def put(self, key: str, scores: Dict[str, Any], scored_at: Optional[float] = None) -> CachedScores:
+        entry = CachedScores(dict(scores), time.time() if scored_at is None else scored_at)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def is_stale(self, scored_at: Optional[float]) -> Optional[bool]:
+        """Whether scores computed at `scored_at` are older than the TTL (None when unknown)."""
+        if scored_at is None:
+            return None
+        return time.time() - scored_at >= self.ttl
@@ -0,0 +1,258 @@
+"""Hugging Face repository snapshot ingest.
+
+Single-file ingest keeps one weight file per model, so sharded checkpoints
+(`model-00001-of-000NN.safetensors`), tokenizers and configs are lost. In
+snapshot mode (`SNAPSHOT_INGEST=1`) the ingest pipeline instead lists the
+repo's files (`/api/{models|datasets}/{id}?blobs=true`), selects the ones
+worth keeping, and transfers them concurrently. Each file is stored as a
+content-addressed blob like any single-file artifact, and a manifest of
+`path -> sha256/size` is stored under the artifact's own prefix.
+
+Transfers are limited per source host, and the combined size of the files in
+flight is capped, so one huge checkpoint does not run alongside dozens of
+others.
+"""
+
+import fnmatch
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+from aws.config import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_TIMEOUT,
+    SNAPSHOT_EXCLUDE,
+    SNAPSHOT_HOST_CONCURRENCY,
+    SNAPSHOT_MAX_INFLIGHT_BYTES,
+    SNAPSHOT_PER_HOST_CONCURRENCY,
+    SNAPSHOT_WORKERS,
+)
+from cli.utils.HttpClient import http_client
+
+logger = logging.getLogger(__name__)
+
+HF_BASE = "https://huggingface.co"
+MANIFEST_FILENAME = "manifest.json"
+
+# Weight formats that duplicate a safetensors checkpoint in the same repo.
+_DUPLICATE_WEIGHTS = ("pytorch_model*.bin", "*.ckpt", "tf_model*.h5", "flax_model*.msgpack")
+# Preferred "main" file of a snapshot, used when no specific file is requested.
+_PRIMARY_FILES = ("model.safetensors", "pytorch_model.bin", "tf_model.h5", "flax_model.msgpack")
+_WEIGHT_SUFFIXES = (".safetensors", ".bin", ".gguf", ".onnx", ".ckpt", ".pt", ".pth", ".h5", ".msgpack")
+
+
+class SnapshotError(Exception):
+    """The snapshot could not be listed or one of its files failed to transfer."""
+
+
+def hf_repo_from_url(url: str) -> Optional[Tuple[str, str]]:
+    """`("model"|"dataset", repo_id)` for a Hugging Face repo URL, else None."""
+    parsed = urlparse(url or "")
+    host = parsed.netloc.lower().removeprefix("www.")
+    if host != "huggingface.co":
+        return None
+    parts = [p for p in parsed.path.split("/") if p]
+    kind = "model"
+    if parts[:1] == ["datasets"]:
+        kind, parts = "dataset", parts[1:]
+    for marker in ("tree", "blob", "resolve", "commit"):
+        if marker in parts:
+            parts = parts[: parts.index(marker)]
+    if not parts or parts[0] in ("api", "spaces"):
+        return None
+    return kind, "/".join(parts[:2])
+
+
+def list_repo_files(kind: str, repo_id: str, revision: str = "main") -> List[Dict[str, Any]]:
+    """Every file in the repo with its size and, for LFS files, SHA-256."""
+    api = f"{HF_BASE}/api/{'datasets' if kind == 'dataset' else 'models'}/{repo_id}"
+    resp = http_client.get(api, params={"blobs": "true", "revision": revision})
+    if resp.status_code != 200:
+        raise SnapshotError(f"Could not list files of {repo_id} ({resp.status_code})")
+    files = []
+    for sibling in (resp.json() or {}).get("siblings") or []:
+        path = sibling.get("rfilename")
+        if not path:
+            continue
+        lfs = sibling.get("lfs") or {}
+        files.append({
+            "path": path,
+            "size_bytes": int(lfs.get("size") or sibling.get("size") or 0),
+            "sha256": lfs.get("sha256"),
+        })
+    return files
+
+
+def select_files(files: List[Dict[str, Any]], exclude: List[str] = SNAPSHOT_EXCLUDE) -> List[Dict[str, Any]]:
+    """Drop excluded patterns, and other weight formats when safetensors are present."""
+    names = [f["path"].rsplit("/", 1)[-1] for f in files]
+    skip = list(exclude)
+    if any(n.endswith(".safetensors") for n in names):
+        skip.extend(_DUPLICATE_WEIGHTS)
+    return [
+        f for f, name in zip(files, names)
+        if not any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(f["path"], pattern) for pattern in skip)
+    ]
+
+
+def primary_file(manifest: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The file a plain download of the artifact returns: the main weights, else the largest file."""
+    files = sorted(manifest.get("files") or [], key=lambda f: f["path"])
+    by_path = {f["path"]: f for f in files}
+    for name in _PRIMARY_FILES:
+        if name in by_path:
+            return by_path[name]
+    # Sharded checkpoints: the first shard.
+    weights = [f for f in files if f["path"].endswith(_WEIGHT_SUFFIXES)]
+    return weights[0] if weights else max(files, key=lambda f: f.get("size_bytes", 0), default=None)
+
+
+def resolve_url(kind: str, repo_id: str, path: str, revision: str = "main") -> str:
+    prefix = "datasets/" if kind == "dataset" else ""
+    return f"{HF_BASE}/{prefix}{repo_id}/resolve/{revision}/{quote(path)}"
+
+
+class _ByteBudget:
+    """Blocks until the requested bytes fit under the cap (one oversized file may run alone)."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int) -> None:
+        with self._cond:
+            while self.in_use > 0 and self.in_use + n > self.limit:
+                self._cond.wait()
+            self.in_use += n
+
+    def release(self, n: int) -> None:
+        with self._cond:
+            self.in_use -= n
+            self._cond.notify_all()
+
+
+class SnapshotTransfer:
+    """Transfers a Hugging Face repo snapshot into blob storage and builds its manifest."""
+
+    def __init__(
+        self,
+        storage_manager,
+        workers: int = SNAPSHOT_WORKERS,
+        per_host: int = SNAPSHOT_PER_HOST_CONCURRENCY,
+        host_limits: Optional[Dict[str, int]] = None,
+        max_inflight_bytes: int = SNAPSHOT_MAX_INFLIGHT_BYTES,
+    ):
+        self.storage_manager = storage_manager
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.host_limits = dict(SNAPSHOT_HOST_CONCURRENCY if host_limits is None else host_limits)
+        self.max_inflight_bytes = max_inflight_bytes
+        self._host_gates: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        kind: str,
+        repo_id: str,
+        on_bytes: Optional[Callable[[int], None]] = None,
+        revision: str = "main",
+    ) -> Dict[str, Any]:
+        """
+        Store every selected file of the repo and return the manifest.
+
+        Each file holds one blob reference once this returns. On failure,
+        every reference taken so far is released before `SnapshotError`
+        is raised.
+        """
+        files = select_files(list_repo_files(kind, repo_id, revision))
+        if not files:
+            raise SnapshotError(f"No files to store for {repo_id}")
+
+        budget = _ByteBudget(self.max_inflight_bytes)
+        progress = _Progress(on_bytes)
+
+        def transfer(entry: Dict[str, Any]) -> Dict[str, Any]:
+            url = resolve_url(kind, repo_id, entry["path"], revision)
+            budget.acquire(entry["size_bytes"])
+            try:
+                with self._host_gate(urlparse(url).netloc):
+                    return self._transfer_file(entry, url, progress)
+            finally:
+                budget.release(entry["size_bytes"])
+
+        stored: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        # Largest first, so the long transfers start early.
+        ordered = sorted(files, key=lambda f: -f["size_bytes"])
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(ordered)), thread_name_prefix="snapshot") as pool:
+            futures = [(entry, pool.submit(transfer, entry)) for entry in ordered]
+            for entry, future in futures:
+                try:
+                    stored.append(future.result())
+                except Exception as e:
+                    logger.error(f"❌ Snapshot file {entry['path']} failed: {e}")
+                    errors.append(entry["path"])
+
+        if errors:
+            for item in stored:
+                self.storage_manager.release_blob_ref(item["sha256"])
+            raise SnapshotError(f"{len(errors)} file(s) failed to transfer: {', '.join(errors[:5])}")
+
+        stored.sort(key=lambda f: f["path"])
+        return {
+            "source": f"{kind}:{repo_id}@{revision}",
+            "files": stored,
+            "file_count": len(stored),
+            "total_bytes": sum(f["size_bytes"] for f in stored),
+        }
+
+    def _host_gate(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            gate = self._host_gates.get(host)
+            if gate is None:
+                gate = self._host_gates[host] = threading.BoundedSemaphore(
+                    max(1, self.host_limits.get(host, self.per_host))
+                )
+            return gate
+
+    def _transfer_file(self, entry: Dict[str, Any], url: str, progress: "_Progress") -> Dict[str, Any]:
+        if entry.get("sha256"):
+            existing = self.storage_manager.acquire_existing_blob(entry["sha256"])
+            if existing:
+                progress.add(entry["size_bytes"])
+                return {"path": entry["path"], **existing}
+
+        response = http_client.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT)
+        try:
+            if response.status_code != 200:
+                raise SnapshotError(f"GET {url} returned {response.status_code}")
+            blob = self.storage_manager.store_blob_stream(
+                progress.counted(response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE))
+            )
+        finally:
+            response.close()
+        return {"path": entry["path"], **blob}
+
+
+class _Progress:
+    """Thread-safe running byte total across concurrent file transfers."""
+
+    def __init__(self, on_bytes: Optional[Callable[[int], None]]):
+        self.on_bytes = on_bytes
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def add(self, n: int) -> None:
+        with self._lock:
+            self.total += n
+            total = self.total
+        if self.on_bytes:
+            self.on_bytes(total)
+
+    def counted(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            self.add(len(chunk))
+            yield chunk
@@ -3,18 +3,33 @@
 Coordinates S3 (bytes) and DynamoDB (metadata) operations for artifacts.
 """
 
+import json
 import logging
 import requests
+from cli.utils.HttpClient import http_client
 import re
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Callable, Dict, Iterable, List
 from datetime import datetime
-from backend.services.s3_service import S3Service
+from decimal import Decimal
+from backend.services.s3_service import S3Service, StagedBlob
 from aws.config import BUCKET_NAME
+from backend.services.blob_refs import BlobRefStore
 from backend.services.dynamodb_service import DynamoDBService
+from backend.services.ingest import canonical_url
+from backend.services.ranged import RangedDownload
+from backend.services.snapshot import MANIFEST_FILENAME, primary_file
 from cli.utils.ArtifactManager import ArtifactManager
+from datafetchers.zip_manifest import ZipFormatError, read_zip_manifest
 
 logger = logging.getLogger(__name__)
 
+_GIB = 1024 * 1024 * 1024
+
+
+def _gb(value: Optional[float]) -> Optional[Decimal]:
+    """A size in GB as a DynamoDB number (boto3 rejects floats)."""
+    return None if value is None else Decimal(str(round(value, 6)))
+
 
 class StorageManager:
     """High-level storage interface for managing artifacts across S3 and DynamoDB."""
@@ -22,6 +37,7 @@ class StorageManager:
     def __init__(self):
         self.s3 = S3Service()
         self.db = DynamoDBService()
+        self.blobs = BlobRefStore()
         self.artifact_manager = ArtifactManager()
         self.bucket_name = BUCKET_NAME
 
@@ -38,51 +54,319 @@ class StorageManager:
                 raise ValueError("artifact_data must contain 'artifact_id'")
             filename = artifact_data.get('name') if not filename else filename
             s3_uri = self.s3.upload_artifact(artifact_bytes, artifact_id, filename)
-            now = datetime.utcnow().isoformat() + "Z"
-
-            metadata = {
-                "artifact_id": artifact_id,
-                "name": artifact_data.get("name"),
-                "type": artifact_data.get("artifact_type"),
-                "license": artifact_data.get("license"),
-                "size_mb": artifact_data.get("size_mb"),
-                "scores": artifact_data.get("scores", {}),
-                "related_artifacts": artifact_data.get("related_artifacts", {}),
-                "metadata": artifact_data.get("metadata", {}),
-                "created_at": now,
-                "updated_at": now,
-                "processed_url": artifact_data.get("processed_url", ""),
-                "url": s3_uri,
-                "download_url": artifact_data.get("download_url", ""),
-            }
-
-            logger.info(f"📦 Created metadata for artifact '{metadata['name']}' ({artifact_id})")
-            return metadata
+            return self._build_metadata(artifact_data, s3_uri)
+
+        except Exception:
+            logger.exception(f"❌ Failed to create metadata for artifact '{artifact_data.get('name')}'")
+            raise
+
+    def create_metadata_stream(self, artifact_data: Dict[str, Any], chunks: Iterable[bytes], filename: str) -> Dict[str, Any]:
+        """
+        Streams artifact chunks to S3 under their SHA-256 digest, generates metadata dictionary, and returns it.
+        Identical bytes that are already stored are not uploaded again. Takes one blob reference.
+        """
+        try:
+            artifact_id = artifact_data.get("artifact_id")
+            if not artifact_id:
+                raise ValueError("artifact_data must contain 'artifact_id'")
+            filename = filename or artifact_data.get('name') or ""
+            return self._metadata_for_staged(artifact_data, self.s3.stage_stream(chunks), filename)
 
         except Exception:
             logger.exception(f"❌ Failed to create metadata for artifact '{artifact_data.get('name')}'")
             raise
 
-    def generate_download_url(self, artifact_id: str, filename: str, expires_in: int = 3600) -> str:
+    def create_metadata_ranged(
+        self,
+        artifact_data: Dict[str, Any],
+        download: RangedDownload,
+        filename: str,
+        on_bytes: Optional[Callable[[int], None]] = None,
+        resume: Optional[Dict[str, Any]] = None,
+        on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Like `create_metadata_stream`, but fetches the source as concurrent byte ranges,
+        each uploaded directly as one multipart part. Takes one blob reference.
+        `resume` / `on_checkpoint` carry the multipart state across restarts (see `S3Service.stage_ranges`).
+        """
+        try:
+            if not artifact_data.get("artifact_id"):
+                raise ValueError("artifact_data must contain 'artifact_id'")
+            filename = filename or artifact_data.get('name') or ""
+            staged = self.s3.stage_ranges(
+                download.fetch_range,
+                download.size,
+                download.part_size,
+                download.connections,
+                on_bytes,
+                resume=resume,
+                on_checkpoint=on_checkpoint,
+            )
+            return self._metadata_for_staged(artifact_data, staged, filename)
+
+        except Exception:
+            logger.exception(f"❌ Failed to create metadata for artifact '{artifact_data.get('name')}'")
+            raise
+
+    def _metadata_for_staged(self, artifact_data: Dict[str, Any], staged: StagedBlob, filename: str) -> Dict[str, Any]:
+        s3_uri = self._commit_blob(staged)
+        metadata = self._build_metadata(artifact_data, s3_uri)
+        metadata.update({
+            "sha256": staged.sha256,
+            "size_bytes": staged.size,
+            "size_in_gb": _gb(staged.size / _GIB),
+            "filename": filename,
+        })
+        return metadata
+
+    def _commit_blob(self, staged: StagedBlob) -> str:
+        """
+        Reference the blob for `staged.sha256`, uploading it only if it is not stored yet.
+        Returns the blob's S3 URI.
+        """
+        refs = self.blobs.acquire(staged.sha256, staged.size)
+        try:
+            key = self.s3.blob_key(staged.sha256)
+            # refs == 1 means nobody else holds this digest; otherwise the object
+            # should exist, but check in case a concurrent first upload failed.
+            if refs > 1 and self.s3.object_exists(key):
+                staged.discard()
+                logger.info(f"♻️ Reusing stored blob sha256:{staged.sha256[:12]} ({staged.size} bytes not re-uploaded)")
+                return self.s3.blob_uri(staged.sha256)
+            return staged.commit(key)
+        except Exception:
+            staged.discard()
+            self.blobs.release(staged.sha256)
+            raise
+
+    def link_existing_blob(self, artifact_data: Dict[str, Any], sha256: str, filename: Optional[str] = None) -> bool:
+        """
+        Store metadata for an artifact whose bytes are already stored under `sha256`.
+        Returns False (without side effects) when the blob is not present, so the caller can download instead.
+        """
+        size = self._acquire_stored(sha256)
+        if size is None:
+            return False
+        try:
+            metadata = self._build_metadata(artifact_data, self.s3.blob_uri(sha256))
+            metadata.update({
+                "sha256": sha256,
+                "size_bytes": size,
+                "size_in_gb": _gb(size / _GIB),
+                "filename": filename or artifact_data.get("name"),
+            })
+            success = self.db.create_item(metadata)
+        except Exception:
+            logger.exception(f"❌ Exception linking artifact '{artifact_data.get('name')}' to blob {sha256[:12]}")
+            success = False
+        if not success:
+            self.release_blob_ref(sha256)
+            return False
+        logger.info(f"✅ Stored artifact '{metadata['name']}' ({metadata['artifact_id']}) from existing blob {sha256[:12]}")
+        return True
+
+    # ------------------------
+    # Snapshot Operations
+    # ------------------------
+    def store_blob_stream(self, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        """
+        Stream chunks into content-addressed blob storage without creating an artifact item.
+        Takes one blob reference; the caller records it (e.g. in a snapshot manifest) or releases it.
+        """
+        staged = self.s3.stage_stream(chunks)
+        self._commit_blob(staged)
+        return {"sha256": staged.sha256, "size_bytes": staged.size}
+
+    def acquire_existing_blob(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Take a reference on an already stored blob; None when it is not stored."""
+        size = self._acquire_stored(sha256)
+        if size is None:
+            return None
+        return {"sha256": sha256, "size_bytes": size}
+
+    def _acquire_stored(self, sha256: str) -> Optional[int]:
+        """
+        Reference a blob only while it is referenced and not being deleted; return its size.
+        Holding the reference keeps it from being deleted, so the object check after it stays true.
+        """
+        size = self.blobs.acquire_existing(sha256)
+        if size is None:
+            return None
+        if not self.s3.object_exists(self.s3.blob_key(sha256)):
+            self.blobs.release(sha256)
+            return None
+        return size
+
+    def release_blob_ref(self, sha256: str) -> bool:
+        """Drop one reference taken by `store_blob_stream` / `acquire_existing_blob`."""
+        return self._release_blob(sha256, self.s3.blob_key(sha256))
+
+    def store_snapshot(self, artifact_data: Dict[str, Any], manifest: Dict[str, Any]) -> bool:
+        """
+        Store a multi-file artifact whose files are already referenced blobs.
+
+        The manifest is written to `artifacts/{id}/manifest.json`; the item's
+        `url`/`filename` point at the primary file so plain downloads keep
+        working. On failure every file reference is released.
+        """
+        artifact_id = artifact_data.get("artifact_id")
+        try:
+            if not artifact_id:
+                raise ValueError("artifact_data must contain 'artifact_id'")
+            primary = primary_file(manifest)
+            if primary is None:
+                raise ValueError("snapshot manifest lists no files")
+            manifest_uri = self.s3.upload_artifact(
+                json.dumps(manifest).encode("utf-8"), artifact_id, MANIFEST_FILENAME
+            )
+            metadata = self._build_metadata(artifact_data, self.s3.blob_uri(primary["sha256"]))
+            metadata.update({
+                "filename": primary["path"].rsplit("/", 1)[-1],
+                "size_bytes": manifest["total_bytes"],
+                "size_in_gb": _gb(manifest["total_bytes"] / _GIB),
+                "file_count": manifest["file_count"],
+                "manifest_key": self.s3.key_from_uri(manifest_uri),
+            })
+            success = self.db.create_item(metadata)
+        except Exception:
+            logger.exception(f"❌ Exception storing snapshot '{artifact_data.get('name')}'")
+            success = False
+        if not success:
+            for entry in manifest.get("files", []):
+                self.release_blob_ref(entry["sha256"])
+            return False
+        logger.info(
+            f"✅ Stored snapshot '{metadata['name']}' ({artifact_id}): "
+            f"{manifest['file_count']} files, {manifest['total_bytes']} bytes"
+        )
+        return True
+
+    def load_manifest(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The snapshot manifest of an artifact item, or None for single-file artifacts."""
+        key = item.get("manifest_key")
+        if not key:
+            return None
+        return json.loads(self.s3.download_artifact(key))
+
+    def zip_manifest(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        File listing of a stored zip artifact (e.g. a GitHub archive), read from its central directory only.
+        Returns None when the item's object is not a readable zip.
+        """
+        if not item.get("url"):
+            return None
+        key = self.s3.key_from_uri(item["url"])
+        try:
+            return read_zip_manifest(lambda start, end: self.s3.read_range(key, start, end), self.s3.object_size(key))
+        except ZipFormatError as e:
+            logger.info(f"Artifact {item.get('artifact_id')} is not a readable zip: {e}")
+            return None
+
+    def _build_metadata(self, artifact_data: Dict[str, Any], s3_uri: str) -> Dict[str, Any]:
+        """Shape the DynamoDB item for an artifact whose bytes live at `s3_uri`."""
+        artifact_id = artifact_data.get("artifact_id")
+        now = datetime.utcnow().isoformat() + "Z"
+
+        metadata = {
+            "artifact_id": artifact_id,
+            "name": artifact_data.get("name"),
+            "type": artifact_data.get("artifact_type"),
+            "license": artifact_data.get("license"),
+            "size_mb": artifact_data.get("size_mb"),
+            # Expected size from the ingest preflight; replaced by the stored size once known.
+            "size_in_gb": _gb(artifact_data.get("size_in_gb")),
+            "scores": artifact_data.get("scores", {}),
+            # Metric versions and input features behind `scores`, for offline re-scoring.
+            "metric_versions": artifact_data.get("metric_versions"),
+            "metric_inputs": artifact_data.get("metric_inputs"),
+            "scored_at": artifact_data.get("scored_at"),
+            "related_artifacts": artifact_data.get("related_artifacts", {}),
+            "metadata": artifact_data.get("metadata", {}),
+            "created_at": now,
+            "updated_at": now,
+            "processed_url": artifact_data.get("processed_url", ""),
+            "url": s3_uri,
+            "download_url": artifact_data.get("download_url", ""),
+        }
+        # GSI key attributes may not be empty strings, so only set it when known.
+        source = artifact_data.get("canonical_url") or (
+            canonical_url(metadata["processed_url"]) if metadata["processed_url"] else None
+        )
+        if source:
+            metadata["canonical_url"] = source
+
+        logger.info(f"📦 Created metadata for artifact '{metadata['name']}' ({artifact_id})")
+        return metadata
+
+    def generate_download_url(self, artifact_id: str, filename: str, expires_in: int = 3600, s3_uri: Optional[str] = None) -> str:
         """
         Generates a presigned S3 URL for downloading the artifact.
+        `s3_uri` is the item's stored `url`; items created before blob storage fall back to the per-artifact key.
         """
-        key = f"artifacts/{artifact_id}/{filename}"
+        key = self.s3.key_from_uri(s3_uri) if s3_uri else f"artifacts/{artifact_id}/{filename}"
         try:
-            url = self.s3.generate_presigned_url(key, expires_in)
+            url = self.s3.generate_presigned_url(key, expires_in, filename=filename)
             logger.info(f"Generated presigned URL for artifact_id={artifact_id}")
             return url
         except Exception as e:
             logger.exception(f"Failed to generate presigned URL for {key}: {e}")
             raise
 
+    def generate_file_download_url(self, item: Dict[str, Any], path: str, expires_in: int = 3600) -> Optional[str]:
+        """
+        Presigned URL for one file of a snapshot artifact, named after its basename.
+        Returns None when the artifact has no manifest or the path is not in it.
+        """
+        manifest = self.load_manifest(item) or {}
+        entry = next((f for f in manifest.get("files", []) if f["path"] == path), None)
+        if not entry:
+            return None
+        return self.generate_download_url(
+            item["artifact_id"],
+            path.rsplit("/", 1)[-1],
+            expires_in,
+            s3_uri=self.s3.blob_uri(entry["sha256"]),
+        )
+
     def store_artifact(self, artifact_data: Dict[str, Any], artifact_bytes: bytes, filename: str) -> bool:
         """
         Stores the artifact bytes and metadata in S3 and DynamoDB.
         """
+        return self.store_artifact_stream(artifact_data, [artifact_bytes], filename)
+
+    def store_artifact_stream(self, artifact_data: Dict[str, Any], chunks: Iterable[bytes], filename: str) -> bool:
+        """
+        Streams the artifact chunks to S3 and stores metadata in DynamoDB.
+        Peak memory is bounded by the multipart part size, not the artifact size.
+        """
+        return self._store_item(artifact_data, lambda: self.create_metadata_stream(artifact_data, chunks, filename))
+
+    def store_artifact_ranged(
+        self,
+        artifact_data: Dict[str, Any],
+        download: RangedDownload,
+        filename: str,
+        on_bytes: Optional[Callable[[int], None]] = None,
+        resume: Optional[Dict[str, Any]] = None,
+        on_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> bool:
+        """
+        Fetches the artifact as concurrent byte ranges into S3 and stores metadata in DynamoDB.
+        Peak memory is bounded by one part per connection.
+        """
+        return self._store_item(
+            artifact_data,
+            lambda: self.create_metadata_ranged(
+                artifact_data, download, filename, on_bytes, resume=resume, on_checkpoint=on_checkpoint
+            ),
+        )
+
+    def _store_item(self, artifact_data: Dict[str, Any], create_metadata: Callable[[], Dict[str, Any]]) -> bool:
+        metadata: Optional[Dict[str, Any]] = None
+        success = False
         try:
-            metadata = self.create_metadata(artifact_data, artifact_bytes, filename)
-            metadata["download_url"] = artifact_data.get("download_url", "")
+            metadata = create_metadata()
             success = self.db.create_item(metadata)
             if success:
                 logger.info(f"✅ Stored artifact '{metadata['name']}' ({metadata['artifact_id']})")
@@ -92,6 +376,11 @@ class StorageManager:
         except Exception:
             logger.exception(f"❌ Exception storing artifact '{artifact_data.get('name')}'")
             return False
+        finally:
+            # create_metadata holds a blob reference once it returns; keep it
+            # only if the item pointing at the blob was written.
+            if metadata is not None and not success:
+                self.release_blob_ref(metadata["sha256"])
 
     def get_artifact(self, artifact_id: str) -> Dict[str, Any] | None:
         """
@@ -106,12 +395,62 @@ class StorageManager:
             logger.exception(f"❌ Exception retrieving artifact with artifact_id={artifact_id}")
             return None
 
+    def update_scores(
+        self,
+        artifact_id: str,
+        scores: Dict[str, Any],
+        metric_versions: Dict[str, int],
+        score_key: str,
+        scored_at: float,
+        metric_inputs: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Persist a computed rating on the artifact item, with the metric versions and input key it came from.
+
+        `metric_inputs`, when given, replaces the stored input features used for offline re-scoring.
+        """
+        # Stored as JSON text like ingest-time scores (boto3 rejects floats).
+        update = {
+            "scores": json.dumps(scores),
+            "metric_versions": metric_versions,
+            "score_key": score_key,
+            "scored_at": int(scored_at),
+            "updated_at": datetime.utcnow().isoformat() + "Z",
+        }
+        if metric_inputs is not None:
+            update["metric_inputs"] = json.dumps(metric_inputs, default=str)
+        try:
+            return self.db.update_item(artifact_id, update)
+        except Exception:
+            logger.exception(f"❌ Exception storing scores for artifact_id={artifact_id}")
+            return False
+
+    def scan_artifacts(self) -> List[Dict[str, Any]]:
+        """
+        Every artifact item in the table.
+        """
+        try:
+            return self.db.scan_all()
+        except Exception:
+            logger.exception("❌ Exception scanning artifacts")
+            return []
+
+    def find_by_url(self, url: str) -> Dict[str, Any] | None:
+        """
+        Return the newest artifact ingested from `url` (compared by canonical form), if any.
+        """
+        try:
+            return self.db.get_by_canonical_url(canonical_url(url))
+        except Exception:
+            logger.exception(f"❌ Exception looking up artifact by url={url}")
+            return None
+
     def get_artifact_bytes(self, url: str) -> bytes | None:
         """
         Fetch artifact bytes from a URL.
         """
         try:
-            response = requests.get(url, stream=True, timeout=10)
+            response = http_client.get(url, stream=True)
             response.raise_for_status()
             artifact_bytes = response.content
             logger.info(f"⬇️ Fetched artifact bytes from URL: {url}")
@@ -129,6 +468,7 @@ class StorageManager:
             logger.info("✅ S3 bucket reset successfully")
             self.db.reset_table()
             logger.info("✅ DynamoDB table reset successfully")
+            self.blobs.reset()
             logger.info("⚡ Storage reset completed successfully")
             return True
         except Exception as e:
@@ -237,6 +577,40 @@ class StorageManager:
             logger.exception(f"❌ Failed during regex artifact search (pattern={regex})")
             raise
 
+    def _release_blob(self, sha256: str, s3_key: str) -> bool:
+        """
+        Drop one reference; delete the blob object when it was the last one.
+
+        The zero count is marked as deleting before the object goes, and the
+        counter is removed only afterwards, so an ingest of the same digest
+        waits and uploads again instead of linking to an object being deleted
+        (see `BlobRefStore`). An unknown digest never deletes anything.
+        """
+        remaining = self.blobs.release(sha256)
+        if remaining is None:
+            logger.warning(f"⚠️ Blob {sha256[:12]} has no reference count; keeping {s3_key}")
+            return True
+        if remaining > 0:
+            logger.info(f"   • Blob {sha256[:12]} still referenced by {remaining} artifact(s); keeping {s3_key}")
+            return True
+        token = self.blobs.begin_delete(sha256)
+        if token is None:
+            logger.info(f"   • Blob {sha256[:12]} was re-acquired concurrently; keeping {s3_key}")
+            return True
+        if not self.s3.delete_artifact(s3_key):
+            self.blobs.abort_delete(sha256, token)
+            return False
+        self.blobs.finish_delete(sha256, token)
+        return True
+
+    def _delete_snapshot_files(self, item: Dict[str, Any]) -> bool:
+        """Release every file of a snapshot, then delete its manifest."""
+        manifest = self.load_manifest(item) or {}
+        ok = True
+        for entry in manifest.get("files", []):
+            ok = self.release_blob_ref(entry["sha256"]) and ok
+        return self.s3.delete_artifact(item["manifest_key"]) and ok
+
     def delete_artifact(self, artifact_id: str) -> bool:
         """
         Delete an artifact from both S3 and DynamoDB.
@@ -254,14 +628,8 @@ class StorageManager:
             # --- Extract S3 key from stored s3://bucket/... URI ---
             raw_url = item.get("url", "")
 
-            if raw_url.startswith("s3://"):
-                # New correct format
-                prefix = f"s3://{self.s3.bucket_name}/"
-                s3_key = raw_url[len(prefix):]
-            else:
-                # Fallback for older formats (or misformatted ones)
-                # example: "https://BUCKET_NAME.s3.amazonaws.com/artifacts/..."
-                s3_key = raw_url.split(f"{self.s3.bucket_name}/")[-1]
+            # Handles s3://bucket/... and older "https://BUCKET_NAME.s3.amazonaws.com/artifacts/..." formats
+            s3_key = self.s3.key_from_uri(raw_url)
 
             if not s3_key:
                 logger.error(f"❌ Could not extract S3 key for artifact_id={artifact_id}, url={raw_url}")
@@ -270,9 +638,14 @@ class StorageManager:
             logger.info(f"🗑️ Preparing to delete artifact '{name}' ({artifact_id})")
             logger.info(f"   • S3 key resolved as: {s3_key}")
 
-            # --- Delete object from S3 ---
+            # --- Delete object from S3 (blobs only once unreferenced) ---
             try:
-                s3_deleted = self.s3.delete_artifact(s3_key)
+                if item.get("manifest_key"):
+                    s3_deleted = self._delete_snapshot_files(item)
+                elif item.get("sha256"):
+                    s3_deleted = self._release_blob(item["sha256"], s3_key)
+                else:
+                    s3_deleted = self.s3.delete_artifact(s3_key)
                 if s3_deleted:
                     logger.info(f"   ✔ S3 object deleted: {s3_key}")
                 else:
@@ -0,0 +1,5 @@
+"""Benchmarks package.
+
+Standalone performance scripts (run with `python -m benchmarks.<name>`) that
+exercise ingest and scoring paths against local stand-ins for remote services.
+"""
@@ -0,0 +1,98 @@
+"""Benchmark: fetch-then-score barrier vs dataflow scheduling of fetchers and metrics.
+
+Every data fetcher is a stand-in that sleeps for its share of the fetch (the
+bus-factor commit walk takes `--slow-ms`, the others `--fetch-ms`). Each metric
+is a stand-in that spins for `--metric-ms` but keeps the real metric's
+`fetchers` declaration, so the dependency graph is the production one. Two
+modes score `--artifacts` artifacts one after another:
+  - barrier:  `fetch_artifact_data` then `score_artifact`
+  - dataflow: `DataflowScheduler.run`
+The table reports mean seconds per artifact, and the critical path of the last
+dataflow run is printed.
+
+Usage:
+    python -m benchmarks.bench_dataflow --artifacts 5 --fetch-ms 50 --slow-ms 400 --metric-ms 60
+"""
+
+import argparse
+import time
+
+from cli.utils.DataflowScheduler import DataflowScheduler
+from cli.utils.MetricDataFetcher import MetricDataFetcher
+from cli.utils.MetricScorer import MetricScorer
+
+
+def _stand_in_fetcher(name: str, seconds: float):
+    def fetch_Modeldata(self, data):
+        time.sleep(seconds)
+        return {name: True}
+
+    return type(name, (), {"fetch_Modeldata": fetch_Modeldata})()
+
+
+class _StandInMetric:
+    def __init__(self, seconds: float, fetchers, size: bool = False):
+        self.seconds = seconds
+        self.fetchers = fetchers
+        self.size = size
+
+    def getScores(self, data):
+        deadline = time.thread_time() + self.seconds
+        while time.thread_time() < deadline:
+            pass
+        if self.size:
+            return {"raspberry_pi": 0.5, "jetson_nano": 0.5, "desktop_pc": 0.5, "aws_server": 0.5, "latency": 0.0}
+        return {"score": 0.5, "latency": 0.0}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--artifacts", type=int, default=5)
+    parser.add_argument("--fetch-ms", type=float, default=50.0)
+    parser.add_argument("--slow-ms", type=float, default=400.0)
+    parser.add_argument("--metric-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    data_fetcher = MetricDataFetcher()
+    data_fetcher.fetchers = [
+        _stand_in_fetcher(
+            f.__class__.__name__,
+            (args.slow_ms if f.__class__.__name__ == "BusFactorDataFetcher" else args.fetch_ms) / 1000,
+        )
+        for f in data_fetcher.fetchers
+    ]
+    scorer = MetricScorer()
+    scorer.metrics = {
+        name: _StandInMetric(args.metric_ms / 1000, metric.fetchers, size=name == "size_score")
+        for name, metric in scorer.metrics.items()
+    }
+    scheduler = DataflowScheduler(data_fetcher, scorer)
+    meta = {"artifact_type": "model", "download_url": "u"}
+
+    def barrier() -> None:
+        scorer.score_artifact(data_fetcher.fetch_artifact_data(meta))
+
+    last = {}
+
+    def dataflow() -> None:
+        last["result"] = scheduler.run(meta)
+
+    print(
+        f"artifacts={args.artifacts} fetch={args.fetch_ms:.0f} ms (bus factor {args.slow_ms:.0f} ms) "
+        f"metric={args.metric_ms:.0f} ms"
+    )
+    print(f"{'mode':>9} {'s/artifact':>11}")
+    for mode, run in (("barrier", barrier), ("dataflow", dataflow)):
+        start = time.perf_counter()
+        for _ in range(args.artifacts):
+            run()
+        print(f"{mode:>9} {(time.perf_counter() - start) / args.artifacts:>11.3f}")
+
+    result = last["result"]
+    print(f"\ncritical path: {' -> '.join(result.critical_path)} ({result.seconds:.3f}s)")
+    for name, node in sorted(result.nodes.items(), key=lambda item: item[1].get("end", 0)):
+        print(f"  {node['kind']:>7} {name:<30} start={node.get('start', '-')!s:>6} end={node.get('end', '-')!s:>6}")
+
+
+if __name__ == "__main__":
+    main()
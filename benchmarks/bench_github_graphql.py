@@ -0,0 +1,109 @@
+"""Benchmark: REST vs GraphQL fetch mode for GitHub repositories.
+
+Replays what ingesting N GitHub repos costs against a local stand-in for
+api.github.com, which adds `--rtt-ms` of latency to every request:
+
+* rest:    `/repos/{repo}`, `/commits?per_page=100` and `/git/trees` per repo
+* graphql: one aliased query per `--batch` repos (metadata, default branch,
+           commit authors, root tree) plus the SHA-addressed tree call, which
+           GraphQL cannot list recursively
+
+Quota is counted the way GitHub bills it: one point per REST call, and for
+GraphQL the requested connection nodes divided by 100 (minimum 1) per query.
+
+Usage:
+    python -m benchmarks.bench_github_graphql --repos 50 --batch 25 --rtt-ms 40
+"""
+
+import argparse
+import json
+import math
+import re
+import time
+
+from benchmarks.common import LocalServer, QuietHandler, timed
+from cli.utils.GitHubGraphQL import COMMIT_HISTORY, build_query
+from cli.utils.HttpClient import HttpClient
+
+
+def _graphql_points(query: str) -> int:
+    """GitHub's rate-limit cost: total `first:` nodes requested / 100, at least 1."""
+    nodes = sum(int(n) for n in re.findall(r"first:\s*(\d+)", query))
+    return max(1, math.ceil(nodes / 100))
+
+
+def _make_handler(rtt_seconds: float):
+    class _GitHubHandler(QuietHandler):
+        """Answers REST paths with `{}` and GraphQL queries with one node per alias."""
+
+        def _reply(self, payload) -> None:
+            time.sleep(rtt_seconds)
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply({})
+
+        def do_POST(self):
+            query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["query"]
+            aliases = re.findall(r"(r\d+): repository", query)
+            self._reply({"data": {alias: {"nameWithOwner": alias} for alias in aliases}})
+
+    return _GitHubHandler
+
+
+def _rest(client: HttpClient, base: str, repos) -> dict:
+    for repo in repos:
+        client.get(f"{base}/repos/{repo}").content
+        client.get(f"{base}/repos/{repo}/commits?per_page={COMMIT_HISTORY}").content
+        client.get(f"{base}/repos/{repo}/git/trees/HEAD?recursive=1").content
+    calls = 3 * len(repos)
+    return {"round_trips": calls, "quota": calls}
+
+
+def _graphql(client: HttpClient, base: str, repos, batch: int) -> dict:
+    round_trips = quota = 0
+    for i in range(0, len(repos), batch):
+        query = build_query(repos[i : i + batch])
+        client.post(f"{base}/graphql", json={"query": query}).content
+        round_trips += 1
+        quota += _graphql_points(query)
+    for repo in repos:
+        client.get(f"{base}/repos/{repo}/git/trees/sha?recursive=1").content
+        round_trips += 1
+        quota += 1
+    return {"round_trips": round_trips, "quota": quota}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=50, help="repositories to ingest")
+    parser.add_argument("--batch", type=int, default=25, help="repositories per GraphQL query")
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="simulated latency per request")
+    args = parser.parse_args()
+
+    repos = [f"org/repo{i}" for i in range(args.repos)]
+    results = {}
+    with LocalServer(_make_handler(args.rtt_ms / 1000)) as server:
+        for mode in ("rest", "graphql"):
+            client = HttpClient(retries=0)
+            out = {}
+            if mode == "rest":
+                seconds = timed(lambda: out.update(_rest(client, server.base_url, repos)))
+            else:
+                seconds = timed(lambda: out.update(_graphql(client, server.base_url, repos, args.batch)))
+            client.close()
+            results[mode] = {**out, "seconds": seconds}
+
+    print(f"{args.repos} repos, batch={args.batch}, rtt={args.rtt_ms:.0f} ms")
+    print(f"{'mode':>8} {'round trips':>12} {'quota':>6} {'seconds':>8}")
+    for mode, r in results.items():
+        print(f"{mode:>8} {r['round_trips']:>12} {r['quota']:>6} {r['seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
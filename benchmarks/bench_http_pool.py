@@ -0,0 +1,87 @@
+"""Benchmark: fresh connections vs the pooled `HttpClient`.
+
+Replays the sequence of small API calls one ingest makes (repo metadata,
+commits, README, tree, ...) against a local stand-in server, once with bare
+`requests.get` (a new connection per call) and once through
+`cli.utils.HttpClient`. The server sleeps for `--handshake-ms` on every new
+connection to stand in for the TCP+TLS setup a remote host costs, so the
+difference is the latency connection reuse saves per ingest.
+
+Usage:
+    python -m benchmarks.bench_http_pool --ingests 20 --handshake-ms 60
+"""
+
+import argparse
+import time
+
+import requests
+
+from benchmarks.common import LocalServer, QuietHandler, timed
+from cli.utils.HttpClient import HttpClient
+
+# Calls made by one ingest through MetadataFetcher and the data fetchers.
+INGEST_CALLS = (
+    "/api/models/org/model",
+    "/org/model/resolve/main/README.md",
+    "/repos/org/repo",
+    "/repos/org/repo/commits?per_page=100",
+    "/repos/org/repo/git/trees/main?recursive=1",
+    "/repos/org/repo/contents/README.md",
+    "/api/datasets/org/data",
+    "/datasets/org/data/resolve/main/README.md",
+)
+
+
+def _make_handler(handshake_seconds: float):
+    class _ApiHandler(QuietHandler):
+        """Tiny JSON responder with a simulated per-connection setup cost."""
+
+        def setup(self):
+            super().setup()
+            time.sleep(handshake_seconds)
+
+        def do_GET(self):
+            body = b'{"ok": true}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return _ApiHandler
+
+
+def _run_ingests(get, base_url: str, ingests: int) -> None:
+    for _ in range(ingests):
+        for path in INGEST_CALLS:
+            get(f"{base_url}{path}").content
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ingests", type=int, default=20, help="simulated ingests per mode")
+    parser.add_argument("--handshake-ms", type=float, default=60.0, help="simulated connection setup cost")
+    args = parser.parse_args()
+
+    with LocalServer(_make_handler(args.handshake_ms / 1000)) as server:
+        fresh = timed(lambda: _run_ingests(lambda u: requests.get(u, timeout=10), server.base_url, args.ingests))
+
+        client = HttpClient()
+        pooled = timed(lambda: _run_ingests(client.get, server.base_url, args.ingests))
+        stats = client.stats()
+        client.close()
+
+    per_fresh = fresh / args.ingests * 1000
+    per_pooled = pooled / args.ingests * 1000
+    print(f"{len(INGEST_CALLS)} calls/ingest, {args.ingests} ingests, handshake={args.handshake_ms:.0f} ms")
+    print(f"{'mode':>8} {'ms/ingest':>10}")
+    print(f"{'fresh':>8} {per_fresh:>10.1f}")
+    print(f"{'pooled':>8} {per_pooled:>10.1f}")
+    print(
+        f"saved {per_fresh - per_pooled:.1f} ms per ingest; pooled client opened "
+        f"{stats['connections_opened']} connection(s) for {stats['requests']} requests"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark: per-call metric executors vs the shared scoring pool and `score_many`.
+
+`--callers` threads each score `--per-caller` artifacts, the way concurrent
+rate/create requests do. Every metric is a stand-in that takes `--metric-ms`,
+either sleeping (`--work sleep`: I/O or GIL-releasing work) or spinning
+(`--work cpu`: pure-Python heuristics, as most metrics are). Three modes are
+compared:
+  - legacy:     the old `score_artifact`, a fresh 8-thread executor per call
+  - shared:     `MetricScorer.score_artifact` on the shared pool
+  - score_many: one `score_many` call over every artifact (bulk re-score)
+The table reports throughput, the peak number of live threads and how many
+threads were started in total.
+
+Usage:
+    python -m benchmarks.bench_metric_scorer --callers 40 --per-caller 5 --metric-ms 5 --work cpu
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cli.utils import MetricScorer as scorer_module
+from cli.utils.MetricScorer import MetricScorer
+
+
+class _StandInMetric:
+    def __init__(self, seconds: float, cpu: bool, size: bool = False):
+        self.seconds = seconds
+        self.cpu = cpu
+        self.size = size
+
+    def getScores(self, data):
+        if self.cpu:
+            deadline = time.thread_time() + self.seconds
+            while time.thread_time() < deadline:
+                pass
+        else:
+            time.sleep(self.seconds)
+        if self.size:
+            return {"raspberry_pi": 0.5, "jetson_nano": 0.5, "desktop_pc": 0.5, "aws_server": 0.5, "latency": 0.0}
+        return {"score": 0.5, "latency": 0.0}
+
+
+class _ThreadCounter:
+    """Count every thread started (by wrapping `Thread.start`) and sample the peak live count."""
+
+    def __init__(self):
+        self.started = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._original_start = threading.Thread.start
+
+    def __enter__(self):
+        counter = self
+
+        def counting_start(thread):
+            with counter._lock:
+                counter.started += 1
+            counter._original_start(thread)
+
+        sampler = threading.Thread(target=self._sample, daemon=True)
+        self._original_start(sampler)
+        threading.Thread.start = counting_start
+        return self
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, threading.active_count() - 1)
+            time.sleep(0.0005)
+
+    def __exit__(self, *exc):
+        threading.Thread.start = self._original_start
+        self._stop.set()
+
+
+def legacy_score(scorer: MetricScorer, data) -> None:
+    """The pre-pool behaviour: one short-lived executor per scored artifact."""
+    with ThreadPoolExecutor(max_workers=len(scorer.metrics)) as executor:
+        list(executor.map(lambda item: item[1].getScores(data), scorer.metrics.items()))
+
+
+def _run_callers(callers: int, per_caller: int, score_one) -> None:
+    workers = [
+        threading.Thread(target=lambda: [score_one({"i": i}) for i in range(per_caller)]) for _ in range(callers)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=40)
+    parser.add_argument("--per-caller", type=int, default=5)
+    parser.add_argument("--metric-ms", type=float, default=5.0)
+    parser.add_argument("--work", choices=["sleep", "cpu"], default="cpu")
+    args = parser.parse_args()
+
+    scorer = MetricScorer()
+    scorer.metrics = {
+        name: _StandInMetric(args.metric_ms / 1000, args.work == "cpu", size=name == "size_score")
+        for name in scorer.metrics
+    }
+    total = args.callers * args.per_caller
+    # Start the shared pool up front so every mode begins from the same thread count.
+    scorer_module._score_executor()
+
+    modes = {
+        "legacy": lambda: _run_callers(args.callers, args.per_caller, lambda d: legacy_score(scorer, d)),
+        "shared": lambda: _run_callers(args.callers, args.per_caller, scorer.score_artifact),
+        "score_many": lambda: scorer.score_many([{"i": i} for i in range(total)]),
+    }
+    print(
+        f"callers={args.callers} artifacts={total} metric={args.metric_ms:.0f} ms ({args.work}) "
+        f"pool={scorer_module.SCORE_WORKERS} threads"
+    )
+    print(f"{'mode':>11} {'seconds':>8} {'artifacts/s':>12} {'peak threads':>13} {'threads started':>16}")
+    for mode, run in modes.items():
+        with _ThreadCounter() as counter:
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+        print(f"{mode:>11} {seconds:>8.2f} {total / seconds:>12.1f} {counter.peak:>13} {counter.started:>16}")
+
+
+if __name__ == "__main__":
+    main()
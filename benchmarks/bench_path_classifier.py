@@ -0,0 +1,181 @@
+"""Benchmark: compiled path classifier vs the original per-path checks.
+
+Aggregates synthetic repository trees of `--sizes` paths with
+`CodeQualityDataFetcher._aggregate_from_paths` and with `legacy_aggregate`,
+a verbatim copy of the implementation it replaced. Both results must match
+exactly; the table shows throughput of each.
+
+Usage:
+    python -m benchmarks.bench_path_classifier --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+from typing import Any, Dict, Iterable, List, Optional
+
+from benchmarks.common import timed
+from datafetchers.codequalitydata_fetcher import _EXT_LANG_MAP, CodeQualityDataFetcher
+
+_DIRS = [
+    "src", "lib", "pkg", "core", "utils", "models", "data", "docs", "scripts", "tools",
+    "tests", "test", "spec", "examples", "ci", ".github/workflows", ".circleci", "third_party",
+    "services/api", "services/worker", "internal", "cmd", "web", "assets", "configs",
+]
+_FILES = [
+    "main.py", "utils.py", "model.py", "__init__.py", "test_model.py", "model_test.py",
+    "index.js", "app.tsx", "server.go", "lib.rs", "Main.java", "kernel.cu", "ops.h",
+    "README.md", "setup.py", "pyproject.toml", "package.json", "Makefile", "Dockerfile",
+    "config.yml", "build.yaml", "deploy.yml", "lint.py", "format.py", ".flake8", "notes.txt",
+    "image.png", "weights.bin", "run.sh", "build.sh", "analysis.R", "paper.tex", "app.spec.js",
+]
+
+
+def synthetic_paths(n: int, seed: int = 0) -> List[str]:
+    """`n` plausible repository paths with a realistic mix of signals and extensions."""
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(n):
+        depth = rng.randint(0, 4)
+        parts = [rng.choice(_DIRS) for _ in range(depth)]
+        name = rng.choice(_FILES)
+        if rng.random() < 0.5:
+            stem, dot, ext = name.rpartition(".")
+            name = f"{stem or ext}_{rng.randint(0, 999)}{dot}{ext if stem else ''}"
+        paths.append("/".join(parts + [name]))
+    return paths
+
+
+def legacy_aggregate(paths: Iterable[str]) -> Dict[str, Any]:
+    """The pre-compilation `_aggregate_from_paths`, kept verbatim for comparison."""
+
+    def classify_by_extension(path: str) -> Optional[str]:
+        p = path.lower()
+        for ext, lang in _EXT_LANG_MAP.items():
+            if p.endswith(ext):
+                return lang
+        return None
+
+    has_tests = False
+    has_ci = False
+    has_lint_config = False
+    has_readme = False
+    has_packaging = False
+    language_counts: Dict[str, int] = {}
+
+    packaging_files = {
+        "setup.py", "pyproject.toml", "setup.cfg", "requirements.txt", "package.json",
+        "pom.xml", "build.gradle", "gradle.properties", "Cargo.toml", "go.mod", "DESCRIPTION",
+        "environment.yml", "conda.yml", "Makefile", "Pipfile", "poetry.lock", "manifest.in",
+        "__init__.py",
+    }
+
+    for raw_path in paths:
+        path = (raw_path or "").strip().lstrip("./").lower()
+        if not path:
+            continue
+
+        if (
+            path.startswith("tests/")
+            or "/tests/" in path
+            or path.startswith("test/")
+            or "/test/" in path
+            or path.startswith("spec/")
+            or "/spec/" in path
+            or path.startswith("example/")
+            or "/example/" in path
+            or path.startswith("examples/")
+            or "/examples/" in path
+            or path.startswith("test_")
+            or "/test_" in path
+            or path.endswith("_test.py")
+            or path.endswith("test.py")
+            or path.endswith("_spec.rb")
+            or path.endswith(".spec.js")
+            or path.endswith(".test.js")
+            or "unittest" in path
+            or "pytest" in path
+        ):
+            has_tests = True
+
+        if (
+            path.startswith(".github/workflows")
+            or path.endswith(".travis.yml")
+            or path.endswith("travis.yml")
+            or ".circleci/" in path
+            or path.endswith("azure-pipelines.yml")
+            or path.endswith("azure-pipelines.yaml")
+            or path.endswith("jenkinsfile")
+            or path.endswith("drone.yml")
+            or (path.endswith(".yml") and ("ci" in path or "build" in path or "deploy" in path))
+            or (path.endswith(".yaml") and ("ci" in path or "build" in path or "deploy" in path))
+            or path.startswith("ci/")
+            or "/ci/" in path
+            or path == "makefile"
+            or path == "dockerfile"
+            or path.endswith("build.sh")
+            or path.endswith("build.bat")
+        ):
+            has_ci = True
+
+        if (
+            path
+            in {
+                ".flake8", "pyproject.toml", "setup.cfg", "tox.ini", ".pylintrc", "pylint.cfg",
+                ".black", ".isort.cfg", ".pre-commit-config.yaml", ".pre-commit-config.yml",
+                "requirements-dev.txt", "requirements.dev.txt", ".eslintrc", ".eslintrc.json",
+                ".eslintrc.js", ".eslintrc.yaml", ".stylelintrc", ".rubocop.yml", "ruff.toml",
+            }
+            or path.endswith("lint.py")
+            or path.endswith("format.py")
+            or "linting" in path
+            or "formatting" in path
+        ):
+            has_lint_config = True
+
+        if (
+            path.startswith("readme")
+            or path in {"readme.md", "readme.rst", "readme.txt", "readme"}
+            or path == "index.md"
+            or path == "home.md"
+        ):
+            has_readme = True
+
+        if path in {p.lower() for p in packaging_files} or any(
+            path.endswith(f.lower()) for f in packaging_files
+        ):
+            has_packaging = True
+
+        lang = classify_by_extension(path)
+        if lang:
+            language_counts[lang] = language_counts.get(lang, 0) + 1
+
+    return {
+        "has_tests": has_tests,
+        "has_ci": has_ci,
+        "has_lint_config": has_lint_config,
+        "language_counts": language_counts,
+        "total_code_files": sum(language_counts.values()),
+        "has_readme": has_readme,
+        "has_packaging": has_packaging,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    fetcher = CodeQualityDataFetcher()
+    print(f"{'paths':>9} {'legacy s':>9} {'compiled s':>11} {'speedup':>8}")
+    for n in args.sizes:
+        paths = synthetic_paths(n)
+        out: Dict[str, Any] = {}
+        legacy = timed(lambda: out.update(legacy=legacy_aggregate(paths)))
+        compiled = timed(lambda: out.update(compiled=fetcher._aggregate_from_paths(paths)))
+        if out["legacy"] != out["compiled"]:
+            raise SystemExit(f"result mismatch at {n} paths")
+        print(f"{n:>9} {legacy:>9.3f} {compiled:>11.3f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
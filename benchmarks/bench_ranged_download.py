@@ -0,0 +1,95 @@
+"""Benchmark: single-stream vs parallel ranged download into S3 parts.
+
+Serves a synthetic artifact from a local range-capable HTTP server that caps
+each connection at `--conn-mbps`, standing in for the per-stream limit of a
+remote CDN. The artifact is staged into an in-memory S3 stand-in through
+`RangedDownload` + `S3Service.stage_ranges` with each connection count, and
+reports MB/s and range retries. One connection corresponds to the streaming
+path.
+
+Usage:
+    python -m benchmarks.bench_ranged_download --size-mb 256 --connections 1 4 16 --conn-mbps 40
+"""
+
+import argparse
+import hashlib
+import time
+
+from backend.services.ranged import RangedDownload, plan
+from backend.services.s3_service import S3Service
+from benchmarks.bench_streaming_ingest import NullS3
+from benchmarks.common import LocalServer, QuietHandler, timed
+
+_PATTERN = hashlib.sha256(b"model-registry").digest() * 2048  # 64 KiB block
+
+
+def _make_handler(size: int, bytes_per_second: float):
+    class _RangeHandler(QuietHandler):
+        """Serve `size` generated bytes with `Range` support, throttled per connection."""
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+
+        def do_GET(self):
+            start, end = 0, size - 1
+            header = self.headers.get("Range")
+            if header:
+                first, _, last = header.removeprefix("bytes=").partition("-")
+                start, end = int(first), min(int(last), size - 1)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+
+            remaining = end - start + 1
+            began = time.perf_counter()
+            sent = 0
+            while remaining > 0:
+                block = _PATTERN[: min(len(_PATTERN), remaining)]
+                self.wfile.write(block)
+                remaining -= len(block)
+                sent += len(block)
+                ahead = sent / bytes_per_second - (time.perf_counter() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    return _RangeHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--conn-mbps", type=float, default=40.0, help="per-connection cap in MiB/s")
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    handler = _make_handler(size, args.conn_mbps * 1024 * 1024)
+    print(f"size={args.size_mb} MiB, per-connection cap={args.conn_mbps:.0f} MiB/s")
+    print(f"{'conns':>6} {'part MiB':>9} {'MB/s':>8} {'retries':>8}")
+    with LocalServer(handler) as server:
+        url = f"{server.base_url}/artifact.bin"
+        probed = RangedDownload.probe(url, min_size=0)
+        assert probed is not None and probed.size == size
+        for connections in args.connections:
+            layout = plan(size, max_connections=connections)
+            download = RangedDownload(url, size, **layout)
+            svc = S3Service(bucket_name="bench")
+            svc.s3 = NullS3()
+            seconds = timed(
+                lambda: svc.stage_ranges(download.fetch_range, size, download.part_size, download.connections)
+            )
+            assert svc.s3.bytes_received == size
+            print(
+                f"{download.connections:>6} {download.part_size / (1024 * 1024):>9.0f} "
+                f"{args.size_mb / seconds:>8.1f} {download.range_retries:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark: buffered vs streaming artifact ingest.
+
+Serves a synthetic artifact from a local HTTP server and pushes it into an
+in-memory S3 stand-in, once through the legacy path (`response.content` +
+`S3Service.upload_artifact`) and once through `S3Service.stage_stream` committed to its blob key.
+Reports throughput and peak RSS growth for each path.
+
+Usage:
+    python -m benchmarks.bench_streaming_ingest --sizes 64 256 1024
+"""
+
+import argparse
+import hashlib
+
+import requests
+
+from aws.config import DOWNLOAD_CHUNK_SIZE, S3_MULTIPART_PART_SIZE
+from backend.services.s3_service import S3Service
+from benchmarks.common import LocalServer, QuietHandler, RssSampler, mb, timed
+
+_PATTERN = hashlib.sha256(b"model-registry").digest() * 2048  # 64 KiB block
+
+
+class _ArtifactHandler(QuietHandler):
+    """Serve `/blob/<bytes>` as a generated body, written in 64 KiB blocks."""
+
+    def do_GET(self):
+        size = int(self.path.rsplit("/", 1)[-1])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        remaining = size
+        while remaining > 0:
+            block = _PATTERN[: min(len(_PATTERN), remaining)]
+            self.wfile.write(block)
+            remaining -= len(block)
+
+
+class NullS3:
+    """Moto-style S3 client stand-in that accepts uploads but only keeps byte counts."""
+
+    def __init__(self):
+        self.bytes_received = 0
+        self.parts = 0
+
+    def upload_fileobj(self, fileobj, bucket, key):
+        while True:
+            block = fileobj.read(S3_MULTIPART_PART_SIZE)
+            if not block:
+                break
+            self.bytes_received += len(block)
+
+    def put_object(self, Bucket, Key, Body):
+        self.bytes_received += len(Body)
+
+    def create_multipart_upload(self, Bucket, Key):
+        return {"UploadId": "bench"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.bytes_received += len(Body)
+        self.parts += 1
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        pass
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        pass
+
+    def copy(self, CopySource, Bucket, Key):
+        pass
+
+    def delete_object(self, Bucket, Key):
+        pass
+
+
+def _buffered(url: str, svc: S3Service) -> None:
+    response = requests.get(url, stream=True)
+    artifact_bytes = response.content
+    svc.upload_artifact(artifact_bytes, "bench", "artifact.bin")
+
+
+def _streaming(url: str, svc: S3Service) -> None:
+    response = requests.get(url, stream=True)
+    try:
+        staged = svc.stage_stream(response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE))
+        staged.commit(svc.blob_key(staged.sha256))
+    finally:
+        response.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256, 1024], help="artifact sizes in MiB")
+    args = parser.parse_args()
+
+    print(f"part_size={mb(S3_MULTIPART_PART_SIZE):.0f} MiB chunk_size={mb(DOWNLOAD_CHUNK_SIZE):.0f} MiB")
+    print(f"{'size':>8} {'mode':>10} {'MB/s':>10} {'peak RSS +MiB':>14}")
+    with LocalServer(_ArtifactHandler) as server:
+        for size_mib in args.sizes:
+            url = f"{server.base_url}/blob/{size_mib * 1024 * 1024}"
+            # Streaming first: the buffered run may leave the allocator holding pages.
+            for mode, fn in (("streaming", _streaming), ("buffered", _buffered)):
+                svc = S3Service(bucket_name="bench")
+                svc.s3 = NullS3()
+                with RssSampler() as rss:
+                    seconds = timed(lambda: fn(url, svc))
+                assert svc.s3.bytes_received == size_mib * 1024 * 1024
+                print(
+                    f"{size_mib:>6}Mi {mode:>10} {size_mib / seconds:>10.1f} {mb(rss.peak_delta):>14.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark: repo file listing from the archive's zip central directory vs the trees API.
+
+Builds a synthetic repository of `--files` paths (see `bench_path_classifier`)
+with file bodies averaging `--avg-kb` KiB. It zips the repository the way a
+GitHub archive is laid out, under a `repo-main/` root, and serves the zip from
+a local range-capable HTTP server. It also renders the JSON a recursive
+`git/trees` call returns for the same tree, with GitHub's per-entry fields. The
+table compares the bytes transferred to list every file:
+  - `fetch_zip_manifest`: the tail of the archive plus its central directory
+  - the trees API, one call per 100,000 entries (the API's truncation limit)
+  - downloading the whole archive
+Both listings must produce the same signals.
+
+Usage:
+    python -m benchmarks.bench_zip_manifest --files 1000 10000 100000 --avg-kb 8
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import math
+import random
+import threading
+import zipfile
+
+from benchmarks.bench_path_classifier import synthetic_paths
+from benchmarks.common import LocalServer, QuietHandler, mb, timed
+from datafetchers.codequalitydata_fetcher import CodeQualityDataFetcher
+from datafetchers.zip_manifest import archive_paths, fetch_zip_manifest
+
+_TREE_LIMIT = 100_000
+
+
+def build_archive(paths, avg_kb: float, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    words = [hashlib.sha1(str(i).encode()).hexdigest()[:8] for i in range(512)]
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for path in sorted(set(paths)):
+            size = int(rng.expovariate(1 / (avg_kb * 1024)))
+            body = " ".join(rng.choice(words) for _ in range(size // 9 + 1)).encode()[:size]
+            zf.writestr(f"repo-main/{path}", body)
+    return buf.getvalue()
+
+
+def trees_payload(paths) -> bytes:
+    """A recursive `git/trees` response for `paths`, entries shaped like GitHub's."""
+    files = sorted(set(paths))
+    dirs = sorted({"/".join(p.split("/")[:i]) for p in files for i in range(1, p.count("/") + 1)})
+    tree = []
+    for path in sorted(files + dirs):
+        sha = hashlib.sha1(path.encode()).hexdigest()
+        if path in dirs:
+            tree.append({"path": path, "mode": "040000", "type": "tree", "sha": sha,
+                         "url": f"https://api.github.com/repos/o/r/git/trees/{sha}"})
+        else:
+            tree.append({"path": path, "mode": "100644", "type": "blob", "sha": sha, "size": 1024,
+                         "url": f"https://api.github.com/repos/o/r/git/blobs/{sha}"})
+    return json.dumps({"sha": "root", "url": "", "tree": tree, "truncated": False}, indent=2).encode()
+
+
+def _make_handler(archive: bytes, served: dict, lock: threading.Lock):
+    class _ZipHandler(QuietHandler):
+        """Serve `archive` with `Range` support, counting the body bytes sent."""
+
+        def do_GET(self):
+            body, status, content_range = archive, 200, None
+            spec = (self.headers.get("Range") or "").removeprefix("bytes=")
+            if spec:
+                if spec.startswith("-"):
+                    start, end = max(0, len(archive) - int(spec[1:])), len(archive) - 1
+                else:
+                    first, last = spec.split("-")
+                    start, end = int(first), min(int(last), len(archive) - 1)
+                body, status = archive[start : end + 1], 206
+                content_range = f"bytes {start}-{end}/{len(archive)}"
+            self.send_response(status)
+            if content_range:
+                self.send_header("Content-Range", content_range)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                served["bytes"] = served.get("bytes", 0) + len(body)
+                served["requests"] = served.get("requests", 0) + 1
+
+    return _ZipHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--avg-kb", type=float, default=8.0)
+    args = parser.parse_args()
+
+    fetcher = CodeQualityDataFetcher()
+    print(
+        f"{'files':>8} {'zip MiB':>8} {'cd KiB':>8} {'reads':>6} {'trees KiB':>10} "
+        f"{'API calls':>10} {'cd ms':>7} {'trees/cd':>9}"
+    )
+    for n in args.files:
+        paths = synthetic_paths(n)
+        archive = build_archive(paths, args.avg_kb)
+        tree_json = trees_payload(paths)
+        served: dict = {}
+        with LocalServer(_make_handler(archive, served, threading.Lock())) as server:
+            result: dict = {}
+            seconds = timed(lambda: result.update(manifest=fetch_zip_manifest(f"{server.base_url}/repo.zip")))
+        manifest = result["manifest"]
+        assert manifest is not None
+        listed = archive_paths(manifest)
+        assert fetcher._aggregate_from_paths(listed) == fetcher._aggregate_from_paths(sorted(set(paths)))
+
+        cd_bytes = served["bytes"]
+        tree_calls = max(1, math.ceil(len(json.loads(tree_json)["tree"]) / _TREE_LIMIT))
+        print(
+            f"{len(listed):>8} {mb(len(archive)):>8.1f} {cd_bytes / 1024:>8.0f} {served['requests']:>6} "
+            f"{len(tree_json) / 1024:>10.0f} {tree_calls:>10} {seconds * 1000:>7.1f} {len(tree_json) / cd_bytes:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
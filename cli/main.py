@@ -0,0 +1,172 @@
+"""Command-line entrypoint.
+
+Subcommands:
+  batch FILE   Register every URL in FILE (one per line) through the
+               backend's `POST /artifacts/batch` endpoint and print per-URL
+               results and a throughput summary.
+  rescore      Re-score stored artifacts through `POST /artifacts/rescore`.
+               Only metrics whose version changed are recomputed, from the
+               stored input features; prints how many evaluations were skipped.
+  rate ID      Print an artifact's rating from `GET /artifact/model/{id}/rate`.
+               `--metrics` limits it to those metrics, so only the data
+               fetchers they depend on run.
+
+Example:
+    python -m cli.main batch urls.txt --api http://localhost:8000
+    python -m cli.main rescore --api http://localhost:8000
+    python -m cli.main rate t1 --metrics license,size_score
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+import requests
+
+DEFAULT_API = "http://localhost:8000"
+
+
+def read_urls(path: str) -> List[str]:
+    """Read URLs from a file, skipping blank lines and `#` comments."""
+    with open(path, encoding="utf-8") as fh:
+        return [
+            line.strip()
+            for line in fh
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+
+def _parse_concurrency(values: Optional[List[str]]) -> Optional[Dict[str, int]]:
+    if not values:
+        return None
+    out: Dict[str, int] = {}
+    for item in values:
+        stage, _, limit = item.partition("=")
+        out[stage.strip()] = int(limit)
+    return out
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    urls = read_urls(args.file)
+    if not urls:
+        print("No URLs found.", file=sys.stderr)
+        return 1
+
+    payload = {
+        "urls": urls,
+        "artifact_type": args.type,
+        "concurrency": _parse_concurrency(args.concurrency),
+    }
+    resp = requests.post(
+        f"{args.api.rstrip('/')}/artifacts/batch", json=payload, timeout=args.timeout
+    )
+    if resp.status_code != 200:
+        print(f"Batch request failed: HTTP {resp.status_code} {resp.text}", file=sys.stderr)
+        return 1
+
+    body = resp.json()
+    if args.json:
+        print(json.dumps(body, indent=2))
+    else:
+        for r in body.get("results", []):
+            outcome = r.get("artifact_id") if r.get("status") == "created" else r.get("error")
+            print(f"{r.get('status'):>8}  {r.get('seconds', 0):>8.2f}s  {r.get('url')}  {outcome}")
+        s = body.get("summary", {})
+        print(
+            f"\n{s.get('succeeded')}/{s.get('unique')} succeeded "
+            f"({s.get('duplicates_dropped')} duplicates dropped) in {s.get('elapsed_seconds')}s "
+            f"- {s.get('urls_per_second')} URLs/s, {s.get('mb_per_second')} MB/s"
+        )
+    return 0 if body.get("summary", {}).get("failed", 0) == 0 else 2
+
+
+def cmd_rescore(args: argparse.Namespace) -> int:
+    payload = {"ids": args.ids or None}
+    resp = requests.post(
+        f"{args.api.rstrip('/')}/artifacts/rescore", json=payload, timeout=args.timeout
+    )
+    if resp.status_code != 200:
+        print(f"Rescore request failed: HTTP {resp.status_code} {resp.text}", file=sys.stderr)
+        return 1
+
+    body = resp.json()
+    if args.json:
+        print(json.dumps(body, indent=2))
+    else:
+        for r in body.get("results", []):
+            detail = ", ".join(r.get("recomputed", [])) if r.get("status") == "rescored" else r.get("error", "")
+            print(f"{r.get('status'):>14}  {r.get('artifact_id')}  {detail}")
+        s = body.get("summary", {})
+        print(
+            f"\n{s.get('rescored')}/{s.get('artifacts')} re-scored ({s.get('current')} current, "
+            f"{s.get('missing_inputs')} without stored inputs) in {s.get('elapsed_seconds')}s - "
+            f"{s.get('metrics_evaluated')} metric evaluations, {s.get('metrics_skipped')} skipped"
+        )
+    return 0 if body.get("summary", {}).get("failed", 0) == 0 else 2
+
+
+def cmd_rate(args: argparse.Namespace) -> int:
+    params = {"metrics": args.metrics} if args.metrics else None
+    resp = requests.get(
+        f"{args.api.rstrip('/')}/artifact/model/{args.id}/rate", params=params, timeout=args.timeout
+    )
+    if resp.status_code != 200:
+        print(f"Rate request failed: HTTP {resp.status_code} {resp.text}", file=sys.stderr)
+        return 1
+
+    body = resp.json()
+    if args.json:
+        print(json.dumps(body, indent=2))
+    else:
+        print(f"{body.get('name')} ({body.get('category')}) [{resp.headers.get('X-Score-Cache', '-')}]")
+        for key, value in body.items():
+            if key in ("name", "category") or key.endswith("_latency"):
+                continue
+            print(f"{key:>24}  {value}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.main", description="Model Registry CLI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="Register a file of URLs via POST /artifacts/batch")
+    batch.add_argument("file", help="file with one URL per line")
+    batch.add_argument("--api", default=DEFAULT_API, help=f"backend base URL (default {DEFAULT_API})")
+    batch.add_argument("--type", choices=["model", "dataset", "code"], help="force artifact type")
+    batch.add_argument(
+        "--concurrency",
+        nargs="*",
+        metavar="STAGE=N",
+        help="per-stage limits, e.g. metadata=16 transfer=4",
+    )
+    batch.add_argument("--timeout", type=float, default=3600, help="request timeout in seconds")
+    batch.add_argument("--json", action="store_true", help="print the raw JSON response")
+    batch.set_defaults(func=cmd_batch)
+
+    rescore = sub.add_parser("rescore", help="Re-score stored artifacts whose metric versions changed")
+    rescore.add_argument("ids", nargs="*", help="artifact ids (default: every stored artifact)")
+    rescore.add_argument("--api", default=DEFAULT_API, help=f"backend base URL (default {DEFAULT_API})")
+    rescore.add_argument("--timeout", type=float, default=3600, help="request timeout in seconds")
+    rescore.add_argument("--json", action="store_true", help="print the raw JSON response")
+    rescore.set_defaults(func=cmd_rescore)
+
+    rate = sub.add_parser("rate", help="Print an artifact's rating via GET /artifact/model/{id}/rate")
+    rate.add_argument("id", help="artifact id")
+    rate.add_argument("--metrics", help="comma-separated metric names (default: all, with net_score)")
+    rate.add_argument("--api", default=DEFAULT_API, help=f"backend base URL (default {DEFAULT_API})")
+    rate.add_argument("--timeout", type=float, default=600, help="request timeout in seconds")
+    rate.add_argument("--json", action="store_true", help="print the raw JSON response")
+    rate.set_defaults(func=cmd_rate)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
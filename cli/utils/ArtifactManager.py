@@ -4,19 +4,23 @@ Combines metadata fetching and metric scoring to produce an artifact scoring
 payload suitable for the backend rating endpoint.
 """
 
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import json
 import re
 import logging
+import time
 import uuid
 
 try:
     from ModelRegistry.cli.utils.MetadataFetcher import MetadataFetcher
     from ModelRegistry.cli.utils.MetricScorer import MetricScorer
     from ModelRegistry.cli.utils.MetricDataFetcher import MetricDataFetcher
+    from ModelRegistry.cli.utils.DataflowScheduler import DataflowScheduler
 except ModuleNotFoundError:  # fallback when running inside ModelRegistry
     from cli.utils.MetadataFetcher import MetadataFetcher
     from cli.utils.MetricScorer import MetricScorer
     from cli.utils.MetricDataFetcher import MetricDataFetcher
+    from cli.utils.DataflowScheduler import DataflowScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,7 @@ class ArtifactManager:
         self.metadatafetcher = MetadataFetcher()
         self.metricdatafetcher = MetricDataFetcher()
         self.scorer = MetricScorer()
+        self.dataflow = DataflowScheduler(self.metricdatafetcher, self.scorer)
 
     def _extract_name_from_url(self, url: str) -> str:
         """Extract a clean artifact name from a URL."""
@@ -35,32 +40,91 @@ class ArtifactManager:
         name = re.sub(r"[^\w\-\.]", "_", path_part).replace(".git", "")
         return name or "unknown_artifact"
 
-    def getArtifactData(self, url: str) -> Dict[str, Any]:
+    def getMetadata(self, url: str) -> Dict[str, Any]:
+        """Fetch source metadata (HF/GitHub API payload plus download URL)."""
+        return self.metadatafetcher.fetch(url)
+
+    def getMetricData(self, meta_info: Dict[str, Any], metrics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run the data fetchers over pre-fetched metadata (only those `metrics` need, when given)."""
+        return self.metricdatafetcher.fetch_artifact_data(
+            meta_info, fetchers=self.scorer.fetchers_for(metrics), on_missed=self._log_zeroed
+        )
+
+    def _log_zeroed(self, missed: List[str]) -> None:
+        """Name the metrics that score without the data of fetchers that timed out."""
+        logger.warning(
+            "Metrics %s are scored without data from timed-out fetchers %s",
+            ", ".join(self.scorer.dependents(missed)) or "-",
+            ", ".join(missed),
+        )
+
+    def getArtifactData(self, url: str, metrics: Optional[List[str]] = None) -> Dict[str, Any]:
         """Fetch metadata and structured data for an artifact."""
-        meta_info = self.metadatafetcher.fetch(url)
-        artifact_data = self.metricdatafetcher.fetch_artifact_data(meta_info)
+        meta_info = self.getMetadata(url)
+        artifact_data = self.getMetricData(meta_info, metrics)
         return artifact_data
 
-    def scoreArtifact(self, artifact_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Score artifact using all metrics."""
-        scores = self.scorer.score_artifact(artifact_data)
+    def scoreArtifact(self, artifact_data: Dict[str, Any], metrics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Score artifact using all metrics, or only `metrics` when given."""
+        scores = self.scorer.score_artifact(artifact_data, metrics=metrics)
         return scores
 
-    def processUrl(self, url: str) -> Dict[str, Any]:
-        """Fetch, score, and return artifact data and scores for a given URL with unique ID."""
+    def fetchAndScore(
+        self,
+        meta_info: Dict[str, Any],
+        metrics: Optional[List[str]] = None,
+        on_fetched: Optional[Callable[[], None]] = None,
+    ) -> Tuple[Dict[str, Any], Any, Dict[str, Any]]:
+        """
+        Fetch and score in one dataflow run; each metric starts once its fetchers finish.
+
+        Returns (artifact data, scores, timings report with the critical path).
+        """
+        result = self.dataflow.run(meta_info, metrics=metrics, on_fetched=on_fetched)
+        return result.artifact_data, result.scores, result.report()
+
+    def scoreArtifacts(self, artifacts: List[Dict[str, Any]]) -> List[Any]:
+        """Score many artifacts on the shared metric pool; results are in input order."""
+        return self.scorer.score_many(artifacts)
+
+    def rescoreArtifact(
+        self, features: Dict[str, Any], scores: Dict[str, Any], versions: Optional[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Recompute only the metrics whose version changed since `versions`, from stored input features."""
+        return self.scorer.rescore(features, scores, versions)
+
+    def newArtifact(
+        self, url: str, artifact_data: Dict[str, Any], scores: Any
+    ) -> Dict[str, Any]:
+        """
+        Attach a fresh unique ID, a name derived from the URL and the scores.
+
+        The metric versions and input features the scores came from are
+        recorded too, so the artifact can later be re-scored offline.
+        """
         artifact_id = uuid.uuid4().hex  # generate unique artifact ID
         name = self._extract_name_from_url(url)
-
-        artifact_data = self.getArtifactData(url)
-        scores = self.scoreArtifact(artifact_data)
+        metric_inputs = json.dumps(self.scorer.input_features(artifact_data), default=str)
 
         artifact_data.update(
-            {"artifact_id": artifact_id, "name": name, "scores": scores}
+            {
+                "artifact_id": artifact_id,
+                "name": name,
+                "scores": scores,
+                "metric_versions": self.scorer.metric_versions(),
+                "metric_inputs": metric_inputs,
+                "scored_at": int(time.time()),
+            }
         )
 
         logger.info(f"Processed artifact {name} ({artifact_id}) from URL: {url}")
         return artifact_data
 
+    def processUrl(self, url: str) -> Dict[str, Any]:
+        """Fetch, score, and return artifact data and scores for a given URL with unique ID."""
+        artifact_data, scores, _ = self.fetchAndScore(self.getMetadata(url))
+        return self.newArtifact(url, artifact_data, scores)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
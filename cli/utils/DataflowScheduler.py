@@ -0,0 +1,225 @@
+"""Dataflow scheduling of data fetchers and metrics.
+
+`fetch_artifact_data` followed by `score_artifact` puts a full barrier between
+fetching and scoring: no metric starts until the slowest fetcher (usually the
+bus-factor commit walk) has finished. `DataflowScheduler` instead links each
+fetcher to the metrics that declare it in `fetchers`. A metric is queued on the
+shared score pool as soon as the last of its fetchers completes or misses the
+fetch deadline. Its input is the merged output of those fetchers, in fetcher
+order, which is what it reads from a full fetch. `net_score` is finalized when
+the last metric completes.
+
+Every run records per-node timings (seconds from the start of the run) and the
+critical path: the fetcher that released the last metric to finish, then that
+metric.
+"""
+
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from ModelRegistry.cli.utils.MetricDataFetcher import (
+        FETCH_DEADLINE,
+        MetricDataFetcher,
+        fetch_label,
+        run_with_deadline,
+    )
+    from ModelRegistry.cli.utils.MetricScorer import MetricScorer, _score_executor
+    from ModelRegistry.datafetchers.fetch_context import fetch_context
+except ModuleNotFoundError:
+    from cli.utils.MetricDataFetcher import FETCH_DEADLINE, MetricDataFetcher, fetch_label, run_with_deadline
+    from cli.utils.MetricScorer import MetricScorer, _score_executor
+    from datafetchers.fetch_context import fetch_context
+
+logger = logging.getLogger(__name__)
+
+
+class DataflowResult:
+    """Merged artifact data, scores and node timings of one scheduled run."""
+
+    def __init__(self, artifact_data: Dict[str, Any], scores: Any, nodes: Dict[str, Dict[str, Any]], seconds: float):
+        self.artifact_data = artifact_data
+        self.scores = scores
+        self.nodes = nodes
+        self.seconds = seconds
+
+    @property
+    def critical_path(self) -> List[str]:
+        """Node names on the longest chain: the releasing fetcher (if any), then the last metric to finish."""
+        metrics = [(node["end"], name) for name, node in self.nodes.items() if node["kind"] == "metric"]
+        if not metrics:
+            return []
+        last = max(metrics)[1]
+        after = self.nodes[last].get("after")
+        return [after, last] if after else [last]
+
+    def report(self) -> Dict[str, Any]:
+        return {"seconds": self.seconds, "critical_path": self.critical_path, "nodes": self.nodes}
+
+
+class _Run:
+    """Bookkeeping for one artifact: fetcher outputs, pending dependencies and metric futures."""
+
+    def __init__(self, scorer: MetricScorer, order: List[str], deps: Dict[str, List[str]], download_url: Any):
+        self.scorer = scorer
+        self.order = order
+        self.deps = deps
+        self.download_url = download_url
+        self.started = time.perf_counter()
+        self.outputs: Dict[str, List[Dict[str, Any]]] = {}
+        self.waiting = {name: set(fetchers) for name, fetchers in deps.items()}
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.futures: Dict[str, Future] = {}
+        self.metric_start: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return round(time.perf_counter() - self.started, 3)
+
+    def settle(self, fetcher: str, results: List[Dict[str, Any]], start: float) -> None:
+        """Record a fetcher's output and queue the metrics it completes."""
+        with self._lock:
+            if fetcher in self.nodes:
+                return  # finished after being dropped at the deadline
+            self.outputs[fetcher] = results
+            end = self.elapsed()
+            self.nodes[fetcher] = {"kind": "fetcher", "start": start, "end": end, "seconds": round(end - start, 3)}
+            self._release(fetcher)
+
+    def miss(self, fetcher: str) -> None:
+        """Drop a fetcher that missed the deadline; its metrics go ahead without its data."""
+        with self._lock:
+            if fetcher in self.nodes:
+                return
+            self.nodes[fetcher] = {"kind": "fetcher", "missed": True, "end": self.elapsed()}
+            self._release(fetcher)
+
+    def _release(self, fetcher: str) -> None:
+        ready = []
+        for name, pending in self.waiting.items():
+            if fetcher in pending:
+                pending.discard(fetcher)
+                if not pending:
+                    ready.append(name)
+        for name in ready:
+            self._submit(name, fetcher)
+
+    def submit_independent(self) -> None:
+        """Queue metrics that depend on none of the scheduled fetchers."""
+        with self._lock:
+            for name, pending in self.waiting.items():
+                if not pending and name not in self.futures:
+                    self._submit(name, None)
+
+    def _submit(self, name: str, after: Optional[str]) -> None:
+        if self.metric_start is None:
+            self.metric_start = time.time()
+        self.nodes[name] = {"kind": "metric", "ready": self.elapsed(), "after": after}
+        data = self.merged(self.deps[name])
+        self.futures[name] = _score_executor().submit(self._evaluate, name, data)
+
+    def _evaluate(self, name: str, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any], float]:
+        start = self.elapsed()
+        result = self.scorer.run_metric(name, self.scorer.metrics[name], data)
+        end = self.elapsed()
+        with self._lock:
+            self.nodes[name].update({"start": start, "end": end, "seconds": round(end - start, 3)})
+        return result
+
+    def merged(self, fetchers: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Outputs of `fetchers` (default: all settled) merged in fetcher order, as a full fetch would."""
+        data: Dict[str, Any] = {}
+        for fetcher in self.order:
+            if fetchers is None or fetcher in fetchers:
+                for result in self.outputs.get(fetcher, ()):
+                    data.update(result)
+        data["download_url"] = self.download_url
+        return data
+
+
+class DataflowScheduler:
+    """Runs an artifact's fetchers and metrics as one dependency graph on the shared pools."""
+
+    def __init__(self, data_fetcher: MetricDataFetcher, scorer: MetricScorer):
+        self.data_fetcher = data_fetcher
+        self.scorer = scorer
+
+    def dependencies(self, metrics: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """
+        Fetchers (class names) each selected metric waits for.
+
+        A metric that declares no `fetchers` waits for all of them, which is
+        the old barrier behaviour.
+        """
+        names = list(self.scorer.metrics) if metrics is None else [n for n in self.scorer.metrics if n in metrics]
+        order = [f.__class__.__name__ for f in self.data_fetcher.select(self.scorer.fetchers_for(metrics))]
+        deps = {}
+        for name in names:
+            declared = getattr(self.scorer.metrics[name], "fetchers", ())
+            deps[name] = [f for f in order if f in declared] if declared else list(order)
+        return deps
+
+    def run(
+        self,
+        meta_info: Dict[str, Any],
+        metrics: Optional[List[str]] = None,
+        deadline: Optional[float] = None,
+        on_fetched: Optional[Callable[[], None]] = None,
+        as_json_str: bool = True,
+    ) -> DataflowResult:
+        """
+        Fetch and score one artifact, starting each metric once its inputs are ready.
+
+        `metrics` and the returned scores behave as in `score_artifact`.
+        A fetcher that runs longer than `deadline` seconds (default
+        `FETCH_DEADLINE`), or is still queued that long, contributes nothing,
+        as in `fetch_artifact_data`.
+        `on_fetched` is called once fetching is over, while the remaining
+        metrics may still be running.
+        """
+        fetchers = self.data_fetcher.select(self.scorer.fetchers_for(metrics))
+        order = [f.__class__.__name__ for f in fetchers]
+        deps = self.dependencies(metrics)
+        run = _Run(self.scorer, order, deps, meta_info.get("download_url"))
+        deadline = FETCH_DEADLINE if deadline is None else deadline
+
+        with fetch_context(fetch_label(meta_info)):
+            run.submit_independent()
+            _, missed = run_with_deadline(
+                [(name, functools.partial(self._fetch_node, run, f, meta_info)) for name, f in zip(order, fetchers)],
+                deadline,
+            )
+            for i in missed:
+                run.miss(order[i])
+        if missed:
+            logger.warning(
+                "Metrics %s are scored without data from timed-out fetchers %s",
+                ", ".join(m for m in self.scorer.dependents(order[i] for i in missed) if m in deps) or "-",
+                ", ".join(order[i] for i in missed),
+            )
+        artifact_data = run.merged()
+        if on_fetched is not None:
+            on_fetched()
+
+        # Every fetcher has settled, so every metric has been queued.
+        metric_results = [run.futures[name].result() for name in deps]
+        scores = self.scorer.finalize(
+            metric_results, run.metric_start or time.time(), list(deps), as_json_str=as_json_str
+        )
+        result = DataflowResult(artifact_data, scores, run.nodes, run.elapsed())
+        logger.info(
+            "Dataflow for %s took %.3fs; critical path: %s",
+            fetch_label(meta_info) or "-",
+            result.seconds,
+            " -> ".join(result.critical_path) or "-",
+        )
+        return result
+
+    def _fetch_node(self, run: _Run, fetcher, meta_info: Dict[str, Any]) -> None:
+        start = run.elapsed()
+        results, _ = self.data_fetcher.run_fetcher(fetcher, meta_info)
+        run.settle(fetcher.__class__.__name__, results, start)
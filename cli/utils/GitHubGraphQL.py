@@ -0,0 +1,236 @@
+"""GitHub GraphQL fetch mode.
+
+With `GITHUB_FETCH_MODE=graphql` a GitHub repository's metadata, default
+branch, recent commit authors and root tree entries come from one GraphQL
+query instead of three REST calls (`/repos/{repo}`, `/commits`,
+`/git/trees`). Bulk ingestion can `prefetch` many repositories at once; they
+are packed into aliased queries of `GITHUB_GRAPHQL_BATCH` repositories each.
+Results ("bundles") are kept for `GITHUB_GRAPHQL_TTL` seconds so every
+fetcher working on the same repository reuses them. The REST path remains
+the fallback: without a token (GraphQL requires one), when the query fails,
+or for repositories missing from the response.
+
+Tuning (environment variables):
+  GITHUB_FETCH_MODE       "rest" (default) or "graphql"
+  GITHUB_GRAPHQL_BATCH    repositories per aliased query (default 25)
+  GITHUB_GRAPHQL_TTL      seconds a bundle is reused (default 300)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from cli.utils.GitHubRateLimiter import configured_tokens
+from cli.utils.HttpClient import http_client
+
+logger = logging.getLogger(__name__)
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+# Matches the REST path, which reads one page of 100 commits.
+COMMIT_HISTORY = 100
+
+_REPO_FIELDS = """
+    nameWithOwner
+    name
+    description
+    url
+    homepageUrl
+    isFork
+    isArchived
+    stargazerCount
+    forkCount
+    diskUsage
+    createdAt
+    updatedAt
+    pushedAt
+    licenseInfo { key name spdxId }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    defaultBranchRef {
+      name
+      target {
+        ... on Commit {
+          oid
+          tree { oid entries { name path type oid } }
+          history(first: %d) {
+            nodes { author { name email user { login } } }
+          }
+        }
+      }
+    }
+""" % COMMIT_HISTORY
+
+
+def build_query(repos: List[str]) -> str:
+    """One aliased query (`r0`, `r1`, ...) covering every `owner/name` in `repos`."""
+    parts = []
+    for i, repo in enumerate(repos):
+        owner, name = repo.split("/", 1)
+        parts.append(f"r{i}: repository(owner: {_quote(owner)}, name: {_quote(name)}) {{{_REPO_FIELDS}}}")
+    return "query {\n" + "\n".join(parts) + "\n}"
+
+
+def repo_from_url(url: str) -> Optional[str]:
+    """`owner/name` for a github.com repository URL, else None."""
+    parsed = urlparse(url)
+    if parsed.netloc.lower() not in ("github.com", "www.github.com"):
+        return None
+    parts = [p for p in parsed.path.split("/") if p]
+    if len(parts) < 2:
+        return None
+    return f"{parts[0]}/{parts[1].removesuffix('.git')}"
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def bundle_from_node(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one `repository` node into REST-shaped metadata plus commit/tree signals."""
+    branch = node.get("defaultBranchRef") or {}
+    target = branch.get("target") or {}
+    tree = target.get("tree") or {}
+    license_info = node.get("licenseInfo")
+
+    authors: List[str] = []
+    for commit in ((target.get("history") or {}).get("nodes") or []):
+        author = commit.get("author") or {}
+        login = (author.get("user") or {}).get("login")
+        name = author.get("name")
+        email = author.get("email")
+        if login:
+            authors.append(str(login))
+        elif name:
+            authors.append(str(name))
+        elif email:
+            authors.append(str(email))
+
+    metadata = {
+        "full_name": node.get("nameWithOwner"),
+        "name": node.get("name"),
+        "description": node.get("description"),
+        "html_url": node.get("url"),
+        "homepage": node.get("homepageUrl"),
+        "fork": node.get("isFork"),
+        "archived": node.get("isArchived"),
+        "stargazers_count": node.get("stargazerCount"),
+        "forks_count": node.get("forkCount"),
+        "size": node.get("diskUsage"),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "pushed_at": node.get("pushedAt"),
+        "default_branch": branch.get("name"),
+        "license": (
+            {"key": license_info.get("key"), "name": license_info.get("name"), "spdx_id": license_info.get("spdxId")}
+            if license_info
+            else None
+        ),
+        "topics": [
+            (t.get("topic") or {}).get("name")
+            for t in ((node.get("repositoryTopics") or {}).get("nodes") or [])
+        ],
+    }
+    return {
+        "metadata": metadata,
+        "default_branch": branch.get("name"),
+        "head_sha": target.get("oid"),
+        "root_tree_sha": tree.get("oid"),
+        "tree_entries": [
+            {"path": e.get("path") or e.get("name"), "type": e.get("type"), "sha": e.get("oid")}
+            for e in (tree.get("entries") or [])
+        ],
+        "commit_authors": authors,
+    }
+
+
+class GitHubGraphQL:
+    """Fetches and keeps per-repository GraphQL bundles."""
+
+    def __init__(
+        self,
+        mode: str = os.getenv("GITHUB_FETCH_MODE", "rest"),
+        batch_size: int = int(os.getenv("GITHUB_GRAPHQL_BATCH", 25)),
+        ttl_seconds: float = float(os.getenv("GITHUB_GRAPHQL_TTL", 300)),
+    ):
+        self.mode = mode.lower()
+        self.batch_size = max(1, batch_size)
+        self.ttl_seconds = ttl_seconds
+        self._bundles: Dict[str, Any] = {}
+        self._repo_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode == "graphql" and bool(configured_tokens())
+
+    def bundle(self, repo: str) -> Optional[Dict[str, Any]]:
+        """The bundle for `owner/name`, querying GraphQL on a miss; None means use REST."""
+        if not self.enabled or "/" not in repo:
+            return None
+        key = repo.lower()
+        cached = self._cached(key)
+        if cached is not None:
+            return cached or None
+        with self._lock:
+            repo_lock = self._repo_locks.setdefault(key, threading.Lock())
+        with repo_lock:
+            cached = self._cached(key)
+            if cached is None:
+                self._query([repo])
+                cached = self._cached(key)
+        return cached or None
+
+    def prefetch(self, repos: Iterable[str]) -> int:
+        """Fetch bundles for `repos` in aliased batches; returns how many were loaded."""
+        if not self.enabled:
+            return 0
+        todo = sorted({r for r in repos if "/" in r and self._cached(r.lower()) is None})
+        loaded = 0
+        for i in range(0, len(todo), self.batch_size):
+            loaded += self._query(todo[i : i + self.batch_size])
+        return loaded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bundles = {}
+
+    # ------------------------
+    # Internals
+    # ------------------------
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """A live bundle, `{}` for a remembered miss, or None when unknown/expired."""
+        with self._lock:
+            entry = self._bundles.get(key)
+        if entry is None or time.time() - entry[0] > self.ttl_seconds:
+            return None
+        return entry[1]
+
+    def _query(self, repos: List[str]) -> int:
+        data: Dict[str, Any] = {}
+        try:
+            resp = http_client.post(GRAPHQL_URL, json={"query": build_query(repos)})
+            with self._lock:
+                self.queries += 1
+            if resp.status_code == 200:
+                data = (resp.json() or {}).get("data") or {}
+            else:
+                logger.warning(f"⚠️ GitHub GraphQL query failed ({resp.status_code}); using REST")
+        except Exception as e:
+            logger.warning(f"⚠️ GitHub GraphQL query failed: {e}; using REST")
+
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            self._bundles = {k: v for k, v in self._bundles.items() if now - v[0] <= self.ttl_seconds}
+            for i, repo in enumerate(repos):
+                node = data.get(f"r{i}")
+                # Remember misses too, so these repos go to REST without re-querying.
+                self._bundles[repo.lower()] = (now, bundle_from_node(node) if node else {})
+                loaded += 1 if node else 0
+        return loaded
+
+
+github_graphql = GitHubGraphQL()
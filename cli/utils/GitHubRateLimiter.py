@@ -0,0 +1,202 @@
+"""GitHub rate-limit aware token scheduler.
+
+Every call the shared `HttpClient` makes to api.github.com asks this
+scheduler for a token. Remaining quota per token is tracked from the
+`X-RateLimit-*` headers of each response, calls are spread over a pool of
+tokens (the one with the most quota left wins), and when every token is down
+to its reserve the caller waits for the earliest reset instead of burning the
+last requests on 403s. A 403/429 that reports an exhausted quota is retried
+once on another token when one has quota left.
+
+Tuning (environment variables):
+  GITHUB_TOKENS           comma-separated token pool (falls back to GITHUB_TOKEN)
+  GITHUB_RATE_RESERVE     requests kept in hand per token before waiting (default 10)
+  GITHUB_RATE_MAX_WAIT    longest wait for a reset, in seconds (default 60)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_HOST = "api.github.com"
+
+# Quota GitHub grants before the first response tells us otherwise.
+UNAUTHENTICATED_LIMIT = 60
+AUTHENTICATED_LIMIT = 5000
+
+
+def configured_tokens() -> List[str]:
+    raw = os.getenv("GITHUB_TOKENS") or os.getenv("GITHUB_TOKEN") or ""
+    return [t.strip() for t in raw.split(",") if t.strip()]
+
+
+def endpoint_name(path: str) -> str:
+    """Collapse a GitHub API path into an endpoint template for per-endpoint stats."""
+    parts = [p for p in path.split("?")[0].split("/") if p]
+    if len(parts) >= 3 and parts[0] == "repos":
+        rest = parts[3:]
+        if rest[:2] == ["git", "trees"]:
+            rest = ["git", "trees"]
+        elif rest[:1] == ["contents"]:
+            rest = ["contents"]
+        elif len(rest) > 1:
+            rest = rest[:1]
+        return "/" + "/".join(["repos", ":owner", ":repo"] + rest)
+    return "/" + "/".join(parts[:1])
+
+
+class _TokenState:
+    def __init__(self, token: Optional[str]):
+        self.token = token
+        self.limit = AUTHENTICATED_LIMIT if token else UNAUTHENTICATED_LIMIT
+        self.remaining = self.limit
+        self.reset_at = 0.0
+        self.requests = 0
+
+    def available(self, now: float) -> int:
+        if self.reset_at and now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = 0.0
+        return self.remaining
+
+    def label(self) -> str:
+        return f"…{self.token[-4:]}" if self.token else "anonymous"
+
+
+class GitHubRateLimiter:
+    """Hands out GitHub tokens by remaining quota and records what each call cost."""
+
+    def __init__(
+        self,
+        tokens: Optional[List[str]] = None,
+        reserve: int = int(os.getenv("GITHUB_RATE_RESERVE", 10)),
+        max_wait: float = float(os.getenv("GITHUB_RATE_MAX_WAIT", 60)),
+    ):
+        tokens = configured_tokens() if tokens is None else tokens
+        self._tokens = [_TokenState(t) for t in tokens] or [_TokenState(None)]
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._rotations = 0
+
+    # ------------------------
+    # Scheduling
+    # ------------------------
+    def acquire(self, exclude: Optional[_TokenState] = None) -> _TokenState:
+        """
+        Reserve one request on the token with the most quota left.
+
+        Blocks (up to `max_wait`) for the earliest reset when every token is
+        at its reserve; past that the best token is used anyway and GitHub's
+        own 403 is left to the caller.
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                candidates = [s for s in self._tokens if s is not exclude] or self._tokens
+                best = max(candidates, key=lambda s: s.available(now))
+                if best.remaining > self.reserve:
+                    best.remaining -= 1
+                    best.requests += 1
+                    return best
+                wait = min((s.reset_at for s in candidates if s.reset_at), default=now) - now
+                if wait <= 0 or wait > self.max_wait:
+                    if wait > self.max_wait:
+                        logger.warning(
+                            f"⚠️ GitHub quota exhausted on all tokens; next reset in {wait:.0f}s"
+                        )
+                    best.remaining = max(0, best.remaining - 1)
+                    best.requests += 1
+                    return best
+                self._waits += 1
+                self._wait_seconds += wait
+            logger.info(f"⏳ GitHub quota at reserve; waiting {wait:.1f}s for reset")
+            time.sleep(wait)
+
+    def record(self, state: _TokenState, url_path: str, response: requests.Response) -> None:
+        """Update `state` from the response's rate-limit headers and count the call."""
+        headers = response.headers
+        endpoint = endpoint_name(url_path)
+        with self._lock:
+            # GraphQL has its own points budget; per-token state tracks the REST ("core") quota.
+            core = headers.get("X-RateLimit-Resource", "core") == "core"
+            if core and "X-RateLimit-Remaining" in headers:
+                try:
+                    state.limit = int(headers.get("X-RateLimit-Limit", state.limit))
+                    state.remaining = int(headers["X-RateLimit-Remaining"])
+                    state.reset_at = float(headers.get("X-RateLimit-Reset", state.reset_at))
+                except ValueError:
+                    pass
+            if core and self.is_rate_limited(response):
+                state.remaining = 0
+                retry_after = headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    state.reset_at = max(state.reset_at, time.time() + int(retry_after))
+
+            stats = self._endpoints.setdefault(
+                endpoint, {"requests": 0, "quota_used": 0, "not_modified": 0, "rate_limited": 0}
+            )
+            stats["requests"] += 1
+            if response.status_code == 304:
+                stats["not_modified"] += 1
+            else:
+                stats["quota_used"] += 1
+            if self.is_rate_limited(response):
+                stats["rate_limited"] += 1
+
+    def rotated(self) -> None:
+        with self._lock:
+            self._rotations += 1
+
+    def has_spare(self, exclude: _TokenState) -> bool:
+        """True when a token other than `exclude` still has quota above the reserve."""
+        with self._lock:
+            now = time.time()
+            return any(s is not exclude and s.available(now) > self.reserve for s in self._tokens)
+
+    @staticmethod
+    def is_rate_limited(response: requests.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        return response.status_code == 403 and (
+            response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers
+        )
+
+    # ------------------------
+    # Stats
+    # ------------------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            return {
+                "tokens": [
+                    {
+                        "token": s.label(),
+                        "remaining": s.available(now),
+                        "limit": s.limit,
+                        "reset_in": max(0, round(s.reset_at - now)) if s.reset_at else 0,
+                        "requests": s.requests,
+                    }
+                    for s in self._tokens
+                ],
+                "endpoints": {k: dict(v) for k, v in self._endpoints.items()},
+                "waits": self._waits,
+                "wait_seconds": round(self._wait_seconds, 3),
+                "rotations": self._rotations,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._endpoints = {}
+            self._waits = 0
+            self._wait_seconds = 0.0
+            self._rotations = 0
@@ -0,0 +1,242 @@
+"""Shared HTTP client.
+
+One process-wide `requests.Session` used by the fetchers, metrics and backend
+services so calls to api.github.com / huggingface.co reuse pooled keep-alive
+connections instead of opening a fresh TCP+TLS connection per request.
+Idempotent requests are retried with jittered exponential backoff on 429/5xx
+(honouring `Retry-After`). The process-wide client also consults the on-disk
+`ResponseCache` for GitHub / Hugging Face API GETs (see `ResponseCache.py`)
+and schedules api.github.com calls across a token pool by remaining quota
+(see `GitHubRateLimiter.py`).
+
+Tuning (environment variables):
+  HTTP_POOL_CONNECTIONS  hosts kept in the pool cache (default 16)
+  HTTP_POOL_MAXSIZE      keep-alive connections per host (default 32)
+  HTTP_RETRIES           retry attempts per request (default 3)
+  HTTP_BACKOFF           backoff factor in seconds (default 0.5)
+  HTTP_BACKOFF_JITTER    max random seconds added to each backoff (default 0.5)
+  HTTP_CONNECT_TIMEOUT   connect timeout in seconds (default 5)
+  HTTP_READ_TIMEOUT      read timeout in seconds (default 30)
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cli.utils.GitHubRateLimiter import GITHUB_API_HOST, GitHubRateLimiter
+from cli.utils.ResponseCache import ResponseCache, make_response_cache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """
+    Pooled, retrying HTTP client.
+
+    Exposes `get`, `head` and `post` with the `requests` call signature; a
+    per-call `timeout` overrides the configured default. `stats()` reports
+    how many requests were served over reused connections. With a `cache`,
+    non-streaming GETs to cacheable hosts go through it; with a `github`
+    limiter, api.github.com calls are authenticated and paced by it.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = int(os.getenv("HTTP_POOL_CONNECTIONS", 16)),
+        pool_maxsize: int = int(os.getenv("HTTP_POOL_MAXSIZE", 32)),
+        retries: int = int(os.getenv("HTTP_RETRIES", 3)),
+        backoff_factor: float = float(os.getenv("HTTP_BACKOFF", 0.5)),
+        backoff_jitter: float = float(os.getenv("HTTP_BACKOFF_JITTER", 0.5)),
+        connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5)),
+        read_timeout: float = float(os.getenv("HTTP_READ_TIMEOUT", 30)),
+        cache: Optional[ResponseCache] = None,
+        github: Optional[GitHubRateLimiter] = None,
+    ):
+        self.cache = cache
+        self.github = github
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            # Hand the final 429/5xx back to the caller instead of raising,
+            # so existing `status_code` checks keep working.
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._by_host: Dict[str, int] = {}
+
+    # ------------------------
+    # Requests
+    # ------------------------
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        if self.github is not None and urlparse(url).netloc == GITHUB_API_HOST:
+            return self._github_request(self.github, method, url, **kwargs)
+        return self._send(method, url, **kwargs)
+
+    def _github_request(
+        self, limiter: GitHubRateLimiter, method: str, url: str, **kwargs: Any
+    ) -> requests.Response:
+        """Send on the token with most quota left; retry once on another token if rate limited."""
+        path = urlparse(url).path
+        state = limiter.acquire()
+        response = self._send(method, url, **self._with_token(kwargs, state.token))
+        limiter.record(state, path, response)
+        if limiter.is_rate_limited(response) and limiter.has_spare(state):
+            logger.warning(f"⚠️ GitHub rate limit hit on token {state.label()}; rotating")
+            limiter.rotated()
+            state = limiter.acquire(exclude=state)
+            response = self._send(method, url, **self._with_token(kwargs, state.token))
+            limiter.record(state, path, response)
+        return response
+
+    @staticmethod
+    def _with_token(kwargs: Dict[str, Any], token: Optional[str]) -> Dict[str, Any]:
+        if not token:
+            return kwargs
+        headers = {k: v for k, v in (kwargs.get("headers") or {}).items() if k.lower() != "authorization"}
+        headers["Authorization"] = f"token {token}"
+        return {**kwargs, "headers": headers}
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, url, **kwargs)
+        retries = getattr(getattr(response.raw, "retries", None), "history", ()) or ()
+        host = urlparse(url).netloc
+        with self._lock:
+            self._requests += 1
+            self._retries += len(retries)
+            self._by_host[host] = self._by_host.get(host, 0) + 1
+        return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        if self.cache is not None and not kwargs.get("stream") and self.cache.cacheable(url):
+            return self._cached_get(self.cache, url, **kwargs)
+        return self.request("GET", url, **kwargs)
+
+    def _cached_get(self, cache: ResponseCache, url: str, **kwargs: Any) -> requests.Response:
+        """Serve from the cache while fresh, otherwise revalidate with the stored validators."""
+        key = cache.key(url, kwargs.get("headers"), kwargs.get("params"))
+        try:
+            entry = cache.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ HTTP cache unavailable, bypassing: {e}")
+            return self.request("GET", url, **kwargs)
+
+        if entry is not None and entry.is_fresh(cache.ttl_seconds):
+            cache.count("hits")
+            return entry.to_response("HIT")
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        response = self.request("GET", url, headers=headers, **kwargs)
+
+        try:
+            if entry is not None and response.status_code == 304:
+                cache.count("revalidations")
+                cache.refresh(key, response)
+                return entry.to_response("REVALIDATED")
+            cache.count("misses")
+            if response.status_code == 200:
+                cache.put(key, response)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to update HTTP cache: {e}")
+        return response
+
+    def head(self, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    # ------------------------
+    # Stats
+    # ------------------------
+    def stats(self) -> Dict[str, Any]:
+        """
+        Connection-reuse statistics since start (or the last `reset_stats`).
+
+        `connections_opened` comes from the urllib3 pools, so hosts evicted
+        from the pool cache stop contributing to it.
+        """
+        opened = 0
+        pool_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                pool_requests += pool.num_requests
+        with self._lock:
+            total = self._requests
+            stats = {
+                "requests": total,
+                "retries": self._retries,
+                "connections_opened": opened,
+                "connections_reused": max(0, pool_requests - opened),
+                "reuse_ratio": round(1 - opened / pool_requests, 3) if pool_requests else 0.0,
+                "requests_by_host": dict(self._by_host),
+            }
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.github is not None:
+            stats["github"] = self.github.stats()
+        return stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._requests = 0
+            self._retries = 0
+            self._by_host = {}
+        if self.cache is not None:
+            self.cache.reset_stats()
+        if self.github is not None:
+            self.github.reset_stats()
+        self.adapter.poolmanager.clear()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Return the process-wide client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(cache=make_response_cache(), github=GitHubRateLimiter())
+    return _client
+
+
+http_client = get_http_client()
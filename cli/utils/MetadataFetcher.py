@@ -5,6 +5,8 @@ repositories, including a suitable download URL when available.
 """
 
 import requests
+from cli.utils.HttpClient import http_client
+from cli.utils.GitHubGraphQL import github_graphql
 from urllib.parse import urlparse
 import logging
 import os
@@ -98,7 +100,7 @@ class MetadataFetcher:
     # ----- Internal fetch helpers -----
     def _fetch_metadata(self, api_url: str) -> dict:
         try:
-            response = requests.get(api_url, headers=self.headers, timeout=10)
+            response = http_client.get(api_url, headers=self.headers)
             response.raise_for_status()
             logger.info("Fetched metadata from %s", api_url)
             return response.json()
@@ -109,7 +111,8 @@ class MetadataFetcher:
     def _fetch_hf_model_metadata(self, url: str) -> dict:
         try:
             model_id = urlparse(url).path.strip("/")
-            api_url = f"https://huggingface.co/api/models/{model_id}"
+            # blobs=true adds per-file sizes to `siblings` (used by the ingest size preflight).
+            api_url = f"https://huggingface.co/api/models/{model_id}?blobs=true"
             return self._fetch_metadata(api_url)
         except Exception as e:
             logger.exception("Failed to fetch Hugging Face model metadata: %s", url)
@@ -131,6 +134,9 @@ class MetadataFetcher:
             if len(parts) < 2:
                 return {"artifact_type": "unknown", "error": "GitHub URL must include owner/repo"}
             owner, repo = parts[:2]
+            bundle = github_graphql.bundle(f"{owner}/{repo}")
+            if bundle:
+                return dict(bundle["metadata"])
             api_url = f"https://api.github.com/repos/{owner}/{repo}"
             return self._fetch_metadata(api_url)
         except Exception as e:
@@ -4,14 +4,21 @@ Builds the structured input required by the metric scorers by delegating to
 individual data fetchers.
 """
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import contextvars
+import functools
 import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 try:
     from ModelRegistry.cli.utils.MetadataFetcher import MetadataFetcher
 except ModuleNotFoundError:
     from cli.utils.MetadataFetcher import MetadataFetcher
 
 try:
+    from ModelRegistry.datafetchers.fetch_context import fetch_context
     from ModelRegistry.datafetchers.licensedata_fetcher import LicenseDataFetcher
     from ModelRegistry.datafetchers.busfactordata_fetcher import BusFactorDataFetcher
     from ModelRegistry.datafetchers.datasetdata_fetcher import DatasetDataFetcher
@@ -21,6 +28,7 @@ try:
     from ModelRegistry.datafetchers.rampuptimedata_fetcher import RampUpTimeDataFetcher
     from ModelRegistry.datafetchers.datasetnCodedata_fetcher import DatasetAndCodeDataFetcher
 except ModuleNotFoundError:
+    from datafetchers.fetch_context import fetch_context
     from datafetchers.licensedata_fetcher import LicenseDataFetcher
     from datafetchers.busfactordata_fetcher import BusFactorDataFetcher
     from datafetchers.datasetdata_fetcher import DatasetDataFetcher
@@ -33,6 +41,76 @@ except ModuleNotFoundError:
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Shared pool for fetcher calls across all concurrent ingests.
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", 16))
+# Seconds each fetcher may run, counted from when it starts on a worker, before
+# it is dropped. A fetcher still queued this long after submission is cancelled.
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", 20))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _fetch_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="fetch")
+    return _executor
+
+
+def run_with_deadline(
+    calls: List[Tuple[str, Callable[[], Any]]], deadline: float
+) -> Tuple[List[Future], List[int]]:
+    """
+    Run named `calls` on the shared fetch pool; wait until each finishes or misses `deadline`.
+
+    Each call's deadline starts when a worker picks it up, so time spent queued
+    behind other ingests' fetchers does not count against it. A call that has
+    not started `deadline` seconds after submission is cancelled.
+
+    Returns the futures in `calls` order and the positions of the calls that missed.
+    """
+    executor = _fetch_executor()
+    started: Dict[int, float] = {}
+
+    def timed(i: int, call: Callable[[], Any]) -> Any:
+        started[i] = time.monotonic()
+        return call()
+
+    submitted = time.monotonic()
+    # Each task gets a copy of this context so the fetch context follows it.
+    futures = [
+        executor.submit(contextvars.copy_context().run, timed, i, call) for i, (_, call) in enumerate(calls)
+    ]
+    pending = set(range(len(futures)))
+    missed = set()
+    while pending:
+        now = time.monotonic()
+        for i in sorted(pending):
+            name = calls[i][0]
+            if futures[i].done():
+                pending.discard(i)
+            elif i not in started:
+                if now - submitted >= deadline and futures[i].cancel():
+                    logger.warning("Fetcher %s was still queued after %.1fs; cancelled", name, deadline)
+                    missed.add(i)
+                    pending.discard(i)
+            elif now - started[i] >= deadline:
+                logger.warning("Fetcher %s missed the %.1fs deadline; skipping its data", name, deadline)
+                missed.add(i)
+                pending.discard(i)
+        if pending:
+            expires = min(started.get(i, submitted) + deadline for i in pending)
+            wait([futures[i] for i in pending], timeout=max(0.0, expires - now), return_when=FIRST_COMPLETED)
+    return futures, sorted(missed)
+
+
+def fetch_label(meta_info: Dict[str, Any]) -> str:
+    """Name of an artifact's fetch context in logs."""
+    return str(meta_info.get("id") or meta_info.get("full_name") or "")
+
 
 class MetricDataFetcher:
     """
@@ -53,34 +131,85 @@ class MetricDataFetcher:
             DatasetAndCodeDataFetcher()
         ]
 
-    def fetch_artifact_data(self, meta_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Fetch structured data for all metrics from pre-fetched meta."""
-        artifact_type = meta_info.get("artifact_type", "unknown")
-        raw = meta_info
-        artifact_data: Dict[str, Any] = {}
-        for fetcher in self.fetchers:
-            try:
-                if artifact_type == "model":
-                    artifact_data.update(fetcher.fetch_Modeldata(raw))
-                elif artifact_type == "dataset":
-                    artifact_data.update(fetcher.fetch_Datasetdata(raw))
-                elif artifact_type == "code":
-                    artifact_data.update(fetcher.fetch_Codedata(raw))
-                else:
-                    # Unknown type: try all, best-effort
-                    artifact_data.update(fetcher.fetch_Modeldata(raw))
-                    artifact_data.update(fetcher.fetch_Datasetdata(raw))
-                    artifact_data.update(fetcher.fetch_Codedata(raw))
-            except Exception as e:
-                logger.debug(
-                    "Fetcher %s failed: %s",
-                    fetcher.__class__.__name__,
-                    e,
-                )
-                continue
+    def fetch_artifact_data(
+        self,
+        meta_info: Dict[str, Any],
+        deadline: Optional[float] = None,
+        fetchers: Optional[Iterable[str]] = None,
+        on_missed: Optional[Callable[[List[str]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Fetch structured data for all metrics from pre-fetched meta.
+
+        Fetchers run in parallel on a shared executor and share one fetch
+        context, so a README, linked repo, tree or commit list needed by
+        several metrics is fetched only once. Results are merged in fetcher
+        order, exactly as a sequential run would. A fetcher that runs longer
+        than `deadline` seconds (default `FETCH_DEADLINE`), or is still queued
+        that long, contributes nothing; their class names are passed to
+        `on_missed`. `fetchers` limits the run to those fetcher class names
+        (see `MetricScorer.fetchers_for`).
+        """
+        selected = self.select(fetchers)
+        with fetch_context(fetch_label(meta_info)):
+            artifact_data, missed = self._run_fetchers(
+                meta_info, FETCH_DEADLINE if deadline is None else deadline, selected
+            )
+        if missed and on_missed is not None:
+            on_missed(missed)
         artifact_data["download_url"] = meta_info.get("download_url")
         return artifact_data
 
+    def select(self, fetchers: Optional[Iterable[str]] = None) -> List[Any]:
+        """The fetcher instances named in `fetchers` (class names), in merge order; all of them for None."""
+        if fetchers is None:
+            return list(self.fetchers)
+        wanted = set(fetchers)
+        return [f for f in self.fetchers if f.__class__.__name__ in wanted]
+
+    def _run_fetchers(
+        self, meta_info: Dict[str, Any], deadline: float, fetchers: List[Any]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        futures, missed = run_with_deadline(
+            [(f.__class__.__name__, functools.partial(self.run_fetcher, f, meta_info)) for f in fetchers], deadline
+        )
+
+        artifact_data: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        for i, (fetcher, future) in enumerate(zip(fetchers, futures)):
+            if i in missed:
+                continue
+            results, seconds = future.result()
+            timings[fetcher.__class__.__name__] = round(seconds, 3)
+            for result in results:
+                artifact_data.update(result)
+        logger.info("Fetcher timings (s): %s", timings)
+        return artifact_data, [fetchers[i].__class__.__name__ for i in missed]
+
+    def run_fetcher(self, fetcher, raw: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float]:
+        """Run one fetcher for the artifact type; returns its partial results and duration."""
+        artifact_type = raw.get("artifact_type", "unknown")
+        start = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        try:
+            if artifact_type == "model":
+                results.append(dict(fetcher.fetch_Modeldata(raw)))
+            elif artifact_type == "dataset":
+                results.append(dict(fetcher.fetch_Datasetdata(raw)))
+            elif artifact_type == "code":
+                results.append(dict(fetcher.fetch_Codedata(raw)))
+            else:
+                # Unknown type: try all, best-effort
+                results.append(dict(fetcher.fetch_Modeldata(raw)))
+                results.append(dict(fetcher.fetch_Datasetdata(raw)))
+                results.append(dict(fetcher.fetch_Codedata(raw)))
+        except Exception as e:
+            logger.debug(
+                "Fetcher %s failed: %s",
+                fetcher.__class__.__name__,
+                e,
+            )
+        return results, time.perf_counter() - start
+
     def run(self):
         """Interactive main method to test metadata and metrics fetching."""
         url = input("Enter a model/dataset/repo URL: ").strip()
@@ -5,9 +5,11 @@ a combined response payload.
 """
 
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from decimal import Decimal, ROUND_HALF_UP
 
 try:
@@ -36,11 +38,68 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Shared pool for metric evaluations across all concurrent scoring calls.
+SCORE_WORKERS = int(os.getenv("SCORE_WORKERS", 32))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _score_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=SCORE_WORKERS, thread_name_prefix="score")
+    return _executor
+
+
+# Output keys that differ from the internal metric name.
+_TOP_KEYS = {"dataset_and_code": "dataset_and_code_score"}
+_SIZE_DEVICES = ("raspberry_pi", "jetson_nano", "desktop_pc", "aws_server")
+
+
+def parse_metric_selection(raw: Any, available: Iterable[str]) -> Optional[List[str]]:
+    """
+    Metric names from a `metrics=` selection (comma-separated string or list).
+
+    Output key spellings (`dataset_and_code_score`) are accepted. Returns None
+    when nothing is selected, meaning every metric. Raises ValueError naming
+    any unknown metric.
+    """
+    if raw is None:
+        return None
+    items = raw.split(",") if isinstance(raw, str) else list(raw)
+    aliases = {top: name for name, top in _TOP_KEYS.items()}
+    names = [aliases.get(item.strip(), item.strip()) for item in items if item and item.strip()]
+    if not names:
+        return None
+    available = list(available)
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)} (available: {', '.join(available)})")
+    return [n for n in available if n in names]
+
+
+def project_scores(scores: Dict[str, Any], names: Iterable[str]) -> Dict[str, Any]:
+    """The `name`/`category` fields and the score + latency fields of `names` from a ModelRating payload."""
+    out = {key: scores[key] for key in ("name", "category") if key in scores}
+    for name in names:
+        top = _TOP_KEYS.get(name, name)
+        for key in (top, f"{top}_latency"):
+            if key in scores:
+                out[key] = scores[key]
+    return out
+
 
 class MetricScorer:
     """
     Runs all 8 metrics for any artifact type.
     Returns scores, latencies, and a weighted net score as **strings**.
+
+    Metric evaluations of every scorer in the process run on one bounded pool
+    (`SCORE_WORKERS` threads), so concurrent requests queue for it instead
+    of each starting threads of their own.
     """
 
     def __init__(self):
@@ -80,6 +139,7 @@ class MetricScorer:
         *,
         flat: bool = False,
         as_json_str: bool = True,
+        metrics: Optional[List[str]] = None,
     ) -> Any:
         """
         Run metrics and return ALL scores + latencies + net score.
@@ -88,64 +148,197 @@ class MetricScorer:
         - flat: if True, return a flat mapping of metric keys -> numeric values
           (backward-compatible shape).
         - as_json_str: if True (default), return a JSON string; otherwise a dict.
+        - metrics: run only these metrics (see `parse_metric_selection`). The
+          result then holds just their fields, without `net_score`.
 
         By default returns a JSON string with numeric values suitable for the autograder.
         """
-        results: Dict[str, Decimal] = {}
+        return self.score_many([data], flat=flat, as_json_str=as_json_str, metrics=metrics)[0]
 
-        def run_metric(name: str, metric):
-            try:
-                res = metric.getScores(data)
-            except Exception as e:
-                logger.debug("Metric %s failed: %s", name, e)
-                if name == "size_score":
-                    res = {
-                        "raspberry_pi": 0.0,
-                        "jetson_nano": 0.0,
-                        "desktop_pc": 0.0,
-                        "aws_server": 0.0,
-                        "latency": 0.0,
-                    }
-                else:
-                    res = {"score": 0.0, "latency": 0.0}
-            return name, res
+    def score_many(
+        self,
+        artifacts: List[Dict[str, Any]],
+        *,
+        flat: bool = False,
+        as_json_str: bool = True,
+        metrics: Optional[List[str]] = None,
+    ) -> List[Any]:
+        """
+        Score several artifacts at once; results come back in input order.
 
+        Every metric x artifact evaluation is queued on the shared pool up
+        front, so a bulk re-score keeps all workers busy. Each artifact's
+        `net_latency` runs from submission until its last metric finished.
+        """
+        names = list(self.metrics) if metrics is None else [n for n in self.metrics if n in metrics]
+        executor = _score_executor()
         start_time = time.time()
+        submitted: List[List[Future]] = [
+            [executor.submit(self.run_metric, name, self.metrics[name], data) for name in names]
+            for data in artifacts
+        ]
+        return [
+            self.finalize([f.result() for f in futures], start_time, names, flat=flat, as_json_str=as_json_str)
+            for futures in submitted
+        ]
+
+    def finalize(
+        self,
+        metric_results: List[Tuple[str, Dict[str, Any], float]],
+        start_time: float,
+        metrics: Optional[List[str]] = None,
+        *,
+        flat: bool = False,
+        as_json_str: bool = True,
+    ) -> Any:
+        """
+        Build one artifact's scores payload from its `run_metric` results.
 
-        # Run metrics concurrently
-        with ThreadPoolExecutor(max_workers=len(self.metrics)) as executor:
-            futures = {
-                executor.submit(run_metric, name, metric): name
-                for name, metric in self.metrics.items()
-            }
+        `net_latency` runs from `start_time` until the last metric finished.
+        When `metrics` is a strict subset, only their fields are kept.
+        """
+        out = self._combine(metric_results, start_time, flat, False)
+        if metrics is not None and len(metrics) < len(self.metrics):
+            out = self._project(out, metrics, flat)
+        return json.dumps(out) if as_json_str else out
+
+    def fetchers_for(self, metrics: Optional[List[str]]) -> Optional[List[str]]:
+        """Data fetchers (class names) the selected metrics need; None (every fetcher) for no selection."""
+        if metrics is None:
+            return None
+        needed: List[str] = []
+        for name in metrics:
+            for fetcher in getattr(self.metrics[name], "fetchers", ()):
+                if fetcher not in needed:
+                    needed.append(fetcher)
+        return needed
+
+    def dependents(self, fetchers: Iterable[str]) -> List[str]:
+        """Metrics that read any of `fetchers` (class names); a metric declaring no `fetchers` reads them all."""
+        wanted = set(fetchers)
+        return [
+            name for name, metric in self.metrics.items()
+            if not getattr(metric, "fetchers", ()) or wanted.intersection(metric.fetchers)
+        ]
+
+    def metric_versions(self) -> Dict[str, int]:
+        """The version of every metric, by metric name (recorded with stored scores)."""
+        return {name: int(getattr(metric, "version", 1)) for name, metric in self.metrics.items()}
+
+    def input_features(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """The part of `data` the metrics declare as inputs; enough to re-score without fetching."""
+        keys = {key for metric in self.metrics.values() for key in getattr(metric, "inputs", ())}
+        return {key: data[key] for key in sorted(keys) if key in data}
+
+    def rescore(
+        self,
+        data: Dict[str, Any],
+        scores: Dict[str, Any],
+        versions: Optional[Dict[str, Any]] = None,
+        *,
+        as_json_str: bool = False,
+    ) -> Tuple[Any, List[str]]:
+        """
+        Re-score an artifact, recomputing only metrics whose version changed.
 
-            for future in as_completed(futures):
-                name, metric_result = future.result()
+        `scores` is an earlier `score_artifact` result (ModelRating shape) and
+        `versions` the metric versions it was computed with; metrics missing
+        from `versions` count as changed. Unchanged metrics keep their stored
+        score and latency, and `net_score` is recombined from all of them.
+        `net_score_latency` covers the recomputed metrics only.
 
-                if name == "size_score":
-                    for dev in [
-                        "raspberry_pi",
-                        "jetson_nano",
-                        "desktop_pc",
-                        "aws_server",
-                    ]:
-                        results[dev] = self._to_decimal(metric_result.get(dev, 0.0))
+        Returns (scores, names of the metrics that were recomputed).
+        """
+        versions = versions or {}
+        current = self.metric_versions()
+        changed = [
+            name for name in self.metrics
+            if versions.get(name) is None or int(versions[name]) != current[name]
+        ]
+        executor = _score_executor()
+        start_time = time.time()
+        futures = {name: executor.submit(self.run_metric, name, self.metrics[name], data) for name in changed}
+        results = [
+            futures[name].result() if name in futures else (name, self._stored_result(name, scores), start_time)
+            for name in self.metrics
+        ]
+        out = self._combine(results, start_time, False, False)
+        out["name"] = scores.get("name", "")
+        out["category"] = scores.get("category", "")
+        return (json.dumps(out) if as_json_str else out), changed
 
-                    # pick whichever latency key is present
-                    size_latency = metric_result.get(
-                        "latency", metric_result.get("size_score_latency", 0.0)
-                    )
-                    results["size_score_latency"] = self._to_decimal(size_latency)
-                    # also keep a generic "latency" key to preserve earlier behavior
-                    results["latency"] = self._to_decimal(size_latency)
-                else:
-                    results[name] = self._to_decimal(metric_result.get("score", 0.0))
-                    results[f"{name}_latency"] = self._to_decimal(
-                        metric_result.get("latency", 0.0)
-                    )
+    @staticmethod
+    def run_metric(name: str, metric, data: Dict[str, Any]) -> Tuple[str, Dict[str, Any], float]:
+        """Evaluate one metric; returns (name, result, finish time). A failing metric scores 0."""
+        try:
+            res = metric.getScores(data)
+        except Exception as e:
+            logger.debug("Metric %s failed: %s", name, e)
+            if name == "size_score":
+                res = {
+                    "raspberry_pi": 0.0,
+                    "jetson_nano": 0.0,
+                    "desktop_pc": 0.0,
+                    "aws_server": 0.0,
+                    "latency": 0.0,
+                }
+            else:
+                res = {"score": 0.0, "latency": 0.0}
+        return name, res, time.time()
+
+    @staticmethod
+    def _project(out: Dict[str, Any], names: List[str], flat: bool) -> Dict[str, Any]:
+        """Keep only the selected metrics' fields of a scores payload."""
+        if not flat:
+            return project_scores(out, names)
+        keys = []
+        for name in names:
+            keys += [*_SIZE_DEVICES, "size_score_latency"] if name == "size_score" else [name, f"{name}_latency"]
+        return {key: out[key] for key in keys if key in out}
+
+    @staticmethod
+    def _stored_result(name: str, scores: Dict[str, Any]) -> Dict[str, Any]:
+        """A metric's `getScores`-style result, read back from a ModelRating payload."""
+        if name == "size_score":
+            res = dict(scores.get("size_score") or {})
+            res["latency"] = scores.get("size_score_latency", 0.0)
+            return res
+        key = "dataset_and_code_score" if name == "dataset_and_code" else name
+        return {"score": scores.get(key, 0.0), "latency": scores.get(f"{key}_latency", 0.0)}
+
+    def _combine(
+        self, metric_results: List[Tuple[str, Dict[str, Any], float]], start_time: float, flat: bool, as_json_str: bool
+    ) -> Any:
+        """Fold one artifact's (name, result, finish time) metric results into the scores payload."""
+        results: Dict[str, Decimal] = {}
+        finished = start_time
+        for name, metric_result, done_at in metric_results:
+            finished = max(finished, done_at)
+
+            if name == "size_score":
+                for dev in [
+                    "raspberry_pi",
+                    "jetson_nano",
+                    "desktop_pc",
+                    "aws_server",
+                ]:
+                    results[dev] = self._to_decimal(metric_result.get(dev, 0.0))
+
+                # pick whichever latency key is present
+                size_latency = metric_result.get(
+                    "latency", metric_result.get("size_score_latency", 0.0)
+                )
+                results["size_score_latency"] = self._to_decimal(size_latency)
+                # also keep a generic "latency" key to preserve earlier behavior
+                results["latency"] = self._to_decimal(size_latency)
+            else:
+                results[name] = self._to_decimal(metric_result.get("score", 0.0))
+                results[f"{name}_latency"] = self._to_decimal(
+                    metric_result.get("latency", 0.0)
+                )
 
         # Compute net latency
-        net_latency = Decimal(str((time.time() - start_time) * 1000)).quantize(
+        net_latency = Decimal(str((finished - start_time) * 1000)).quantize(
             Decimal("0.01"), rounding=ROUND_HALF_UP
         )
 
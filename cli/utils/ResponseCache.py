@@ -0,0 +1,212 @@
+"""On-disk HTTP response cache.
+
+Stores successful GET responses from the GitHub and Hugging Face APIs in a
+SQLite file so re-rating or re-ingesting an artifact does not spend API rate
+limit on payloads we already have. Entries are served directly while fresh
+(`HTTP_CACHE_TTL`); stale entries are revalidated with `If-None-Match` /
+`If-Modified-Since`, and GitHub does not count the resulting 304s against the
+rate limit. Total size is bounded (`HTTP_CACHE_MAX_MB`) with least-recently
+used eviction.
+
+Tuning (environment variables):
+  HTTP_CACHE_ENABLED  "0" disables the cache (default "1")
+  HTTP_CACHE_PATH     SQLite file (default .cache/http_cache.db in the repo)
+  HTTP_CACHE_TTL      seconds an entry is served without revalidation (default 3600)
+  HTTP_CACHE_MAX_MB   size bound before LRU eviction (default 256)
+  HTTP_CACHE_HOSTS    comma-separated hosts to cache (default api.github.com,huggingface.co)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), "../../.cache/http_cache.db")
+DEFAULT_CACHE_HOSTS = ("api.github.com", "huggingface.co")
+
+# Response headers worth replaying from the cache.
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link", "X-Linked-Etag", "X-Linked-Size")
+
+
+class CachedEntry:
+    """A stored response plus its validators."""
+
+    def __init__(self, row: sqlite3.Row):
+        self.key = row["key"]
+        self.url = row["url"]
+        self.status = row["status"]
+        self.headers = json.loads(row["headers"])
+        self.body = row["body"]
+        self.etag = row["etag"]
+        self.last_modified = row["last_modified"]
+        self.stored_at = row["stored_at"]
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.stored_at < ttl
+
+    def to_response(self, cache_status: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = self.body
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.headers["X-Cache"] = cache_status
+        response.url = self.url
+        response.reason = "OK"
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        return response
+
+
+class ResponseCache:
+    """SQLite-backed GET response cache with TTL, validators and LRU eviction."""
+
+    def __init__(
+        self,
+        path: str = os.getenv("HTTP_CACHE_PATH", DEFAULT_CACHE_PATH),
+        ttl_seconds: float = float(os.getenv("HTTP_CACHE_TTL", 3600)),
+        max_bytes: int = int(float(os.getenv("HTTP_CACHE_MAX_MB", 256)) * 1024 * 1024),
+        hosts: Optional[Iterable[str]] = None,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        env_hosts = os.getenv("HTTP_CACHE_HOSTS")
+        self.hosts = set(
+            hosts or ([h.strip() for h in env_hosts.split(",") if h.strip()] if env_hosts else DEFAULT_CACHE_HOSTS)
+        )
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._counters = {"hits": 0, "misses": 0, "revalidations": 0, "stores": 0, "evictions": 0}
+
+    # ------------------------
+    # Storage
+    # ------------------------
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL,"
+                " status INTEGER NOT NULL,"
+                " headers TEXT NOT NULL,"
+                " body BLOB NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(accessed_at)")
+            self._initialized = True
+        return conn
+
+    def cacheable(self, url: str) -> bool:
+        return urlparse(url).netloc.lower() in self.hosts
+
+    @staticmethod
+    def key(url: str, headers: Optional[Dict[str, str]] = None, params: Any = None) -> str:
+        """Cache key over the URL, query params and the `Accept` header (which changes payloads)."""
+        accept = ""
+        for name, value in (headers or {}).items():
+            if name.lower() == "accept":
+                accept = value
+        query = urlencode(sorted(params.items()) if isinstance(params, dict) else params or [])
+        raw = f"{url}?{query}|{accept}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedEntry]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT * FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return CachedEntry(row)
+
+    def put(self, key: str, response: requests.Response) -> None:
+        body = response.content or b""
+        if len(body) > self.max_bytes:
+            return
+        headers = {h: response.headers[h] for h in _KEPT_HEADERS if h in response.headers}
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, url, status, headers, body, etag, last_modified, stored_at, accessed_at, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    response.status_code,
+                    json.dumps(headers),
+                    body,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    now,
+                    now,
+                    len(body),
+                ),
+            )
+            self._counters["stores"] += 1
+            self._evict(conn)
+
+    def refresh(self, key: str, response: requests.Response) -> None:
+        """Mark an entry fresh again after a 304, adopting any new validators."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET stored_at = ?, etag = COALESCE(?, etag),"
+                " last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time(), response.headers.get("ETag"), response.headers.get("Last-Modified"), key),
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for row in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (row["key"],))
+            self._counters["evictions"] += 1
+            total -= row["size"]
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    # ------------------------
+    # Counters
+    # ------------------------
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        lookups = stats["hits"] + stats["misses"] + stats["revalidations"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["revalidations"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counters = dict.fromkeys(self._counters, 0)
+
+
+def make_response_cache() -> Optional[ResponseCache]:
+    """Build the process cache unless `HTTP_CACHE_ENABLED=0`."""
+    if os.getenv("HTTP_CACHE_ENABLED", "1") == "0":
+        return None
+    return ResponseCache()
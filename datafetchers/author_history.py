@@ -0,0 +1,212 @@
+"""Incremental commit-author history for the Bus Factor metric.
+
+Keeps, per GitHub repository, the commit count of every author seen so far
+plus a watermark: the newest commit SHA and its date. The first rating walks
+up to `AUTHOR_HISTORY_MAX_PAGES` pages of the commits API; later page fetches
+run concurrently. A re-rate asks only for commits `since` the watermark date
+and stops at the watermark SHA. When the head has not moved, that is one
+(usually cached, 304) request and nothing is rebuilt.
+
+Tuning (environment variables):
+  AUTHOR_HISTORY_ENABLED    "0" falls back to a single page of commits (default "1")
+  AUTHOR_HISTORY_PATH       SQLite file (default .cache/author_history.db in the repo)
+  AUTHOR_HISTORY_MAX_PAGES  pages of 100 commits walked per refresh (default 10)
+  AUTHOR_HISTORY_WORKERS    concurrent page fetches (default 4)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from cli.utils.HttpClient import http_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(__file__), "../.cache/author_history.db")
+_GH_COMMITS_URL = "https://api.github.com/repos/{repo}/commits"
+PER_PAGE = 100
+
+
+def commit_author(commit: Dict[str, Any]) -> Optional[str]:
+    """Author identifier for a commits-API entry: GitHub login, else name, else email."""
+    author = commit.get("author")
+    if isinstance(author, dict) and author.get("login"):
+        return str(author["login"])
+    info = (commit.get("commit") or {}).get("author") or {}
+    if info.get("name"):
+        return str(info["name"])
+    if info.get("email"):
+        return str(info["email"])
+    return None
+
+
+class AuthorHistoryStore:
+    """Per-repo author counts and watermark in a local SQLite file."""
+
+    def __init__(self, path: str = os.getenv("AUTHOR_HISTORY_PATH", DEFAULT_HISTORY_PATH)):
+        self.path = path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS author_history ("
+                " repo TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL)"
+            )
+            self._initialized = True
+        return conn
+
+    def get(self, repo: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT data FROM author_history WHERE repo = ?", (repo.lower(),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, record: Dict[str, Any]) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO author_history (repo, data) VALUES (?, ?)",
+                (record["repo"].lower(), json.dumps(record)),
+            )
+
+
+class AuthorHistory:
+    """Maintains `AuthorHistoryStore` records from the GitHub commits API."""
+
+    def __init__(
+        self,
+        store: Optional[AuthorHistoryStore] = None,
+        max_pages: int = int(os.getenv("AUTHOR_HISTORY_MAX_PAGES", 10)),
+        workers: int = int(os.getenv("AUTHOR_HISTORY_WORKERS", 4)),
+    ):
+        self.store = store or AuthorHistoryStore()
+        self.max_pages = max(1, max_pages)
+        self.workers = max(1, workers)
+        self._repo_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def author_counts(
+        self, repo: str, headers: Optional[Dict[str, str]] = None, head_sha: Optional[str] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Commit counts per author for `repo`, most active first, after bringing
+        the stored history up to date. `head_sha` (when the caller already
+        knows the branch head) skips the API entirely if nothing moved.
+        Returns None when GitHub could not be reached and nothing is stored.
+        """
+        with self._lock:
+            repo_lock = self._repo_locks.setdefault(repo.lower(), threading.Lock())
+        with repo_lock:
+            record = self.store.get(repo)
+            if record and head_sha and record["head_sha"] == head_sha:
+                return self._ordered(record["authors"])
+            record = self._refresh(repo, record, headers or {})
+        return self._ordered(record["authors"]) if record else None
+
+    # ------------------------
+    # Internals
+    # ------------------------
+    def _refresh(
+        self, repo: str, record: Optional[Dict[str, Any]], headers: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        params: Dict[str, Any] = {"per_page": PER_PAGE}
+        if record and record.get("since"):
+            params["since"] = record["since"]
+
+        first = self._page(repo, params, 1, headers)
+        if first is None:
+            return record
+        commits, last_page = first
+        if not commits or (record and commits[0].get("sha") == record["head_sha"]):
+            return record or self._record(repo, None, None, Counter(), 0)
+
+        if last_page > self.max_pages:
+            logger.info(f"Author history for {repo}: walking {self.max_pages} of {last_page} pages")
+        pages = range(2, min(last_page, self.max_pages) + 1)
+        if pages:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="authors") as pool:
+                for result in pool.map(lambda n: self._page(repo, params, n, headers), pages):
+                    if result is None:
+                        # A missing page would leave a gap under the new watermark; retry next time.
+                        return record
+                    commits.extend(result[0])
+
+        counts = Counter(record["authors"]) if record else Counter()
+        new = 0
+        for commit in commits:
+            if record and commit.get("sha") == record["head_sha"]:
+                break
+            author = commit_author(commit)
+            if author:
+                counts[author] += 1
+            new += 1
+
+        head = commits[0]
+        since = ((head.get("commit") or {}).get("committer") or {}).get("date")
+        updated = self._record(
+            repo, head.get("sha"), since, counts, (record["commits"] if record else 0) + new
+        )
+        self.store.put(updated)
+        return updated
+
+    def _page(
+        self, repo: str, params: Dict[str, Any], page: int, headers: Dict[str, str]
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """One page of commits plus the last page number from the `Link` header."""
+        try:
+            resp = http_client.get(
+                _GH_COMMITS_URL.format(repo=repo), params={**params, "page": page}, headers=headers
+            )
+            if resp.status_code != 200:
+                return None
+            commits = resp.json() or []
+            last = (getattr(resp, "links", None) or {}).get("last", {}).get("url")
+            last_page = int(parse_qs(urlparse(last).query).get("page", [page])[0]) if last else page
+            return list(commits), last_page
+        except Exception as e:
+            logger.debug("Commit page %d for %s failed: %s", page, repo, e)
+            return None
+
+    @staticmethod
+    def _record(
+        repo: str, head_sha: Optional[str], since: Optional[str], counts: Counter, commits: int
+    ) -> Dict[str, Any]:
+        return {
+            "repo": repo,
+            "head_sha": head_sha,
+            "since": since,
+            "authors": dict(counts),
+            "commits": commits,
+            "updated_at": time.time(),
+        }
+
+    @staticmethod
+    def _ordered(counts: Dict[str, int]) -> Dict[str, int]:
+        return dict(sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])))
+
+
+_history: Optional[AuthorHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_author_history() -> Optional[AuthorHistory]:
+    """The process-wide history, or None when `AUTHOR_HISTORY_ENABLED=0`."""
+    global _history
+    if os.getenv("AUTHOR_HISTORY_ENABLED", "1") == "0":
+        return None
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = AuthorHistory()
+    return _history
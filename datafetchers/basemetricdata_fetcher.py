@@ -5,8 +5,10 @@ needed for each metric.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+from cli.utils.HttpClient import http_client
 from cli.utils.MetadataFetcher import MetadataFetcher
+from .fetch_context import FetchContext, current_fetch_context
 
 
 class BaseDataFetcher(ABC):
@@ -43,3 +45,77 @@ class BaseDataFetcher(ABC):
         """Fetch dataset metadata for a given URL."""
         self.metadata["dataset"] = data.get("dataset", "unknown")
         return self.metadata
+
+    # -------------------------
+    # Shared remote lookups
+    # -------------------------
+    @property
+    def context(self) -> FetchContext:
+        """The active per-artifact fetch context (a throwaway one outside `fetch_context()`)."""
+        return current_fetch_context() or FetchContext()
+
+    def _make_headers(self) -> Dict[str, str]:
+        # Authorization is added by the shared client's GitHub token scheduler.
+        return {"Accept": "application/vnd.github.v3+json"}
+
+    def _fetch_hf_readme(self, identifier: str, kind: str) -> Optional[str]:
+        """Fetch README.md raw contents from a Hugging Face model or dataset (once per artifact).
+
+        kind: "model" or "dataset"
+        """
+        if not identifier:
+            return None
+        return self.context.memo(
+            ("hf_readme", kind, identifier),
+            lambda: self._load_hf_readme(identifier, kind),
+        )
+
+    def _load_hf_readme(self, identifier: str, kind: str) -> Optional[str]:
+        base = "https://huggingface.co"
+        if kind == "dataset":
+            url = f"{base}/datasets/{identifier}/resolve/main/README.md"
+        else:
+            url = f"{base}/{identifier}/resolve/main/README.md"
+        try:
+            resp = http_client.get(url)
+            if resp.status_code == 200 and isinstance(resp.text, str):
+                return resp.text
+        except Exception:
+            return None
+        return None
+
+    def _linked_github_repo(self, identifier: str, kind: str) -> Optional[str]:
+        """Return the "owner/repo" a Hugging Face model/dataset README links to, if any."""
+        if not identifier:
+            return None
+        return self.context.memo(
+            ("linked_repo", kind, identifier),
+            lambda: self._extract_github_repo_from_text(self._fetch_hf_readme(identifier, kind) or ""),
+        )
+
+    @staticmethod
+    def _extract_github_repo_from_text(text: str) -> Optional[str]:
+        """Extract first GitHub owner/repo from a README or text blob.
+
+        Returns value like "owner/repo" or None.
+        """
+        if not text:
+            return None
+        # Simple heuristic search to avoid heavy regex dependencies
+        marker = "github.com/"
+        idx = text.find(marker)
+        if idx == -1:
+            return None
+        frag = text[idx + len(marker) : idx + len(marker) + 200]
+        # Split on delimiters that commonly follow repo paths
+        for delim in [" ", "\n", "\r", "\t", ")", "]", "<", ">", '"', "'", "#"]:
+            frag = frag.split(delim)[0]
+        # owner/repo[/...]
+        parts = frag.strip().split("/")
+        if len(parts) >= 2:
+            owner = parts[0]
+            # Clean trailing punctuation
+            repo = parts[1].rstrip(".,);]\n\r")
+            if owner and repo:
+                return f"{owner}/{repo}"
+        return None
@@ -4,9 +4,11 @@ This module pulls evidence from GitHub/Hugging Face sources and normalizes it
 into a dict shape expected by the bus factor scoring logic.
 """
 
-import os
-from typing import Any, Dict, List, Optional, Set
-import requests
+from collections import Counter
+from typing import Any, Dict, List, Set
+from cli.utils.GitHubGraphQL import COMMIT_HISTORY, github_graphql
+from cli.utils.HttpClient import http_client
+from .author_history import commit_author, get_author_history
 from .basemetricdata_fetcher import BaseDataFetcher
 
 
@@ -18,10 +20,11 @@ class BusFactorDataFetcher(BaseDataFetcher):
     """Fetches evidence needed for Bus Factor metric.
 
     Output shape:
-      { "commit_authors": List[str] }
+      { "commit_authors": List[str], "author_commit_counts": Dict[str, int] }
 
     Sources handled:
       - GitHub repo metadata (fetch_Codedata): use commits API to collect authors
+          (incrementally, through the per-repo author history store)
       - HF model/dataset metadata (fetch_Modeldata/fetch_Datasetdata):
           attempt to discover a linked GitHub repo from README and query it
     """
@@ -40,45 +43,59 @@ class BusFactorDataFetcher(BaseDataFetcher):
         """
         repo_full_name = str(data.get("full_name", "") or "").strip()
         if not repo_full_name:
-            return {"commit_authors": []}
-
-        authors = self._fetch_commit_authors_from_github(repo_full_name, per_page=100)
-        unique_authors = self._unique_preserve_order(authors)
-        return {"commit_authors": unique_authors}
+            return {"commit_authors": [], "author_commit_counts": {}}
+        return self._authors_result(repo_full_name)
 
     def fetch_Modeldata(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Attempt to find a linked GitHub repo for a Hugging Face model and fetch authors."""
         # Try README of the HF model repo to locate a GitHub repo reference
         model_id = str(data.get("id", "") or data.get("modelId", "") or "").strip()
         if model_id:
-            readme = self._fetch_hf_readme(model_id, kind="model")
-            repo = self._extract_github_repo_from_text(readme or "") if readme else None
+            repo = self._linked_github_repo(model_id, kind="model")
             if repo:
-                authors = self._fetch_commit_authors_from_github(repo, per_page=100)
-                return {"commit_authors": self._unique_preserve_order(authors)}
+                return self._authors_result(repo)
         # If no repo found, return empty list
-        return {"commit_authors": []}
+        return {"commit_authors": [], "author_commit_counts": {}}
 
     def fetch_Datasetdata(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Attempt to find a linked GitHub repo for a Hugging Face dataset and fetch authors."""
         ds_id = str(data.get("id", "") or "").strip()
         if ds_id:
-            readme = self._fetch_hf_readme(ds_id, kind="dataset")
-            repo = self._extract_github_repo_from_text(readme or "") if readme else None
+            repo = self._linked_github_repo(ds_id, kind="dataset")
             if repo:
-                authors = self._fetch_commit_authors_from_github(repo, per_page=100)
-                return {"commit_authors": self._unique_preserve_order(authors)}
-        return {"commit_authors": []}
+                return self._authors_result(repo)
+        return {"commit_authors": [], "author_commit_counts": {}}
 
     # -------------------------
     # Internal helpers
     # -------------------------
-    def _make_headers(self) -> Dict[str, str]:
-        headers: Dict[str, str] = {"Accept": "application/vnd.github.v3+json"}
-        token = os.getenv("GITHUB_TOKEN")
-        if token:
-            headers["Authorization"] = f"token {token}"
-        return headers
+    def _authors_result(self, repo_path: str) -> Dict[str, Any]:
+        counts = self._author_commit_counts(repo_path)
+        return {"commit_authors": list(counts), "author_commit_counts": counts}
+
+    def _author_commit_counts(self, repo_path: str) -> Dict[str, int]:
+        """Commit counts per author, most active first (memoized per artifact).
+
+        Uses the incremental author history when enabled; otherwise (or when
+        GitHub is unreachable and nothing is stored) counts one page of commits.
+        """
+        return self.context.memo(
+            ("author_counts", repo_path),
+            lambda: self._load_author_commit_counts(repo_path),
+        )
+
+    def _load_author_commit_counts(self, repo_path: str) -> Dict[str, int]:
+        history = get_author_history()
+        if history is not None:
+            bundle = github_graphql.bundle(repo_path)
+            counts = history.author_counts(
+                repo_path, headers=self._make_headers(), head_sha=bundle.get("head_sha") if bundle else None
+            )
+            if counts is not None:
+                return counts
+        authors = self._fetch_commit_authors_from_github(repo_path, per_page=100)
+        counts = Counter(a.strip() for a in authors if a and a.strip())
+        return {a: counts[a] for a in self._unique_preserve_order(authors)}
 
     def _fetch_commit_authors_from_github(
         self, repo_path: str, per_page: int = 100
@@ -88,27 +105,24 @@ class BusFactorDataFetcher(BaseDataFetcher):
         We attempt to use the user login from the top-level "author.login" when present;
         otherwise we fall back to the commit author name/email from the commit payload.
         The returned list may include duplicates; the caller should uniquify if needed.
+        Memoized per artifact in the fetch context.
         """
+        return self.context.memo(
+            ("commit_authors", repo_path, per_page),
+            lambda: self._load_commit_authors(repo_path, per_page),
+        )
+
+    def _load_commit_authors(self, repo_path: str, per_page: int) -> List[str]:
+        bundle = github_graphql.bundle(repo_path)
+        if bundle and per_page <= COMMIT_HISTORY:
+            return list(bundle["commit_authors"][:per_page])
         try:
             url = _GH_COMMITS_API.format(repo=repo_path, per_page=per_page)
-            resp = requests.get(url, headers=self._make_headers(), timeout=10)
+            resp = http_client.get(url, headers=self._make_headers())
             if resp.status_code != 200:
                 return []
             commits = resp.json() or []
-            authors: List[str] = []
-            for c in commits:
-                a = c.get("author")
-                if isinstance(a, dict) and a.get("login"):
-                    authors.append(str(a["login"]))
-                    continue
-                commit_info = (c.get("commit") or {}).get("author", {})
-                name = commit_info.get("name")
-                email = commit_info.get("email")
-                if name:
-                    authors.append(str(name))
-                elif email:
-                    authors.append(str(email))
-            return authors
+            return [a for a in (commit_author(c) for c in commits) if a]
         except Exception:
             return []
 
@@ -121,45 +135,3 @@ class BusFactorDataFetcher(BaseDataFetcher):
                 seen.add(key)
                 out.append(key)
         return out
-
-    def _fetch_hf_readme(self, identifier: str, kind: str) -> Optional[str]:
-        """Fetch README.md raw contents from a Hugging Face model or dataset.
-
-        kind: "model" or "dataset"
-        """
-        if not identifier:
-            return None
-        base = "https://huggingface.co"
-        if kind == "dataset":
-            url = f"{base}/datasets/{identifier}/resolve/main/README.md"
-        else:
-            url = f"{base}/{identifier}/resolve/main/README.md"
-        try:
-            resp = requests.get(url, timeout=10)
-            if resp.status_code == 200 and isinstance(resp.text, str):
-                return resp.text
-        except Exception:
-            return None
-        return None
-
-    def _extract_github_repo_from_text(self, text: str) -> Optional[str]:
-        """Extract first GitHub owner/repo from a README or text blob.
-
-        Returns value like "owner/repo" or None.
-        """
-        if not text:
-            return None
-        marker = "github.com/"
-        idx = text.find(marker)
-        if idx == -1:
-            return None
-        frag = text[idx + len(marker) : idx + len(marker) + 200]
-        for delim in [" ", "\n", "\r", "\t", ")", "]", "<", ">", '"', "'", "#"]:
-            frag = frag.split(delim)[0]
-        parts = frag.strip().split("/")
-        if len(parts) >= 2:
-            owner = parts[0]
-            repo = parts[1].rstrip(".,);]\n\r")
-            if owner and repo:
-                return f"{owner}/{repo}"
-        return None
\ No newline at end of file
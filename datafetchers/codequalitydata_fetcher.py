@@ -4,16 +4,48 @@ Collects simple repository signals (tests, CI, lint config, languages, etc.)
 from GitHub and exposes a normalized dict for the scoring logic.
 """
 
+import copy
 import os
-from typing import Any, Dict, List, Optional
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
 
-import requests
+from cli.utils.GitHubGraphQL import github_graphql
 
 from .basemetricdata_fetcher import BaseDataFetcher
+from .tree_walker import TreeWalker
+from .zip_manifest import archive_paths, fetch_zip_manifest
 
 
-# GitHub trees API template to list repository files recursively
-_GH_TREE_API = "https://api.github.com/repos/{repo}/git/trees/{branch}?recursive=1"
+class _TreeSummaryCache:
+    """Bounded LRU of aggregated signals keyed by root tree SHA (a SHA's content never changes)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sha: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            summary = self._entries.get(sha)
+            if summary is not None:
+                self._entries.move_to_end(sha)
+            return summary
+
+    def put(self, sha: str, summary: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[sha] = summary
+            self._entries.move_to_end(sha)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_tree_walker = TreeWalker()
+_tree_summaries = _TreeSummaryCache(int(os.getenv("TREE_SUMMARY_CACHE_SIZE", 256)))
+# List GitHub repos from their archive's zip central directory (HTTP Range
+# reads from codeload, no API quota) before falling back to the trees API.
+_ARCHIVE_LISTING = os.getenv("ZIP_MANIFEST_ENABLED", "1") == "1"
 
 # Map common file extensions to language labels
 _EXT_LANG_MAP: Dict[str, str] = {
@@ -59,6 +91,71 @@ _EXT_LANG_MAP: Dict[str, str] = {
     ".pl": "Perl",
     ".tex": "LaTeX",
 }
+# Languages are looked up on the last suffix only. Every key above is a single
+# suffix except ".cu.h", which ".h" always matched first anyway.
+
+# Path signals, precompiled for `_aggregate_from_paths` (paths are lowercased).
+# Tests: a tests/test/spec/example(s) directory or test_ file at any depth,
+# test-style file suffixes, or unittest/pytest anywhere in the path.
+_TEST_MARKERS = re.compile(
+    r"(?:^|/)(?:tests/|test/|spec/|examples?/|test_)"
+    r"|(?:test\.py|_spec\.rb|\.spec\.js|\.test\.js)\Z"
+    r"|unittest|pytest"
+)
+_CI_MARKERS = re.compile(
+    r"^\.github/workflows|\.circleci/|(?:^|/)ci/"
+    r"|(?:travis\.yml|azure-pipelines\.ya?ml|jenkinsfile|drone\.yml|build\.sh|build\.bat)\Z"
+)
+_CI_FILES = frozenset({"makefile", "dockerfile"})
+_YAML_SUFFIXES = (".yml", ".yaml")
+_CI_YAML_WORDS = re.compile(r"ci|build|deploy")
+_LINT_CONFIG_FILES = frozenset(
+    {
+        ".flake8",
+        "pyproject.toml",
+        "setup.cfg",
+        "tox.ini",
+        ".pylintrc",
+        "pylint.cfg",
+        ".black",
+        ".isort.cfg",
+        ".pre-commit-config.yaml",
+        ".pre-commit-config.yml",
+        "requirements-dev.txt",
+        "requirements.dev.txt",
+        ".eslintrc",
+        ".eslintrc.json",
+        ".eslintrc.js",
+        ".eslintrc.yaml",
+        ".stylelintrc",
+        ".rubocop.yml",
+        "ruff.toml",
+    }
+)
+_LINT_MARKERS = re.compile(r"(?:lint|format)\.py\Z|linting|formatting")
+_README_FILES = frozenset({"index.md", "home.md"})
+# Packaging files across ecosystems
+_PACKAGING_FILES = (
+    "setup.py",
+    "pyproject.toml",
+    "setup.cfg",
+    "requirements.txt",
+    "package.json",
+    "pom.xml",  # maven (java)
+    "build.gradle",  # gradle (java/kotlin)
+    "gradle.properties",
+    "Cargo.toml",  # rust
+    "go.mod",  # go
+    "DESCRIPTION",  # R
+    "environment.yml",
+    "conda.yml",
+    "Makefile",
+    "Pipfile",
+    "poetry.lock",
+    "manifest.in",
+    "__init__.py",
+)
+_PACKAGING_SUFFIXES = tuple(f.lower() for f in _PACKAGING_FILES)
 
 
 class CodeQualityDataFetcher(BaseDataFetcher):
@@ -74,7 +171,9 @@ class CodeQualityDataFetcher(BaseDataFetcher):
       - has_packaging: bool
 
     Sources handled:
-      - GitHub repo metadata (fetch_Codedata): uses GitHub trees API to scan files
+      - GitHub repo metadata (fetch_Codedata): lists the repo archive from its zip
+          central directory via Range requests; otherwise walks the GitHub trees API
+          (splitting truncated listings by subtree) and aggregates paths as they arrive
       - HF model/dataset metadata (fetch_Modeldata/fetch_Datasetdata): uses siblings list
     """
 
@@ -98,12 +197,9 @@ class CodeQualityDataFetcher(BaseDataFetcher):
         if not repo_full_name:
             return self.metadata
 
-        tree = self._fetch_repo_tree(repo_full_name, default_branch)
-        if not tree:
-            return self.metadata
-
-        paths = [str(e.get("path", "") or "") for e in tree]
-        self.metadata = self._aggregate_from_paths(paths)
+        summary = self._summarize_repo_tree(repo_full_name, default_branch)
+        if summary:
+            self.metadata = summary
         return self.metadata
 
     def fetch_Modeldata(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -126,17 +222,11 @@ class CodeQualityDataFetcher(BaseDataFetcher):
         if self._looks_sparse(self.metadata):
             model_id = str(data.get("id", "") or data.get("modelId", "") or "").strip()
             if model_id:
-                readme = self._fetch_hf_readme(model_id, kind="model")
-                repo = (
-                    self._extract_github_repo_from_text(readme or "")
-                    if readme
-                    else None
-                )
+                repo = self._linked_github_repo(model_id, kind="model")
                 if repo:
-                    tree = self._fetch_repo_tree(repo, "HEAD")
-                    if tree:
-                        paths = [str(e.get("path", "") or "") for e in tree]
-                        self.metadata = self._aggregate_from_paths(paths)
+                    summary = self._summarize_repo_tree(repo, "HEAD")
+                    if summary:
+                        self.metadata = summary
         return self.metadata
 
     def fetch_Datasetdata(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -154,17 +244,11 @@ class CodeQualityDataFetcher(BaseDataFetcher):
         if self._looks_sparse(self.metadata):
             ds_id = str(data.get("id", "") or "").strip()
             if ds_id:
-                readme = self._fetch_hf_readme(ds_id, kind="dataset")
-                repo = (
-                    self._extract_github_repo_from_text(readme or "")
-                    if readme
-                    else None
-                )
+                repo = self._linked_github_repo(ds_id, kind="dataset")
                 if repo:
-                    tree = self._fetch_repo_tree(repo, "HEAD")
-                    if tree:
-                        paths = [str(e.get("path", "") or "") for e in tree]
-                        self.metadata = self._aggregate_from_paths(paths)
+                    summary = self._summarize_repo_tree(repo, "HEAD")
+                    if summary:
+                        self.metadata = summary
         return self.metadata
 
     # -------------------------
@@ -181,13 +265,6 @@ class CodeQualityDataFetcher(BaseDataFetcher):
             "has_packaging": False,
         }
 
-    def _make_headers(self) -> Dict[str, str]:
-        headers: Dict[str, str] = {"Accept": "application/vnd.github.v3+json"}
-        token = os.getenv("GITHUB_TOKEN")
-        if token:
-            headers["Authorization"] = f"token {token}"
-        return headers
-
     def _looks_sparse(self, meta: Dict[str, Any]) -> bool:
         """Heuristic: return True if there is little/no evidence from HF siblings.
 
@@ -204,220 +281,120 @@ class CodeQualityDataFetcher(BaseDataFetcher):
             and not meta.get("has_packaging", False)
         )
 
-    def _fetch_hf_readme(self, identifier: str, kind: str) -> Optional[str]:
-        """Fetch README.md raw contents from a Hugging Face model or dataset.
+    def _summarize_repo_tree(self, repo_path: str, branch: str = "HEAD") -> Optional[Dict[str, Any]]:
+        """Aggregated signals over a GitHub repo's full tree (memoized per artifact)."""
+        return self.context.memo(
+            ("repo_tree_summary", repo_path, branch),
+            lambda: self._load_repo_tree_summary(repo_path, branch),
+        )
 
-        kind: "model" or "dataset"
-        """
-        if not identifier:
-            return None
-        base = "https://huggingface.co"
-        if kind == "dataset":
-            url = f"{base}/datasets/{identifier}/resolve/main/README.md"
-        else:
-            url = f"{base}/{identifier}/resolve/main/README.md"
-        try:
-            resp = requests.get(url, timeout=10)
-            if resp.status_code == 200 and isinstance(resp.text, str):
-                return resp.text
-        except Exception:
+    def _load_repo_tree_summary(self, repo_path: str, branch: str) -> Optional[Dict[str, Any]]:
+        """Walk the tree into the aggregator, reusing the summary of an already seen tree SHA."""
+        headers = self._make_headers()
+        # The GraphQL bundle already pins the root tree SHA; otherwise resolve it.
+        bundle = github_graphql.bundle(repo_path)
+        tree_sha = None
+        if bundle and bundle.get("root_tree_sha") and branch in ("HEAD", bundle.get("default_branch")):
+            tree_sha = bundle["root_tree_sha"]
+            cached = _tree_summaries.get(tree_sha)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        # The archive listing needs no API call, so it goes before resolving the SHA.
+        if _ARCHIVE_LISTING:
+            summary = self._summarize_archive(repo_path, branch)
+            if summary is not None:
+                if tree_sha:
+                    _tree_summaries.put(tree_sha, copy.deepcopy(summary))
+                return summary
+
+        if not tree_sha:
+            tree_sha = _tree_walker.resolve(repo_path, branch, headers)
+        if not tree_sha:
             return None
-        return None
 
-    def _extract_github_repo_from_text(self, text: str) -> Optional[str]:
-        """Extract first GitHub owner/repo from a README or text blob.
+        cached = _tree_summaries.get(tree_sha)
+        if cached is not None:
+            return copy.deepcopy(cached)
 
-        Returns value like "owner/repo" or None.
-        """
-        if not text:
-            return None
-        # Simple heuristic search to avoid heavy regex dependencies
-        marker = "github.com/"
-        idx = text.find(marker)
-        if idx == -1:
-            return None
-        frag = text[idx + len(marker) : idx + len(marker) + 200]
-        # Split on delimiters that commonly follow repo paths
-        for delim in [" ", "\n", "\r", "\t", ")", "]", "<", ">", '"', "'", "#"]:
-            frag = frag.split(delim)[0]
-        # owner/repo[/...]
-        parts = frag.strip().split("/")
-        if len(parts) >= 2:
-            owner = parts[0]
-            repo = parts[1]
-            # Clean trailing punctuation
-            repo = repo.rstrip(".,);]\n\r")
-            if owner and repo:
-                return f"{owner}/{repo}"
-        return None
-
-    def _fetch_repo_tree(
-        self, repo_path: str, branch: str = "HEAD"
-    ) -> Optional[List[Dict[str, Any]]]:
-        url = _GH_TREE_API.format(repo=repo_path, branch=branch)
-        try:
-            resp = requests.get(url, headers=self._make_headers(), timeout=10)
-            if resp.status_code == 200:
-                payload = resp.json()
-                tree = payload.get("tree", [])
-                if isinstance(tree, list):
-                    return tree
+        summary = self._empty_result()
+        complete = _tree_walker.walk(
+            repo_path, tree_sha, lambda paths: self._aggregate_from_paths(paths, into=summary), headers
+        )
+        if complete is None:
             return None
-        except Exception:
+        if complete:
+            _tree_summaries.put(tree_sha, copy.deepcopy(summary))
+        return summary
+
+    def _summarize_archive(self, repo_path: str, branch: str) -> Optional[Dict[str, Any]]:
+        """Signals from the file list in the repo archive's zip central directory; None if unavailable."""
+        ref = "HEAD" if branch == "HEAD" else f"refs/heads/{branch}"
+        manifest = fetch_zip_manifest(f"https://github.com/{repo_path}/archive/{ref}.zip")
+        if manifest is None:
             return None
+        return self._aggregate_from_paths(archive_paths(manifest))
 
-    def _classify_by_extension(self, path: str) -> Optional[str]:
-        p = path.lower()
-        for ext, lang in _EXT_LANG_MAP.items():
-            if p.endswith(ext):
-                return lang
-        return None
-
-    def _aggregate_from_paths(self, paths: List[str]) -> Dict[str, Any]:
-        has_tests = False
-        has_ci = False
-        has_lint_config = False
-        has_readme = False
-        has_packaging = False
-        language_counts: Dict[str, int] = {}
-
-        # Packaging files across ecosystems
-        packaging_files = {
-            "setup.py",
-            "pyproject.toml",
-            "setup.cfg",
-            "requirements.txt",
-            "package.json",
-            "pom.xml",  # maven (java)
-            "build.gradle",  # gradle (java/kotlin)
-            "gradle.properties",
-            "Cargo.toml",  # rust
-            "go.mod",  # go
-            "DESCRIPTION",  # R
-            "environment.yml",
-            "conda.yml",
-            "Makefile",
-            "Pipfile",
-            "poetry.lock",
-            "manifest.in",
-            "__init__.py",
-        }
+    def _aggregate_from_paths(
+        self, paths: Iterable[str], into: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Aggregate signals over `paths`, folding them into `into` when given.
 
+        Passing the previous result back in lets a tree be aggregated batch by
+        batch as it is listed.
+        """
+        result = into if into is not None else self._empty_result()
+        has_tests = result["has_tests"]
+        has_ci = result["has_ci"]
+        has_lint_config = result["has_lint_config"]
+        has_readme = result["has_readme"]
+        has_packaging = result["has_packaging"]
+        language_counts: Dict[str, int] = result["language_counts"]
+
+        # Each signal is checked only until it is first seen; after that the
+        # path only needs its extension lookup.
         for raw_path in paths:
             path = (raw_path or "").strip().lstrip("./").lower()
             if not path:
                 continue
 
-            # Test detection (broad heuristics)
-            if (
-                path.startswith("tests/")
-                or "/tests/" in path
-                or path.startswith("test/")
-                or "/test/" in path
-                or path.startswith("spec/")
-                or "/spec/" in path
-                or path.startswith("example/")
-                or "/example/" in path
-                or path.startswith("examples/")
-                or "/examples/" in path
-                or path.startswith("test_")
-                or "/test_" in path
-                or path.endswith("_test.py")
-                or path.endswith("test.py")
-                or path.endswith("_spec.rb")
-                or path.endswith(".spec.js")
-                or path.endswith(".test.js")
-                or "unittest" in path
-                or "pytest" in path
-            ):
+            if not has_tests and _TEST_MARKERS.search(path):
                 has_tests = True
 
-            # CI detection
-            if (
-                path.startswith(".github/workflows")
-                or path.endswith(".travis.yml")
-                or path.endswith("travis.yml")
-                or ".circleci/" in path
-                or path.endswith("azure-pipelines.yml")
-                or path.endswith("azure-pipelines.yaml")
-                or path.endswith("jenkinsfile")
-                or path.endswith("drone.yml")
-                or (
-                    path.endswith(".yml")
-                    and ("ci" in path or "build" in path or "deploy" in path)
-                )
-                or (
-                    path.endswith(".yaml")
-                    and ("ci" in path or "build" in path or "deploy" in path)
-                )
-                or path.startswith("ci/")
-                or "/ci/" in path
-                or path == "makefile"
-                or path == "dockerfile"
-                or path.endswith("build.sh")
-                or path.endswith("build.bat")
+            if not has_ci and (
+                path in _CI_FILES
+                or _CI_MARKERS.search(path)
+                or (path.endswith(_YAML_SUFFIXES) and _CI_YAML_WORDS.search(path))
             ):
                 has_ci = True
 
-            # Linting / formatting detection
-            if (
-                path
-                in {
-                    ".flake8",
-                    "pyproject.toml",
-                    "setup.cfg",
-                    "tox.ini",
-                    ".pylintrc",
-                    "pylint.cfg",
-                    ".black",
-                    ".isort.cfg",
-                    ".pre-commit-config.yaml",
-                    ".pre-commit-config.yml",
-                    "requirements-dev.txt",
-                    "requirements.dev.txt",
-                    ".eslintrc",
-                    ".eslintrc.json",
-                    ".eslintrc.js",
-                    ".eslintrc.yaml",
-                    ".stylelintrc",
-                    ".rubocop.yml",
-                    "ruff.toml",
-                }
-                or path.endswith("lint.py")
-                or path.endswith("format.py")
-                or "linting" in path
-                or "formatting" in path
-            ):
+            if not has_lint_config and (path in _LINT_CONFIG_FILES or _LINT_MARKERS.search(path)):
                 has_lint_config = True
 
-            # README detection
-            if (
-                path.startswith("readme")
-                or path in {"readme.md", "readme.rst", "readme.txt", "readme"}
-                or path == "index.md"
-                or path == "home.md"
-            ):
+            if not has_readme and (path.startswith("readme") or path in _README_FILES):
                 has_readme = True
 
-            # Packaging detection
-            if path in {p.lower() for p in packaging_files} or any(
-                path.endswith(f.lower()) for f in packaging_files
-            ):
+            # Also matches the exact file names, since x.endswith(x) holds.
+            if not has_packaging and path.endswith(_PACKAGING_SUFFIXES):
                 has_packaging = True
 
-            # Language classification
-            lang = self._classify_by_extension(path)
-            if lang:
-                language_counts[lang] = language_counts.get(lang, 0) + 1
+            dot = path.rfind(".")
+            if dot >= 0:
+                lang = _EXT_LANG_MAP.get(path[dot:])
+                if lang:
+                    language_counts[lang] = language_counts.get(lang, 0) + 1
 
         total_code_files = sum(language_counts.values())
 
-        return {
-            "has_tests": has_tests,
-            "has_ci": has_ci,
-            "has_lint_config": has_lint_config,
-            "language_counts": language_counts,
-            "total_code_files": total_code_files,
-            "has_readme": has_readme,
-            "has_packaging": has_packaging,
-        }
\ No newline at end of file
+        result.update(
+            {
+                "has_tests": has_tests,
+                "has_ci": has_ci,
+                "has_lint_config": has_lint_config,
+                "language_counts": language_counts,
+                "total_code_files": total_code_files,
+                "has_readme": has_readme,
+                "has_packaging": has_packaging,
+            }
+        )
+        return result
\ No newline at end of file
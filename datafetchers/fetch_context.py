@@ -0,0 +1,82 @@
+"""Per-ingest fetch context.
+
+`MetricDataFetcher.fetch_artifact_data` opens one `FetchContext` per artifact
+and every data fetcher reads through it, so a README, linked GitHub repo,
+repo tree or commit list is fetched at most once per artifact no matter how
+many metrics need it. The active context travels in a `ContextVar`, which
+keeps concurrent ingests (batch, job workers) isolated from each other.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["FetchContext"]] = ContextVar("fetch_context", default=None)
+
+
+class FetchContext:
+    """Memoizes remote payloads for the duration of one artifact's data fetch."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self._values: Dict[Hashable, Any] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    def memo(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the value cached under `key`, calling `loader()` on first use.
+
+        Concurrent callers for the same key wait for the first load instead of
+        issuing a duplicate request. Failed loads (exceptions) are not cached.
+        """
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._values:
+                    self.hits += 1
+                    return self._values[key]
+            value = loader()
+            with self._lock:
+                self._values[key] = value
+                self.fetches += 1
+            return value
+
+    def stats(self) -> Dict[str, int]:
+        """Remote loads performed and duplicate loads avoided."""
+        with self._lock:
+            return {"fetches": self.fetches, "duplicates_avoided": self.hits}
+
+
+def current_fetch_context() -> Optional[FetchContext]:
+    """The context opened by the enclosing `fetch_context()` block, if any."""
+    return _current.get()
+
+
+@contextmanager
+def fetch_context(label: str = "") -> Iterator[FetchContext]:
+    """Open a fresh `FetchContext` for the enclosed block and log its stats on exit."""
+    ctx = FetchContext(label)
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+        stats = ctx.stats()
+        logger.info(
+            "Fetch context %s: %d remote fetches, %d duplicates avoided",
+            label or "-",
+            stats["fetches"],
+            stats["duplicates_avoided"],
+        )
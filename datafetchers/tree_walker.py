@@ -0,0 +1,133 @@
+"""GitHub repository tree walker.
+
+`git/trees/{sha}?recursive=1` stops at 100,000 entries (or 7 MB) and sets
+`truncated`, so a monorepo's listing silently misses files. `TreeWalker`
+detects that case and walks the repository by subtree instead, fetching up to
+`TREE_WALK_WORKERS` subtrees concurrently; a subtree that is itself too big
+is split again. Paths are handed to a callback one subtree at a time, so the
+caller can aggregate without the whole listing ever being held in memory.
+
+Tuning (environment variables):
+  TREE_WALK_WORKERS   concurrent subtree fetches (default 8)
+"""
+
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cli.utils.HttpClient import http_client
+
+logger = logging.getLogger(__name__)
+
+_GH_TREE_URL = "https://api.github.com/repos/{repo}/git/trees/{sha}"
+
+# (paths under the subtree, subtrees still to expand as (prefix, sha))
+_Expansion = Tuple[List[str], List[Tuple[str, str]]]
+
+
+class TreeWalker:
+    """Lists every path in a GitHub tree, splitting truncated listings by subtree."""
+
+    def __init__(self, workers: int = int(os.getenv("TREE_WALK_WORKERS", 8))):
+        self.workers = max(1, workers)
+
+    def resolve(self, repo: str, ref: str, headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Root tree SHA for a branch, tag or commit (one small, cacheable request)."""
+        payload = self._get_tree(repo, ref, recursive=False, headers=headers)
+        return payload.get("sha") if payload else None
+
+    def walk(
+        self,
+        repo: str,
+        tree_sha: str,
+        on_paths: Callable[[List[str]], object],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Optional[bool]:
+        """
+        Feed every entry path under `tree_sha` to `on_paths`, in batches.
+
+        Returns None when the tree could not be read at all, True when every
+        path was delivered and False when some subtree failed (partial listing).
+        """
+        payload = self._get_tree(repo, tree_sha, recursive=True, headers=headers)
+        if payload is None:
+            return None
+        if not payload.get("truncated"):
+            on_paths(self._paths(payload, ""))
+            return True
+
+        logger.info(f"🌲 Tree for {repo} is truncated; walking subtrees")
+        root = self._expand(repo, tree_sha, "", headers, try_recursive=False)
+        if root is None:
+            return None
+        paths, pending = root
+        on_paths(paths)
+        complete = True
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tree") as pool:
+            running = {pool.submit(self._expand, repo, sha, prefix, headers): prefix for prefix, sha in pending}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    prefix = running.pop(future)
+                    result = future.result()
+                    if result is None:
+                        logger.warning(f"⚠️ Failed to list subtree {prefix!r} of {repo}")
+                        complete = False
+                        continue
+                    sub_paths, children = result
+                    on_paths(sub_paths)
+                    for child_prefix, sha in children:
+                        running[pool.submit(self._expand, repo, sha, child_prefix, headers)] = child_prefix
+        return complete
+
+    # ------------------------
+    # Internals
+    # ------------------------
+    def _expand(
+        self,
+        repo: str,
+        sha: str,
+        prefix: str,
+        headers: Optional[Dict[str, str]],
+        try_recursive: bool = True,
+    ) -> Optional[_Expansion]:
+        """List a subtree in one recursive call, or one level deep when that is truncated."""
+        if try_recursive:
+            payload = self._get_tree(repo, sha, recursive=True, headers=headers)
+            if payload is None:
+                return None
+            if not payload.get("truncated"):
+                return self._paths(payload, prefix), []
+
+        payload = self._get_tree(repo, sha, recursive=False, headers=headers)
+        if payload is None:
+            return None
+        children = [
+            (f"{prefix}{e.get('path')}/", e.get("sha"))
+            for e in payload.get("tree", [])
+            if e.get("type") == "tree" and e.get("sha")
+        ]
+        return self._paths(payload, prefix), children
+
+    @staticmethod
+    def _paths(payload: Dict[str, Any], prefix: str) -> List[str]:
+        tree = payload.get("tree", [])
+        if not isinstance(tree, list):
+            return []
+        return [prefix + str(e.get("path", "") or "") for e in tree]
+
+    @staticmethod
+    def _get_tree(
+        repo: str, sha: str, recursive: bool, headers: Optional[Dict[str, str]]
+    ) -> Optional[Dict[str, Any]]:
+        url = _GH_TREE_URL.format(repo=repo, sha=sha)
+        try:
+            resp = http_client.get(url, params={"recursive": 1} if recursive else None, headers=headers)
+            if resp.status_code != 200:
+                return None
+            payload = resp.json()
+            return payload if isinstance(payload, dict) else None
+        except Exception as e:
+            logger.debug("Tree fetch %s failed: %s", url, e)
+            return None
@@ -0,0 +1,237 @@
+"""Zip archive listings read from the central directory alone.
+
+A zip file ends with an end-of-central-directory (EOCD) record. That record
+points at the central directory, which holds one fixed-size header plus a name
+for every entry, with sizes but no file data. Reading only those two regions
+lists every file in a GitHub `archive/...zip` without downloading or
+decompressing it. Typically that is the last few KB of the archive.
+
+`read_zip_manifest` takes a `read_range(start, end)` callable, so the same
+parser runs over HTTP Range requests (`fetch_zip_manifest`) or against a stored
+S3 object. ZIP64 archives (more than 65,535 entries or offsets past 4 GB) are
+supported; multi-disk archives are not.
+
+Tuning (environment variables):
+  ZIP_MANIFEST_MAX_CD_MB   largest central directory that will be read (default 64)
+"""
+
+import logging
+import os
+import re
+import struct
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from cli.utils.HttpClient import http_client
+
+logger = logging.getLogger(__name__)
+
+_EOCD_SIG = b"PK\x05\x06"
+_EOCD = struct.Struct("<4sHHHHIIH")
+_ZIP64_LOCATOR_SIG = b"PK\x06\x07"
+_ZIP64_LOCATOR = struct.Struct("<4sIQI")
+_ZIP64_EOCD_SIG = b"PK\x06\x06"
+_ZIP64_EOCD = struct.Struct("<4sQHHIIQQQQ")
+_CENTRAL_HEADER_SIG = b"PK\x01\x02"
+_CENTRAL_HEADER = struct.Struct("<4sHHHHHHIIIHHHHHII")
+_ZIP64_EXTRA_ID = 0x0001
+_UTF8_FLAG = 0x0800
+_U16_MAX = 0xFFFF
+_U32_MAX = 0xFFFFFFFF
+
+# Enough trailing bytes to hold the EOCD record with the longest possible
+# comment, plus the ZIP64 locator in front of it.
+TAIL_BYTES = _EOCD.size + _U16_MAX + _ZIP64_LOCATOR.size
+
+_MAX_CD_BYTES = int(float(os.getenv("ZIP_MANIFEST_MAX_CD_MB", 64)) * 1024 * 1024)
+_CONTENT_RANGE = re.compile(r"bytes\s+\d+-\d+/(\d+)")
+_TIMEOUT = 15
+
+ReadRange = Callable[[int, int], bytes]
+
+
+class ZipFormatError(Exception):
+    """The bytes read do not form a readable zip central directory."""
+
+
+def read_zip_manifest(
+    read_range: ReadRange, size: int, tail: bytes = b"", max_cd_bytes: int = _MAX_CD_BYTES
+) -> Dict[str, Any]:
+    """
+    List the files of a `size`-byte zip from its EOCD and central directory.
+
+    `read_range(start, end)` returns bytes `start..end` (inclusive). `tail` may
+    hold the archive's last `TAIL_BYTES` (or all of it) if they were already
+    read, so they are not fetched again. Directory entries are skipped.
+
+    Returns:
+        {"files": [{"path", "size", "compressed_size"}], "file_count",
+         "total_bytes", "bytes_read"}
+
+    Raises:
+        ZipFormatError: when no valid EOCD / central directory is found.
+    """
+    bytes_read = len(tail)
+    if len(tail) < min(size, TAIL_BYTES):
+        tail = read_range(max(0, size - TAIL_BYTES), size - 1)
+        bytes_read += len(tail)
+    tail_start = size - len(tail)
+
+    def region(start: int, length: int) -> bytes:
+        nonlocal bytes_read
+        if start < 0 or start + length > size:
+            raise ZipFormatError("central directory points outside the archive")
+        if start >= tail_start:
+            return tail[start - tail_start : start - tail_start + length]
+        data = read_range(start, start + length - 1)
+        bytes_read += len(data)
+        if len(data) != length:
+            raise ZipFormatError(f"short read at offset {start}: {len(data)} of {length} bytes")
+        return data
+
+    eocd = _find_eocd(tail)
+    _, disk, cd_disk, _, entries, cd_size, cd_offset, _ = _EOCD.unpack_from(tail, eocd)
+    if _U16_MAX in (entries, disk, cd_disk) or _U32_MAX in (cd_size, cd_offset):
+        entries, cd_size, cd_offset, disk, cd_disk = _zip64_directory(tail, eocd, region)
+    if disk or cd_disk:
+        raise ZipFormatError("multi-disk archives are not supported")
+    if cd_size > max_cd_bytes:
+        raise ZipFormatError(f"central directory of {cd_size} bytes exceeds the {max_cd_bytes} byte limit")
+
+    central_directory = region(cd_offset, cd_size) if cd_size else b""
+    files = [
+        {"path": path, "size": file_size, "compressed_size": compressed}
+        for path, file_size, compressed in _central_entries(central_directory, entries)
+        if not path.endswith("/")
+    ]
+    return {
+        "files": files,
+        "file_count": len(files),
+        "total_bytes": sum(f["size"] for f in files),
+        "bytes_read": bytes_read,
+    }
+
+
+def fetch_zip_manifest(url: str, headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    List a remote zip with HTTP Range requests.
+
+    The first request asks for the archive's last `TAIL_BYTES`, which also
+    reveals its size. Returns None when the source does not serve byte ranges
+    (its full body is never read) or the archive cannot be parsed. The caller
+    can then list the files another way.
+    """
+    headers = dict(headers or {})
+    try:
+        # stream=True keeps range responses out of the shared HTTP cache.
+        response = http_client.get(
+            url, headers={**headers, "Range": f"bytes=-{TAIL_BYTES}"}, stream=True, timeout=_TIMEOUT
+        )
+    except requests.RequestException as e:
+        logger.info("Zip manifest of %s unavailable: %s", url, e)
+        return None
+    try:
+        match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        if response.status_code != 206 or not match:
+            logger.info("Zip manifest of %s unavailable: no byte-range support", url)
+            return None
+        tail = response.content
+        # Later ranges go straight to the final (e.g. codeload) URL.
+        source = response.url or url
+    finally:
+        response.close()
+
+    def read_range(start: int, end: int) -> bytes:
+        ranged = http_client.get(
+            source, headers={**headers, "Range": f"bytes={start}-{end}"}, stream=True, timeout=_TIMEOUT
+        )
+        try:
+            if ranged.status_code != 206:
+                raise ZipFormatError(f"range {start}-{end} answered with HTTP {ranged.status_code}")
+            return ranged.content
+        finally:
+            ranged.close()
+
+    try:
+        return read_zip_manifest(read_range, int(match.group(1)), tail)
+    except (ZipFormatError, requests.RequestException) as e:
+        logger.warning("⚠️ Could not read zip manifest of %s: %s", url, e)
+        return None
+
+
+def archive_paths(manifest: Dict[str, Any]) -> List[str]:
+    """File paths with the single top-level directory GitHub archives add (`repo-branch/`) removed."""
+    paths = [f["path"] for f in manifest.get("files", [])]
+    roots = {p.split("/", 1)[0] for p in paths}
+    if len(roots) == 1 and all("/" in p for p in paths):
+        return [p.split("/", 1)[1] for p in paths]
+    return paths
+
+
+# ------------------------
+# Record parsing
+# ------------------------
+def _find_eocd(tail: bytes) -> int:
+    """Offset of the EOCD record in `tail`: the last signature whose comment length reaches the end."""
+    pos = len(tail)
+    while True:
+        pos = tail.rfind(_EOCD_SIG, 0, pos)
+        if pos < 0:
+            raise ZipFormatError("no end-of-central-directory record")
+        if pos + _EOCD.size <= len(tail):
+            comment_length = _EOCD.unpack_from(tail, pos)[-1]
+            if pos + _EOCD.size + comment_length == len(tail):
+                return pos
+
+
+def _zip64_directory(
+    tail: bytes, eocd: int, region: Callable[[int, int], bytes]
+) -> Tuple[int, int, int, int, int]:
+    """(entries, cd_size, cd_offset, disk, cd_disk) from the ZIP64 EOCD record."""
+    locator = eocd - _ZIP64_LOCATOR.size
+    if locator < 0 or tail[locator : locator + 4] != _ZIP64_LOCATOR_SIG:
+        raise ZipFormatError("ZIP64 end-of-central-directory locator missing")
+    _, _, record_offset, _ = _ZIP64_LOCATOR.unpack_from(tail, locator)
+    record = region(record_offset, _ZIP64_EOCD.size)
+    sig, _, _, _, disk, cd_disk, _, entries, cd_size, cd_offset = _ZIP64_EOCD.unpack(record)
+    if sig != _ZIP64_EOCD_SIG:
+        raise ZipFormatError("ZIP64 end-of-central-directory record missing")
+    return entries, cd_size, cd_offset, disk, cd_disk
+
+
+def _central_entries(data: bytes, count: int) -> Iterator[Tuple[str, int, int]]:
+    """(name, size, compressed size) for each central directory header in `data`."""
+    offset = 0
+    for _ in range(count):
+        if data[offset : offset + 4] != _CENTRAL_HEADER_SIG or offset + _CENTRAL_HEADER.size > len(data):
+            raise ZipFormatError(f"corrupt central directory at offset {offset}")
+        fields = _CENTRAL_HEADER.unpack_from(data, offset)
+        flags, compressed, size = fields[3], fields[8], fields[9]
+        name_length, extra_length, comment_length = fields[10], fields[11], fields[12]
+
+        name_start = offset + _CENTRAL_HEADER.size
+        extra_start = name_start + name_length
+        name = data[name_start:extra_start].decode("utf-8" if flags & _UTF8_FLAG else "cp437", errors="replace")
+        if _U32_MAX in (size, compressed):
+            size, compressed = _zip64_sizes(data[extra_start : extra_start + extra_length], size, compressed)
+        offset = extra_start + extra_length + comment_length
+        yield name, size, compressed
+
+
+def _zip64_sizes(extra: bytes, size: int, compressed: int) -> Tuple[int, int]:
+    """Replace the 32-bit size fields that overflowed with their ZIP64 extra-field values."""
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<HH", extra, pos)
+        body = extra[pos + 4 : pos + 4 + length]
+        if header_id == _ZIP64_EXTRA_ID:
+            values = iter(struct.unpack_from(f"<{len(body) // 8}Q", body))
+            # Only the overflowed fields are present, in this order.
+            if size == _U32_MAX:
+                size = next(values, size)
+            if compressed == _U32_MAX:
+                compressed = next(values, compressed)
+            break
+        pos += 4 + length
+    return size, compressed
@@ -4,7 +4,7 @@ Defines the `BaseMetric` contract for metric implementations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 import time
 
 
@@ -14,6 +14,16 @@ class BaseMetric(ABC):
     Provides timing and score storage.
     """
 
+    # Bump when a subclass changes its heuristic; stored scores record the
+    # version they were computed with, so only changed metrics are re-scored.
+    version: int = 1
+    # Keys of the fetched artifact data the metric reads. Stored with each
+    # artifact so it can be re-scored without fetching again.
+    inputs: Tuple[str, ...] = ()
+    # Data fetchers (class names) whose merged output supplies `inputs`.
+    # Scoring a subset of metrics runs only the fetchers they list.
+    fetchers: Tuple[str, ...] = ()
+
     def __init__(self):
         # Internal storage; outputs are converted to Decimal
         self.score: float = 0.00
@@ -16,6 +16,10 @@ class BusFactorMetric(BaseMetric):
         - Safe against non-list types and nulls; strings or other types won't crash
     """
 
+    version = 1
+    inputs = ("commit_authors",)
+    fetchers = ("BusFactorDataFetcher",)
+
     def __init__(self):
         super().__init__()
 
@@ -33,6 +33,13 @@ class CodeQualityMetric(BaseMetric):
       - docs/packaging:        0.20  (1.0 if both, 0.5 if one, 0.0 if none)
     """
 
+    version = 1
+    inputs = (
+        "has_tests", "has_ci", "has_lint_config", "language_counts",
+        "total_code_files", "has_readme", "has_packaging",
+    )
+    fetchers = ("CodeQualityDataFetcher",)
+
     def __init__(self):
         super().__init__()
         self.datafetcher = CodeQualityDataFetcher()
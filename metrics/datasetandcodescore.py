@@ -12,6 +12,13 @@ class DatasetAndCodeScoreMetric(BaseMetric):
     `datafetchers.datasetnCodedata_fetcher.DatasetAndCodeDataFetcher`.
     """
 
+    version = 1
+    inputs = (
+        "has_documentation", "description", "has_code_examples", "category",
+        "example_count", "ml_integration", "licenses", "engagement",
+    )
+    fetchers = ("DatasetAndCodeDataFetcher",)
+
     def __init__(self):
         super().__init__()
 
@@ -2,7 +2,7 @@
 
 import os
 import time
-import requests
+from cli.utils.HttpClient import http_client
 import logging
 from typing import Any, Dict
 from .basemetric import BaseMetric
@@ -21,6 +21,18 @@ class DatasetQualityMetric(BaseMetric):
     heuristic.
     """
 
+    version = 1
+    inputs = (
+        "dataset", "url", "dataset_url", "code_url", "description", "metadata",
+        "siblings", "tags", "cardData", "downloads", "likes",
+        "transformersInfo", "transformers_info", "widgetData",
+    )
+    # SizeDataFetcher supplies the "dataset" placeholder for dataset artifacts.
+    fetchers = (
+        "DatasetDataFetcher", "SizeDataFetcher", "PerformanceClaimsDataFetcher",
+        "RampUpTimeDataFetcher", "DatasetAndCodeDataFetcher",
+    )
+
     def __init__(self):
         super().__init__()
         self.datafetcher = DatasetDataFetcher()
@@ -90,7 +102,7 @@ Respond with only a number between 0.0 and 1.0.
                     "temperature": 0.0,
                 }
 
-                resp = requests.post(
+                resp = http_client.post(
                     "https://genai.api.purdue.edu/v1/chat/completions",
                     headers=headers,
                     json=payload,
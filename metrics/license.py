@@ -18,6 +18,10 @@ class LicenseMetric(BaseMetric):
         - Unknown (score = 0.2)
     """
 
+    version = 1
+    inputs = ("license",)
+    fetchers = ("LicenseDataFetcher",)
+
     def __init__(self):
         super().__init__()
         self.datafetcher = LicenseDataFetcher()
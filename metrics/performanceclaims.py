@@ -16,6 +16,10 @@ class PerformanceClaimsMetric(BaseMetric):
             - If nothing found, a small floor score is returned (0.3) to avoid 0 for unknowns.
     """
 
+    version = 1
+    inputs = ("model_index", "tags", "cardData", "downloads", "likes")
+    fetchers = ("PerformanceClaimsDataFetcher", "RampUpTimeDataFetcher", "DatasetAndCodeDataFetcher")
+
     def __init__(self):
         super().__init__()
 
@@ -9,6 +9,13 @@ class RampUpTimeMetric(BaseMetric):
     Class for scoring Ramp Up Time Metric
     """
 
+    version = 1
+    inputs = (
+        "description", "metadata", "cardData", "siblings", "tags",
+        "widgetData", "transformersInfo", "category",
+    )
+    fetchers = ("RampUpTimeDataFetcher", "DatasetAndCodeDataFetcher")
+
     def __init__(self):
         super().__init__()
 
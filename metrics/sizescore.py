@@ -11,6 +11,10 @@ class SizeScoreMetric(BaseMetric):
     Stores individual device scores and measures latency.
     """
 
+    version = 1
+    inputs = ("model_size_mb",)
+    fetchers = ("SizeDataFetcher",)
+
     def __init__(self):
         super().__init__()
         # Max supported model size in MB for each device
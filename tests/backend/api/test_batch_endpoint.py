@@ -0,0 +1,40 @@
+"""Tests for `backend.api.batch` router."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+class _Resp:
+    """Tiny requests-like streaming response stub."""
+
+    status_code = 200
+
+    def iter_content(self, chunk_size=1):
+        yield b"bytes"
+
+    def close(self):
+        pass
+
+
+def test_batch_endpoint_returns_results_and_summary(monkeypatch: pytest.MonkeyPatch, patch_backend_deps):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+
+    from backend.main import app
+
+    client = TestClient(app)
+    res = client.post(
+        "/artifacts/batch",
+        json={"urls": ["https://github.com/o/a", "https://github.com/o/b", "https://github.com/o/a/"]},
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert [r["status"] for r in body["results"]] == ["created", "created"]
+    assert body["summary"]["unique"] == 2
+    assert body["summary"]["duplicates_dropped"] == 1
+
+
+def test_batch_endpoint_rejects_empty_list(patch_backend_deps):
+    from backend.main import app
+
+    client = TestClient(app)
+    assert client.post("/artifacts/batch", json={"urls": []}).status_code == 400
@@ -11,10 +11,17 @@ class _Resp:
         self.status_code = status_code
         self.content = content
 
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
 
 def test_create_endpoint_creates_artifact(monkeypatch: pytest.MonkeyPatch, patch_backend_deps):
     monkeypatch.setattr(
-        "backend.api.create.requests.get",
+        "backend.services.ingest.http_client.get",
         lambda *args, **kwargs: _Resp(status_code=200, content=b"bytes"),
     )
 
@@ -24,3 +31,69 @@ def test_create_endpoint_creates_artifact(monkeypatch: pytest.MonkeyPatch, patch
     res = client.post("/artifact/model", json={"url": "https://github.com/o/r"})
     assert res.status_code == 201
     assert "metadata" in res.json()
+
+
+def test_create_endpoint_returns_existing_artifact_unless_refresh(
+    monkeypatch: pytest.MonkeyPatch, patch_backend_deps, fake_artifact_manager
+):
+    monkeypatch.setattr(
+        "backend.services.ingest.http_client.get",
+        lambda *args, **kwargs: _Resp(status_code=200, content=b"bytes"),
+    )
+
+    from backend.main import app
+
+    client = TestClient(app)
+    first = client.post("/artifact/model", json={"url": "https://github.com/o/r"})
+    again = client.post("/artifact/model", json={"url": "https://www.github.com/O/r.git/"})
+    assert again.status_code == 200
+    assert again.json()["metadata"]["id"] == first.json()["metadata"]["id"]
+
+    fresh = client.post("/artifact/model?refresh=true", json={"url": "https://github.com/o/r"})
+    assert fresh.status_code == 201
+    assert fresh.json()["metadata"]["id"] != first.json()["metadata"]["id"]
+
+
+def test_create_endpoint_replays_idempotency_key(monkeypatch: pytest.MonkeyPatch, patch_backend_deps):
+    calls = []
+
+    def fake_get(*args, **kwargs):
+        calls.append(args)
+        return _Resp(status_code=200, content=b"bytes")
+
+    monkeypatch.setattr("backend.services.ingest.http_client.get", fake_get)
+
+    from backend.main import app
+
+    client = TestClient(app)
+    headers = {"Idempotency-Key": "k1"}
+    first = client.post("/artifact/model?refresh=true", json={"url": "https://github.com/o/r"}, headers=headers)
+    retry = client.post("/artifact/model?refresh=true", json={"url": "https://github.com/o/r"}, headers=headers)
+    assert (first.status_code, retry.status_code) == (201, 201)
+    assert retry.json() == first.json()
+    assert len(calls) == 1
+
+    other = client.post("/artifact/model", json={"url": "https://github.com/o/other"}, headers=headers)
+    assert other.status_code == 422
+
+
+def test_create_endpoint_returns_429_with_retry_after_when_saturated(
+    monkeypatch: pytest.MonkeyPatch, patch_backend_deps
+):
+    from backend.services.admission import AdmissionController
+
+    saturated = AdmissionController(max_bytes=1, max_transfers=1, per_host=1)
+    monkeypatch.setattr("backend.services.ingest.ingest_admission", saturated)
+    monkeypatch.setattr("backend.api.create.INGEST_ADMISSION_WAIT", 0.01)
+    monkeypatch.setattr(
+        "backend.services.ingest.http_client.get", lambda *a, **k: pytest.fail("download started")
+    )
+
+    from backend.main import app
+
+    client = TestClient(app)
+    with saturated.admit("example.com", 1):
+        res = client.post("/artifact/model", json={"url": "https://github.com/o/busy"})
+    assert res.status_code == 429
+    assert res.headers["Retry-After"] == "5"
+    assert saturated.stats()["rejected"] == 1
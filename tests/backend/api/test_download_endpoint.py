@@ -12,3 +12,22 @@ def test_download_endpoint_redirects(patch_backend_deps, fake_storage_manager):
     res = client.get("/artifact/a1/download", follow_redirects=False)
     assert res.status_code == 302
     assert res.headers["location"].startswith("https://")
+
+
+def test_download_endpoint_selects_snapshot_file(patch_backend_deps, fake_storage_manager):
+    fake_storage_manager.items["s1"] = {
+        "artifact_id": "s1",
+        "name": "snap",
+        "type": "model",
+        "manifest": {"files": [{"path": "tokenizer/vocab.txt", "sha256": "x"}]},
+    }
+
+    from backend.main import app
+
+    client = TestClient(app)
+    res = client.get("/artifact/s1/download?file=tokenizer/vocab.txt", follow_redirects=False)
+    assert res.status_code == 302
+    assert res.headers["location"].endswith("tokenizer/vocab.txt?expires=3600")
+
+    missing = client.get("/artifact/s1/download?file=nope.bin", follow_redirects=False)
+    assert missing.status_code == 404
@@ -0,0 +1,71 @@
+"""Tests for `backend.api.jobs` router."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+class _Resp:
+    """Tiny requests-like streaming response stub."""
+
+    status_code = 200
+
+    def iter_content(self, chunk_size=1):
+        yield b"bytes"
+
+    def close(self):
+        pass
+
+
+def test_create_job_returns_202_and_reports_artifact(
+    monkeypatch: pytest.MonkeyPatch, patch_backend_deps, fake_job_manager
+):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+
+    from backend.main import app
+
+    client = TestClient(app)
+    res = client.post("/jobs/artifact/model", json={"url": "https://github.com/o/r"})
+    assert res.status_code == 202
+    job_id = res.json()["job_id"]
+    assert res.headers["location"] == f"/jobs/{job_id}"
+
+    fake_job_manager.wait(job_id, timeout=5)
+    job = client.get(f"/jobs/{job_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["artifact_id"]
+    assert all(s["status"] == "done" for s in job["stages"].values())
+
+
+def test_create_with_async_queues_a_job(monkeypatch: pytest.MonkeyPatch, patch_backend_deps, fake_job_manager):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+
+    from backend.main import app
+
+    res = TestClient(app).post("/artifact/model?async=true", json={"url": "https://github.com/o/r"})
+    assert res.status_code == 202
+    job_id = res.json()["job_id"]
+    assert res.headers["location"] == f"/jobs/{job_id}"
+    assert fake_job_manager.wait(job_id, timeout=5)["status"] == "succeeded"
+
+
+def test_get_job_unknown_returns_404(patch_backend_deps):
+    from backend.main import app
+
+    client = TestClient(app)
+    assert client.get("/jobs/nope").status_code == 404
+
+
+def test_create_job_with_same_idempotency_key_returns_original_job(
+    monkeypatch: pytest.MonkeyPatch, patch_backend_deps, fake_job_manager
+):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+
+    from backend.main import app
+
+    client = TestClient(app)
+    headers = {"Idempotency-Key": "retry-1"}
+    first = client.post("/jobs/artifact/model", json={"url": "https://github.com/o/r"}, headers=headers)
+    retry = client.post("/jobs/artifact/model", json={"url": "https://github.com/o/r"}, headers=headers)
+    assert first.status_code == retry.status_code == 202
+    assert retry.json()["job_id"] == first.json()["job_id"]
+    fake_job_manager.wait(first.json()["job_id"], timeout=5)
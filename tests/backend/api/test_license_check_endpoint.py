@@ -15,7 +15,7 @@ def test_license_check_endpoint_returns_true(monkeypatch: pytest.MonkeyPatch, pa
     fake_storage_manager.items["a1"] = {"artifact_id": "a1", "name": "foo", "type": "model"}
 
     monkeypatch.setattr(
-        "backend.api.license_check.requests.head",
+        "backend.api.license_check.http_client.head",
         lambda *args, **kwargs: _Resp(status_code=200),
     )
 
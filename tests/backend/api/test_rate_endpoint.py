@@ -1,5 +1,7 @@
 """Tests for `backend.api.rate` router."""
 
+import json
+
 from fastapi.testclient import TestClient
 
 
@@ -18,3 +20,109 @@ def test_rate_endpoint_returns_scores(patch_backend_deps, fake_storage_manager):
     res = client.get("/artifact/model/a1/rate")
     assert res.status_code == 200
     assert "net_score" in res.json()
+
+
+def _unscored(fake_storage_manager, artifact_id="a1"):
+    fake_storage_manager.items[artifact_id] = {
+        "artifact_id": artifact_id,
+        "name": "foo",
+        "artifact_type": "model",
+        "processed_url": "https://huggingface.co/org/foo",
+        "scores": None,
+    }
+
+
+def test_rate_endpoint_computes_persists_and_reports_miss(patch_backend_deps, fake_storage_manager, fake_artifact_manager):
+    _unscored(fake_storage_manager)
+
+    from backend.main import app
+
+    client = TestClient(app)
+    res = client.get("/artifact/model/a1/rate")
+    assert res.status_code == 200
+    assert res.json() == {"net_score": 0.42, "name": "foo", "category": "model"}
+    assert res.headers["X-Score-Cache"] == "miss"
+    assert res.headers["X-Score-Stale"] == "false"
+
+    item = fake_storage_manager.items["a1"]
+    assert json.loads(item["scores"])["net_score"] == 0.42
+    assert item["metric_versions"] == {"license": 1, "size_score": 1}
+
+    res = client.get("/artifact/model/a1/rate")
+    assert res.headers["X-Score-Cache"] == "stored"
+    assert res.json()["name"] == "foo"
+    assert fake_artifact_manager.score_calls == 1
+
+
+def test_rate_endpoint_reuses_cached_scores_for_same_inputs(patch_backend_deps, fake_storage_manager, fake_artifact_manager):
+    _unscored(fake_storage_manager, "a1")
+    _unscored(fake_storage_manager, "a2")
+    fake_storage_manager.items["a2"]["name"] = "bar"
+
+    from backend.main import app
+
+    client = TestClient(app)
+    assert client.get("/artifact/model/a1/rate").headers["X-Score-Cache"] == "miss"
+    res = client.get("/artifact/model/a2/rate")
+    assert res.headers["X-Score-Cache"] == "hit"
+    assert res.json()["name"] == "bar"
+    assert fake_artifact_manager.score_calls == 1
+
+
+def test_rate_endpoint_recomputes_scores_from_older_metric_versions(
+    patch_backend_deps, fake_storage_manager, fake_artifact_manager
+):
+    _unscored(fake_storage_manager)
+    fake_storage_manager.items["a1"].update(
+        {"scores": json.dumps({"net_score": 0.1}), "metric_versions": {"license": 0, "size_score": 1}}
+    )
+
+    from backend.main import app
+
+    res = TestClient(app).get("/artifact/model/a1/rate")
+    assert res.headers["X-Score-Cache"] == "miss"
+    assert res.json()["net_score"] == 0.42
+    assert fake_storage_manager.items["a1"]["metric_versions"]["license"] == 1
+
+
+def test_rate_endpoint_marks_stored_scores_without_timestamp_unknown(patch_backend_deps, fake_storage_manager):
+    fake_storage_manager.items["a1"] = {"artifact_id": "a1", "name": "foo", "scores": {"net_score": 0.5}}
+
+    from backend.main import app
+
+    res = TestClient(app).get("/artifact/model/a1/rate")
+    assert res.headers["X-Score-Cache"] == "stored"
+    assert res.headers["X-Score-Stale"] == "unknown"
+    assert "X-Score-Age" not in res.headers
+
+
+def test_rate_endpoint_scores_only_selected_metrics(patch_backend_deps, fake_storage_manager, fake_artifact_manager):
+    _unscored(fake_storage_manager)
+
+    from backend.main import app
+
+    client = TestClient(app)
+    res = client.get("/artifact/model/a1/rate", params={"metrics": "license"})
+    assert res.status_code == 200
+    assert res.json() == {"name": "foo", "category": "model", "license": 0.5}
+    assert fake_artifact_manager.fetched_for == ["license"]
+    # A partial rating is cached but never stored as the artifact's scores.
+    assert fake_storage_manager.items["a1"]["scores"] is None
+
+    assert client.get("/artifact/model/a1/rate", params={"metrics": "bogus"}).status_code == 400
+
+
+def test_rate_endpoint_projects_stored_scores_to_selection(patch_backend_deps, fake_storage_manager, fake_artifact_manager):
+    fake_storage_manager.items["a1"] = {
+        "artifact_id": "a1",
+        "name": "foo",
+        "artifact_type": "model",
+        "scores": {"net_score": 0.5, "license": 1.0, "license_latency": 3, "size_score": {"aws_server": 1.0}},
+    }
+
+    from backend.main import app
+
+    res = TestClient(app).get("/artifact/model/a1/rate?metrics=license")
+    assert res.headers["X-Score-Cache"] == "stored"
+    assert res.json() == {"license": 1.0, "license_latency": 3, "name": "foo", "category": "model"}
+    assert fake_artifact_manager.score_calls == 0
@@ -0,0 +1,34 @@
+"""Tests for `backend.api.rescore` router."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from cli.utils.MetricScorer import MetricScorer
+
+
+def test_rescore_endpoint_rescores_all_stored_artifacts(patch_backend_deps, fake_storage_manager, fake_artifact_manager):
+    class Metric:
+        version = 2
+        inputs = ("license",)
+
+        def getScores(self, data):
+            return {"score": 1.0 if data.get("license") == "mit" else 0.0, "latency": 0.0}
+
+    scorer = MetricScorer()
+    scorer.metrics = {"license": Metric()}
+    scorer.weights = {"license": scorer.weights["license"]}
+    fake_artifact_manager.scorer = scorer
+    fake_storage_manager.items["a1"] = {
+        "artifact_id": "a1",
+        "scores": json.dumps({"license": 0.0, "license_latency": 0.0, "net_score": 0.0}),
+        "metric_versions": {"license": 1},
+        "metric_inputs": json.dumps({"license": "mit"}),
+    }
+
+    from backend.main import app
+
+    res = TestClient(app).post("/artifacts/rescore")
+    assert res.status_code == 200
+    assert res.json()["summary"]["rescored"] == 1
+    assert json.loads(fake_storage_manager.items["a1"]["scores"])["net_score"] == 0.1
@@ -0,0 +1,21 @@
+"""Tests for `backend.api.stats` router."""
+
+from fastapi.testclient import TestClient
+
+
+def test_stats_endpoint_reports_http_client_stats(patch_backend_deps):
+    from backend.main import app
+
+    client = TestClient(app)
+    res = client.get("/stats")
+    assert res.status_code == 200
+    http = res.json()["http"]
+    assert {"requests", "retries", "connections_opened", "connections_reused", "reuse_ratio"} <= set(http)
+
+
+def test_stats_endpoint_reports_admission_gauges(patch_backend_deps):
+    from backend.main import app
+
+    res = TestClient(app).get("/stats")
+    admission = res.json()["admission"]
+    assert {"active_transfers", "bytes_in_flight", "budget_used", "waiting", "rejected"} <= set(admission)
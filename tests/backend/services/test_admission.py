@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from backend.services.admission import AdmissionController, AdmissionRejected
+
+
+def test_admission_enforces_transfer_and_host_slots():
+    ctl = AdmissionController(max_bytes=100, max_transfers=2, per_host=1)
+
+    with ctl.admit("a", 10):
+        with pytest.raises(AdmissionRejected) as exc:
+            with ctl.admit("a", 10, timeout=0.01):
+                pass
+        assert "from a" in exc.value.reason
+        with ctl.admit("b", 10):
+            assert ctl.stats()["active_by_host"] == {"a": 1, "b": 1}
+            with pytest.raises(AdmissionRejected):
+                with ctl.admit("c", 10, timeout=0.01):
+                    pass
+
+    stats = ctl.stats()
+    assert stats["active_transfers"] == 0 and stats["bytes_in_flight"] == 0
+    assert stats["admitted"] == 2 and stats["rejected"] == 2
+
+
+def test_admission_byte_budget_queues_until_released_and_admits_oversized_alone():
+    ctl = AdmissionController(max_bytes=100, max_transfers=10, per_host=10)
+    with ctl.admit("a", 500):  # larger than the budget, but nothing else is in flight
+        assert ctl.stats()["budget_used"] == 5.0
+
+    release = threading.Event()
+
+    def holder():
+        with ctl.admit("a", 80):
+            release.wait(1)
+
+    t = threading.Thread(target=holder)
+    t.start()
+    while ctl.stats()["active_transfers"] == 0:
+        time.sleep(0.001)
+    threading.Timer(0.05, release.set).start()
+
+    with ctl.admit("b", 50, timeout=1):
+        stats = ctl.stats()
+    t.join()
+    assert stats["bytes_in_flight"] == 50
+    assert ctl.stats()["queued"] == 1
+
+
+def test_admission_check_waits_for_capacity_without_reserving_any():
+    ctl = AdmissionController(max_bytes=100, max_transfers=10, per_host=1)
+
+    ctl.check("a", 80)
+    assert ctl.stats()["active_transfers"] == 0 and ctl.stats()["bytes_in_flight"] == 0
+
+    with ctl.admit("a", 10):
+        with pytest.raises(AdmissionRejected):
+            ctl.check("a", 10, timeout=0.01)
+        ctl.check("b", 90, timeout=0.01)
+    ctl.check("a", 10, timeout=0.01)
+    stats = ctl.stats()
+    assert stats["admitted"] == 1 and stats["rejected"] == 1 and stats["bytes_in_flight"] == 0
+
+
+def test_admission_resize_grows_within_budget_and_gives_up_bytes_while_waiting():
+    ctl = AdmissionController(max_bytes=100, max_transfers=10, per_host=10)
+
+    with ctl.admit("a", 10) as first:
+        first.resize(60)
+        assert ctl.stats()["bytes_in_flight"] == 60
+        with ctl.admit("b", 30) as second:
+            with pytest.raises(AdmissionRejected):
+                second.resize(50, timeout=0.01)
+            # The failed grow released its bytes instead of holding them while it waited.
+            assert second.nbytes == 0 and ctl.stats()["bytes_in_flight"] == 60
+            first.resize(20)
+            second.resize(50, timeout=0.01)
+            assert ctl.stats()["bytes_in_flight"] == 70
+    assert ctl.stats()["bytes_in_flight"] == 0
+
+
+def test_admission_retry_after_follows_observed_transfer_time():
+    ctl = AdmissionController(max_bytes=10, max_transfers=1, per_host=1)
+    with ctl.admit("a", 1):
+        with pytest.raises(AdmissionRejected) as exc:
+            with ctl.admit("a", 1, timeout=0):
+                pass
+    # No completed transfer before the rejection: default hint.
+    assert exc.value.retry_after == 5
+
+    ctl._avg_hold = 200.0
+    with ctl.admit("a", 1):
+        with pytest.raises(AdmissionRejected) as exc:
+            with ctl.admit("a", 1, timeout=0):
+                pass
+    assert 1 <= exc.value.retry_after <= 60
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from backend.services.batch import BatchIngestor, dedupe_urls
+from backend.services.ingest import canonical_url
+
+
+class _Resp:
+    """Minimal streaming response stub."""
+
+    status_code = 200
+
+    def iter_content(self, chunk_size=1):
+        yield b"1234"
+
+    def close(self):
+        pass
+
+
+def test_canonical_url_normalizes_equivalent_spellings():
+    assert canonical_url("https://www.GitHub.com/Org/Repo.git/") == "https://github.com/org/repo"
+    assert canonical_url("https://github.com/org/repo/tree/main/src") == "https://github.com/org/repo"
+    assert canonical_url("https://huggingface.co/org/model/tree/main?x=1") == "https://huggingface.co/org/model"
+
+
+def test_dedupe_urls_keeps_first_spelling_in_order():
+    urls = ["https://github.com/o/r", " ", "https://github.com/O/r/", "https://huggingface.co/a/b"]
+    assert dedupe_urls(urls) == ["https://github.com/o/r", "https://huggingface.co/a/b"]
+
+
+def test_batch_ingestor_respects_stage_limits(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+    active = {"n": 0, "max": 0}
+    lock = threading.Lock()
+
+    def slow_score(data):
+        with lock:
+            active["n"] += 1
+            active["max"] = max(active["max"], active["n"])
+        time.sleep(0.02)
+        with lock:
+            active["n"] -= 1
+        return {"net_score": 0.5}
+
+    fake_artifact_manager.scoreArtifact = slow_score
+    ingestor = BatchIngestor(
+        fake_artifact_manager,
+        fake_storage_manager,
+        {"metadata": 8, "metric_data": 8, "score": 2, "transfer": 4},
+    )
+    urls = [f"https://github.com/o/r{i}" for i in range(8)] + ["https://github.com/o/R0"]
+
+    out = ingestor.run(urls)
+
+    assert active["max"] <= 2
+    assert [r["url"] for r in out["results"]] == urls[:8]
+    assert all(r["status"] == "created" for r in out["results"])
+    assert out["summary"]["duplicates_dropped"] == 1
+    assert out["summary"]["bytes_transferred"] == 8 * 4
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from backend.services.blob_refs import BlobRefStore
+
+
+def test_blob_refs_acquire_and_release_count_references(fake_blobs_table):
+    store = BlobRefStore(table=fake_blobs_table)
+
+    assert store.acquire("d1", 10) == 1
+    assert store.acquire("d1", 10) == 2
+    assert store.release("d1") == 1
+    assert store.get("d1")["size_bytes"] == 10
+
+
+def test_blob_refs_release_unknown_digest_returns_none(fake_blobs_table):
+    store = BlobRefStore(table=fake_blobs_table)
+    assert store.release("missing") is None
+
+
+def test_blob_refs_delete_mark_blocks_new_references_until_finished(fake_blobs_table):
+    import threading
+    import time
+
+    store = BlobRefStore(table=fake_blobs_table)
+    store.acquire("d1", 1)
+
+    assert store.begin_delete("d1") is None  # still referenced
+    store.release("d1")
+    token = store.begin_delete("d1")
+    assert token and store.begin_delete("d1") is None
+    assert store.acquire_existing("d1") is None
+
+    acquired = []
+    t = threading.Thread(target=lambda: acquired.append(store.acquire("d1", 1)))
+    t.start()
+    time.sleep(0.05)
+    assert acquired == []  # waits while the object is being deleted
+
+    assert store.finish_delete("d1", token) is True
+    t.join(2)
+    assert acquired == [1]  # a fresh count: the caller uploads again
+    assert store.acquire_existing("d1") == 1
+
+
+def test_blob_refs_abort_and_stale_delete_marks(fake_blobs_table):
+    store = BlobRefStore(table=fake_blobs_table, delete_stale_seconds=0)
+    store.acquire("d1", 1)
+    store.release("d1")
+
+    token = store.begin_delete("d1")
+    store.abort_delete("d1", token)
+    assert "deleting" not in store.get("d1")
+
+    store.begin_delete("d1")
+    # A mark left by a crashed process does not block ingest forever.
+    assert store.acquire("d1", 1) == 1
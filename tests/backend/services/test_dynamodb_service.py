@@ -28,6 +28,10 @@ class _FakeTable:
     def scan(self):
         return {"Items": list(self.items.values())}
 
+    def query(self, **kwargs):
+        self.query_calls = getattr(self, "query_calls", []) + [kwargs]
+        return {"Items": [it for it in self.items.values() if it.get("canonical_url")]}
+
 
 def test_dynamodb_service_create_and_get_item():
     t = _FakeTable()
@@ -64,3 +68,15 @@ def test_dynamodb_service_delete_and_scan_and_reset():
     # reset should delete remaining items
     svc.reset_table()
     assert svc.scan_all() == []
+
+
+def test_dynamodb_service_get_by_canonical_url_queries_index_newest_first():
+    t = _FakeTable()
+    svc = DynamoDBService(table=t)
+    t.put_item({"artifact_id": "a1", "canonical_url": "https://github.com/o/r"})
+
+    assert svc.get_by_canonical_url("https://github.com/o/r")["artifact_id"] == "a1"
+    call = t.query_calls[-1]
+    assert call["IndexName"] == "canonical_url-index"
+    assert call["ScanIndexForward"] is False
+    assert call["Limit"] == 1
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from backend.services.idempotency import (
+    IdempotencyConflict,
+    IdempotencyInProgress,
+    IdempotencyRegistry,
+    SQLiteIdempotencyStore,
+)
+
+
+def _registry(tmp_path, **kwargs) -> IdempotencyRegistry:
+    return IdempotencyRegistry(SQLiteIdempotencyStore(str(tmp_path / "keys.db")), **kwargs)
+
+
+def test_registry_replays_result_and_rejects_other_fingerprint(tmp_path):
+    reg = _registry(tmp_path)
+    calls = []
+
+    assert reg.run("k", "fp", lambda: calls.append(1) or {"id": "a1"}) == {"id": "a1"}
+    assert reg.run("k", "fp", lambda: calls.append(1) or {"id": "a2"}) == {"id": "a1"}
+    assert calls == [1]
+
+    with pytest.raises(IdempotencyConflict):
+        reg.run("k", "other", lambda: None)
+
+
+def test_registry_concurrent_callers_share_one_run(tmp_path):
+    reg = _registry(tmp_path)
+    started = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "done"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(reg.run("k", "fp", slow)))
+    first.start()
+    started.wait(2)
+    results.append(reg.run("k", "fp", slow))
+    first.join()
+
+    assert results == ["done", "done"]
+    assert calls == [1]
+
+
+def test_registry_forgets_failures(tmp_path):
+    reg = _registry(tmp_path)
+
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        reg.run("k", "fp", boom)
+    assert reg.run("k", "fp", lambda: "ok") == "ok"
+
+
+def test_registry_pending_key_from_other_process(tmp_path):
+    reg = _registry(tmp_path, pending_seconds=60)
+    reg.store.claim(reg._record("k", "fp", "pending"))
+
+    with pytest.raises(IdempotencyInProgress):
+        reg.run("k", "fp", lambda: "ok")
+
+    stale = _registry(tmp_path, pending_seconds=0)
+    assert stale.run("k", "fp", lambda: "ok") == "ok"
+
+
+def test_registry_takes_over_abandoned_key_only_once(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    reg = _registry(tmp_path, pending_seconds=60)
+    abandoned = reg._record("k", "fp", "pending")
+    abandoned["created_at"] -= 120
+    reg.store.claim(abandoned)
+
+    # Another process read the same abandoned record and took the key first.
+    assert reg.store.takeover(reg._record("k", "fp", "pending"), abandoned)
+    assert not reg.store.takeover(reg._record("k", "fp", "pending"), abandoned)
+
+    reads = [abandoned]
+    get = reg.store.get
+    monkeypatch.setattr(reg.store, "get", lambda key: reads.pop() if reads else get(key))
+    with pytest.raises(IdempotencyInProgress):
+        reg.run("k", "fp", lambda: pytest.fail("ran a second time"))
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.services.ingest import IngestError, IngestPipeline
+
+
+class _Resp:
+    """Minimal streaming response stub."""
+
+    status_code = 200
+
+    def iter_content(self, chunk_size=1):
+        yield b"ab"
+        yield b"cd"
+
+    def close(self):
+        pass
+
+
+def test_ingest_pipeline_reports_stages_and_stores(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+    events = []
+
+    stored = IngestPipeline(fake_artifact_manager, fake_storage_manager).run(
+        "https://huggingface.co/org/model", "model", on_event=lambda s, st, i: events.append((s, st))
+    )
+
+    assert stored["type"] == "model"
+    assert ("transfer", "progress") in events
+    assert [e for e in events if e[1] != "progress"] == [
+        ("metadata", "running"), ("metadata", "done"),
+        ("preflight", "running"), ("preflight", "done"),
+        ("metric_data", "running"), ("metric_data", "done"),
+        ("score", "running"), ("score", "done"),
+        ("transfer", "running"), ("transfer", "done"),
+    ]
+
+
+def test_ingest_pipeline_overlaps_fetching_and_scoring_only_with_dataflow(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+    calls = []
+    fetch_and_score = fake_artifact_manager.fetchAndScore
+
+    def counted(meta, **kw):
+        calls.append("dataflow")
+        return fetch_and_score(meta, **kw)
+
+    fake_artifact_manager.fetchAndScore = counted
+    events = []
+
+    for dataflow in (True, False):
+        IngestPipeline(fake_artifact_manager, fake_storage_manager, dataflow=dataflow).run(
+            f"https://huggingface.co/org/model{dataflow}", "model", on_event=lambda s, st, i: events.append((s, st, i))
+        )
+
+    assert calls == ["dataflow"]
+    score_done = [i for s, st, i in events if (s, st) == ("score", "done")]
+    assert score_done[0]["critical_path"] == [] and "critical_path" not in score_done[1]
+
+
+def test_ingest_pipeline_without_download_url_fails(fake_artifact_manager, fake_storage_manager):
+    fake_artifact_manager.getMetadata = lambda url: {"artifact_type": "model"}
+
+    with pytest.raises(IngestError) as exc:
+        IngestPipeline(fake_artifact_manager, fake_storage_manager).run("https://x/y", "model")
+    assert exc.value.status_code == 400
+
+
+def test_ingest_pipeline_links_advertised_blob_without_downloading(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    digest = "a" * 64
+    url = "https://huggingface.co/org/model/resolve/main/model.safetensors"
+    fake_artifact_manager.getMetadata = lambda u: {"artifact_type": "model", "download_url": url}
+
+    class _Head:
+        headers = {"X-Linked-Etag": f'"{digest}"'}
+
+    def link(artifact_data, sha256, filename=None):
+        fake_storage_manager.items[artifact_data["artifact_id"]] = {"artifact_id": artifact_data["artifact_id"], "sha256": sha256}
+        return True
+
+    def no_get(*a, **k):
+        raise AssertionError("download should be skipped")
+
+    monkeypatch.setattr("backend.services.ingest.http_client.head", lambda *a, **k: _Head())
+    monkeypatch.setattr("backend.services.ingest.http_client.get", no_get)
+    monkeypatch.setattr(fake_storage_manager, "link_existing_blob", link)
+
+    stored = IngestPipeline(fake_artifact_manager, fake_storage_manager).run("https://huggingface.co/org/model", "model")
+    assert stored["sha256"] == digest
+
+
+def test_ingest_pipeline_returns_existing_artifact_for_same_canonical_url(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+    pipeline = IngestPipeline(fake_artifact_manager, fake_storage_manager)
+    first = pipeline.run("https://huggingface.co/org/model", "model")
+
+    def no_metadata(url):
+        raise AssertionError("metadata should not be fetched again")
+
+    monkeypatch.setattr(fake_artifact_manager, "getMetadata", no_metadata)
+    again = pipeline.run("https://huggingface.co/org/model/tree/main", "model")
+    assert again["artifact_id"] == first["artifact_id"]
+
+    with pytest.raises(AssertionError):
+        pipeline.run("https://huggingface.co/org/model", "model", reuse_existing=False)
+
+
+def test_ingest_pipeline_snapshot_mode_stores_manifest(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    manifest = {"files": [{"path": "model.safetensors", "sha256": "a" * 64, "size_bytes": 4}],
+                "file_count": 1, "total_bytes": 4}
+    seen = {}
+
+    def fake_run(self, kind, repo_id, on_bytes=None, revision="main"):
+        seen["repo"] = (kind, repo_id)
+        on_bytes(4)
+        return manifest
+
+    def store_snapshot(artifact_data, m):
+        fake_storage_manager.items[artifact_data["artifact_id"]] = {"artifact_id": artifact_data["artifact_id"], "manifest": m}
+        return True
+
+    monkeypatch.setattr("backend.services.ingest.SnapshotTransfer.run", fake_run)
+    fake_storage_manager.store_snapshot = store_snapshot
+    events = []
+
+    stored = IngestPipeline(fake_artifact_manager, fake_storage_manager, snapshots=True).run(
+        "https://huggingface.co/org/model/tree/main", "model", on_event=lambda s, st, i: events.append((s, st, i))
+    )
+
+    assert seen["repo"] == ("model", "org/model")
+    assert stored["manifest"] == manifest
+    assert ("transfer", "progress", {"bytes": 4}) in events
+
+
+def test_ingest_pipeline_uses_ranged_download_when_source_supports_it(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    from backend.services.ranged import RangedDownload
+
+    download = RangedDownload("https://cdn/x", size=64, part_size=16, connections=4)
+    monkeypatch.setattr("backend.services.ingest.RangedDownload.probe", staticmethod(lambda url, **k: download))
+    monkeypatch.setattr(
+        "backend.services.ingest.http_client.get", lambda *a, **k: pytest.fail("single-stream GET used")
+    )
+
+    def store_artifact_ranged(artifact_data, ranged, filename, on_bytes=None, resume=None, on_checkpoint=None):
+        assert ranged is download
+        on_bytes(64)
+        return fake_storage_manager.store_artifact(artifact_data, b"", filename)
+
+    fake_storage_manager.store_artifact_ranged = store_artifact_ranged
+    events = []
+
+    stored = IngestPipeline(fake_artifact_manager, fake_storage_manager, ranged=True).run(
+        "https://huggingface.co/org/model", "model", on_event=lambda s, st, i: events.append((s, st, i))
+    )
+
+    assert stored["type"] == "model"
+    assert ("transfer", "progress", {"bytes": 64}) in events
+
+
+def test_ingest_pipeline_rejects_oversized_artifact_before_download(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    url = "https://huggingface.co/org/model/resolve/main/model.safetensors"
+    fake_artifact_manager.getMetadata = lambda u: {
+        "artifact_type": "model",
+        "download_url": url,
+        "siblings": [{"rfilename": "model.safetensors", "size": 3 * 1024, "lfs": {"size": 3 * 1024**3}}],
+    }
+    monkeypatch.setattr("backend.services.ingest.http_client.head", lambda *a, **k: pytest.fail("HEAD sent"))
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: pytest.fail("GET sent"))
+    events = []
+
+    with pytest.raises(IngestError) as exc:
+        IngestPipeline(fake_artifact_manager, fake_storage_manager, max_artifact_bytes=2 * 1024**3).run(
+            "https://huggingface.co/org/model", "model", on_event=lambda s, st, i: events.append((s, st))
+        )
+
+    assert exc.value.status_code == 413
+    assert ("preflight", "failed") in events
+    assert not any(stage in ("metric_data", "transfer") for stage, _ in events)
+
+
+def test_ingest_pipeline_checks_admission_before_fetching_and_holds_it_only_for_the_transfer(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    from backend.services.admission import AdmissionController
+
+    admission = AdmissionController(max_bytes=1024**3, max_transfers=1, per_host=1)
+    events = []
+    pipeline = IngestPipeline(
+        fake_artifact_manager, fake_storage_manager, admission=admission, admission_wait=0.01
+    )
+
+    # No capacity: rejected before any metric data is fetched.
+    with admission.admit("example.com", 1):
+        with pytest.raises(IngestError) as exc:
+            pipeline.run("https://huggingface.co/org/busy", "model", on_event=lambda s, st, i: events.append(s))
+    assert exc.value.status_code == 429
+    assert events == ["metadata", "metadata", "preflight", "preflight"]
+
+    held = {}
+    scored = fake_artifact_manager.fetchAndScore
+
+    def score(meta, **kw):
+        held["score"] = admission.stats()["active_transfers"]
+        return scored(meta, **kw)
+
+    def transfer(artifact_data, emit, admission_handle, resume, estimate):
+        held["transfer"] = admission.stats()["active_by_host"]
+        raise IngestError(502, "download failed")
+
+    fake_artifact_manager.fetchAndScore = score
+    monkeypatch.setattr(pipeline, "_transfer_admitted", transfer)
+    with pytest.raises(IngestError):
+        pipeline.run("https://huggingface.co/org/broken", "model")
+    assert held == {"score": 0, "transfer": {"example.com": 1}}
+    stats = admission.stats()
+    assert stats["active_transfers"] == 0 and stats["bytes_in_flight"] == 0
+
+
+def test_ingest_pipeline_sends_small_artifacts_down_single_get_without_range_probe(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    class _Head:
+        status_code = 200
+        headers = {"Content-Length": "4", "Accept-Ranges": "bytes"}
+        url = "https://example.com/model.bin"
+
+    monkeypatch.setattr("backend.services.preflight.http_client.head", lambda *a, **k: _Head())
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+    monkeypatch.setattr(
+        "backend.services.ingest.RangedDownload.probe", staticmethod(lambda *a, **k: pytest.fail("range probe"))
+    )
+
+    stored = IngestPipeline(fake_artifact_manager, fake_storage_manager, ranged=True, preflight_head=True).run(
+        "https://huggingface.co/org/model", "model"
+    )
+
+    assert stored["size_in_gb"] == pytest.approx(4 / 1024**3)
+
+
+def test_ingest_pipeline_cuts_off_unsized_stream_over_the_limit(
+    monkeypatch: pytest.MonkeyPatch, fake_artifact_manager, fake_storage_manager
+):
+    monkeypatch.setattr("backend.services.ingest.http_client.get", lambda *a, **k: _Resp())
+
+    def store_artifact_stream(artifact_data, chunks, filename):
+        try:
+            b"".join(chunks)
+        except IngestError:
+            return False
+        return True
+
+    fake_storage_manager.store_artifact_stream = store_artifact_stream
+
+    with pytest.raises(IngestError) as exc:
+        IngestPipeline(fake_artifact_manager, fake_storage_manager, max_artifact_bytes=3).run(
+            "https://huggingface.co/org/model", "model"
+        )
+    assert exc.value.status_code == 413
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import time
+
+from backend.services.ingest import IngestError
+from backend.services.jobs import DynamoDBJobStore, IngestJobManager, SQLiteJobStore
+
+
+class _FakePipeline:
+    """IngestPipeline stand-in that reports every stage and returns a stored item."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    def run(self, url, artifact_type, name=None, on_event=None, reuse_existing=True, resume=None):
+        for stage in ("metadata", "metric_data", "score"):
+            on_event(stage, "running", {})
+            on_event(stage, "done", {"seconds": 0.0})
+        on_event("transfer", "running", {})
+        if self.fail:
+            on_event("transfer", "failed", {"error": "boom"})
+            raise IngestError(400, "No download URL found for the artifact")
+        on_event("transfer", "progress", {"bytes": 10})
+        on_event("transfer", "done", {"seconds": 0.0})
+        return {"artifact_id": "a1"}
+
+
+def test_sqlite_job_store_roundtrip_and_status_filter(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    store.put({"job_id": "j1", "status": "queued", "created_at": "1", "updated_at": "1"})
+    store.put({"job_id": "j2", "status": "succeeded", "created_at": "2", "updated_at": "2"})
+
+    assert store.get("j1")["status"] == "queued"
+    assert store.get("missing") is None
+    assert [j["job_id"] for j in store.list_by_status(["queued", "running"])] == ["j1"]
+
+
+def test_job_manager_runs_pipeline_and_records_stages(tmp_path):
+    manager = IngestJobManager(SQLiteJobStore(str(tmp_path / "jobs.db")), _FakePipeline, max_workers=1)
+
+    job = manager.submit("https://huggingface.co/org/model", "model")
+    done = manager.wait(job["job_id"], timeout=5)
+    manager.shutdown(wait=True)
+
+    assert done["status"] == "succeeded"
+    assert done["artifact_id"] == "a1"
+    assert done["stages"]["transfer"]["status"] == "done"
+    assert done["stages"]["transfer"]["bytes"] == 10
+
+
+def test_job_manager_records_pipeline_failure(tmp_path):
+    manager = IngestJobManager(
+        SQLiteJobStore(str(tmp_path / "jobs.db")), lambda: _FakePipeline(fail=True), max_workers=1
+    )
+
+    job = manager.submit("https://huggingface.co/org/model", "model")
+    done = manager.wait(job["job_id"], timeout=5)
+    manager.shutdown(wait=True)
+
+    assert done["status"] == "failed"
+    assert done["error"] == "No download URL found for the artifact"
+    assert done["stages"]["transfer"]["status"] == "failed"
+
+
+def test_job_manager_start_requeues_unfinished_jobs(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    store.put(
+        {
+            "job_id": "j1",
+            "status": "running",
+            "url": "https://huggingface.co/org/model",
+            "artifact_type": "model",
+            "name": None,
+            "attempts": 1,
+            "stages": {},
+            "created_at": "1",
+            "updated_at": "1",
+        }
+    )
+
+    manager = IngestJobManager(store, _FakePipeline, max_workers=1)
+    assert manager.start() == 1
+    done = manager.wait("j1", timeout=5)
+    manager.shutdown(wait=True)
+
+    assert done["status"] == "succeeded"
+    assert done["attempts"] == 2
+
+
+def test_job_manager_checkpoints_upload_and_resumes_after_restart(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    checkpoint = {"key": "staging/x", "upload_id": "up1", "parts": [{"PartNumber": 1, "ETag": "e1"}]}
+
+    class _CrashingPipeline:
+        def run(self, url, artifact_type, name=None, on_event=None, reuse_existing=True, resume=None):
+            on_event("transfer", "running", {})
+            on_event("transfer", "checkpoint", checkpoint)
+            # The worker dies here: the record must already hold the checkpoint.
+            assert store.get(job_id)["checkpoint"] == checkpoint
+            raise SystemExit
+
+    # lease_seconds=0: the crashed worker stops renewing, so its lease is already over.
+    manager = IngestJobManager(store, _CrashingPipeline, max_workers=1, lease_seconds=0)
+    job_id = manager.submit("https://huggingface.co/org/model", "model")["job_id"]
+    try:
+        manager.wait(job_id, timeout=5)
+    except SystemExit:
+        pass
+    manager.shutdown(wait=True)
+    assert store.get(job_id)["status"] == "running"
+
+    seen = {}
+
+    class _ResumingPipeline(_FakePipeline):
+        def run(self, url, artifact_type, name=None, on_event=None, reuse_existing=True, resume=None):
+            seen["resume"] = resume
+            return super().run(url, artifact_type, name, on_event, reuse_existing)
+
+    class _Uploads:
+        def abort_stale_uploads(self, max_age_seconds, keep=()):
+            seen.setdefault("keep", set(keep))
+            return 0
+
+    restarted = IngestJobManager(store, _ResumingPipeline, max_workers=1, uploads=_Uploads(), reap_interval=60)
+    assert restarted.start() == 1
+    done = restarted.wait(job_id, timeout=5)
+    restarted.shutdown(wait=True)
+
+    assert seen["resume"] == checkpoint
+    assert seen["keep"] == {"up1"}
+    assert done["status"] == "succeeded"
+    assert "checkpoint" not in done
+
+
+def test_job_manager_start_leaves_jobs_with_live_leases_to_their_owner(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+    job = {
+        "job_id": "j1",
+        "status": "running",
+        "url": "https://huggingface.co/org/model",
+        "artifact_type": "model",
+        "name": None,
+        "attempts": 1,
+        "stages": {},
+        "created_at": "1",
+        "updated_at": "1",
+    }
+    assert store.claim(dict(job), "other-process", int(time.time()) + 60)
+
+    manager = IngestJobManager(store, _FakePipeline, max_workers=1)
+    assert manager.start() == 0
+    assert store.get("j1")["status"] == "running"
+    assert not store.claim(dict(job), manager.owner, int(time.time()) + 60)
+
+    # Once the other process stops renewing, the lease keeper takes the job over.
+    assert store.claim(dict(job), "other-process", int(time.time()) - 1)
+    assert manager.recover_expired() == 1
+    done = manager.wait("j1", timeout=5)
+    manager.shutdown(wait=True)
+
+    assert done["status"] == "succeeded"
+    assert done["owner"] == manager.owner
+    # A finished job can no longer be claimed.
+    assert not store.claim(dict(job), "other-process", int(time.time()) + 60)
+
+
+def test_dynamodb_job_store_claims_conditionally_and_reads_renewed_lease():
+    from botocore.exceptions import ClientError
+
+    class _Table:
+        def __init__(self):
+            self.items, self.calls = {}, []
+
+        def put_item(self, Item, **kwargs):
+            self.calls.append(kwargs)
+            if kwargs and Item["job_id"] in self.items and self.items[Item["job_id"]]["owner"] != Item["owner"]:
+                raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem")
+            self.items[Item["job_id"]] = Item
+
+        def update_item(self, Key, ExpressionAttributeValues, **kwargs):
+            self.items[Key["job_id"]]["lease_expires"] = ExpressionAttributeValues[":until"]
+
+        def get_item(self, Key):
+            return {"Item": self.items.get(Key["job_id"])}
+
+    table = _Table()
+    store = DynamoDBJobStore(table=table)
+    job = {"job_id": "j1", "status": "queued", "created_at": "1", "updated_at": "1"}
+
+    assert store.claim(dict(job), "p1", 100)
+    assert "lease_expires <= :now" in table.calls[0]["ConditionExpression"]
+    assert not store.claim(dict(job), "p2", 100)
+    assert store.renew("j1", "p1", 200)
+    assert store.get("j1")["lease_expires"] == 200 and store.get("j1")["owner"] == "p1"
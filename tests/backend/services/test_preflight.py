@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.services.preflight import estimate_repo_size, estimate_size, sibling_size
+
+_URL = "https://huggingface.co/org/model/resolve/main/weights/model.safetensors"
+
+
+class _Head:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_sibling_size_prefers_lfs_size_for_resolved_file():
+    meta = {"siblings": [
+        {"rfilename": "config.json", "size": 10},
+        {"rfilename": "weights/model.safetensors", "size": 134, "lfs": {"size": 5000}},
+    ]}
+
+    assert sibling_size(meta, _URL) == 5000
+    assert sibling_size(meta, "https://github.com/org/repo/archive/refs/heads/main.zip") is None
+    assert sibling_size({"siblings": [{"rfilename": "weights/model.safetensors"}]}, _URL) is None
+
+
+def test_estimate_size_uses_siblings_without_head(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("backend.services.preflight.http_client.head", lambda *a, **k: pytest.fail("HEAD sent"))
+    meta = {"siblings": [{"rfilename": "weights/model.safetensors", "size": 2048}]}
+
+    estimate = estimate_size(_URL, meta)
+
+    assert (estimate.size, estimate.source) == (2048, "siblings")
+    assert estimate.size_in_gb == pytest.approx(2048 / 1024**3)
+
+
+def test_estimate_size_falls_back_to_head_then_unknown(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(
+        "backend.services.preflight.http_client.head", lambda *a, **k: _Head(headers={"Content-Length": "777"})
+    )
+    estimate = estimate_size(_URL, {})
+    assert (estimate.size, estimate.source) == (777, "head")
+    assert estimate.head is not None
+
+    monkeypatch.setattr("backend.services.preflight.http_client.head", lambda *a, **k: _Head(status_code=404))
+    assert estimate_size(_URL, {}).source == "unknown"
+    # Repo-wide figures are not the file's size.
+    meta = {"usedStorage": 4096, "safetensors": {"total": 1000}}
+    assert estimate_size(_URL, meta, head=False).size is None
+
+
+def test_estimate_repo_size_sums_selected_files_else_used_storage():
+    meta = {
+        "usedStorage": 99999,
+        "siblings": [
+            {"rfilename": "model.safetensors", "size": 100},
+            {"rfilename": "pytorch_model.bin", "size": 100},
+            {"rfilename": "config.json", "size": 5},
+        ],
+    }
+
+    # pytorch_model.bin duplicates the safetensors weights and is not transferred.
+    assert estimate_repo_size(meta).size == 105
+    assert estimate_repo_size({"usedStorage": 1234, "siblings": [{"rfilename": "a"}]}).size == 1234
+    assert estimate_repo_size({}).size is None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+import requests
+
+from backend.services.ranged import RangedDownload, RangeError, plan
+
+_MIB = 1024 * 1024
+
+
+class _Resp:
+    def __init__(self, status_code=200, headers=None, body=b"", url=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+        self.url = url
+
+    def iter_content(self, chunk_size=1):
+        yield self._body
+
+    def close(self):
+        pass
+
+
+def test_plan_adapts_part_size_and_connections_to_object_size():
+    small = plan(40 * _MIB, max_connections=16, min_part=8 * _MIB, max_part=64 * _MIB)
+    assert small == {"part_size": 8 * _MIB, "connections": 5}
+
+    large = plan(20 * 1024 * _MIB, max_connections=16, min_part=8 * _MIB, max_part=64 * _MIB)
+    assert large == {"part_size": 64 * _MIB, "connections": 16}
+
+    # Huge objects grow the part size to stay under the 10,000-part limit.
+    huge = plan(1024 * 1024 * _MIB, max_connections=16, min_part=8 * _MIB, max_part=64 * _MIB)
+    assert huge["part_size"] * 10_000 >= 1024 * 1024 * _MIB
+
+
+def test_probe_requires_byte_ranges_and_follows_redirects(monkeypatch):
+    heads = {
+        "https://h/ranged": _Resp(headers={"Accept-Ranges": "bytes", "Content-Length": str(100 * _MIB)},
+                                  url="https://cdn/signed"),
+        "https://h/plain": _Resp(headers={"Content-Length": str(100 * _MIB)}),
+        "https://h/small": _Resp(headers={"Accept-Ranges": "bytes", "Content-Length": "10"}),
+    }
+    monkeypatch.setattr("backend.services.ranged.http_client.head", lambda url, **kw: heads[url])
+
+    download = RangedDownload.probe("https://h/ranged", min_size=_MIB)
+    assert download.url == "https://cdn/signed"
+    assert download.size == 100 * _MIB
+    assert RangedDownload.probe("https://h/plain", min_size=_MIB) is None
+    assert RangedDownload.probe("https://h/small", min_size=_MIB) is None
+
+
+def test_fetch_range_retries_only_the_failed_range(monkeypatch):
+    monkeypatch.setattr("backend.services.ranged.time.sleep", lambda s: None)
+    attempts = []
+
+    def fake_get(url, headers=None, **kw):
+        attempts.append(headers["Range"])
+        if len(attempts) == 1:
+            raise requests.ConnectionError("reset")
+        if len(attempts) == 2:
+            return _Resp(status_code=206, body=b"ab")  # short body
+        return _Resp(status_code=206, body=b"abcd")
+
+    monkeypatch.setattr("backend.services.ranged.http_client.get", fake_get)
+    download = RangedDownload("https://h/x", size=8, part_size=4, connections=2, retries=3)
+
+    assert download.fetch_range(4, 7) == b"abcd"
+    assert attempts == ["bytes=4-7"] * 3
+    assert download.range_retries == 2
+
+
+def test_fetch_range_gives_up_after_retries(monkeypatch):
+    monkeypatch.setattr("backend.services.ranged.time.sleep", lambda s: None)
+    # A 200 means the server ignored the Range header.
+    monkeypatch.setattr("backend.services.ranged.http_client.get", lambda url, **kw: _Resp(status_code=200, body=b"all"))
+
+    with pytest.raises(RangeError):
+        RangedDownload("https://h/x", size=8, part_size=4, connections=2, retries=1).fetch_range(0, 3)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+
+from backend.services.rescore import Rescorer
+from cli.utils.MetricScorer import MetricScorer
+
+
+class _Metric:
+    def __init__(self, score, version=1):
+        self.score, self.version, self.calls = score, version, 0
+        self.inputs = ("license",)
+
+    def getScores(self, data):
+        self.calls += 1
+        assert data == {"license": "mit"}
+        return {"score": self.score, "latency": 0.0}
+
+
+def _scorer() -> MetricScorer:
+    scorer = MetricScorer()
+    scorer.metrics = {name: _Metric(0.5) for name in scorer.metrics if name != "size_score"}
+    return scorer
+
+
+def _store(storage, artifact_id, scorer, **extra):
+    scores = scorer.score_artifact({"license": "mit"}, as_json_str=False)
+    storage.items[artifact_id] = {
+        "artifact_id": artifact_id,
+        "processed_url": f"https://github.com/o/{artifact_id}",
+        "scores": json.dumps(scores),
+        "metric_versions": scorer.metric_versions(),
+        "metric_inputs": json.dumps({"license": "mit"}),
+        **extra,
+    }
+
+
+def test_rescorer_recomputes_changed_metrics_from_stored_inputs(fake_storage_manager):
+    scorer = _scorer()
+    _store(fake_storage_manager, "a1", scorer)
+    _store(fake_storage_manager, "a2", scorer)
+    fake_storage_manager.items["legacy"] = {"artifact_id": "legacy", "scores": json.dumps({"net_score": 0.3})}
+
+    scorer.metrics["license"] = _Metric(1.0, version=2)
+    body = Rescorer(fake_storage_manager, scorer).run()
+
+    by_id = {r["artifact_id"]: r for r in body["results"]}
+    assert by_id["a1"]["recomputed"] == ["license"]
+    assert by_id["legacy"]["status"] == "missing_inputs"
+    summary = body["summary"]
+    assert (summary["rescored"], summary["missing_inputs"]) == (2, 1)
+    assert (summary["metrics_evaluated"], summary["metrics_skipped"]) == (2, 12)
+    assert scorer.metrics["bus_factor"].calls == 2  # only the two original scoring runs
+
+    item = fake_storage_manager.items["a1"]
+    assert json.loads(item["scores"])["license"] == 1.0
+    assert item["metric_versions"]["license"] == 2
+
+    again = Rescorer(fake_storage_manager, scorer).run(["a1", "nope"])
+    assert [r["status"] for r in again["results"]] == ["current", "not_found"]
+    assert again["summary"]["metrics_skipped"] == 7
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import hashlib
 from io import BytesIO
 
+import pytest
+from botocore.exceptions import ClientError
+
 from backend.services.s3_service import S3Service
 
 
@@ -15,6 +19,54 @@ class _FakeS3:
         self.deleted_batches = []
         self.presigned = []
         self.objects = {"k": b"data"}
+        self.puts = []
+        self.parts = []
+        self.completed = []
+        self.aborted = []
+        self.copies = []
+        self.live_uploads = {}
+        self.uploads_in_progress = []
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes):
+        self.puts.append((Bucket, Key, Body))
+
+    def create_multipart_upload(self, Bucket: str, Key: str):
+        return {"UploadId": "up1"}
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: bytes):
+        self.parts.append((PartNumber, Body))
+        return {"ETag": f"etag{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload):
+        self.completed.append((Key, UploadId, MultipartUpload["Parts"]))
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str):
+        self.aborted.append((Key, UploadId))
+
+    def copy(self, CopySource, Bucket: str, Key: str):
+        self.copies.append((CopySource["Key"], Key))
+
+    def list_parts(self, Bucket: str, Key: str, UploadId: str, **kwargs):
+        if UploadId not in self.live_uploads:
+            raise ClientError({"Error": {"Code": "NoSuchUpload"}}, "ListParts")
+        return {"Parts": [{"PartNumber": n, "ETag": f"etag{n}"} for n in self.live_uploads[UploadId]]}
+
+    def list_multipart_uploads(self, Bucket: str, Prefix: str, **kwargs):
+        return {"Uploads": self.uploads_in_progress}
+
+    def get_object(self, Bucket: str, Key: str):
+        data = self.objects[Key]
+
+        class _Body:
+            def iter_chunks(self, chunk_size=1024):
+                yield data
+
+        return {"Body": _Body()}
+
+    def head_object(self, Bucket: str, Key: str):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
 
     def upload_fileobj(self, fileobj: BytesIO, bucket: str, key: str):
         self.uploads.append((bucket, key, fileobj.read()))
@@ -46,6 +98,155 @@ def test_s3_service_upload_artifact_returns_s3_uri():
     assert svc.s3.uploads == [("b", "artifacts/id1/file.bin", b"abc")]
 
 
+def test_s3_service_stage_stream_aborts_on_failure():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+
+    def chunks():
+        yield b"abcdef"
+        raise IOError("connection reset")
+
+    with pytest.raises(IOError):
+        svc.stage_stream(chunks(), part_size=4)
+    assert len(svc.s3.aborted) == 1
+    assert svc.s3.aborted[0][0].startswith("staging/")
+    assert svc.s3.completed == []
+
+
+def test_s3_service_stage_stream_hashes_and_commits_to_blob_key():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+
+    staged = svc.stage_stream(iter([b"abc", b"defg", b"hi"]), part_size=4)
+    assert staged.sha256 == hashlib.sha256(b"abcdefghi").hexdigest()
+    assert staged.size == 9
+    assert svc.s3.parts == [(1, b"abcd"), (2, b"efgh"), (3, b"i")]
+    assert svc.s3.completed == []
+
+    uri = staged.commit(svc.blob_key(staged.sha256))
+    assert uri == f"s3://b/blobs/sha256/{staged.sha256}"
+    assert svc.s3.copies == [(staged.key, f"blobs/sha256/{staged.sha256}")]
+    assert svc.s3.deletes == [("b", staged.key)]
+
+
+def test_s3_service_stage_ranges_uploads_each_range_as_a_part_and_hashes_in_order():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+    data = bytes(range(10)) * 3
+    totals = []
+
+    staged = svc.stage_ranges(lambda s, e: data[s:e + 1], len(data), part_size=8, concurrency=3, on_bytes=totals.append)
+
+    assert staged.sha256 == hashlib.sha256(data).hexdigest()
+    assert staged.size == 30
+    assert sorted(svc.s3.parts) == [(1, data[0:8]), (2, data[8:16]), (3, data[16:24]), (4, data[24:30])]
+    assert [p["PartNumber"] for p in staged.parts] == [1, 2, 3, 4]
+    assert totals == [8, 16, 24, 30]
+
+
+def test_s3_service_stage_ranges_aborts_on_failed_range():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+
+    def fetch(start, end):
+        if start == 8:
+            raise RuntimeError("range failed")
+        return b"x" * (end - start + 1)
+
+    with pytest.raises(RuntimeError):
+        svc.stage_ranges(fetch, 24, part_size=8, concurrency=2)
+    assert len(svc.s3.aborted) == 1
+
+
+def test_s3_service_stage_ranges_checkpoints_and_resumes_missing_parts_only():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+    data = bytes(range(24))
+    checkpoints = []
+    svc.stage_ranges(lambda s, e: data[s:e + 1], 24, part_size=8, concurrency=2, on_checkpoint=checkpoints.append)
+    assert [len(c["parts"]) for c in checkpoints] == [1, 2, 3]
+    assert checkpoints[0]["parts"][0] == {"ETag": "etag1", "PartNumber": 1, "start": 0, "end": 7}
+
+    # A worker died after part 1; S3 still holds it.
+    resume = {**checkpoints[0], "key": "staging/old", "upload_id": "old"}
+    svc.s3 = _FakeS3()
+    svc.s3.live_uploads["old"] = [1]
+    svc.s3.objects["staging/old"] = data
+    fetched = []
+
+    def fetch(start, end):
+        fetched.append(start)
+        return data[start:end + 1]
+
+    staged = svc.stage_ranges(fetch, 24, part_size=8, concurrency=2, resume=resume)
+
+    assert fetched == [8, 16]
+    assert [p for p, _ in svc.s3.parts] == [2, 3]
+    assert svc.s3.completed == [("staging/old", "old", [
+        {"ETag": "etag1", "PartNumber": 1}, {"ETag": "etag2", "PartNumber": 2}, {"ETag": "etag3", "PartNumber": 3},
+    ])]
+    assert staged.sha256 == hashlib.sha256(data).hexdigest()
+    staged.commit(svc.blob_key(staged.sha256))
+    assert svc.s3.copies == [("staging/old", f"blobs/sha256/{staged.sha256}")]
+
+
+def test_s3_service_stage_ranges_starts_over_when_checkpointed_upload_is_gone():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+    data = bytes(range(16))
+    resume = {"key": "staging/old", "upload_id": "gone", "size": 16, "part_size": 8,
+              "parts": [{"ETag": "etag1", "PartNumber": 1, "start": 0, "end": 7}]}
+
+    staged = svc.stage_ranges(lambda s, e: data[s:e + 1], 16, part_size=8, resume=resume)
+
+    assert staged.key != "staging/old"
+    assert [p for p, _ in sorted(svc.s3.parts)] == [1, 2]
+
+
+def test_s3_service_abort_stale_uploads_keeps_recent_and_held_uploads():
+    from datetime import datetime, timedelta, timezone
+
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+    old = datetime.now(timezone.utc) - timedelta(hours=48)
+    svc.s3.uploads_in_progress = [
+        {"Key": "staging/a", "UploadId": "stale", "Initiated": old},
+        {"Key": "staging/b", "UploadId": "held", "Initiated": old},
+        {"Key": "staging/c", "UploadId": "fresh", "Initiated": datetime.now(timezone.utc)},
+    ]
+
+    assert svc.abort_stale_uploads(24 * 3600, keep={"held"}) == 1
+    assert svc.s3.aborted == [("staging/a", "stale")]
+
+
+def test_s3_service_stage_stream_discard_aborts_without_completing():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+
+    staged = svc.stage_stream(iter([b"abcdef"]), part_size=4)
+    staged.discard()
+    assert svc.s3.aborted == [(staged.key, "up1")]
+    assert svc.s3.completed == []
+
+
+def test_s3_service_stage_stream_small_payload_commits_with_put_object():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+
+    staged = svc.stage_stream(iter([b"ab"]), part_size=4)
+    staged.commit("blobs/sha256/x")
+    assert svc.s3.puts == [("b", "blobs/sha256/x", b"ab")]
+    assert svc.s3.copies == []
+
+
+def test_s3_service_object_exists_uses_head_object():
+    svc = S3Service(bucket_name="b")
+    svc.s3 = _FakeS3()
+
+    assert svc.object_exists("k") is True
+    assert svc.object_exists("missing") is False
+
+
 def test_s3_service_download_artifact_reads_bytes():
     svc = S3Service(bucket_name="b")
     fake = _FakeS3()
@@ -63,6 +264,9 @@ def test_s3_service_generate_presigned_url_passes_params():
     url = svc.generate_presigned_url("artifacts/id1/file.bin", expires_in=123)
     assert url.endswith("artifacts/id1/file.bin?exp=123")
 
+    svc.generate_presigned_url("blobs/sha256/abc", filename="model.bin")
+    assert svc.s3.presigned[-1][1]["ResponseContentDisposition"] == 'attachment; filename="model.bin"'
+
 
 def test_s3_service_delete_artifact_returns_true():
     svc = S3Service(bucket_name="b")
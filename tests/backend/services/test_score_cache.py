@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+from backend.services.score_cache import ScoreCache, score_key
+
+
+def test_score_key_depends_on_canonical_url_inputs_and_versions():
+    data = {"license": "mit", "readme": "hello"}
+    versions = {"license": 1, "bus_factor": 1}
+    key = score_key("https://github.com/Org/Repo.git", data, versions)
+
+    assert key == score_key("https://www.github.com/org/repo/tree/main", dict(reversed(list(data.items()))), versions)
+    assert key != score_key("https://github.com/org/other", data, versions)
+    assert key != score_key("https://github.com/org/repo", {**data, "readme": "changed"}, versions)
+    assert key != score_key("https://github.com/org/repo", data, {**versions, "license": 2})
+
+
+def test_score_cache_hits_return_copies_and_count():
+    cache = ScoreCache(ttl=60, max_entries=4)
+    assert cache.get("k") is None
+    cache.put("k", {"net_score": 0.5, "name": ""})
+
+    entry = cache.get("k")
+    entry.scores["name"] = "changed"
+    assert cache.get("k").scores == {"net_score": 0.5, "name": ""}
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_score_cache_evicts_least_recently_used():
+    cache = ScoreCache(ttl=60, max_entries=2)
+    cache.put("a", {"net_score": 0.1})
+    cache.put("b", {"net_score": 0.2})
+    cache.get("a")
+    cache.put("c", {"net_score": 0.3})
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_score_cache_expires_entries_and_reports_staleness():
+    cache = ScoreCache(ttl=10, max_entries=4)
+    cache.put("old", {"net_score": 0.1}, scored_at=time.time() - 11)
+
+    assert cache.get("old") is None
+    assert len(cache) == 0
+    assert cache.is_stale(time.time() - 11) is True
+    assert cache.is_stale(time.time()) is False
+    assert cache.is_stale(None) is None
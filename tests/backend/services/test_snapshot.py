@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+
+import pytest
+
+from backend.services.snapshot import (
+    SnapshotError,
+    SnapshotTransfer,
+    _ByteBudget,
+    hf_repo_from_url,
+    primary_file,
+    select_files,
+)
+
+_FILES = {
+    "config.json": b'{"a": 1}',
+    "model-00001-of-00002.safetensors": b"shard-one",
+    "model-00002-of-00002.safetensors": b"shard-two",
+    "pytorch_model.bin": b"duplicate weights",
+    "tokenizer/vocab.txt": b"hello world",
+    ".gitattributes": b"*.bin lfs",
+}
+
+
+class _Resp:
+    def __init__(self, status_code=200, payload=None, body=b""):
+        self.status_code = status_code
+        self._payload = payload
+        self._body = body
+
+    def json(self):
+        return self._payload
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self._body), 4):
+            yield self._body[i:i + 4]
+
+    def close(self):
+        pass
+
+
+class _FakeStorage:
+    """Blob side of StorageManager: reference counts by digest."""
+
+    def __init__(self):
+        self.refs = {}
+        self.uploads = 0
+        self._lock = threading.Lock()
+
+    def store_blob_stream(self, chunks):
+        data = b"".join(chunks)
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self.uploads += 1
+            self.refs[digest] = self.refs.get(digest, 0) + 1
+        return {"sha256": digest, "size_bytes": len(data)}
+
+    def acquire_existing_blob(self, sha256):
+        with self._lock:
+            if not self.refs.get(sha256):
+                return None
+            self.refs[sha256] += 1
+            return {"sha256": sha256, "size_bytes": 0}
+
+    def release_blob_ref(self, sha256):
+        with self._lock:
+            self.refs[sha256] -= 1
+            if not self.refs[sha256]:
+                del self.refs[sha256]
+        return True
+
+
+def _serve(monkeypatch, files=_FILES, fail=(), lfs=()):
+    requested = []
+
+    def fake_get(url, params=None, stream=False, timeout=None, **kw):
+        if "/api/models/" in url:
+            siblings = []
+            for path, body in files.items():
+                sibling = {"rfilename": path, "size": len(body)}
+                if path in lfs:
+                    sibling["lfs"] = {"sha256": hashlib.sha256(body).hexdigest(), "size": len(body)}
+                siblings.append(sibling)
+            return _Resp(payload={"siblings": siblings})
+        path = url.split("/resolve/main/", 1)[1]
+        requested.append(path)
+        if path in fail:
+            return _Resp(status_code=500)
+        return _Resp(body=files[path])
+
+    monkeypatch.setattr("backend.services.snapshot.http_client.get", fake_get)
+    return requested
+
+
+def test_hf_repo_from_url_handles_models_datasets_and_other_hosts():
+    assert hf_repo_from_url("https://huggingface.co/org/model/tree/main") == ("model", "org/model")
+    assert hf_repo_from_url("https://www.huggingface.co/datasets/org/data") == ("dataset", "org/data")
+    assert hf_repo_from_url("https://huggingface.co/gpt2") == ("model", "gpt2")
+    assert hf_repo_from_url("https://huggingface.co/spaces/org/app") is None
+    assert hf_repo_from_url("https://github.com/org/repo") is None
+
+
+def test_select_files_drops_excluded_and_duplicate_weight_formats():
+    files = [{"path": p, "size_bytes": len(b)} for p, b in _FILES.items()]
+    kept = [f["path"] for f in select_files(files, exclude=[".gitattributes"])]
+    assert kept == [
+        "config.json",
+        "model-00001-of-00002.safetensors",
+        "model-00002-of-00002.safetensors",
+        "tokenizer/vocab.txt",
+    ]
+    # Without safetensors, the .bin checkpoint is the weights and is kept.
+    bin_only = [{"path": "pytorch_model.bin", "size_bytes": 1}]
+    assert select_files(bin_only, exclude=[]) == bin_only
+
+
+def test_snapshot_transfer_stores_every_selected_file(monkeypatch):
+    requested = _serve(monkeypatch)
+    storage = _FakeStorage()
+    totals = []
+
+    manifest = SnapshotTransfer(storage, workers=4, per_host=2).run("model", "org/model", totals.append)
+
+    assert [f["path"] for f in manifest["files"]] == [
+        "config.json",
+        "model-00001-of-00002.safetensors",
+        "model-00002-of-00002.safetensors",
+        "tokenizer/vocab.txt",
+    ]
+    assert sorted(requested) == [f["path"] for f in manifest["files"]]
+    assert manifest["total_bytes"] == sum(len(_FILES[f["path"]]) for f in manifest["files"])
+    assert max(totals) == manifest["total_bytes"]
+    assert all(storage.refs[f["sha256"]] == 1 for f in manifest["files"])
+    assert primary_file(manifest)["path"] == "model-00001-of-00002.safetensors"
+
+
+def test_snapshot_transfer_reuses_stored_lfs_blobs(monkeypatch):
+    shard = "model-00001-of-00002.safetensors"
+    requested = _serve(monkeypatch, lfs=(shard,))
+    storage = _FakeStorage()
+    storage.refs[hashlib.sha256(_FILES[shard]).hexdigest()] = 1
+
+    SnapshotTransfer(storage).run("model", "org/model")
+
+    assert shard not in requested
+    assert storage.refs[hashlib.sha256(_FILES[shard]).hexdigest()] == 2
+
+
+def test_snapshot_transfer_failure_releases_stored_files(monkeypatch):
+    _serve(monkeypatch, fail=("tokenizer/vocab.txt",))
+    storage = _FakeStorage()
+
+    with pytest.raises(SnapshotError):
+        SnapshotTransfer(storage, workers=1).run("model", "org/model")
+    assert storage.refs == {}
+
+
+def test_byte_budget_admits_oversized_item_alone():
+    budget = _ByteBudget(10)
+    budget.acquire(25)
+    entered = threading.Event()
+
+    def second():
+        budget.acquire(1)
+        entered.set()
+
+    t = threading.Thread(target=second)
+    t.start()
+    time.sleep(0.05)
+    assert not entered.is_set()
+    budget.release(25)
+    t.join(timeout=1)
+    assert entered.is_set()
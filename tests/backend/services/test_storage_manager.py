@@ -1,32 +1,80 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from decimal import Decimal
+
 import pytest
 
+from backend.services.s3_service import S3Service
 from backend.services.storage import StorageManager
 
 
+class _FakeStaged:
+    """StagedBlob-like stub recording whether it was committed or discarded."""
+
+    def __init__(self, s3, data: bytes):
+        self.s3 = s3
+        self.data = data
+        self.sha256 = hashlib.sha256(data).hexdigest()
+        self.size = len(data)
+
+    def commit(self, dest_key: str) -> str:
+        self.s3.objects[dest_key] = self.data
+        return f"s3://{self.s3.bucket_name}/{dest_key}"
+
+    def discard(self) -> None:
+        self.s3.discarded.append(self.sha256)
+
+
 class _FakeS3:
     """In-memory S3Service-like stub used to unit test `StorageManager`."""
 
+    blob_key = staticmethod(S3Service.blob_key)
+
     def __init__(self, bucket_name="b"):
         self.bucket_name = bucket_name
         self.upload_calls = []
         self.delete_calls = []
+        self.objects = {}
+        self.discarded = []
+        self.presigned = []
+
+    def stage_stream(self, chunks):
+        return _FakeStaged(self, b"".join(chunks))
+
+    def blob_uri(self, sha256: str) -> str:
+        return f"s3://{self.bucket_name}/{self.blob_key(sha256)}"
+
+    def key_from_uri(self, uri: str) -> str:
+        return uri.split(f"{self.bucket_name}/")[-1]
+
+    def object_exists(self, key: str) -> bool:
+        return key in self.objects
 
     def upload_artifact(self, artifact_bytes: bytes, artifact_id: str, filename: str) -> str:
         self.upload_calls.append((artifact_id, filename, artifact_bytes))
         return f"s3://{self.bucket_name}/artifacts/{artifact_id}/{filename}"
 
-    def generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
+    def generate_presigned_url(self, key: str, expires_in: int = 3600, filename=None) -> str:
+        self.presigned.append((key, filename))
         return f"https://example.com/{key}?exp={expires_in}"
 
     def delete_artifact(self, s3_key: str) -> bool:
         self.delete_calls.append(s3_key)
+        self.objects.pop(s3_key, None)
         return True
 
     def reset_bucket(self) -> None:
         return None
 
+    def object_size(self, key: str) -> int:
+        return len(self.objects[key])
+
+    def read_range(self, key: str, start: int, end: int) -> bytes:
+        self.range_reads = getattr(self, "range_reads", 0) + 1
+        return self.objects[key][start : end + 1]
+
 
 class _FakeDB:
     """In-memory DynamoDBService-like stub used to unit test `StorageManager`."""
@@ -44,6 +92,12 @@ class _FakeDB:
     def get_item(self, artifact_id: str):
         return self.items.get(artifact_id)
 
+    def update_item(self, artifact_id: str, update_data) -> bool:
+        if artifact_id not in self.items:
+            return False
+        self.items[artifact_id].update(update_data)
+        return True
+
     def delete_item(self, artifact_id: str) -> bool:
         self.deleted.append(artifact_id)
         return self.items.pop(artifact_id, None) is not None
@@ -55,6 +109,62 @@ class _FakeDB:
         self.items.clear()
 
 
+class _FakeBlobs:
+    """In-memory BlobRefStore-like stub."""
+
+    def __init__(self):
+        self.refs = {}
+
+    def acquire(self, sha256: str, size_bytes: int) -> int:
+        entry = self.refs.setdefault(sha256, {"sha256": sha256, "refs": 0, "size_bytes": size_bytes})
+        assert not entry.get("deleting"), "acquired a blob that is being deleted"
+        entry["refs"] += 1
+        return entry["refs"]
+
+    def acquire_existing(self, sha256: str):
+        entry = self.refs.get(sha256)
+        if not entry or entry["refs"] <= 0 or entry.get("deleting"):
+            return None
+        entry["refs"] += 1
+        return entry["size_bytes"]
+
+    def release(self, sha256: str):
+        if sha256 not in self.refs:
+            return None
+        self.refs[sha256]["refs"] -= 1
+        return self.refs[sha256]["refs"]
+
+    def begin_delete(self, sha256: str):
+        entry = self.refs.get(sha256)
+        if not entry or entry["refs"] > 0 or entry.get("deleting"):
+            return None
+        entry["deleting"] = "t"
+        return "t"
+
+    def finish_delete(self, sha256: str, token: str) -> bool:
+        if self.refs.get(sha256, {}).get("deleting") != token:
+            return False
+        del self.refs[sha256]
+        return True
+
+    def abort_delete(self, sha256: str, token: str) -> None:
+        self.refs.get(sha256, {}).pop("deleting", None)
+
+    def get(self, sha256: str):
+        return self.refs.get(sha256)
+
+    def reset(self) -> None:
+        self.refs.clear()
+
+
+def _storage_manager() -> StorageManager:
+    sm = StorageManager()
+    sm.s3 = _FakeS3(bucket_name="b")
+    sm.db = _FakeDB()
+    sm.blobs = _FakeBlobs()
+    return sm
+
+
 def test_storage_manager_create_metadata_requires_artifact_id():
     sm = StorageManager()
     sm.s3 = _FakeS3()
@@ -79,6 +189,151 @@ def test_storage_manager_create_metadata_uploads_and_shapes_fields():
     assert md["type"] == "model"
     assert md["url"].startswith("s3://b/")
     assert md["metadata"]["readme"] == "hi"
+    assert md["size_in_gb"] is None
+
+    estimated = sm.create_metadata({"artifact_id": "a2", "size_in_gb": 1.5}, b"bytes", "n")
+    assert float(estimated["size_in_gb"]) == 1.5
+
+
+def test_storage_manager_store_artifact_stream_persists_item_under_digest():
+    sm = _storage_manager()
+    digest = hashlib.sha256(b"bytes").hexdigest()
+
+    ok = sm.store_artifact_stream(
+        {"artifact_id": "a1", "name": "n", "artifact_type": "model", "processed_url": "https://github.com/O/r/"},
+        iter([b"by", b"tes"]),
+        "n",
+    )
+
+    assert ok is True
+    assert sm.s3.objects == {f"blobs/sha256/{digest}": b"bytes"}
+    item = sm.db.items["a1"]
+    assert item["url"] == f"s3://b/blobs/sha256/{digest}"
+    assert (item["sha256"], item["size_bytes"], item["filename"]) == (digest, 5, "n")
+    assert item["canonical_url"] == "https://github.com/o/r"
+    # The measured size replaces the preflight estimate; stored as a Decimal for DynamoDB.
+    assert isinstance(item["size_in_gb"], Decimal)
+    assert sm.blobs.refs[digest]["refs"] == 1
+
+
+def test_storage_manager_store_artifact_stream_reuses_identical_blob():
+    sm = _storage_manager()
+
+    sm.store_artifact_stream({"artifact_id": "a1", "name": "n"}, iter([b"same"]), "n")
+    sm.store_artifact_stream({"artifact_id": "a2", "name": "other"}, iter([b"sa", b"me"]), "other")
+
+    digest = hashlib.sha256(b"same").hexdigest()
+    assert sm.s3.discarded == [digest]
+    assert sm.db.items["a1"]["url"] == sm.db.items["a2"]["url"]
+    assert sm.blobs.refs[digest]["refs"] == 2
+
+
+def test_storage_manager_link_existing_blob_requires_stored_blob():
+    sm = _storage_manager()
+    sm.store_artifact_stream({"artifact_id": "a1", "name": "n"}, iter([b"w"]), "n")
+    digest = hashlib.sha256(b"w").hexdigest()
+
+    assert sm.link_existing_blob({"artifact_id": "a2", "name": "m"}, "0" * 64) is False
+    assert sm.link_existing_blob({"artifact_id": "a2", "name": "m"}, digest) is True
+    assert sm.db.items["a2"]["sha256"] == digest
+    assert sm.blobs.refs[digest]["refs"] == 2
+
+
+def test_storage_manager_delete_artifact_keeps_blob_until_last_reference():
+    sm = _storage_manager()
+    sm.store_artifact_stream({"artifact_id": "a1", "name": "n"}, iter([b"same"]), "n")
+    sm.store_artifact_stream({"artifact_id": "a2", "name": "m"}, iter([b"same"]), "m")
+    key = f"blobs/sha256/{hashlib.sha256(b'same').hexdigest()}"
+
+    assert sm.delete_artifact("a1") is True
+    assert sm.s3.delete_calls == []
+    assert key in sm.s3.objects
+
+    assert sm.delete_artifact("a2") is True
+    assert sm.s3.delete_calls == [key]
+    assert sm.blobs.refs == {}
+
+
+def test_storage_manager_release_blob_keeps_object_for_unknown_or_reacquired_digest():
+    sm = _storage_manager()
+    sm.s3.objects["blobs/sha256/d1"] = b"x"
+
+    # No counter: nothing says the object is unreferenced.
+    assert sm.release_blob_ref("d1") is True
+    assert sm.s3.delete_calls == []
+
+    # Another ingest re-acquires the digest between release and the delete mark.
+    sm.blobs.acquire("d1", 1)
+    sm.blobs.begin_delete = lambda sha256: None
+    assert sm.release_blob_ref("d1") is True
+    assert sm.s3.delete_calls == []
+
+
+def test_storage_manager_release_racing_commit_of_same_digest_keeps_new_blob(fake_blobs_table):
+    import threading
+
+    from backend.services.blob_refs import BlobRefStore
+
+    sm = _storage_manager()
+    sm.blobs = BlobRefStore(table=fake_blobs_table)
+    digest = hashlib.sha256(b"same").hexdigest()
+    key = f"blobs/sha256/{digest}"
+    assert sm.store_artifact_stream({"artifact_id": "a1", "name": "n"}, iter([b"same"]), "n")
+
+    # Stall the S3 delete of a1's blob until a second ingest of the same bytes has had its chance.
+    deleting, resume = threading.Event(), threading.Event()
+    delete = sm.s3.delete_artifact
+
+    def slow_delete(k):
+        deleting.set()
+        resume.wait(2)
+        return delete(k)
+
+    sm.s3.delete_artifact = slow_delete
+    deleter = threading.Thread(target=sm.delete_artifact, args=("a1",))
+    deleter.start()
+    assert deleting.wait(2)
+
+    # Linking to the blob being deleted is refused; committing it waits for the delete.
+    assert sm.link_existing_blob({"artifact_id": "a2", "name": "m"}, digest) is False
+    ingest = threading.Thread(
+        target=sm.store_artifact_stream, args=({"artifact_id": "a2", "name": "m"}, iter([b"same"]), "m")
+    )
+    ingest.start()
+    ingest.join(0.1)
+    assert ingest.is_alive()
+
+    resume.set()
+    deleter.join(2)
+    ingest.join(2)
+    assert sm.db.items["a2"]["sha256"] == digest
+    assert sm.s3.objects[key] == b"same"
+    assert sm.blobs.get(digest)["refs"] == 1
+
+
+def test_storage_manager_store_item_releases_blob_when_create_item_raises():
+    sm = _storage_manager()
+
+    def boom(metadata):
+        raise RuntimeError("dynamodb down")
+
+    sm.db.create_item = boom
+
+    assert sm.store_artifact_stream({"artifact_id": "a1", "name": "n"}, iter([b"bytes"]), "n") is False
+    # The blob nothing points at is released and deleted.
+    assert sm.blobs.refs == {}
+    assert sm.s3.objects == {}
+
+
+def test_storage_manager_generate_download_url_uses_stored_uri_and_filename():
+    sm = _storage_manager()
+
+    sm.generate_download_url("a1", "model.bin", s3_uri="s3://b/blobs/sha256/abc")
+    sm.generate_download_url("a2", "old.bin")
+    assert sm.s3.presigned == [
+        ("blobs/sha256/abc", "model.bin"),
+        ("artifacts/a2/old.bin", "old.bin"),
+    ]
 
 
 def test_storage_manager_list_artifacts_filters_name_and_type():
@@ -119,3 +374,71 @@ def test_storage_manager_delete_artifact_parses_s3_uri_and_deletes_everywhere():
     assert ok is True
     assert sm.s3.delete_calls == ["artifacts/a1/n"]
     assert sm.db.deleted == ["a1"]
+
+
+def test_storage_manager_snapshot_store_download_and_delete():
+    sm = _storage_manager()
+    sm.s3.download_artifact = lambda key: sm.s3.uploaded[key]
+    sm.s3.uploaded = {}
+    upload = sm.s3.upload_artifact
+
+    def record_upload(data, artifact_id, filename):
+        uri = upload(data, artifact_id, filename)
+        sm.s3.uploaded[sm.s3.key_from_uri(uri)] = data
+        return uri
+
+    sm.s3.upload_artifact = record_upload
+    files = [
+        {"path": "config.json", **sm.store_blob_stream(iter([b"{}"]))},
+        {"path": "model.safetensors", **sm.store_blob_stream(iter([b"weights"]))},
+    ]
+    manifest = {"files": files, "file_count": 2, "total_bytes": 9}
+
+    assert sm.store_snapshot({"artifact_id": "s1", "name": "snap"}, manifest) is True
+    item = sm.db.items["s1"]
+    assert item["manifest_key"] == "artifacts/s1/manifest.json"
+    assert item["filename"] == "model.safetensors"
+    assert item["size_bytes"] == 9
+    assert sm.load_manifest(item) == manifest
+
+    url = sm.generate_file_download_url(item, "config.json")
+    assert url.startswith("https://example.com/blobs/sha256/")
+    assert sm.generate_file_download_url(item, "missing.txt") is None
+
+    assert sm.delete_artifact("s1") is True
+    assert sm.blobs.refs == {}
+    assert "artifacts/s1/manifest.json" in sm.s3.delete_calls
+
+
+def test_storage_manager_zip_manifest_reads_stored_archive_central_directory():
+    import io
+    import zipfile
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("r-main/setup.py", b"x" * 100)
+    sm = _storage_manager()
+    sm.store_artifact_stream({"artifact_id": "a1", "name": "r"}, iter([buf.getvalue()]), "r.zip")
+    sm.store_artifact_stream({"artifact_id": "a2", "name": "n"}, iter([b"not a zip"]), "n")
+
+    manifest = sm.zip_manifest(sm.db.items["a1"])
+
+    assert [f["path"] for f in manifest["files"]] == ["r-main/setup.py"]
+    assert sm.s3.range_reads == 1
+    assert sm.zip_manifest(sm.db.items["a2"]) is None
+
+
+def test_storage_manager_update_scores_persists_json_and_versions():
+    sm = _storage_manager()
+    sm.db.items["a1"] = {"artifact_id": "a1", "scores": {}}
+
+    assert sm.update_scores("a1", {"net_score": 0.75, "size_score": {"aws_server": 1.0}}, {"license": 2}, "k", 1700000000.9)
+    item = sm.db.items["a1"]
+    assert json.loads(item["scores"]) == {"net_score": 0.75, "size_score": {"aws_server": 1.0}}
+    assert item["metric_versions"] == {"license": 2}
+    assert (item["score_key"], item["scored_at"]) == ("k", 1700000000)
+    assert "metric_inputs" not in item
+    assert not sm.update_scores("missing", {}, {}, "k", 0)
+
+    assert sm.update_scores("a1", {}, {}, "k", 0, metric_inputs={"license": "mit"})
+    assert json.loads(sm.db.items["a1"]["metric_inputs"]) == {"license": "mit"}
@@ -0,0 +1,85 @@
+import pytest
+
+from cli import main as cli_main
+
+
+class _Resp:
+    """Minimal requests-like response stub for CLI tests."""
+
+    status_code = 200
+
+    def json(self):
+        return {
+            "results": [{"url": "https://github.com/o/r", "status": "created", "artifact_id": "a1", "seconds": 1.0}],
+            "summary": {"succeeded": 1, "unique": 1, "failed": 0, "duplicates_dropped": 1},
+        }
+
+
+def test_cli_batch_posts_urls_from_file(tmp_path, monkeypatch: pytest.MonkeyPatch, capsys):
+    urls_file = tmp_path / "urls.txt"
+    urls_file.write_text("# comment\nhttps://github.com/o/r\n\nhttps://github.com/o/r/\n")
+    sent = {}
+
+    def fake_post(url, json=None, timeout=None):
+        sent["url"] = url
+        sent["payload"] = json
+        return _Resp()
+
+    monkeypatch.setattr("cli.main.requests.post", fake_post)
+
+    code = cli_main.main(["batch", str(urls_file), "--api", "http://api", "--concurrency", "transfer=2"])
+
+    assert code == 0
+    assert sent["url"] == "http://api/artifacts/batch"
+    assert sent["payload"]["urls"] == ["https://github.com/o/r", "https://github.com/o/r/"]
+    assert sent["payload"]["concurrency"] == {"transfer": 2}
+    assert "1/1 succeeded" in capsys.readouterr().out
+
+
+def test_cli_rescore_reports_skipped_evaluations(monkeypatch: pytest.MonkeyPatch, capsys):
+    sent = {}
+
+    class _RescoreResp:
+        status_code = 200
+
+        def json(self):
+            return {
+                "results": [{"artifact_id": "a1", "status": "rescored", "recomputed": ["license"]}],
+                "summary": {"artifacts": 1, "rescored": 1, "current": 0, "missing_inputs": 0, "failed": 0,
+                            "metrics_evaluated": 1, "metrics_skipped": 7, "elapsed_seconds": 0.01},
+            }
+
+    def fake_post(url, json=None, timeout=None):
+        sent["url"] = url
+        sent["payload"] = json
+        return _RescoreResp()
+
+    monkeypatch.setattr("cli.main.requests.post", fake_post)
+
+    assert cli_main.main(["rescore", "a1", "--api", "http://api"]) == 0
+    assert sent == {"url": "http://api/artifacts/rescore", "payload": {"ids": ["a1"]}}
+    out = capsys.readouterr().out
+    assert "1/1 re-scored" in out and "7 skipped" in out
+
+
+def test_cli_rate_passes_metric_selection(monkeypatch: pytest.MonkeyPatch, capsys):
+    sent = {}
+
+    class _RateResp:
+        status_code = 200
+        headers = {"X-Score-Cache": "miss"}
+
+        def json(self):
+            return {"name": "m", "category": "model", "license": 1.0, "license_latency": 2}
+
+    def fake_get(url, params=None, timeout=None):
+        sent["url"] = url
+        sent["params"] = params
+        return _RateResp()
+
+    monkeypatch.setattr("cli.main.requests.get", fake_get)
+
+    assert cli_main.main(["rate", "a1", "--metrics", "license", "--api", "http://api"]) == 0
+    assert sent == {"url": "http://api/artifact/model/a1/rate", "params": {"metrics": "license"}}
+    out = capsys.readouterr().out
+    assert "license" in out and "license_latency" not in out
@@ -3,10 +3,21 @@ from cli.utils.ArtifactManager import ArtifactManager
 
 def test_artifact_manager_process_url(monkeypatch):
     am = ArtifactManager()
-    monkeypatch.setattr(am, "getArtifactData", lambda url: {"artifact_type": "model"})
-    monkeypatch.setattr(am, "scoreArtifact", lambda data: {"net_score": 0.9})
+    monkeypatch.setattr(am, "getMetadata", lambda url: {"artifact_type": "model"})
+    monkeypatch.setattr(am, "fetchAndScore", lambda meta: (dict(meta), {"net_score": 0.9}, {}))
 
     res = am.processUrl("https://github.com/org/repo")
     assert "artifact_id" in res
     assert res["name"] == "repo"
     assert res["scores"]["net_score"] == 0.9
+
+
+def test_artifact_manager_new_artifact_records_metric_versions_and_inputs():
+    import json
+
+    am = ArtifactManager()
+    res = am.newArtifact("https://github.com/org/repo", {"license": "mit", "other": 1}, {"net_score": 0.9})
+
+    assert res["metric_versions"] == am.scorer.metric_versions()
+    assert json.loads(res["metric_inputs"]) == {"license": "mit"}
+    assert res["scored_at"] > 0
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from cli.utils.DataflowScheduler import DataflowScheduler
+from cli.utils.MetricDataFetcher import MetricDataFetcher
+from cli.utils.MetricScorer import MetricScorer
+
+
+class LicenseDataFetcher:
+    def fetch_Modeldata(self, data):
+        return {"license": "mit"}
+
+
+class BusFactorDataFetcher:
+    """Pages commits until `release` is set (or a timeout)."""
+
+    def __init__(self, release, timeout=2):
+        self.release, self.timeout = release, timeout
+
+    def fetch_Modeldata(self, data):
+        self.release.wait(self.timeout)
+        return {"contributors": 4}
+
+
+class Metric:
+    def __init__(self, fetchers, key, on_score=None, delay=0.0):
+        self.fetchers, self.key, self.on_score, self.delay = fetchers, key, on_score, delay
+
+    def getScores(self, data):
+        if self.on_score:
+            self.on_score()
+        time.sleep(self.delay)
+        return {"score": 1.0 if data.get(self.key) else 0.0, "latency": 0.0}
+
+
+def _scheduler(release, bus_timeout=2):
+    mdf = MetricDataFetcher()
+    mdf.fetchers = [LicenseDataFetcher(), BusFactorDataFetcher(release, bus_timeout)]
+    scorer = MetricScorer()
+    scorer.metrics = {
+        "bus_factor": Metric(("BusFactorDataFetcher",), "contributors", delay=0.05),
+        # Scoring the license unblocks the slow fetcher, so this only finishes
+        # quickly if the license metric runs while bus factor is still fetching.
+        "license": Metric(("LicenseDataFetcher",), "license", on_score=release.set),
+    }
+    return DataflowScheduler(mdf, scorer)
+
+
+def test_dataflow_scheduler_scores_metrics_as_their_fetchers_finish():
+    release = threading.Event()
+    scheduler = _scheduler(release)
+    fetched = []
+
+    result = scheduler.run(
+        {"artifact_type": "model", "download_url": "u"}, on_fetched=lambda: fetched.append(True), as_json_str=False
+    )
+
+    assert fetched == [True]
+    nodes = result.nodes
+    assert nodes["license"]["start"] <= nodes["BusFactorDataFetcher"]["end"]
+    assert nodes["bus_factor"]["after"] == "BusFactorDataFetcher"
+    assert result.critical_path == ["BusFactorDataFetcher", "bus_factor"]
+    assert result.seconds < 1.5
+
+    # Same data and scores as fetching everything first, then scoring.
+    assert result.artifact_data == {"license": "mit", "contributors": 4, "download_url": "u"}
+    barrier = scheduler.scorer.score_artifact(result.artifact_data, as_json_str=False)
+    assert result.scores["net_score"] == barrier["net_score"]
+    assert result.scores["license"] == result.scores["bus_factor"] == 1.0
+
+
+def test_dataflow_scheduler_releases_metrics_of_fetchers_past_deadline():
+    release = threading.Event()
+    scheduler = _scheduler(release, bus_timeout=1)
+    scheduler.scorer.metrics["license"].on_score = None
+
+    result = scheduler.run({"artifact_type": "model"}, deadline=0.1, as_json_str=False)
+    release.set()
+
+    assert result.nodes["BusFactorDataFetcher"]["missed"] is True
+    assert result.scores["bus_factor"] == 0.0 and result.scores["license"] == 1.0
+    assert "contributors" not in result.artifact_data
+
+
+def test_dataflow_scheduler_runs_only_selected_metrics():
+    release = threading.Event()
+    scheduler = _scheduler(release)
+    release.set()
+
+    assert scheduler.dependencies(["license"]) == {"license": ["LicenseDataFetcher"]}
+    result = scheduler.run({"artifact_type": "model"}, metrics=["license"], as_json_str=False)
+
+    assert "BusFactorDataFetcher" not in result.nodes
+    assert result.scores["license"] == 1.0 and "net_score" not in result.scores
+
+
+def test_dataflow_scheduler_times_fetchers_from_their_own_start(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    # One worker: bus factor only starts once the license fetcher is done.
+    monkeypatch.setattr("cli.utils.MetricDataFetcher._executor", ThreadPoolExecutor(max_workers=1))
+    release = threading.Event()
+    scheduler = _scheduler(release)
+
+    def slow_license(data):
+        time.sleep(0.15)
+        return {"license": "mit"}
+
+    scheduler.data_fetcher.fetchers[0].fetch_Modeldata = slow_license
+    threading.Timer(0.3, release.set).start()
+
+    result = scheduler.run({"artifact_type": "model"}, deadline=0.25, as_json_str=False)
+
+    assert "missed" not in result.nodes["BusFactorDataFetcher"]
+    assert result.scores["bus_factor"] == result.scores["license"] == 1.0
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import pytest
+
+from cli.utils.GitHubGraphQL import GitHubGraphQL, build_query, bundle_from_node, repo_from_url
+from datafetchers.busfactordata_fetcher import BusFactorDataFetcher
+
+
+class _Resp:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+
+def _node(name_with_owner="o/r"):
+    return {
+        "nameWithOwner": name_with_owner,
+        "name": name_with_owner.split("/")[1],
+        "description": "demo",
+        "licenseInfo": {"key": "mit", "name": "MIT License", "spdxId": "MIT"},
+        "repositoryTopics": {"nodes": [{"topic": {"name": "ml"}}]},
+        "defaultBranchRef": {
+            "name": "main",
+            "target": {
+                "oid": "c0ffee",
+                "tree": {"oid": "7ree", "entries": [{"name": "tests", "path": "tests", "type": "tree", "oid": "t1"}]},
+                "history": {
+                    "nodes": [
+                        {"author": {"name": "A", "email": "a@x", "user": {"login": "alice"}}},
+                        {"author": {"name": "Bob", "email": "b@x", "user": None}},
+                    ]
+                },
+            },
+        },
+    }
+
+
+@pytest.fixture()
+def graphql(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKENS", "tok1")
+    return GitHubGraphQL(mode="graphql", batch_size=2, ttl_seconds=60)
+
+
+def test_build_query_aliases_each_repo():
+    query = build_query(["o/a", "o/b"])
+    assert 'r0: repository(owner: "o", name: "a")' in query
+    assert 'r1: repository(owner: "o", name: "b")' in query
+
+
+def test_bundle_maps_to_rest_shaped_metadata():
+    bundle = bundle_from_node(_node())
+
+    assert bundle["metadata"]["full_name"] == "o/r"
+    assert bundle["metadata"]["default_branch"] == "main"
+    assert bundle["metadata"]["license"]["name"] == "MIT License"
+    assert bundle["metadata"]["topics"] == ["ml"]
+    assert bundle["commit_authors"] == ["alice", "Bob"]
+    assert bundle["root_tree_sha"] == "7ree"
+    assert bundle["tree_entries"] == [{"path": "tests", "type": "tree", "sha": "t1"}]
+
+
+def test_repo_from_url():
+    assert repo_from_url("https://github.com/o/r.git") == "o/r"
+    assert repo_from_url("https://github.com/o/r/tree/main") == "o/r"
+    assert repo_from_url("https://huggingface.co/o/r") is None
+
+
+def test_prefetch_batches_repos_into_aliased_queries(graphql, monkeypatch):
+    queries = []
+
+    def fake_post(url, json=None, **kw):
+        queries.append(json["query"])
+        count = json["query"].count("repository(")
+        return _Resp({"data": {f"r{i}": _node() for i in range(count)}})
+
+    monkeypatch.setattr("cli.utils.GitHubGraphQL.http_client.post", fake_post)
+
+    assert graphql.prefetch(["o/a", "o/b", "o/c"]) == 3
+    assert len(queries) == 2
+    # Prefetched bundles are served without another round trip.
+    assert graphql.bundle("o/a")["commit_authors"] == ["alice", "Bob"]
+    assert len(queries) == 2
+
+
+def test_failed_query_falls_back_to_rest_once(graphql, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "cli.utils.GitHubGraphQL.http_client.post",
+        lambda url, **kw: calls.append(url) or _Resp({}, status_code=502),
+    )
+
+    assert graphql.bundle("o/r") is None
+    assert graphql.bundle("o/r") is None
+    assert len(calls) == 1
+
+
+def test_disabled_without_token(monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    assert GitHubGraphQL(mode="graphql").bundle("o/r") is None
+
+
+def test_bus_factor_uses_graphql_bundle(graphql, monkeypatch):
+    monkeypatch.setattr("datafetchers.busfactordata_fetcher.github_graphql", graphql)
+    monkeypatch.setattr(
+        "cli.utils.GitHubGraphQL.http_client.post",
+        lambda url, **kw: _Resp({"data": {"r0": _node()}}),
+    )
+
+    def fail_get(*a, **kw):
+        raise AssertionError("REST commits API should not be called")
+
+    monkeypatch.setattr("datafetchers.busfactordata_fetcher.http_client.get", fail_get)
+
+    out = BusFactorDataFetcher().fetch_Codedata({"full_name": "o/r"})
+    assert out["commit_authors"] == ["alice", "Bob"]
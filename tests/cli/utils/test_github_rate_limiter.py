@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+
+import requests
+
+from cli.utils.GitHubRateLimiter import GitHubRateLimiter, endpoint_name
+from cli.utils.HttpClient import HttpClient
+
+
+def _response(status=200, **headers):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}"
+    response.headers.update(headers)
+    return response
+
+
+def test_endpoint_name_collapses_repo_paths():
+    assert endpoint_name("/repos/o/r") == "/repos/:owner/:repo"
+    assert endpoint_name("/repos/o/r/commits") == "/repos/:owner/:repo/commits"
+    assert endpoint_name("/repos/o/r/git/trees/main") == "/repos/:owner/:repo/git/trees"
+    assert endpoint_name("/repos/o/r/contents/src/app.py") == "/repos/:owner/:repo/contents"
+
+
+def test_acquire_prefers_token_with_most_quota():
+    limiter = GitHubRateLimiter(tokens=["aaaa", "bbbb"], reserve=5)
+    a, b = limiter._tokens
+
+    limiter.record(a, "/repos/o/r", _response(**{"X-RateLimit-Remaining": "100", "X-RateLimit-Limit": "5000"}))
+    limiter.record(b, "/repos/o/r", _response(**{"X-RateLimit-Remaining": "4000", "X-RateLimit-Limit": "5000"}))
+
+    assert limiter.acquire() is b
+    assert b.remaining == 3999
+
+
+def test_acquire_waits_for_reset_when_all_tokens_at_reserve(monkeypatch):
+    limiter = GitHubRateLimiter(tokens=["aaaa"], reserve=5, max_wait=30)
+    state = limiter._tokens[0]
+    limiter.record(
+        state,
+        "/repos/o/r/commits",
+        _response(**{"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": str(time.time() + 2)}),
+    )
+    slept = []
+
+    def fake_sleep(seconds):
+        slept.append(seconds)
+        state.reset_at = 1  # the window has passed
+
+    monkeypatch.setattr("cli.utils.GitHubRateLimiter.time.sleep", fake_sleep)
+
+    assert limiter.acquire() is state
+    assert len(slept) == 1 and 0 < slept[0] <= 2
+    assert limiter.stats()["waits"] == 1
+
+
+def test_client_rotates_token_on_rate_limit(monkeypatch):
+    limiter = GitHubRateLimiter(tokens=["aaaa", "bbbb"], reserve=0)
+    client = HttpClient(retries=0, github=limiter)
+    sent = []
+
+    def fake_send(method, url, **kwargs):
+        token = kwargs["headers"]["Authorization"]
+        sent.append(token)
+        if len(sent) == 1:
+            return _response(403, **{"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 600)})
+        return _response(200, **{"X-RateLimit-Remaining": "4999"})
+
+    monkeypatch.setattr(client, "_send", fake_send)
+    response = client.get("https://api.github.com/repos/o/r/commits", headers={"Accept": "application/json"})
+
+    assert response.status_code == 200
+    assert sent[0] != sent[1]
+    stats = client.stats()["github"]
+    assert stats["rotations"] == 1
+    assert stats["endpoints"]["/repos/:owner/:repo/commits"] == {
+        "requests": 2,
+        "quota_used": 2,
+        "not_modified": 0,
+        "rate_limited": 1,
+    }
+    client.close()
+
+
+def test_non_github_hosts_skip_the_limiter(monkeypatch):
+    limiter = GitHubRateLimiter(tokens=["aaaa"])
+    client = HttpClient(retries=0, github=limiter)
+    monkeypatch.setattr(client, "_send", lambda method, url, **kw: _response(200))
+
+    client.get("https://huggingface.co/api/models/org/model")
+
+    assert limiter.stats()["endpoints"] == {}
+    client.close()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cli.utils.HttpClient import HttpClient, get_http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Keep-alive handler: `/flaky` fails with 503 once, everything else returns 200."""
+
+    protocol_version = "HTTP/1.1"
+    failures = {"/flaky": 1}
+
+    def do_GET(self):
+        remaining = self.failures.get(self.path, 0)
+        if remaining:
+            self.failures[self.path] = remaining - 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    host, port = httpd.server_address[:2]
+    yield f"http://{host}:{port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_http_client_reuses_pooled_connection(server):
+    client = HttpClient(retries=0)
+
+    for _ in range(5):
+        assert client.get(f"{server}/x").status_code == 200
+
+    stats = client.stats()
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
+    client.close()
+
+
+def test_http_client_retries_5xx_with_backoff(server):
+    _Handler.failures["/flaky"] = 1
+    client = HttpClient(retries=2, backoff_factor=0, backoff_jitter=0)
+
+    assert client.get(f"{server}/flaky").status_code == 200
+    assert client.stats()["retries"] == 1
+    client.close()
+
+
+def test_http_client_returns_final_error_response_when_retries_exhausted(server):
+    _Handler.failures["/flaky"] = 5
+    client = HttpClient(retries=1, backoff_factor=0, backoff_jitter=0)
+
+    assert client.get(f"{server}/flaky").status_code == 503
+    client.close()
+
+
+def test_get_http_client_is_process_wide():
+    assert get_http_client() is get_http_client()
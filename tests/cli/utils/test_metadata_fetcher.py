@@ -23,7 +23,7 @@ def test_metadata_fetcher_github(monkeypatch: pytest.MonkeyPatch):
         assert url.startswith("https://api.github.com/repos/")
         return _Resp({"full_name": "o/r"})
 
-    monkeypatch.setattr("cli.utils.MetadataFetcher.requests.get", fake_get)
+    monkeypatch.setattr("cli.utils.MetadataFetcher.http_client.get", fake_get)
 
     mf = MetadataFetcher(github_token=None)
     out = mf.fetch("https://github.com/o/r")
@@ -36,7 +36,7 @@ def test_metadata_fetcher_hf_model_download_url(monkeypatch: pytest.MonkeyPatch)
         assert url.startswith("https://huggingface.co/api/models/")
         return _Resp({"id": "org/model", "siblings": [{"rfilename": "model.safetensors"}]})
 
-    monkeypatch.setattr("cli.utils.MetadataFetcher.requests.get", fake_get)
+    monkeypatch.setattr("cli.utils.MetadataFetcher.http_client.get", fake_get)
 
     mf = MetadataFetcher(github_token=None)
     out = mf.fetch("https://huggingface.co/org/model")
@@ -24,3 +24,149 @@ def test_metric_data_fetcher_calls_correct_fetcher_method():
     assert out["m"] == 1
     assert out["download_url"] == "u"
     assert calls == ["m"]
+
+
+def test_metric_data_fetcher_fetches_shared_readme_and_repo_once(monkeypatch):
+    from datafetchers.busfactordata_fetcher import BusFactorDataFetcher
+    from datafetchers.codequalitydata_fetcher import CodeQualityDataFetcher
+
+    urls = []
+
+    class _Resp:
+        def __init__(self, payload=None, text=""):
+            self.status_code = 200
+            self._payload = payload
+            self.text = text
+
+        def json(self):
+            return self._payload
+
+    def fake_get(url, headers=None, **kwargs):
+        urls.append(url)
+        if url.endswith("README.md"):
+            return _Resp(text="Code: https://github.com/o/r")
+        if "/commits" in url:
+            return _Resp([{"author": {"login": "a"}}])
+        return _Resp({"sha": "shared-readme-tree", "tree": [{"path": "tests/test_a.py"}]})
+
+    monkeypatch.setattr("datafetchers.basemetricdata_fetcher.http_client.get", fake_get)
+
+    mdf = MetricDataFetcher()
+    mdf.fetchers = [BusFactorDataFetcher(), CodeQualityDataFetcher(), BusFactorDataFetcher()]
+    out = mdf.fetch_artifact_data({"artifact_type": "model", "id": "org/m", "siblings": []})
+
+    assert out["commit_authors"] == ["a"]
+    assert out["has_tests"] is True
+    assert sum(u.endswith("README.md") for u in urls) == 1
+    assert sum("/commits" in u for u in urls) == 1
+
+
+def test_metric_data_fetcher_runs_fetchers_in_parallel_and_merges_in_order():
+    import time
+
+    class Slow:
+        def __init__(self, key, value, delay):
+            self.key, self.value, self.delay = key, value, delay
+
+        def fetch_Modeldata(self, data):
+            time.sleep(self.delay)
+            return {self.key: self.value}
+
+    mdf = MetricDataFetcher()
+    # The later fetcher finishes first but must still win the shared key.
+    mdf.fetchers = [Slow("k", "first", 0.2), Slow("k", "second", 0.0), Slow("other", 1, 0.2), Slow("x", 2, 0.2)]
+
+    start = time.perf_counter()
+    out = mdf.fetch_artifact_data({"artifact_type": "model"})
+    elapsed = time.perf_counter() - start
+
+    assert out["k"] == "second"
+    assert out["other"] == 1 and out["x"] == 2
+    assert elapsed < 0.5
+
+
+def test_metric_data_fetcher_drops_fetchers_past_deadline():
+    import threading
+
+    release = threading.Event()
+
+    class Stuck:
+        def fetch_Modeldata(self, data):
+            release.wait(2)
+            return {"late": True}
+
+    class Fast:
+        def fetch_Modeldata(self, data):
+            return {"fast": True}
+
+    mdf = MetricDataFetcher()
+    mdf.fetchers = [Stuck(), Fast()]
+    out = mdf.fetch_artifact_data({"artifact_type": "model", "download_url": "u"}, deadline=0.1)
+    release.set()
+
+    assert out == {"fast": True, "download_url": "u"}
+
+
+def test_metric_data_fetcher_runs_only_selected_fetchers():
+    class LicenseDataFetcher:
+        def fetch_Modeldata(self, data):
+            return {"license": "mit"}
+
+    class SizeDataFetcher:
+        def fetch_Modeldata(self, data):
+            raise AssertionError("unselected fetcher ran")
+
+    mdf = MetricDataFetcher()
+    mdf.fetchers = [LicenseDataFetcher(), SizeDataFetcher()]
+    out = mdf.fetch_artifact_data({"artifact_type": "model", "download_url": "u"}, fetchers=["LicenseDataFetcher"])
+
+    assert out == {"license": "mit", "download_url": "u"}
+
+
+def test_metric_data_fetcher_deadline_starts_when_fetcher_starts_and_cancels_queued(monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    # One worker: each fetcher queues behind the previous one.
+    monkeypatch.setattr("cli.utils.MetricDataFetcher._executor", ThreadPoolExecutor(max_workers=1))
+
+    class First:
+        def fetch_Modeldata(self, data):
+            time.sleep(0.15)
+            return {"first": True}
+
+    class Second:
+        def fetch_Modeldata(self, data):
+            time.sleep(0.15)
+            return {"second": True}
+
+    mdf = MetricDataFetcher()
+    mdf.fetchers = [First(), Second()]
+    # Second finishes 0.3s after submission but only 0.15s after it started.
+    assert mdf.fetch_artifact_data({"artifact_type": "model"}, deadline=0.25) == {
+        "first": True, "second": True, "download_url": None
+    }
+
+    release = threading.Event()
+    ran = []
+
+    class Stuck:
+        def fetch_Modeldata(self, data):
+            release.wait(2)
+            return {"late": True}
+
+    class Queued:
+        def fetch_Modeldata(self, data):
+            ran.append(True)
+            return {"queued": True}
+
+    missed = []
+    mdf.fetchers = [Stuck(), Queued()]
+    out = mdf.fetch_artifact_data({"artifact_type": "model"}, deadline=0.1, on_missed=missed.extend)
+    release.set()
+    time.sleep(0.05)
+
+    assert out == {"download_url": None}
+    assert missed == ["Stuck", "Queued"]
+    assert ran == []
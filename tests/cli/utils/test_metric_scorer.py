@@ -35,3 +35,107 @@ def test_metric_scorer_net_score_deterministic():
     assert out["code_quality"] == 1.0
     assert out["size_score"]["raspberry_pi"] == 1.0
     assert out["net_score"] == float(scorer.weights["code_quality"] + scorer.weights["size_score"])
+
+
+def test_metric_scorer_score_many_keeps_input_order_on_shared_pool(monkeypatch):
+    import threading
+
+    threads = set()
+
+    class Echo:
+        """Scores each artifact by its own value, recording the worker thread."""
+
+        def getScores(self, data):
+            threads.add(threading.current_thread().name)
+            return {"score": data["v"], "latency": 0.0}
+
+    scorer = MetricScorer()
+    scorer.metrics = {name: Echo() for name in scorer.metrics if name != "size_score"}
+
+    outs = scorer.score_many([{"v": 0.1}, {"v": 0.9}, {"v": 0.5}], as_json_str=False)
+
+    assert [o["license"] for o in outs] == [0.1, 0.9, 0.5]
+    assert all(name.startswith("score") for name in threads)
+
+    # Later calls, from any scorer, reuse the pool instead of creating executors.
+    def no_new_executor(*a, **k):
+        raise AssertionError("per-call executor created")
+
+    monkeypatch.setattr("cli.utils.MetricScorer.ThreadPoolExecutor", no_new_executor)
+    other = MetricScorer()
+    other.metrics = scorer.metrics
+    assert other.score_artifact({"v": 0.2}, as_json_str=False)["license"] == 0.2
+
+
+def test_metric_scorer_rescore_recomputes_only_changed_metrics():
+    class Counted:
+        def __init__(self, score, version=1, inputs=()):
+            self.score, self.version, self.inputs, self.calls = score, version, inputs, 0
+
+        def getScores(self, data):
+            self.calls += 1
+            return {"score": self.score, "latency": 1.0}
+
+    class Size(Counted):
+        def getScores(self, data):
+            self.calls += 1
+            return {d: self.score for d in ("raspberry_pi", "jetson_nano", "desktop_pc", "aws_server")} | {"latency": 1.0}
+
+    scorer = MetricScorer()
+    scorer.metrics = {name: Counted(0.5, inputs=(name,)) for name in scorer.metrics}
+    scorer.metrics["size_score"] = Size(1.0, inputs=("model_size_mb",))
+    data = {"license": "mit", "model_size_mb": 10, "unused": "x"}
+
+    assert scorer.input_features(data) == {"license": "mit", "model_size_mb": 10}
+    stored = scorer.score_artifact(data, as_json_str=False)
+    versions = scorer.metric_versions()
+    assert versions == {name: 1 for name in scorer.metrics}
+
+    scorer.metrics["ramp_up_time"] = Counted(1.0, version=2)
+    out, recomputed = scorer.rescore(data, stored, versions)
+
+    assert recomputed == ["ramp_up_time"]
+    assert scorer.metrics["license"].calls == 1 and scorer.metrics["size_score"].calls == 1
+    assert out["ramp_up_time"] == 1.0
+    assert out["size_score"] == stored["size_score"]
+    assert out["dataset_and_code_score"] == stored["dataset_and_code_score"]
+    assert out["net_score"] == scorer.score_artifact(data, as_json_str=False)["net_score"]
+
+
+def test_metric_scorer_selection_runs_only_selected_metrics_and_their_fetchers():
+    import pytest
+
+    from cli.utils.MetricScorer import parse_metric_selection
+
+    class Counted:
+        def __init__(self, fetchers):
+            self.fetchers, self.calls = fetchers, 0
+
+        def getScores(self, data):
+            self.calls += 1
+            return {"score": 0.5, "latency": 1.0}
+
+    scorer = MetricScorer()
+    fetchers = {name: tuple(m.fetchers) for name, m in scorer.metrics.items()}
+    scorer.metrics = {name: Counted(fetchers[name]) for name in scorer.metrics if name != "size_score"}
+
+    selection = parse_metric_selection("dataset_and_code_score, license", scorer.metrics)
+    assert selection == ["dataset_and_code", "license"]
+    assert parse_metric_selection("", scorer.metrics) is None
+    with pytest.raises(ValueError, match="bogus"):
+        parse_metric_selection("license,bogus", scorer.metrics)
+
+    assert scorer.fetchers_for(["license"]) == ["LicenseDataFetcher"]
+    assert scorer.fetchers_for(None) is None
+    assert scorer.dependents(["LicenseDataFetcher"]) == ["license"]
+
+    out = scorer.score_artifact({}, as_json_str=False, metrics=selection)
+    assert out == {
+        "name": "",
+        "category": "",
+        "dataset_and_code_score": 0.5,
+        "dataset_and_code_score_latency": 1.0,
+        "license": 0.5,
+        "license_latency": 1.0,
+    }
+    assert {n for n, m in scorer.metrics.items() if m.calls} == {"license", "dataset_and_code"}
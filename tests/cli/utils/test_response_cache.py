@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+import pytest
+
+from cli.utils.HttpClient import HttpClient
+from cli.utils.ResponseCache import ResponseCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves `/repo` with an ETag and answers matching `If-None-Match` with 304."""
+
+    protocol_version = "HTTP/1.1"
+    etag = '"v1"'
+    seen: List[Tuple[str, Optional[str]]] = []
+
+    def do_GET(self):
+        type(self).seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b'{"name": "repo"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    _Handler.seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    host, port = httpd.server_address[:2]
+    yield f"http://{host}:{port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(tmp_path, server, ttl=3600.0, max_bytes=1 << 20):
+    cache = ResponseCache(
+        path=str(tmp_path / "http_cache.db"),
+        ttl_seconds=ttl,
+        max_bytes=max_bytes,
+        hosts=[urlparse(server).netloc],
+    )
+    return HttpClient(retries=0, cache=cache)
+
+
+def test_fresh_entry_is_served_without_a_request(tmp_path, server):
+    client = _client(tmp_path, server)
+
+    first = client.get(f"{server}/repo")
+    second = client.get(f"{server}/repo")
+
+    assert first.json() == second.json() == {"name": "repo"}
+    assert second.headers["X-Cache"] == "HIT"
+    assert len(_Handler.seen) == 1
+    stats = client.stats()["cache"]
+    assert (stats["misses"], stats["hits"], stats["revalidations"]) == (1, 1, 0)
+    client.close()
+
+
+def test_stale_entry_revalidates_with_if_none_match(tmp_path, server):
+    client = _client(tmp_path, server, ttl=0)
+
+    client.get(f"{server}/repo")
+    again = client.get(f"{server}/repo")
+
+    assert again.status_code == 200
+    assert again.json() == {"name": "repo"}
+    assert again.headers["X-Cache"] == "REVALIDATED"
+    assert _Handler.seen == [("/repo", None), ("/repo", '"v1"')]
+    assert client.stats()["cache"]["revalidations"] == 1
+    client.close()
+
+
+def test_streaming_and_uncached_hosts_bypass_cache(tmp_path, server):
+    client = _client(tmp_path, server)
+
+    client.get(f"{server}/repo", stream=True).content
+    client.get(f"{server}/repo", stream=True).content
+    client.cache.hosts = {"api.github.com"}
+    client.get(f"{server}/repo")
+
+    assert len(_Handler.seen) == 3
+    assert client.stats()["cache"]["misses"] == 0
+    client.close()
+
+
+def test_lru_eviction_keeps_cache_under_size_bound(tmp_path, server):
+    client = _client(tmp_path, server, max_bytes=40)
+
+    client.get(f"{server}/a")
+    client.get(f"{server}/b")
+    client.get(f"{server}/c")
+
+    cache = client.cache
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(cache.key(f"{server}/a")) is None
+    assert cache.get(cache.key(f"{server}/c")) is not None
+    client.close()
+
+
+def test_cache_key_depends_on_accept_and_params():
+    base = ResponseCache.key("https://api.github.com/repos/o/r/commits", params={"per_page": 100})
+
+    assert base == ResponseCache.key("https://api.github.com/repos/o/r/commits", params={"per_page": 100})
+    assert base != ResponseCache.key("https://api.github.com/repos/o/r/commits", params={"per_page": 50})
+    assert base != ResponseCache.key(
+        "https://api.github.com/repos/o/r/commits",
+        headers={"Accept": "application/vnd.github.raw"},
+        params={"per_page": 100},
+    )
@@ -1,9 +1,21 @@
+import json
+import os
 import re
+import threading
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 import pytest
 
+# Keep the shared HTTP client and bus-factor fetcher from writing on-disk caches during tests.
+os.environ.setdefault("HTTP_CACHE_ENABLED", "0")
+os.environ.setdefault("AUTHOR_HISTORY_ENABLED", "0")
+# Ingest tests fake single GETs; ranged downloads and the size preflight would HEAD the real source first.
+os.environ.setdefault("RANGED_DOWNLOAD", "0")
+os.environ.setdefault("INGEST_PREFLIGHT_HEAD", "0")
+# Code-quality tests fake the trees API; the archive listing would range-read GitHub first.
+os.environ.setdefault("ZIP_MANIFEST_ENABLED", "0")
+
 
 @dataclass
 class DummyResponse:
@@ -21,29 +33,72 @@ class DummyResponse:
             raise RuntimeError(f"HTTP {self.status_code}")
 
 
+class FakeMetric:
+    version = 1
+
+
+class FakeScorer:
+    """Stands in for `MetricScorer` where only the metric versions and inputs matter."""
+
+    def __init__(self):
+        self.metrics = {"license": FakeMetric(), "size_score": FakeMetric()}
+
+    def metric_versions(self) -> Dict[str, int]:
+        return {name: metric.version for name, metric in self.metrics.items()}
+
+    def input_features(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(data)
+
+
 class FakeArtifactManager:
     """In-memory ArtifactManager used by API e2e tests."""
 
     def __init__(self):
         self._n = 0
+        self._lock = threading.Lock()
+        self.scorer = FakeScorer()
+        self.score_calls = 0
+        self.fetched_for: Optional[List[str]] = None
 
     def processUrl(self, url: str) -> Dict[str, Any]:
-        self._n += 1
-        artifact_id = f"t{self._n}"
+        data = self.getMetricData(self.getMetadata(url))
+        return self.newArtifact(url, data, {"net_score": 0.5, "name": "", "category": ""})
+
+    def getMetadata(self, url: str) -> Dict[str, Any]:
         name = url.rstrip("/").split("/")[-1] or "artifact"
-        return {
-            "artifact_id": artifact_id,
-            "name": name,
-            "artifact_type": "model",
-            "processed_url": url,
-            "download_url": f"https://example.com/{artifact_id}.bin",
-            "scores": {"net_score": 0.5, "name": "", "category": ""},
-        }
+        return {"artifact_type": "model", "download_url": f"https://example.com/{name}.bin"}
+
+    def getMetricData(self, meta_info: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(meta_info)
+
+    def newArtifact(self, url: str, artifact_data: Dict[str, Any], scores: Any) -> Dict[str, Any]:
+        with self._lock:
+            self._n += 1
+            artifact_id = f"t{self._n}"
+        artifact_data.update(
+            {
+                "artifact_id": artifact_id,
+                "name": url.rstrip("/").split("/")[-1] or "artifact",
+                "processed_url": url,
+                "scores": scores,
+            }
+        )
+        return artifact_data
+
+    def fetchAndScore(self, meta_info: Dict[str, Any], metrics: Optional[List[str]] = None, on_fetched=None):
+        artifact_data = self.getMetricData(meta_info)
+        if on_fetched is not None:
+            on_fetched()
+        return artifact_data, self.scoreArtifact(artifact_data), {"critical_path": []}
 
-    def getArtifactData(self, url: str) -> Dict[str, Any]:
+    def getArtifactData(self, url: str, metrics: Optional[List[str]] = None) -> Dict[str, Any]:
+        self.fetched_for = metrics
         return {"processed_url": url, "artifact_type": "model"}
 
-    def scoreArtifact(self, artifact_data: Dict[str, Any]):
+    def scoreArtifact(self, artifact_data: Dict[str, Any], metrics: Optional[List[str]] = None):
+        self.score_calls += 1
+        if metrics is not None:
+            return {"name": "", "category": "", **{name: 0.5 for name in metrics}}
         return {"net_score": 0.42, "name": "", "category": ""}
 
 
@@ -65,6 +120,7 @@ class FakeStorageManager:
             "type": artifact_type,
             "artifact_type": artifact_type,
             "processed_url": artifact_data.get("processed_url", ""),
+            "canonical_url": artifact_data.get("canonical_url"),
             "download_url": artifact_data.get("download_url", ""),
             "url": f"s3://{self.bucket_name}/artifacts/{artifact_id}/{name}",
             "scores": artifact_data.get("scores"),
@@ -73,9 +129,33 @@ class FakeStorageManager:
         }
         return True
 
+    def store_artifact_stream(self, artifact_data: Dict[str, Any], chunks, filename: str) -> bool:
+        return self.store_artifact(artifact_data, b"".join(chunks), filename)
+
     def get_artifact(self, artifact_id: str) -> Optional[Dict[str, Any]]:
         return self.items.get(artifact_id)
 
+    def update_scores(self, artifact_id, scores, metric_versions, score_key, scored_at, metric_inputs=None) -> bool:
+        item = self.items.get(artifact_id)
+        if item is None:
+            return False
+        item.update(
+            {"scores": json.dumps(scores), "metric_versions": metric_versions, "score_key": score_key, "scored_at": int(scored_at)}
+        )
+        if metric_inputs is not None:
+            item["metric_inputs"] = json.dumps(metric_inputs)
+        return True
+
+    def scan_artifacts(self) -> List[Dict[str, Any]]:
+        return list(self.items.values())
+
+    def find_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+        from backend.services.ingest import canonical_url
+
+        key = canonical_url(url)
+        matches = [it for it in self.items.values() if it.get("canonical_url") == key]
+        return matches[-1] if matches else None
+
     def delete_artifact(self, artifact_id: str) -> bool:
         return self.items.pop(artifact_id, None) is not None
 
@@ -83,9 +163,20 @@ class FakeStorageManager:
         self.items.clear()
         return True
 
-    def generate_download_url(self, artifact_id: str, filename: str, expires_in: int = 3600) -> str:
+    def link_existing_blob(self, artifact_data: Dict[str, Any], sha256: str, filename: Optional[str] = None) -> bool:
+        return False
+
+    def generate_download_url(
+        self, artifact_id: str, filename: str, expires_in: int = 3600, s3_uri: Optional[str] = None
+    ) -> str:
         return f"https://example.com/download/{artifact_id}/{filename}?expires={expires_in}"
 
+    def generate_file_download_url(self, item: Dict[str, Any], path: str, expires_in: int = 3600) -> Optional[str]:
+        files = (item.get("manifest") or {}).get("files", [])
+        if not any(f["path"] == path for f in files):
+            return None
+        return f"https://example.com/download/{item['artifact_id']}/{path}?expires={expires_in}"
+
     def list_artifacts(self, queries: List[Dict[str, Any]], offset: Optional[int] = 0, page_size: int = 10) -> Dict[str, Any]:
         all_items = list(self.items.values())
 
@@ -132,6 +223,63 @@ class FakeStorageManager:
         return out
 
 
+class FakeBlobsTable:
+    """DynamoDB blobs table stub evaluating the update/condition expressions `BlobRefStore` uses."""
+
+    def __init__(self):
+        self.items: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _failed(op: str):
+        from botocore.exceptions import ClientError
+
+        return ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, op)
+
+    @staticmethod
+    def _check(item, condition, values) -> bool:
+        for clause in (condition or "").split(" AND "):
+            ok = {
+                "attribute_exists(sha256)": item is not None,
+                "attribute_not_exists(deleting)": not (item or {}).get("deleting"),
+                "refs > :zero": item is not None and item["refs"] > 0,
+                "refs <= :zero": item is not None and item["refs"] <= 0,
+                "deleting = :token": item is not None and item.get("deleting") == values.get(":token"),
+                "": True,
+            }[clause]
+            if not ok:
+                return False
+        return True
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ReturnValues, ConditionExpression=None):
+        sha = Key["sha256"]
+        values = ExpressionAttributeValues
+        if not self._check(self.items.get(sha), ConditionExpression, values):
+            raise self._failed("UpdateItem")
+        item = self.items.setdefault(sha, {"sha256": sha, "refs": 0})
+        if UpdateExpression.startswith("ADD refs"):
+            item["refs"] += values.get(":one", 0) + values.get(":minus_one", 0)
+        if ":size" in values:
+            item["size_bytes"] = values[":size"]
+        if UpdateExpression.startswith("SET deleting"):
+            item.update(deleting=values[":token"], deleting_since=values[":now"])
+        if UpdateExpression.startswith("REMOVE"):
+            item.pop("deleting", None)
+            item.pop("deleting_since", None)
+        return {"Attributes": dict(item) if ReturnValues == "ALL_NEW" else {"refs": item["refs"]}}
+
+    def delete_item(self, Key, ConditionExpression=None, ExpressionAttributeValues=None):
+        if not self._check(self.items.get(Key["sha256"]), ConditionExpression, ExpressionAttributeValues or {}):
+            raise self._failed("DeleteItem")
+        self.items.pop(Key["sha256"], None)
+
+    def get_item(self, Key):
+        item = self.items.get(Key["sha256"])
+        return {"Item": dict(item)} if item else {}
+
+    def scan(self, **kwargs):
+        return {"Items": list(self.items.values())}
+
+
 @pytest.fixture()
 def fake_artifact_manager() -> FakeArtifactManager:
     return FakeArtifactManager()
@@ -143,12 +291,49 @@ def fake_storage_manager(fake_artifact_manager: FakeArtifactManager) -> FakeStor
 
 
 @pytest.fixture()
-def patch_backend_deps(monkeypatch: pytest.MonkeyPatch, fake_storage_manager: FakeStorageManager, fake_artifact_manager: FakeArtifactManager):
+def fake_blobs_table() -> FakeBlobsTable:
+    return FakeBlobsTable()
+
+
+@pytest.fixture()
+def fake_job_manager(tmp_path, fake_storage_manager: FakeStorageManager, fake_artifact_manager: FakeArtifactManager):
+    """Ingestion job manager journaling to a temporary SQLite file."""
+    from backend.services.ingest import IngestPipeline
+    from backend.services.jobs import IngestJobManager, SQLiteJobStore
+
+    manager = IngestJobManager(
+        store=SQLiteJobStore(str(tmp_path / "jobs.db")),
+        pipeline_factory=lambda: IngestPipeline(fake_artifact_manager, fake_storage_manager),
+        max_workers=2,
+    )
+    yield manager
+    manager.shutdown(wait=True)
+
+
+@pytest.fixture()
+def fake_idempotency(tmp_path):
+    """Idempotency-Key registry journaling to a temporary SQLite file."""
+    from backend.services.idempotency import IdempotencyRegistry, SQLiteIdempotencyStore
+
+    return IdempotencyRegistry(SQLiteIdempotencyStore(str(tmp_path / "jobs.db")))
+
+
+@pytest.fixture()
+def patch_backend_deps(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_storage_manager: FakeStorageManager,
+    fake_artifact_manager: FakeArtifactManager,
+    fake_job_manager,
+    fake_idempotency,
+):
     """Patch backend modules to use fake managers (avoids AWS/network)."""
     import backend.deps as deps
+    from backend.services.score_cache import ScoreCache
 
     monkeypatch.setattr(deps, "storage_manager", fake_storage_manager, raising=True)
     monkeypatch.setattr(deps, "artifact_manager", fake_artifact_manager, raising=True)
+    monkeypatch.setattr(deps, "job_manager", fake_job_manager, raising=True)
+    monkeypatch.setattr(deps, "idempotency", fake_idempotency, raising=True)
 
     # Routers import manager singletons directly, so patch their module globals too.
     import backend.api.create as create
@@ -162,11 +347,22 @@ def patch_backend_deps(monkeypatch: pytest.MonkeyPatch, fake_storage_manager: Fa
     import backend.api.reset as reset
     import backend.api.license_check as license_check
     import backend.api.lineage as lineage
+    import backend.api.jobs as jobs
+    import backend.api.batch as batch
+    import backend.api.rescore as rescore
 
-    for mod in [create, list_api, retrieve, delete, download, byregex, rate, cost, reset, license_check, lineage]:
+    for mod in [
+        create, list_api, retrieve, delete, download, byregex, rate, cost, reset, license_check, lineage, jobs, batch, rescore
+    ]:
         if hasattr(mod, "storage_manager"):
             monkeypatch.setattr(mod, "storage_manager", fake_storage_manager, raising=True)
         if hasattr(mod, "artifact_manager"):
             monkeypatch.setattr(mod, "artifact_manager", fake_artifact_manager, raising=True)
+        if hasattr(mod, "job_manager"):
+            monkeypatch.setattr(mod, "job_manager", fake_job_manager, raising=True)
+        if hasattr(mod, "idempotency"):
+            monkeypatch.setattr(mod, "idempotency", fake_idempotency, raising=True)
+        if hasattr(mod, "score_cache"):
+            monkeypatch.setattr(mod, "score_cache", ScoreCache(), raising=True)
 
     return True
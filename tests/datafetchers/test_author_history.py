@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from datafetchers.author_history import AuthorHistory, AuthorHistoryStore, commit_author
+from datafetchers.busfactordata_fetcher import BusFactorDataFetcher
+
+
+class _Resp:
+    def __init__(self, payload, last_page=None, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.links = {"last": {"url": f"https://api.github.com/x?page={last_page}"}} if last_page else {}
+
+    def json(self):
+        return self._payload
+
+
+def _commit(sha, login, date="2024-01-01T00:00:00Z"):
+    return {"sha": sha, "author": {"login": login}, "commit": {"committer": {"date": date}}}
+
+
+class _FakeGitHub:
+    """Serves a newest-first commit list in pages of `per_page`, honouring a `since` marker."""
+
+    def __init__(self, commits, per_page=2):
+        self.commits = commits
+        self.per_page = per_page
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, **kw):
+        with self._lock:
+            self.calls.append(dict(params))
+        commits = self.commits
+        if params.get("since"):
+            commits = [c for c in commits if c["commit"]["committer"]["date"] >= params["since"]]
+        page = params["page"]
+        last = max(1, -(-len(commits) // self.per_page))
+        chunk = commits[(page - 1) * self.per_page : page * self.per_page]
+        return _Resp(chunk, last_page=last if last > 1 else None)
+
+
+@pytest.fixture()
+def github(monkeypatch):
+    fake = _FakeGitHub(
+        [
+            _commit("c4", "alice", "2024-01-04T00:00:00Z"),
+            _commit("c3", "bob", "2024-01-03T00:00:00Z"),
+            _commit("c2", "alice", "2024-01-02T00:00:00Z"),
+            _commit("c1", "carol", "2024-01-01T00:00:00Z"),
+        ]
+    )
+    monkeypatch.setattr("datafetchers.author_history.http_client.get", fake.get)
+    return fake
+
+
+def _history(tmp_path, max_pages=10):
+    return AuthorHistory(AuthorHistoryStore(str(tmp_path / "authors.db")), max_pages=max_pages, workers=2)
+
+
+def test_first_refresh_walks_all_pages(tmp_path, github):
+    counts = _history(tmp_path).author_counts("o/r")
+
+    assert counts == {"alice": 2, "bob": 1, "carol": 1}
+    assert sorted(c["page"] for c in github.calls) == [1, 2]
+
+
+def test_refresh_only_counts_commits_after_watermark(tmp_path, github):
+    history = _history(tmp_path)
+    history.author_counts("o/r")
+    github.commits.insert(0, _commit("c5", "dave", "2024-01-05T00:00:00Z"))
+    github.calls.clear()
+
+    counts = history.author_counts("o/r")
+
+    assert counts == {"alice": 2, "bob": 1, "carol": 1, "dave": 1}
+    assert github.calls == [{"per_page": 100, "since": "2024-01-04T00:00:00Z", "page": 1}]
+    record = history.store.get("o/r")
+    assert (record["head_sha"], record["commits"]) == ("c5", 5)
+
+
+def test_unchanged_head_skips_the_api(tmp_path, github):
+    history = _history(tmp_path)
+    history.author_counts("o/r")
+    github.calls.clear()
+
+    assert history.author_counts("o/r", head_sha="c4") == {"alice": 2, "bob": 1, "carol": 1}
+    assert github.calls == []
+
+
+def test_window_limits_pages_walked(tmp_path, github):
+    counts = _history(tmp_path, max_pages=1).author_counts("o/r")
+
+    assert counts == {"alice": 1, "bob": 1}
+
+
+def test_unreachable_github_returns_none(tmp_path, monkeypatch):
+    monkeypatch.setattr("datafetchers.author_history.http_client.get", lambda *a, **kw: _Resp([], status_code=403))
+    assert _history(tmp_path).author_counts("o/r") is None
+
+
+def test_commit_author_falls_back_to_name_then_email():
+    assert commit_author({"author": None, "commit": {"author": {"name": "N", "email": "e"}}}) == "N"
+    assert commit_author({"commit": {"author": {"email": "e"}}}) == "e"
+    assert commit_author({}) is None
+
+
+def test_bus_factor_fetcher_reports_commit_counts(tmp_path, github, monkeypatch):
+    monkeypatch.setattr("datafetchers.busfactordata_fetcher.get_author_history", lambda: _history(tmp_path))
+
+    out = BusFactorDataFetcher().fetch_Codedata({"full_name": "o/r"})
+
+    assert out["commit_authors"] == ["alice", "bob", "carol"]
+    assert out["author_commit_counts"] == {"alice": 2, "bob": 1, "carol": 1}
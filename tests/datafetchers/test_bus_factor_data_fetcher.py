@@ -23,7 +23,7 @@ def test_bus_factor_data_fetcher_codedata(monkeypatch: pytest.MonkeyPatch):
             {"author": {"login": "a"}},
         ])
 
-    monkeypatch.setattr("datafetchers.busfactordata_fetcher.requests.get", fake_get)
+    monkeypatch.setattr("datafetchers.busfactordata_fetcher.http_client.get", fake_get)
 
     f = BusFactorDataFetcher()
     out = f.fetch_Codedata({"full_name": "o/r"})
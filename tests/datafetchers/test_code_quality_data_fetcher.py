@@ -1,17 +1,39 @@
-from datafetchers.codequalitydata_fetcher import CodeQualityDataFetcher
+import pytest
+
+from datafetchers import codequalitydata_fetcher
+from datafetchers.codequalitydata_fetcher import CodeQualityDataFetcher, _TreeSummaryCache
+
+
+class _Resp:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture(autouse=True)
+def fresh_tree_cache(monkeypatch):
+    monkeypatch.setattr(codequalitydata_fetcher, "_tree_summaries", _TreeSummaryCache(8))
 
 
 def test_code_quality_fetcher_from_repo_tree(monkeypatch):
     f = CodeQualityDataFetcher()
     monkeypatch.setattr(
-        f,
-        "_fetch_repo_tree",
-        lambda repo, branch: [
-            {"path": "README.md"},
-            {"path": "tests/test_a.py"},
-            {"path": ".github/workflows/ci.yml"},
-            {"path": "pyproject.toml"},
-        ],
+        "datafetchers.tree_walker.http_client.get",
+        lambda url, params=None, headers=None: _Resp(
+            {
+                "sha": "root",
+                "truncated": False,
+                "tree": [
+                    {"path": "README.md"},
+                    {"path": "tests/test_a.py"},
+                    {"path": ".github/workflows/ci.yml"},
+                    {"path": "pyproject.toml"},
+                ],
+            }
+        ),
     )
 
     out = f.fetch_Codedata({"full_name": "o/r", "default_branch": "main"})
@@ -19,3 +41,90 @@ def test_code_quality_fetcher_from_repo_tree(monkeypatch):
     assert out["has_tests"] is True
     assert out["has_ci"] is True
     assert out["has_packaging"] is True
+
+
+def test_code_quality_walks_truncated_tree_by_subtree(monkeypatch):
+    trees = {
+        "main": {"sha": "root", "tree": []},
+        "root": {
+            "sha": "root",
+            "tree": [
+                {"path": "README.md", "type": "blob"},
+                {"path": "pkg", "type": "tree", "sha": "pkg"},
+                {"path": "services", "type": "tree", "sha": "svc"},
+            ],
+        },
+        "pkg": {"sha": "pkg", "tree": [{"path": "core.py", "type": "blob"}]},
+        "svc": {"sha": "svc", "tree": [{"path": "api/tests/test_api.go", "type": "blob"}]},
+    }
+    calls = []
+
+    def fake_get(url, params=None, headers=None):
+        sha = url.rsplit("/", 1)[-1]
+        recursive = bool(params)
+        calls.append((sha, recursive))
+        payload = dict(trees[sha])
+        # The root listing is too big to come back in one recursive call.
+        payload["truncated"] = recursive and sha == "root"
+        return _Resp(payload)
+
+    monkeypatch.setattr("datafetchers.tree_walker.http_client.get", fake_get)
+
+    out = CodeQualityDataFetcher().fetch_Codedata({"full_name": "o/r", "default_branch": "main"})
+    assert out["has_readme"] is True
+    assert out["has_tests"] is True
+    assert out["language_counts"] == {"Python": 1, "Go": 1}
+    assert ("pkg", True) in calls and ("svc", True) in calls
+
+    # Unchanged root tree SHA: the summary is reused without walking again.
+    calls.clear()
+    again = CodeQualityDataFetcher().fetch_Codedata({"full_name": "o/r", "default_branch": "main"})
+    assert again == out
+    assert calls == [("main", False)]
+
+
+def test_compiled_classifier_matches_legacy_checks_per_path():
+    from benchmarks.bench_path_classifier import legacy_aggregate, synthetic_paths
+
+    edge_cases = [
+        "./tests/x.py", "../a/test_b.py", "src/mytest.py", "a/b/.travis.yml", "x/ci/y",
+        "ci.yaml", "docs/build/index.md", "kernel.cu.h", "view.mm", "lib.m", ".py", "noext",
+        "README", "readme.rst", "home.md", "sub/Makefile", "pkg/__init__.py", "tools/Jenkinsfile",
+        "azure-pipelines.yaml", "web/app.test.js", "x/linting/rules.txt", "setup.cfg", "  ",
+    ]
+    f = CodeQualityDataFetcher()
+    for path in edge_cases + synthetic_paths(3000, seed=7):
+        assert f._aggregate_from_paths([path]) == legacy_aggregate([path]), path
+
+
+def test_code_quality_lists_repo_from_archive_central_directory(monkeypatch):
+    manifest = {"files": [
+        {"path": "r-main/README.md", "size": 1},
+        {"path": "r-main/tests/test_a.py", "size": 1},
+        {"path": "r-main/src/lib.rs", "size": 1},
+    ]}
+    urls = []
+    monkeypatch.setattr(codequalitydata_fetcher, "_ARCHIVE_LISTING", True)
+    monkeypatch.setattr(codequalitydata_fetcher, "fetch_zip_manifest", lambda url: urls.append(url) or manifest)
+    monkeypatch.setattr(
+        "datafetchers.tree_walker.http_client.get", lambda *a, **k: pytest.fail("trees API called")
+    )
+
+    out = CodeQualityDataFetcher().fetch_Codedata({"full_name": "o/r", "default_branch": "main"})
+
+    assert urls == ["https://github.com/o/r/archive/refs/heads/main.zip"]
+    assert out["has_readme"] is True
+    assert out["has_tests"] is True
+    assert out["language_counts"] == {"Python": 1, "Rust": 1}
+
+
+def test_code_quality_falls_back_to_trees_api_without_archive_listing(monkeypatch):
+    monkeypatch.setattr(codequalitydata_fetcher, "_ARCHIVE_LISTING", True)
+    monkeypatch.setattr(codequalitydata_fetcher, "fetch_zip_manifest", lambda url: None)
+    monkeypatch.setattr(
+        "datafetchers.tree_walker.http_client.get",
+        lambda url, params=None, headers=None: _Resp({"sha": "root", "truncated": False, "tree": [{"path": "setup.py"}]}),
+    )
+
+    out = CodeQualityDataFetcher().fetch_Codedata({"full_name": "o/r", "default_branch": "main"})
+    assert out["has_packaging"] is True
@@ -0,0 +1,38 @@
+import threading
+import time
+
+from datafetchers.fetch_context import FetchContext, current_fetch_context, fetch_context
+
+
+def test_fetch_context_memoizes_and_counts_duplicates():
+    ctx = FetchContext()
+    calls = []
+
+    assert ctx.memo("k", lambda: calls.append(1) or "v") == "v"
+    assert ctx.memo("k", lambda: calls.append(1) or "other") == "v"
+    assert calls == [1]
+    assert ctx.stats() == {"fetches": 1, "duplicates_avoided": 1}
+
+
+def test_fetch_context_concurrent_callers_share_one_load():
+    ctx = FetchContext()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "v"
+
+    threads = [threading.Thread(target=ctx.memo, args=("k", slow)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [1]
+
+
+def test_fetch_context_block_sets_and_resets_current():
+    assert current_fetch_context() is None
+    with fetch_context("x") as ctx:
+        assert current_fetch_context() is ctx
+    assert current_fetch_context() is None
@@ -0,0 +1,126 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from datafetchers.zip_manifest import ZipFormatError, archive_paths, fetch_zip_manifest, read_zip_manifest
+
+
+def _zip(entries, comment=b"", compression=zipfile.ZIP_DEFLATED):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+        zf.comment = comment
+    return buf.getvalue()
+
+
+def _reader(blob, calls=None):
+    def read_range(start, end):
+        if calls is not None:
+            calls.append((start, end))
+        return blob[start : end + 1]
+
+    return read_range
+
+
+def test_read_zip_manifest_lists_files_from_central_directory_only():
+    payload = os.urandom(256 * 1024)
+    blob = _zip(
+        [("repo-main/", b""), ("repo-main/README.md", b"# hi"), ("repo-main/src/model.bin", payload)],
+        comment=b"archive comment with PK\x05\x06 inside",
+        compression=zipfile.ZIP_STORED,
+    )
+    calls = []
+
+    manifest = read_zip_manifest(_reader(blob, calls), len(blob))
+
+    assert [(f["path"], f["size"]) for f in manifest["files"]] == [
+        ("repo-main/README.md", 4),
+        ("repo-main/src/model.bin", len(payload)),
+    ]
+    assert manifest["total_bytes"] == 4 + len(payload)
+    # One read of the tail; the central directory sits inside it.
+    assert len(calls) == 1
+    assert manifest["bytes_read"] < len(blob) // 2
+    assert archive_paths(manifest) == ["README.md", "src/model.bin"]
+
+
+def test_read_zip_manifest_reads_central_directory_outside_the_tail():
+    entries = [(f"r/pkg/module_{i:05d}_{'x' * 40}.py", b"") for i in range(2000)]
+    blob = _zip(entries)
+    calls = []
+
+    manifest = read_zip_manifest(_reader(blob, calls), len(blob))
+
+    assert manifest["file_count"] == 2000
+    assert len(calls) == 2
+
+
+def test_read_zip_manifest_handles_zip64_entry_counts():
+    blob = _zip([(f"f{i}", b"") for i in range(0x10000 + 5)], compression=zipfile.ZIP_STORED)
+
+    manifest = read_zip_manifest(_reader(blob), len(blob))
+
+    assert manifest["file_count"] == 0x10000 + 5
+
+
+def test_read_zip_manifest_rejects_non_zip():
+    with pytest.raises(ZipFormatError):
+        read_zip_manifest(_reader(b"not a zip" * 100), 900)
+
+
+class _RangeResp:
+    def __init__(self, blob, range_header, honour=True):
+        self.url = "https://codeload.github.com/o/r/zip/refs/heads/main"
+        self.closed = False
+        spec = range_header.removeprefix("bytes=")
+        if not honour:
+            self.status_code, self.headers, self.content = 200, {}, blob
+            return
+        if spec.startswith("-"):
+            start, end = max(0, len(blob) - int(spec[1:])), len(blob) - 1
+        else:
+            first, last = spec.split("-")
+            start, end = int(first), min(int(last), len(blob) - 1)
+        self.status_code = 206
+        self.headers = {"Content-Range": f"bytes {start}-{end}/{len(blob)}"}
+        self.content = blob[start : end + 1]
+
+    def close(self):
+        self.closed = True
+
+
+def test_fetch_zip_manifest_over_http_ranges(monkeypatch: pytest.MonkeyPatch):
+    blob = _zip([("r-main/setup.py", b"x" * 1000), ("r-main/tests/test_a.py", b"y")])
+    urls = []
+
+    def get(url, headers=None, stream=False, timeout=None):
+        assert stream is True
+        urls.append(url)
+        return _RangeResp(blob, headers["Range"])
+
+    monkeypatch.setattr("datafetchers.zip_manifest.http_client.get", get)
+
+    manifest = fetch_zip_manifest("https://github.com/o/r/archive/refs/heads/main.zip")
+
+    assert manifest is not None
+    assert archive_paths(manifest) == ["setup.py", "tests/test_a.py"]
+    assert manifest["bytes_read"] == len(blob)
+    assert len(urls) == 1
+
+
+def test_fetch_zip_manifest_gives_up_without_range_support(monkeypatch: pytest.MonkeyPatch):
+    blob = _zip([("r-main/a.py", b"")])
+    seen = []
+
+    def get(url, headers=None, stream=False, timeout=None):
+        resp = _RangeResp(blob, headers["Range"], honour=False)
+        seen.append(resp)
+        return resp
+
+    monkeypatch.setattr("datafetchers.zip_manifest.http_client.get", get)
+
+    assert fetch_zip_manifest("https://github.com/o/r/archive/HEAD.zip") is None
+    assert seen[0].closed
@@ -12,15 +12,22 @@ class _Resp:
         self.status_code = status_code
         self.content = content
 
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
 
-def test_api_happy_path_all_endpoints(patch_backend_deps, monkeypatch: pytest.MonkeyPatch):
+    def close(self):
+        pass
+
+
+def test_api_happy_path_all_endpoints(patch_backend_deps, fake_job_manager, monkeypatch: pytest.MonkeyPatch):
     # Patch external network calls used by create + license-check routers.
     monkeypatch.setattr(
-        "backend.api.create.requests.get",
+        "backend.services.ingest.http_client.get",
         lambda *args, **kwargs: _Resp(status_code=200, content=b"artifact-bytes"),
     )
     monkeypatch.setattr(
-        "backend.api.license_check.requests.head",
+        "backend.api.license_check.http_client.head",
         lambda *args, **kwargs: _Resp(status_code=200, content=b""),
     )
 
@@ -51,6 +58,30 @@ def test_api_happy_path_all_endpoints(patch_backend_deps, monkeypatch: pytest.Mo
     artifact_id = c.json()["metadata"]["id"]
     exercised.add(("POST", "/artifact/{artifact_type}"))
 
+    # async ingestion job
+    j = client.post("/jobs/artifact/model", json={"url": "https://github.com/o/job"})
+    assert j.status_code == 202
+    job_id = j.json()["job_id"]
+    exercised.add(("POST", "/jobs/artifact/{artifact_type}"))
+
+    fake_job_manager.wait(job_id, timeout=5)
+    js = client.get(f"/jobs/{job_id}")
+    assert js.status_code == 200
+    assert js.json()["status"] == "succeeded"
+    exercised.add(("GET", "/jobs/{job_id}"))
+
+    # batch ingest
+    b = client.post("/artifacts/batch", json={"urls": ["https://github.com/o/b1", "https://github.com/o/b2"]})
+    assert b.status_code == 200
+    assert b.json()["summary"]["succeeded"] == 2
+    exercised.add(("POST", "/artifacts/batch"))
+
+    # rescore (fake items carry no stored metric inputs)
+    rs = client.post("/artifacts/rescore", json={"ids": [artifact_id, "missing"]})
+    assert rs.status_code == 200
+    assert [r["status"] for r in rs.json()["results"]] == ["missing_inputs", "not_found"]
+    exercised.add(("POST", "/artifacts/rescore"))
+
     # retrieve
     r = client.get(f"/artifacts/model/{artifact_id}")
     assert r.status_code == 200
@@ -111,6 +142,12 @@ def test_api_happy_path_all_endpoints(patch_backend_deps, monkeypatch: pytest.Mo
     assert d.status_code == 200
     exercised.add(("DELETE", "/artifacts/{artifact_type}/{id}"))
 
+    # stats
+    st = client.get("/stats")
+    assert st.status_code == 200
+    assert "reuse_ratio" in st.json()["http"]
+    exercised.add(("GET", "/stats"))
+
     # reset
     rs = client.delete("/reset")
     assert rs.status_code == 200